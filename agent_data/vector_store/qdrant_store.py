@@ -1,9 +1,13 @@
 import asyncio
 import logging
 import os
+import threading
+import weakref
+from collections import Counter
 from typing import Any
 
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.http.exceptions import UnexpectedResponse
 from qdrant_client.http.models import (
     Distance,
     FieldCondition,
@@ -33,6 +37,65 @@ except ImportError:
 
 logger = logging.getLogger(__name__)  # Added logger
 
+QDRANT_TIMEOUT = 20  # Set a higher timeout (e.g., 20 seconds)
+# Upper bound on distinct tags returned by one facet request
+TAG_FACET_LIMIT = int(os.getenv("QDRANT_TAG_FACET_LIMIT", "10000"))
+
+# Clients are pooled per (client class, url, api_key) so every QdrantStore pointing
+# at the same cluster reuses one HTTP connection pool. Async clients are also keyed
+# by event loop, since their connections cannot be shared across loops.
+_sync_clients: dict[tuple, Any] = {}
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+def get_pooled_client(url: str, api_key: str | None) -> QdrantClient:
+    """Return the shared synchronous client for a Qdrant endpoint."""
+    key = (QdrantClient, url, api_key)
+    with _clients_lock:
+        client = _sync_clients.get(key)
+        if client is None:
+            client = _sync_clients[key] = QdrantClient(
+                url=url, api_key=api_key, timeout=QDRANT_TIMEOUT
+            )
+        return client
+
+
+def get_pooled_async_client(url: str, api_key: str | None) -> AsyncQdrantClient:
+    """Return the shared async client for a Qdrant endpoint on the running loop."""
+    loop = asyncio.get_running_loop()
+    key = (AsyncQdrantClient, url, api_key)
+    with _clients_lock:
+        loop_clients = _async_clients.setdefault(loop, {})
+        client = loop_clients.get(key)
+        if client is None:
+            client = loop_clients[key] = AsyncQdrantClient(
+                url=url, api_key=api_key, timeout=QDRANT_TIMEOUT
+            )
+        return client
+
+
+def _normalize_tag(value: Any) -> str | None:
+    """Return a stripped, non-empty tag, or None for values that are not tags."""
+    if isinstance(value, str) and value.strip():
+        return value.strip()
+    return None
+
+
+async def close_pooled_clients():
+    """Close pooled clients; async ones only for the running loop."""
+    with _clients_lock:
+        sync_clients = list(_sync_clients.values())
+        _sync_clients.clear()
+        async_clients = list(
+            _async_clients.pop(asyncio.get_running_loop(), {}).values()
+        )
+
+    for client in async_clients:
+        await client.close()
+    for client in sync_clients:
+        client.close()
+
 
 class QdrantStore:
     _instance = None
@@ -80,14 +143,20 @@ class QdrantStore:
         else:
             logger.warning("Qdrant API Key is NOT set. Ensure this is intentional.")
 
-        self.client = QdrantClient(
-            url=qdrant_url,
-            api_key=api_key,
-            timeout=20,  # Set a higher timeout (e.g., 20 seconds)
-        )
+        self.qdrant_url = qdrant_url
+        self.api_key = api_key
+        # Synchronous client, only for the synchronous methods below
+        self.client = get_pooled_client(qdrant_url, api_key)
         self.collection_name = os.getenv("QDRANT_COLLECTION_NAME", "my_collection")
         self._ensure_collection()
 
+        # Tag enumeration uses the facet API when the server supports it (None
+        # until first tried). Otherwise tag -> count lives in a registry that is
+        # built with one scroll and then kept up to date by this store's writes.
+        self._facets_supported: bool | None = None
+        self._tag_counts: Counter | None = None
+        self._tag_lock = threading.Lock()
+
         self.firestore_manager: FirestoreMetadataManager | None = None
         self.enable_firestore_sync = (
             os.getenv("ENABLE_FIRESTORE_SYNC", "false").lower() == "true"
@@ -133,6 +202,11 @@ class QdrantStore:
         else:
             logger.info("Firestore sync is disabled.")
 
+    @property
+    def async_client(self) -> AsyncQdrantClient:
+        """Pooled async client bound to the running event loop."""
+        return get_pooled_async_client(self.qdrant_url, self.api_key)
+
     def _ensure_collection(self):
         collection_exists = self.client.collection_exists(
             collection_name=self.collection_name
@@ -169,11 +243,15 @@ class QdrantStore:
     async def upsert_vector(
         self, point_id: int | str, vector: list[float], metadata: dict
     ) -> bool:
-        # Qdrant client is synchronous
-        self.client.upsert(
+        previous_tag = await self._stored_tag(point_id)
+        await self.async_client.upsert(
             collection_name=self.collection_name,
             points=[PointStruct(id=point_id, vector=vector, payload=metadata)],
         )
+        if previous_tag is not False:
+            self._update_tag_counts(
+                {previous_tag: -1, _normalize_tag((metadata or {}).get("tag")): 1}
+            )
         print(f"✅ Vector {point_id} inserted into Qdrant.")
 
         if (
@@ -247,10 +325,12 @@ class QdrantStore:
         Returns:
             True if the deletion request was accepted
         """
-        # Qdrant client is synchronous
-        self.client.delete(
+        previous_tag = await self._stored_tag(point_id)
+        await self.async_client.delete(
             collection_name=self.collection_name, points_selector=[point_id]
         )
+        if previous_tag is not False:
+            self._update_tag_counts({previous_tag: -1})
         print(f"✅ Vector {point_id} deleted from Qdrant.")
 
         if self.enable_firestore_sync and self.firestore_manager:
@@ -311,38 +391,140 @@ class QdrantStore:
         )
         return result.count
 
-    def list_all_tags(self) -> list[str]:
+    def _facet_tag_counts(self, exact: bool = False) -> Counter | None:
         """
-        Retrieve all unique tags from the collection.
+        Count tags with Qdrant's facet API over the keyword index on 'tag'.
 
         Returns:
-            A sorted list of unique tags.
+            tag -> count, or None if facets are unavailable on this client/server
         """
-        all_tags = set()
-        next_page_offset = None  # Initialize offset for the first scroll
+        if self._facets_supported is False:
+            return None
+        try:
+            response = self.client.facet(
+                collection_name=self.collection_name,
+                key="tag",
+                limit=TAG_FACET_LIMIT,
+                exact=exact,
+            )
+            hits = response.hits
+        except (AttributeError, TypeError, NotImplementedError) as e:
+            # Client predates facets (qdrant-client < 1.12)
+            logger.info(f"Facet API unavailable, using the tag registry: {e}")
+            self._facets_supported = False
+            return None
+        except UnexpectedResponse as e:
+            if e.status_code != 404:
+                raise
+            # Server predates facets (Qdrant < 1.12)
+            logger.info(f"Facet API unavailable, using the tag registry: {e}")
+            self._facets_supported = False
+            return None
 
+        self._facets_supported = True
+        if len(hits) >= TAG_FACET_LIMIT:
+            logger.warning(
+                f"Tag facet hit the limit of {TAG_FACET_LIMIT}; raise QDRANT_TAG_FACET_LIMIT to list every tag."
+            )
+        counts = Counter()
+        for hit in hits:
+            tag = _normalize_tag(hit.value)
+            if tag:
+                counts[tag] += hit.count
+        return counts
+
+    def _build_tag_registry(self) -> Counter:
+        """Count tags with one full scroll; only done when facets are unavailable."""
+        counts = Counter()
+        next_page_offset = None
         while True:
-            # Scroll through points, 100 at a time with payload
-            # The Qdrant client handles pagination internally using the offset
             points, next_page_offset = self.client.scroll(
                 collection_name=self.collection_name,
-                limit=100,  # Process 100 points per batch
+                limit=256,
                 offset=next_page_offset,
-                with_payload=True,
-                with_vectors=False,  # Vectors are not needed
+                with_payload=["tag"],
+                with_vectors=False,
             )
-
             for point in points:
-                if point.payload and isinstance(point.payload, dict):
-                    tag_value = point.payload.get("tag")
-                    # Ensure tag_value is a non-empty string
-                    if tag_value and isinstance(tag_value, str) and tag_value.strip():
-                        all_tags.add(tag_value.strip())
-
+                if isinstance(point.payload, dict):
+                    tag = _normalize_tag(point.payload.get("tag"))
+                    if tag:
+                        counts[tag] += 1
             if next_page_offset is None:
-                break  # Exit loop if no more pages
+                break
+        logger.info(
+            f"Built tag registry for '{self.collection_name}' with {len(counts)} tags."
+        )
+        return counts
+
+    def _update_tag_counts(self, deltas: dict[str | None, int]):
+        """Apply count changes to the tag registry, if it has been built."""
+        with self._tag_lock:
+            if self._tag_counts is None:
+                return
+            for tag, delta in deltas.items():
+                if tag:
+                    self._tag_counts[tag] += delta
+                    if self._tag_counts[tag] <= 0:
+                        del self._tag_counts[tag]
+
+    async def _stored_tag(self, point_id: int | str) -> str | None | bool:
+        """
+        Current tag of a point, for keeping the tag registry in step with writes.
 
-        return sorted(list(all_tags))
+        Returns:
+            The stored tag (None if the point is missing or untagged), or False
+            when no registry is maintained and the lookup was skipped
+        """
+        if self._tag_counts is None:
+            return False
+        try:
+            points = await self.async_client.retrieve(
+                collection_name=self.collection_name,
+                ids=[point_id],
+                with_payload=["tag"],
+                with_vectors=False,
+            )
+        except Exception as e:
+            logger.warning(
+                f"Could not read previous tag of point {point_id}, rebuilding tag registry on next use: {e}"
+            )
+            self.invalidate_tag_registry()
+            return False
+        if points and isinstance(points[0].payload, dict):
+            return _normalize_tag(points[0].payload.get("tag"))
+        return None
+
+    def invalidate_tag_registry(self):
+        """Drop the tag registry so the next listing rebuilds it from Qdrant."""
+        with self._tag_lock:
+            self._tag_counts = None
+
+    def list_all_tags(self, with_counts: bool = False) -> list[str] | dict[str, int]:
+        """
+        Retrieve all unique tags from the collection.
+
+        Tags come from Qdrant's facet API when available, so the cost grows with
+        the number of tags rather than points. Otherwise a tag registry is built
+        with one scroll and maintained by this store's upserts and deletes;
+        writes made outside this store need ``invalidate_tag_registry()``.
+
+        Args:
+            with_counts: Return ``{tag: point_count}`` instead of tag names.
+
+        Returns:
+            A sorted list of unique tags, or a tag -> count dict sorted by tag.
+        """
+        counts = self._facet_tag_counts(exact=with_counts)
+        if counts is None:
+            with self._tag_lock:
+                if self._tag_counts is None:
+                    self._tag_counts = self._build_tag_registry()
+                counts = Counter(self._tag_counts)
+
+        if with_counts:
+            return {tag: counts[tag] for tag in sorted(counts)}
+        return sorted(counts)
 
     async def delete_vectors_by_tag(self, tag: str) -> int:
         """
@@ -368,20 +550,11 @@ class QdrantStore:
                 logger.debug(
                     f"Fetching points with tag '{tag}' for Firestore metadata deletion."
                 )
-                # Make this part async if get_vector_ids_by_tag becomes async, or use sync client call
-                # For now, assuming get_vector_ids_by_tag is synchronous or adapted.
-                # Adapting to use a synchronous scroll within this async method for now.
-                # This part ideally should be async if Qdrant client supports it or if get_vector_ids_by_tag is async.
-
-                # Simplified approach: Perform Qdrant scroll to get IDs
-                # Note: Qdrant client operations are synchronous.
-                # If Qdrant had an async client, this would be cleaner.
-                # For now, we'll run the sync Qdrant calls within this async method.
 
                 current_offset = None
                 limit_per_scroll = 100  # Adjust as needed
                 while True:
-                    scroll_result, current_offset = self.client.scroll(
+                    scroll_result, current_offset = await self.async_client.scroll(
                         collection_name=self.collection_name,
                         scroll_filter=delete_filter,
                         limit=limit_per_scroll,
@@ -406,19 +579,19 @@ class QdrantStore:
                 )
                 # Continue with Qdrant deletion even if fetching IDs for Firestore fails.
 
-        # Qdrant client is synchronous
-        count_response = self.client.count(
+        count_response = await self.async_client.count(
             collection_name=self.collection_name, count_filter=delete_filter, exact=True
         )
         num_to_delete_in_qdrant = count_response.count
 
         if num_to_delete_in_qdrant > 0:
-            self.client.delete(
+            await self.async_client.delete(
                 collection_name=self.collection_name, points_selector=delete_filter
             )
             print(
                 f"✅ Deleted {num_to_delete_in_qdrant} vectors with tag '{tag}' from Qdrant."
             )
+            self._update_tag_counts({_normalize_tag(tag): -num_to_delete_in_qdrant})
         else:
             print(f"No vectors found with tag '{tag}' in Qdrant to delete.")
             return 0  # No Qdrant vectors deleted
@@ -470,9 +643,8 @@ class QdrantStore:
 
     async def purge_all_vectors(self) -> int:
         """
-        Purges all vectors from the specified Qdrant collection.
-        To bypass TypeError with PointsSelector, this now passes a raw dict
-        for the filter directly to the client's delete_points method.
+        Purges all vectors from the specified Qdrant collection by deleting
+        with an empty filter, which matches every point.
 
         Returns:
             The number of vectors deleted, or 0 if an error occurred or no vectors were found.
@@ -485,7 +657,7 @@ class QdrantStore:
         try:
             # Step 1: Get the current count of points in the collection.
             try:
-                initial_count_result = self.client.count(
+                initial_count_result = await self.async_client.count(
                     collection_name=self.collection_name, exact=True
                 )
                 initial_point_count = initial_count_result.count
@@ -518,23 +690,15 @@ class QdrantStore:
                         )
                 return 0
 
-            # Step 2: Define the raw filter for deleting all points.
-            # This dictionary will be passed directly as `points_selector`.
-            # The mock client will need to be updated to handle this dict format for select-all.
-            delete_all_filter_dict = {
-                "filter": {
-                    "must": []
-                    # No "should" or "must_not" implies they are empty/not applicable for a select-all filter.
-                }
-            }
-
+            # Step 2: Delete with an empty filter, which selects every point.
             logger.info(
-                f"Attempting to delete all points from '{self.collection_name}' using a raw filter dict."
+                f"Attempting to delete all points from '{self.collection_name}' using an empty filter."
             )
-            response = self.client.delete_points(
+            response = await self.async_client.delete(
                 collection_name=self.collection_name,
-                points_selector=delete_all_filter_dict,  # Pass the dict directly
+                points_selector=Filter(must=[]),
             )
+            self.invalidate_tag_registry()
             logger.info(
                 f"Delete all points operation status for collection '{self.collection_name}': {response.status if hasattr(response, 'status') else 'N/A'}"
             )
@@ -546,7 +710,7 @@ class QdrantStore:
                 if initial_point_count > 0:
                     deleted_count = initial_point_count
                     logger.info(
-                        f"Successfully submitted deletion for all {deleted_count} points using raw filter dict."
+                        f"Successfully submitted deletion for all {deleted_count} points using an empty filter."
                     )
                 elif (
                     initial_point_count == 0
@@ -582,7 +746,7 @@ class QdrantStore:
 
             else:
                 logger.warning(
-                    f"Deletion by raw filter dict might have failed. Status: {response.status if hasattr(response, 'status') else 'N/A'}"
+                    f"Deletion by empty filter might have failed. Status: {response.status if hasattr(response, 'status') else 'N/A'}"
                 )
                 # deleted_count remains 0
 
@@ -804,7 +968,6 @@ class QdrantStore:
             must=[FieldCondition(key="tag", match=MatchValue(value=tag))]
         )
 
-        # Qdrant client scroll is synchronous, so run it in a separate thread
         # The `offset` parameter for Qdrant's scroll is the `next_page_offset` from a previous response.
         # If it's the first call, it should be None.
         # The API here uses `offset` more like a traditional database offset for simplicity, but Qdrant's scroll
@@ -824,8 +987,7 @@ class QdrantStore:
         # If this method is only used to fetch a large batch of IDs (e.g., for batch update),
         # then `offset` would typically be `None` for the first (and possibly only) call.
 
-        records, _ = await asyncio.to_thread(
-            self.client.scroll,
+        records, _ = await self.async_client.scroll(
             collection_name=self.collection_name,
             scroll_filter=scroll_filter,
             limit=limit,
@@ -841,7 +1003,7 @@ class QdrantStore:
         """Check if the vector store is healthy and accessible."""
         try:
             # Try to get collections as a health check
-            await asyncio.to_thread(self.client.get_collections)
+            await self.async_client.get_collections()
             return True
         except Exception as e:
             logger.error(f"Qdrant health check failed: {e}")
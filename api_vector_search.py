@@ -196,6 +196,7 @@ class CountByTagResponse(BaseModel):
 class ListAllTagsResponse(BaseModel):
     status: str  # Literal["ok"] - Using str for now, can refine to Literal if needed
     tags: list[str]
+    counts: dict[str, int] | None = None  # Only with ?with_counts=true
 
 
 # Pydantic models for /delete_vectors_by_tag
@@ -619,13 +620,19 @@ async def count_vectors_by_tag(
 
 
 @app.post("/list_all_tags", response_model=ListAllTagsResponse)
-async def list_all_tags(qdrant_store: QdrantStore = Depends(get_qdrant_store)):
+async def list_all_tags(
+    with_counts: bool = False, qdrant_store: QdrantStore = Depends(get_qdrant_store)
+):
     """
     List all unique tags present in the vector collection.
-    The request body is empty for this endpoint.
+    The request body is empty for this endpoint; pass ?with_counts=true to also
+    get the number of vectors per tag.
     .cursor: CLI29_list_all_tags_api_added
     """
     try:
+        if with_counts:
+            counts = qdrant_store.list_all_tags(with_counts=True)
+            return ListAllTagsResponse(status="ok", tags=list(counts), counts=counts)
         tags = qdrant_store.list_all_tags()
         return ListAllTagsResponse(status="ok", tags=tags)
     except Exception as e:
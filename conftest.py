@@ -129,6 +129,7 @@ def global_comprehensive_mocks(monkeypatch):
 
         try:
             monkeypatch.setattr("google.cloud.firestore.Client", MagicMock())
+            monkeypatch.setattr("google.cloud.firestore.AsyncClient", MagicMock())
         except ImportError:
             pass  # Module not installed
 
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request JWT authentication overhead with and without the
+verified-token cache in AuthManager.
+
+Usage:
+    JWT_SECRET_KEY=dev-secret python scripts/benchmark_auth_overhead.py --requests 20000 --users 50
+"""
+
+import argparse
+import json
+import os
+import time
+
+try:
+    from scripts.benchmark_utils import summarize_latencies
+except ImportError:  # Run as a file, with scripts/ itself on sys.path
+    from benchmark_utils import summarize_latencies
+
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key")
+
+from agent_data_manager.auth.auth_manager import AuthManager  # noqa: E402
+
+
+def run_benchmark(manager: AuthManager, tokens: list[str], requests: int) -> dict:
+    """Resolve principals for a round-robin token stream and collect latencies."""
+    latencies = []
+    for i in range(requests):
+        token = tokens[i % len(tokens)]
+        start = time.perf_counter()
+        manager.get_principal(token)
+        latencies.append((time.perf_counter() - start) * 1_000_000)
+
+    return {"requests": requests, **summarize_latencies(latencies, "us")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JWT auth overhead")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=50)
+    args = parser.parse_args()
+
+    manager = AuthManager()
+    tokens = [
+        manager.create_user_token(f"user_{i}", f"user_{i}@bench.local")
+        for i in range(args.users)
+    ]
+
+    manager.token_cache_enabled = False
+    uncached = run_benchmark(manager, tokens, args.requests)
+
+    manager.token_cache_enabled = True
+    manager.token_cache.clear()
+    cached = run_benchmark(manager, tokens, args.requests)
+
+    report = {
+        "uncached": uncached,
+        "cached": cached,
+        "cache_stats": manager.token_cache.get_stats(),
+        "speedup_p50": (
+            uncached["p50_us"] / cached["p50_us"] if cached["p50_us"] else None
+        ),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
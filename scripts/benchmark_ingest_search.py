@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+End-to-end ingest and search benchmark that runs without cloud services.
+
+Documents are ingested through /batch_save and then /query, /batch_query and
+/cskh_query are called concurrently against the in-process gateway, with:
+
+* embeddings from the deterministic hash-seeded provider (optionally with a
+  simulated per-request latency) instead of OpenAI
+* Qdrant in local mode (``:memory:`` or ``file://<path>``) instead of a cluster
+* Firestore on the emulator when ``--firestore-emulator`` (or
+  FIRESTORE_EMULATOR_HOST) is given; without it Firestore status writes are
+  skipped and /cskh_query, which needs Firestore metadata, is not measured
+
+Reports ingestion docs/sec and p50/p95/p99 latency per endpoint, and writes
+the report as JSON for comparing runs.
+
+Usage:
+    PYTHONPATH=src python scripts/benchmark_ingest_search.py \\
+        --documents 500 --queries 200 --concurrency 8 \\
+        --embedding-latency-ms 50 --output logs/benchmarks/run.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+from agent_data_manager import api_mcp_gateway as gateway
+from agent_data_manager.config.settings import Settings, settings
+from agent_data_manager.embedding.batching_embedding_provider import (
+    BatchingEmbeddingProvider,
+)
+from agent_data_manager.embedding.openai_embedding_provider import (
+    get_default_embedding_provider,
+)
+from agent_data_manager.event.event_manager import shutdown_event_manager
+from agent_data_manager.tools.qdrant_vectorization_tool import QdrantVectorizationTool
+from agent_data_manager.vector_store.firestore_metadata_manager import (
+    FirestoreMetadataManager,
+)
+from agent_data_manager.vector_store.qdrant_store import get_qdrant_store
+
+try:
+    from scripts.benchmark_utils import summarize_latencies
+except ImportError:  # Run as a file, with scripts/ itself on sys.path
+    from benchmark_utils import summarize_latencies
+
+TOPICS = {
+    "billing": "invoice payment refund charge card plan subscription price",
+    "shipping": "delivery parcel courier tracking address warehouse delay route",
+    "account": "login password profile email security verification session reset",
+    "returns": "return exchange damaged warranty label policy receipt condition",
+}
+FILLER = (
+    "customer support agent request issue answer guide steps help team order "
+    "service update status time contact information please check case"
+).split()
+
+
+def build_corpus(count: int, seed: int) -> list[dict]:
+    """Synthetic documents, each about one topic, reproducible from the seed."""
+    rng = random.Random(seed)
+    documents = []
+    for i in range(count):
+        tag = rng.choice(sorted(TOPICS))
+        words = TOPICS[tag].split() * 3 + FILLER
+        content = " ".join(rng.choices(words, k=rng.randint(80, 200)))
+        documents.append(
+            {
+                "doc_id": f"bench_{i:06d}",
+                "content": content,
+                "metadata": {"title": f"{tag.title()} guide {i}", "topic": tag},
+                "tag": tag,
+            }
+        )
+    return documents
+
+
+def build_queries(documents: list[dict], count: int, seed: int) -> list[str]:
+    """Distinct queries made of words from random documents, so searches hit."""
+    rng = random.Random(seed + 1)
+    queries = []
+    for i in range(count):
+        words = rng.choice(documents)["content"].split()
+        queries.append(f"{' '.join(rng.sample(words, k=min(6, len(words))))} q{i}")
+    return queries
+
+
+def latency_summary(latencies_ms: list[float], errors: int) -> dict:
+    """Request count, error count and mean/p50/p95/p99 latency in milliseconds."""
+    return {
+        "requests": len(latencies_ms) + errors,
+        "errors": errors,
+        **summarize_latencies(latencies_ms, "ms"),
+    }
+
+
+async def run_concurrently(client, requests: list[tuple[str, dict]], concurrency):
+    """POST every (path, body) with at most ``concurrency`` in flight.
+
+    Returns the latencies of successful requests, the error count and every
+    JSON response body.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies_ms: list[float] = []
+    bodies: list[dict] = []
+    errors = 0
+
+    async def send(path: str, body: dict):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post(path, json=body)
+            elapsed = (time.perf_counter() - started) * 1000
+        bodies.append(response.json())
+        if response.status_code == 200 and bodies[-1].get("status") not in (
+            "error",
+            "failed",
+        ):
+            latencies_ms.append(elapsed)
+        else:
+            errors += 1
+
+    await asyncio.gather(*(send(path, body) for path, body in requests))
+    return latencies_ms, errors, bodies
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def local_settings(args) -> dict:
+    """Settings overrides that point the gateway at the offline services."""
+    return {
+        "QDRANT_URL": args.qdrant,
+        "QDRANT_API_KEY": "",
+        "QDRANT_COLLECTION_NAME": f"benchmark_{uuid.uuid4().hex[:8]}",
+        "VECTOR_DIMENSION": args.dimension,
+        "EMBEDDING_PROVIDER": "deterministic",
+        "DETERMINISTIC_EMBEDDING_LATENCY_MS": args.embedding_latency_ms,
+        "EMBEDDING_BATCHING_ENABLED": args.embedding_batching,
+        "ENABLE_AUTHENTICATION": False,
+        "EVENT_PUBLISHER": "local",
+        # Local Qdrant has no cluster quota to respect
+        "QDRANT_REQUESTS_PER_MINUTE": args.qdrant_rpm,
+    }
+
+
+def start_services(firestore_emulator: str | None):
+    """Create the gateway's Qdrant store and vectorization tool for the run."""
+    qdrant_config = settings.get_qdrant_config()
+    store = get_qdrant_store()
+    tool = QdrantVectorizationTool()
+    tool.qdrant_store = store
+    if firestore_emulator:
+        # The Firestore client connects to FIRESTORE_EMULATOR_HOST on its own
+        tool.firestore_manager = FirestoreMetadataManager(
+            project_id=settings.get_firestore_config()["project_id"],
+            collection_name=f"{qdrant_config['collection_name']}_metadata",
+        )
+    if settings.get_embedding_config()["batching_enabled"]:
+        tool.embedding_provider = BatchingEmbeddingProvider(
+            get_default_embedding_provider()
+        )
+    else:
+        tool.embedding_provider = get_default_embedding_provider()
+    tool._initialized = True
+    gateway.qdrant_store = store
+    gateway.vectorization_tool = tool
+    return store
+
+
+async def run_benchmark(args) -> dict:
+    """Ingest the corpus, run the query mix and return the report."""
+    firestore_emulator = args.firestore_emulator or os.environ.get(
+        "FIRESTORE_EMULATOR_HOST"
+    )
+    # Only for this run, so later Firestore clients in the process are unaffected
+    emulator_env = (
+        {"FIRESTORE_EMULATOR_HOST": firestore_emulator} if firestore_emulator else {}
+    )
+    documents = build_corpus(args.documents, args.seed)
+    queries = build_queries(documents, args.queries, args.seed)
+
+    limiter_enabled = gateway.limiter.enabled
+    gateway.limiter.enabled = False  # The gateway's per-user limits would cap the run
+    try:
+        with (
+            patch.multiple(Settings, **local_settings(args)),
+            patch.dict(os.environ, emulator_env),
+        ):
+            store = start_services(firestore_emulator)
+            transport = httpx.ASGITransport(app=gateway.app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://benchmark", timeout=120
+            ) as client:
+                for document in documents:
+                    document["update_firestore"] = bool(firestore_emulator)
+                batches = [
+                    ("/batch_save", {"documents": documents[i : i + args.batch_size]})
+                    for i in range(0, len(documents), args.batch_size)
+                ]
+                started = time.perf_counter()
+                _, failed_batches, saved = await run_concurrently(
+                    client, batches, args.concurrency
+                )
+                ingest_seconds = time.perf_counter() - started
+                stored = await store.get_vector_count()
+
+                query = {"limit": args.limit, "score_threshold": 0.0}
+                workloads = {
+                    "query": [("/query", {"query_text": q, **query}) for q in queries],
+                    "batch_query": [
+                        (
+                            "/batch_query",
+                            {
+                                "queries": [
+                                    {"query_text": q, **query}
+                                    for q in queries[i : i + args.batch_query_size]
+                                ]
+                            },
+                        )
+                        for i in range(0, len(queries), args.batch_query_size)
+                    ],
+                }
+                if firestore_emulator:
+                    workloads["cskh_query"] = [
+                        ("/cskh_query", {"query_text": q, **query}) for q in queries
+                    ]
+
+                endpoints = {}
+                for name, requests in workloads.items():
+                    latencies_ms, errors, _ = await run_concurrently(
+                        client, requests, args.concurrency
+                    )
+                    endpoints[name] = latency_summary(latencies_ms, errors)
+                if not firestore_emulator:
+                    endpoints["cskh_query"] = {
+                        "skipped": "needs Firestore metadata; pass --firestore-emulator"
+                    }
+    finally:
+        gateway.limiter.enabled = limiter_enabled
+        await shutdown_event_manager()
+
+    return {
+        "benchmark": "ingest_search",
+        "timestamp": datetime.utcnow().isoformat(),
+        "git_commit": _git_commit(),
+        "config": {
+            **{key: value for key, value in vars(args).items() if key != "output"},
+            "firestore_emulator": firestore_emulator,
+        },
+        "ingestion": {
+            "documents": len(documents),
+            "failed_batches": failed_batches,
+            "failed_documents": sum(body.get("failed_saves", 0) for body in saved),
+            "points_stored": stored,
+            "seconds": ingest_seconds,
+            "docs_per_sec": len(documents) / ingest_seconds if ingest_seconds else 0,
+        },
+        "endpoints": endpoints,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Offline end-to-end ingest and search benchmark"
+    )
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=20, help="docs per save")
+    parser.add_argument("--batch-query-size", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=10, help="results per query")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--embedding-latency-ms", type=float, default=0.0)
+    parser.add_argument("--embedding-batching", action="store_true")
+    parser.add_argument(
+        "--qdrant", default=":memory:", help="':memory:' or file://<path>"
+    )
+    parser.add_argument(
+        "--qdrant-rpm", type=int, default=0, help="Qdrant rate limit, 0 for none"
+    )
+    parser.add_argument("--firestore-emulator", help="host:port of the emulator")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="JSON report path")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> dict:
+    args = parse_args(argv)
+    report = asyncio.run(run_benchmark(args))
+    output = args.output or (
+        f"logs/benchmarks/ingest_search_{datetime.utcnow():%Y%m%d_%H%M%S}.json"
+    )
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    Path(output).write_text(json.dumps(report, indent=2))
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
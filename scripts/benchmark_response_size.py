@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark /query response size and serialization time with and without raw
+vectors, and with a field projection, using synthetic 1536-dim results.
+
+Usage:
+    python scripts/benchmark_response_size.py --results 10 --dimension 1536
+"""
+
+import argparse
+import json
+import random
+import time
+
+from agent_data_manager.api_mcp_gateway import QueryVectorsResponse, _project_results
+
+try:
+    from scripts.benchmark_utils import summarize_latencies
+except ImportError:  # Run as a file, with scripts/ itself on sys.path
+    from benchmark_utils import summarize_latencies
+
+
+def build_results(count: int, dimension: int, with_vectors: bool) -> list[dict]:
+    """Search results shaped like QdrantStore.semantic_search output."""
+    results = []
+    for i in range(count):
+        result = {
+            "id": i,
+            "score": 0.9 - i * 0.01,
+            "metadata": {
+                "doc_id": f"doc_{i}",
+                "tag": "benchmark",
+                "title": f"Document {i}",
+                "original_text": "lorem ipsum " * 40,
+            },
+        }
+        if with_vectors:
+            result["vector"] = [random.random() for _ in range(dimension)]
+        results.append(result)
+    return results
+
+
+def measure(results: list[dict], iterations: int) -> dict:
+    """Serialize a QueryVectorsResponse repeatedly; report bytes and latency."""
+    latencies = []
+    body = b""
+    for _ in range(iterations):
+        start = time.perf_counter()
+        body = (
+            QueryVectorsResponse(
+                status="success",
+                query_text="benchmark",
+                results=results,
+                total_found=len(results),
+                message="benchmark",
+            )
+            .model_dump_json()
+            .encode()
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {"bytes": len(body), **summarize_latencies(latencies, "ms")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark search response size")
+    parser.add_argument("--results", type=int, default=10)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    with_vectors = build_results(args.results, args.dimension, with_vectors=True)
+    without_vectors = build_results(args.results, args.dimension, with_vectors=False)
+    projected = _project_results(without_vectors, ["id", "score", "metadata.title"])
+
+    report = {
+        "with_vectors": measure(with_vectors, args.iterations),
+        "without_vectors": measure(without_vectors, args.iterations),
+        "projected": measure(projected, args.iterations),
+    }
+    report["size_reduction"] = (
+        report["with_vectors"]["bytes"] / report["without_vectors"]["bytes"]
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""Latency summaries shared by the benchmark scripts."""
+
+import statistics
+
+
+def summarize_latencies(latencies: list[float], unit: str = "ms") -> dict:
+    """
+    Mean and p50/p95/p99 of a list of latencies.
+
+    Args:
+        latencies: Measured latencies, in any order
+        unit: Unit suffix of the keys, e.g. "ms" gives mean_ms, p50_ms, ...
+
+    Returns:
+        Summary dictionary, empty when there are no latencies
+    """
+    if not latencies:
+        return {}
+    if len(latencies) == 1:
+        p50 = p95 = p99 = latencies[0]
+    else:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    return {
+        f"mean_{unit}": statistics.fmean(latencies),
+        f"p50_{unit}": p50,
+        f"p95_{unit}": p95,
+        f"p99_{unit}": p99,
+    }
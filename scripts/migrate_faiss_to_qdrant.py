@@ -4,17 +4,21 @@ FAISS to Qdrant Migration Script
 
 This script performs migration from FAISS to Qdrant by:
 1. Reading FAISS indexes from GCS (huyen1974-faiss-index-storage-test bucket)
-2. Uploading vectors to Qdrant Cloud with timeout/retry logic
-3. Logging migration progress and performance metrics
-4. Supporting both dry-run and actual migration modes
+2. Streaming vectors out of each index in blocks (reconstruct_n) and upserting
+   them to Qdrant Cloud as multi-point batches, with a bounded number in flight
+3. Checkpointing each index (offset and checksum so far) so interrupted runs resume
+4. Logging migration progress and throughput (vectors/sec)
+5. Supporting both dry-run and actual migration modes
 
 Usage:
     python scripts/migrate_faiss_to_qdrant.py [--dry-run] [--verbose] [--limit N]
+        [--batch-size N] [--concurrency N]
 """
 
 import argparse
 import asyncio
 import hashlib
+import json
 import logging
 import os
 import pickle
@@ -22,6 +26,8 @@ import sys
 import tempfile
 import time
 import uuid
+from collections import deque
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
@@ -29,6 +35,8 @@ import faiss
 import numpy as np
 from google.cloud import exceptions as google_cloud_exceptions
 from google.cloud import firestore, storage
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models
 
 # Add the project root to the path to import QdrantStore
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -59,27 +67,23 @@ QDRANT_URL = os.environ.get(
 QDRANT_COLLECTION_NAME = os.environ.get("QDRANT_COLLECTION_NAME", "migrated_vectors")
 
 # Migration Configuration
-# OPTIMIZED FOR QDRANT FREE TIER (CLI 114B7 findings):
-# - Concurrency 2: 0.31s/vector (OPTIMAL)
-# - Concurrency 3: 0.80s/vector (2.5x slower due to rate limiting)
-# - Batch size 100: Optimal balance between throughput and memory
-# - Batch delay 3s: Prevents rate limiting on free tier
-BATCH_SIZE = 100  # Vectors per batch (20 batches of 100 for 2000 vectors)
-BATCH_DELAY = (
-    3.0  # Seconds between batches (increased from 2.0 for rate-limit mitigation)
-)
+# Each batch is one multi-point upsert; MAX_IN_FLIGHT_BATCHES bounds the number
+# of outstanding requests, replacing the per-vector uploads and fixed sleeps
+# that were tuned for the Qdrant free tier.
+BATCH_SIZE = int(os.environ.get("MIGRATION_BATCH_SIZE", "256"))  # Vectors per upsert
+MAX_IN_FLIGHT_BATCHES = int(os.environ.get("MIGRATION_MAX_IN_FLIGHT", "4"))
 TIMEOUT_SECONDS = 30  # Timeout for individual operations
 MAX_RETRIES = 3  # Maximum retry attempts
 RETRY_DELAY_BASE = 2  # Base delay for exponential backoff
-MAX_CONCURRENT_UPLOADS = (
-    2  # Maximum concurrent vector uploads (CLI114B7: optimized for Qdrant free tier)
-)
 
 # Ensure logs directory exists
 LOGS_DIR = Path("logs")
 LOGS_DIR.mkdir(exist_ok=True)
 MIGRATION_LOG_FILE = LOGS_DIR / "migration.log"
 PERF_SLOW_LOG_FILE = LOGS_DIR / "perf_slow.log"
+CHECKPOINT_DIR = Path(
+    os.environ.get("MIGRATION_CHECKPOINT_DIR", LOGS_DIR / "migration_checkpoints")
+)
 
 
 class MigrationError(Exception):
@@ -172,49 +176,215 @@ async def retry_with_backoff(
             await asyncio.sleep(delay)
 
 
-async def upload_vector_with_timeout(
-    qdrant_store: QdrantStore,
-    point_id: str,
-    vector: list[float],
-    metadata: dict[str, Any],
-    migration_logger: logging.Logger,
-    perf_logger: logging.Logger,
-    semaphore: asyncio.Semaphore,
-) -> bool:
-    """Upload a single vector to Qdrant with timeout and performance logging"""
-    async with semaphore:  # Control concurrency
-        start_time = time.time()
+def _reconstructable(index: faiss.Index) -> faiss.Index:
+    """IndexIDMap cannot reconstruct by position; its wrapped index can."""
+    if isinstance(index, faiss.IndexIDMap | faiss.IndexIDMap2):
+        return faiss.downcast_index(index.index)
+    return index
 
-        try:
-            # Use asyncio.wait_for to implement timeout
-            await asyncio.wait_for(
-                retry_with_backoff(
-                    qdrant_store.upsert_vector, point_id, vector, metadata
-                ),
-                timeout=TIMEOUT_SECONDS,
-            )
 
-            latency_ms = int((time.time() - start_time) * 1000)
-            migration_logger.info(f"[{point_id}] [SUCCESS]")
+def iter_vector_blocks(
+    index: faiss.Index, start: int, stop: int, block_size: int = BATCH_SIZE
+) -> Iterator[tuple[int, np.ndarray]]:
+    """Yield (offset, vectors) blocks of the index with reconstruct_n."""
+    source = _reconstructable(index)
+    for offset in range(start, stop, block_size):
+        yield offset, source.reconstruct_n(offset, min(block_size, stop - offset))
 
-            # Log slow operations
-            if latency_ms > 5000:  # >5 seconds
-                perf_logger.info(f"[UPLOAD] [{latency_ms}] [SUCCESS]")
 
-            return True
+def _point_id(index_name: str, vector_index: int) -> str:
+    """Deterministic point ID, so retried and resumed batches overwrite."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"faiss://{index_name}/{vector_index}"))
 
-        except TimeoutError:
-            latency_ms = int((time.time() - start_time) * 1000)
-            migration_logger.error(f"[{point_id}] [TIMEOUT]")
-            perf_logger.info(f"[UPLOAD] [{latency_ms}] [TIMEOUT]")
-            return False
 
-        except Exception as e:
-            latency_ms = int((time.time() - start_time) * 1000)
-            migration_logger.error(f"[{point_id}] [ERROR: {str(e)}]")
-            if latency_ms > 5000:
-                perf_logger.info(f"[UPLOAD] [{latency_ms}] [ERROR]")
-            return False
+def checkpoint_path(index_name: str, checkpoint_dir: Path = CHECKPOINT_DIR) -> Path:
+    return checkpoint_dir / f"{index_name}.json"
+
+
+def load_checkpoint(
+    index_name: str, checkpoint_dir: Path = CHECKPOINT_DIR
+) -> dict[str, Any] | None:
+    path = checkpoint_path(index_name, checkpoint_dir)
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_checkpoint(
+    index_name: str,
+    offset: int,
+    ntotal: int,
+    checksum: str,
+    checkpoint_dir: Path = CHECKPOINT_DIR,
+) -> None:
+    """Atomically record that vectors [0, offset) of the index are migrated."""
+    checkpoint_dir.mkdir(parents=True, exist_ok=True)
+    path = checkpoint_path(index_name, checkpoint_dir)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(
+            {
+                "index_name": index_name,
+                "offset": offset,
+                "ntotal": ntotal,
+                "checksum": checksum,
+                "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            f,
+        )
+    os.replace(tmp_path, path)
+
+
+def _resume_offset(
+    index: faiss.Index, index_name: str, checkpoint_dir: Path, block_size: int
+) -> tuple[int, Any]:
+    """
+    Offset to resume from, and a SHA-256 hasher fed the migrated prefix.
+
+    The prefix is re-hashed and compared to the checkpoint checksum; if the
+    index changed since the checkpoint, migration restarts from the start.
+    """
+    checkpoint = load_checkpoint(index_name, checkpoint_dir)
+    if not checkpoint or not checkpoint["offset"]:
+        return 0, hashlib.sha256()
+
+    offset = checkpoint["offset"]
+    if checkpoint["ntotal"] == index.ntotal:
+        hasher = hashlib.sha256()
+        for _, block in iter_vector_blocks(index, 0, offset, block_size):
+            hasher.update(block.tobytes())
+        if hasher.hexdigest() == checkpoint["checksum"]:
+            logger.info(f"Resuming {index_name} from checkpoint offset {offset}")
+            return offset, hasher
+
+    logger.warning(f"Checkpoint for {index_name} does not match the index, restarting")
+    return 0, hashlib.sha256()
+
+
+async def upsert_batch(
+    client: AsyncQdrantClient,
+    collection_name: str,
+    index_name: str,
+    offset: int,
+    vectors: np.ndarray,
+    original_ids: list | None = None,
+) -> None:
+    """Upsert one block of vectors as a single multi-point request."""
+    ids = []
+    payloads = []
+    for i in range(len(vectors)):
+        vector_index = offset + i
+        ids.append(_point_id(index_name, vector_index))
+        payload = {
+            "source_index": index_name,
+            "vector_index": vector_index,
+            "tag": f"migrated_{index_name}",
+        }
+        if original_ids is not None and vector_index < len(original_ids):
+            payload["original_id"] = str(original_ids[vector_index])
+        payloads.append(payload)
+
+    await asyncio.wait_for(
+        retry_with_backoff(
+            client.upsert,
+            collection_name=collection_name,
+            points=models.Batch(ids=ids, vectors=vectors.tolist(), payloads=payloads),
+            wait=True,
+        ),
+        timeout=TIMEOUT_SECONDS,
+    )
+
+
+async def migrate_index(
+    client: AsyncQdrantClient,
+    collection_name: str,
+    index: faiss.Index,
+    index_name: str,
+    metadata: Any = None,
+    limit: int | None = None,
+    batch_size: int = BATCH_SIZE,
+    max_in_flight: int = MAX_IN_FLIGHT_BATCHES,
+    checkpoint_dir: Path = CHECKPOINT_DIR,
+) -> dict[str, Any]:
+    """
+    Migrate one FAISS index, resuming from its checkpoint.
+
+    Blocks of ``batch_size`` vectors are upserted with up to ``max_in_flight``
+    requests outstanding. Batches are retired in submission order and the
+    checkpoint (offset and SHA-256 of the vectors migrated so far) advances
+    after each one, so an interrupted run resumes after the last contiguous
+    batch Qdrant acknowledged.
+
+    Returns:
+        Dict with start/end offsets, migrated vector count, checksum and
+        vectors_per_second
+
+    Raises:
+        QdrantMigrationError: If a batch fails after retries; the checkpoint
+            keeps the last contiguous migrated offset
+    """
+    start_time = time.time()
+    start, hasher = _resume_offset(index, index_name, checkpoint_dir, batch_size)
+    stop = index.ntotal if limit is None else min(index.ntotal, start + limit)
+
+    if isinstance(index, faiss.IndexIDMap | faiss.IndexIDMap2):
+        original_ids = faiss.vector_to_array(index.id_map).tolist()
+    elif isinstance(metadata, dict) and "ids" in metadata:
+        original_ids = metadata["ids"]
+    else:
+        original_ids = None
+
+    pending: deque[tuple[asyncio.Task, int, str]] = deque()
+    migrated_offset = start
+    checksum = hasher.hexdigest()
+
+    async def retire_oldest():
+        nonlocal migrated_offset, checksum
+        task, end, block_checksum = pending.popleft()
+        await task
+        migrated_offset, checksum = end, block_checksum
+        save_checkpoint(
+            index_name, migrated_offset, index.ntotal, checksum, checkpoint_dir
+        )
+        elapsed = time.time() - start_time
+        logger.info(
+            f"{index_name}: {migrated_offset}/{stop} vectors migrated "
+            f"({(migrated_offset - start) / elapsed:.0f} vectors/sec)"
+        )
+
+    try:
+        for offset, block in iter_vector_blocks(index, start, stop, batch_size):
+            hasher.update(block.tobytes())
+            task = asyncio.create_task(
+                upsert_batch(
+                    client, collection_name, index_name, offset, block, original_ids
+                )
+            )
+            pending.append((task, offset + len(block), hasher.hexdigest()))
+            if len(pending) >= max_in_flight:
+                await retire_oldest()
+        while pending:
+            await retire_oldest()
+    except Exception as e:
+        for task, _, _ in pending:
+            task.cancel()
+        await asyncio.gather(*(task for task, _, _ in pending), return_exceptions=True)
+        raise QdrantMigrationError(
+            f"Migration of {index_name} stopped at offset {migrated_offset}: {e}"
+        ) from e
+
+    duration = time.time() - start_time
+    migrated = migrated_offset - start
+    return {
+        "index_name": index_name,
+        "start_offset": start,
+        "end_offset": migrated_offset,
+        "migrated_vectors": migrated,
+        "checksum": checksum,
+        "duration_seconds": duration,
+        "vectors_per_second": migrated / duration if duration > 0 else 0.0,
+    }
 
 
 def download_gcs_file(
@@ -303,7 +473,7 @@ def load_faiss_index_and_metadata(
     gcs_faiss_path: str,
     gcs_meta_path: str,
     temp_dir: str,
-) -> tuple[faiss.Index, dict[str, Any], np.ndarray]:
+) -> tuple[faiss.Index, dict[str, Any]]:
     """Load FAISS index and metadata from GCS"""
 
     # Parse GCS paths
@@ -330,12 +500,8 @@ def load_faiss_index_and_metadata(
         with open(temp_meta_path, "rb") as f:
             metadata = pickle.load(f)
 
-        # Extract vectors from index
-        logger.info(f"Extracting {index.ntotal} vectors from FAISS index")
-        vectors = np.zeros((index.ntotal, index.d), dtype=np.float32)
-        index.reconstruct_n(0, index.ntotal, vectors)
-
-        return index, metadata, vectors
+        # Vectors are read block by block with iter_vector_blocks
+        return index, metadata
 
     except Exception as e:
         raise FAISSIndexNotFoundError(f"Failed to load FAISS index: {e}")
@@ -346,22 +512,11 @@ def load_faiss_index_and_metadata(
                 os.remove(temp_file)
 
 
-def calculate_vectors_checksum(all_vectors: list[np.ndarray]) -> str:
-    """Calculate SHA-256 checksum of all vectors combined"""
-    logger.info("Calculating SHA-256 checksum of all vectors")
-
+def update_vectors_checksum(hasher: Any, index: faiss.Index) -> None:
+    """Feed all vectors of an index into a SHA-256 hasher, block by block"""
     try:
-        hasher = hashlib.sha256()
-
-        for vectors in all_vectors:
-            # Convert to bytes and update hash
-            vectors_bytes = vectors.tobytes()
-            hasher.update(vectors_bytes)
-
-        checksum = hasher.hexdigest()
-        logger.info(f"Calculated checksum: {checksum}")
-        return checksum
-
+        for _, block in iter_vector_blocks(index, 0, index.ntotal):
+            hasher.update(block.tobytes())
     except Exception as e:
         raise ChecksumCalculationError(f"Failed to calculate checksum: {e}")
 
@@ -394,7 +549,7 @@ def perform_migration_dryrun(verbose: bool = False) -> dict[str, Any]:
 
         total_vectors = 0
         total_indexes = len(indexes)
-        all_vectors = []
+        hasher = hashlib.sha256()
         index_details = []
 
         # Process each index
@@ -407,18 +562,18 @@ def perform_migration_dryrun(verbose: bool = False) -> dict[str, Any]:
 
                 try:
                     # Load index and extract vectors
-                    index, metadata, vectors = load_faiss_index_and_metadata(
+                    index, metadata = load_faiss_index_and_metadata(
                         storage_client,
                         index_info["gcs_faiss_path"],
                         index_info["gcs_meta_path"],
                         temp_dir,
                     )
+                    update_vectors_checksum(hasher, index)
 
                     # Collect statistics
                     index_vector_count = index.ntotal
                     index_dimension = index.d
                     total_vectors += index_vector_count
-                    all_vectors.append(vectors)
 
                     index_details.append(
                         {
@@ -451,7 +606,8 @@ def perform_migration_dryrun(verbose: bool = False) -> dict[str, Any]:
                     continue
 
         # Calculate overall checksum
-        checksum = calculate_vectors_checksum(all_vectors) if all_vectors else ""
+        checksum = hasher.hexdigest() if total_vectors else ""
+        migration_logger.info(f"Calculated checksum: {checksum}")
 
         # Log summary
         duration = time.time() - start_time
@@ -505,16 +661,19 @@ def perform_migration_dryrun(verbose: bool = False) -> dict[str, Any]:
 async def perform_actual_migration(
     limit: int | None = None,
     verbose: bool = False,
-    concurrency_level: int = MAX_CONCURRENT_UPLOADS,
+    concurrency_level: int = MAX_IN_FLIGHT_BATCHES,
+    batch_size: int = BATCH_SIZE,
 ) -> dict[str, Any]:
-    """Perform actual migration of vectors from FAISS to Qdrant"""
+    """
+    Perform actual migration of vectors from FAISS to Qdrant.
+
+    Each index resumes from its checkpoint; ``concurrency_level`` is the number
+    of multi-point upserts kept in flight.
+    """
     migration_logger = setup_migration_logger()
     perf_logger = setup_performance_logger()
     start_time = time.time()
 
-    # Create semaphore for concurrency control
-    semaphore = asyncio.Semaphore(concurrency_level)
-
     migration_logger.info("=" * 60)
     migration_logger.info(
         f"FAISS to Qdrant Migration Started (limit: {limit or 'unlimited'}, concurrency: {concurrency_level})"
@@ -560,10 +719,11 @@ async def perform_actual_migration(
                 "duration_seconds": time.time() - start_time,
             }
 
+        client = qdrant_store.async_client
         total_vectors_uploaded = 0
         total_vectors_failed = 0
-        total_vectors_processed = 0
         vectors_remaining = limit or float("inf")
+        index_results = []
 
         # Process each index
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -576,90 +736,52 @@ async def perform_actual_migration(
                     f"Processing index {i}/{len(indexes)}: {index_name}"
                 )
 
+                index = None
                 try:
-                    # Load index and extract vectors
-                    index, metadata, vectors = load_faiss_index_and_metadata(
+                    index, metadata = load_faiss_index_and_metadata(
                         storage_client,
                         index_info["gcs_faiss_path"],
                         index_info["gcs_meta_path"],
                         temp_dir,
                     )
 
-                    # Limit vectors if specified
-                    vectors_to_process = min(len(vectors), int(vectors_remaining))
-                    vectors = vectors[:vectors_to_process]
-
-                    migration_logger.info(
-                        f"Migrating {vectors_to_process} vectors from {index_name}"
-                    )
-
-                    # Process vectors in batches
-                    for batch_start in range(0, len(vectors), BATCH_SIZE):
-                        batch_end = min(batch_start + BATCH_SIZE, len(vectors))
-                        batch_vectors = vectors[batch_start:batch_end]
-
-                        migration_logger.info(
-                            f"Processing batch {batch_start//BATCH_SIZE + 1}: vectors {batch_start}-{batch_end-1}"
-                        )
-
-                        # Upload batch
-                        batch_tasks = []
-                        for j, vector in enumerate(batch_vectors):
-                            vector_idx = batch_start + j
-                            point_id = str(uuid.uuid4())  # Use proper UUID
-
-                            # Create metadata
-                            vector_metadata = {
-                                "source_index": index_name,
-                                "vector_index": vector_idx,
-                                "migration_batch": batch_start // BATCH_SIZE + 1,
-                                "tag": f"migrated_{index_name}",
-                            }
-
-                            # Add original metadata if available
-                            if isinstance(metadata, dict) and "ids" in metadata:
-                                if vector_idx < len(metadata["ids"]):
-                                    vector_metadata["original_id"] = str(
-                                        metadata["ids"][vector_idx]
-                                    )
-
-                            task = upload_vector_with_timeout(
-                                qdrant_store,
-                                point_id,
-                                vector.tolist(),
-                                vector_metadata,
-                                migration_logger,
-                                perf_logger,
-                                semaphore,
-                            )
-                            batch_tasks.append(task)
-
-                        # Execute batch upload
-                        batch_results = await asyncio.gather(
-                            *batch_tasks, return_exceptions=True
-                        )
-
-                        # Count results
-                        batch_success = sum(
-                            1 for result in batch_results if result is True
+                    if not await client.collection_exists(QDRANT_COLLECTION_NAME):
+                        await client.create_collection(
+                            QDRANT_COLLECTION_NAME,
+                            vectors_config=models.VectorParams(
+                                size=index.d, distance=models.Distance.COSINE
+                            ),
                         )
-                        batch_failed = len(batch_results) - batch_success
 
-                        total_vectors_uploaded += batch_success
-                        total_vectors_failed += batch_failed
-                        total_vectors_processed += len(batch_results)
-                        vectors_remaining -= len(batch_results)
-
-                        migration_logger.info(
-                            f"Batch completed: {batch_success} success, {batch_failed} failed"
-                        )
+                    index_result = await migrate_index(
+                        client,
+                        QDRANT_COLLECTION_NAME,
+                        index,
+                        index_name,
+                        metadata=metadata,
+                        limit=(
+                            None
+                            if vectors_remaining == float("inf")
+                            else int(vectors_remaining)
+                        ),
+                        batch_size=batch_size,
+                        max_in_flight=concurrency_level,
+                    )
+                    index_results.append(index_result)
+                    total_vectors_uploaded += index_result["migrated_vectors"]
+                    vectors_remaining -= index_result["migrated_vectors"]
 
-                        # Sleep between batches
-                        if batch_end < len(vectors):
-                            await asyncio.sleep(BATCH_DELAY)
+                    migration_logger.info(
+                        f"Index {index_name}: migrated vectors "
+                        f"{index_result['start_offset']}-{index_result['end_offset']} "
+                        f"at {index_result['vectors_per_second']:.0f} vectors/sec"
+                    )
 
                 except Exception as e:
                     migration_logger.error(f"Failed to process index {index_name}: {e}")
+                    if index is not None:
+                        checkpoint = load_checkpoint(index_name) or {"offset": 0}
+                        total_vectors_failed += index.ntotal - checkpoint["offset"]
                     continue
 
         # Log summary
@@ -667,23 +789,21 @@ async def perform_actual_migration(
         migration_logger.info("=" * 60)
         migration_logger.info("MIGRATION SUMMARY")
         migration_logger.info("=" * 60)
-        migration_logger.info(f"Total vectors processed: {total_vectors_processed}")
+        vectors_per_second = total_vectors_uploaded / duration if duration > 0 else 0.0
         migration_logger.info(
             f"Vectors uploaded successfully: {total_vectors_uploaded}"
         )
-        migration_logger.info(f"Vectors failed: {total_vectors_failed}")
-        migration_logger.info(
-            f"Success rate: {(total_vectors_uploaded/total_vectors_processed*100):.1f}%"
-            if total_vectors_processed > 0
-            else "N/A"
-        )
+        migration_logger.info(f"Vectors not migrated: {total_vectors_failed}")
+        migration_logger.info(f"Throughput: {vectors_per_second:.0f} vectors/sec")
         migration_logger.info(f"Duration: {duration:.2f} seconds")
 
         return {
             "status": "success" if total_vectors_failed == 0 else "partial_success",
-            "total_vectors": total_vectors_processed,
+            "total_vectors": total_vectors_uploaded + total_vectors_failed,
             "uploaded_vectors": total_vectors_uploaded,
             "failed_vectors": total_vectors_failed,
+            "vectors_per_second": vectors_per_second,
+            "index_results": index_results,
             "duration_seconds": duration,
         }
 
@@ -720,8 +840,14 @@ def main():
     parser.add_argument(
         "--concurrency",
         type=int,
-        default=MAX_CONCURRENT_UPLOADS,
-        help=f"Number of concurrent uploads (default: {MAX_CONCURRENT_UPLOADS})",
+        default=MAX_IN_FLIGHT_BATCHES,
+        help=f"Number of batches in flight (default: {MAX_IN_FLIGHT_BATCHES})",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=BATCH_SIZE,
+        help=f"Vectors per upsert request (default: {BATCH_SIZE})",
     )
 
     args = parser.parse_args()
@@ -732,7 +858,8 @@ def main():
     print("Starting FAISS to Qdrant migration...")
     print(f"Mode: {'Dry-run' if args.dry_run else 'Actual migration'}")
     print(f"Vector limit: {args.limit}")
-    print(f"Concurrency level: {args.concurrency}")
+    print(f"Batches in flight: {args.concurrency}")
+    print(f"Batch size: {args.batch_size}")
     print(f"FAISS GCS Bucket: {FAISS_GCS_BUCKET}")
     print(f"Qdrant URL: {QDRANT_URL}")
     print(f"Qdrant Collection: {QDRANT_COLLECTION_NAME}")
@@ -759,6 +886,7 @@ def main():
                     limit=args.limit,
                     verbose=args.verbose,
                     concurrency_level=args.concurrency,
+                    batch_size=args.batch_size,
                 )
             )
             print("\nMigration completed!")
@@ -772,10 +900,7 @@ def main():
                         result["uploaded_vectors"] / result["total_vectors"]
                     ) * 100
                     print(f"Success rate: {success_rate:.1f}%")
-                    avg_time_per_vector = (
-                        result["duration_seconds"] / result["total_vectors"]
-                    )
-                    print(f"Average time per vector: {avg_time_per_vector:.2f}s")
+                    print(f"Throughput: {result['vectors_per_second']:.0f} vectors/sec")
             else:
                 print(f"Error: {result.get('error', 'Unknown error')}")
             print(f"Duration: {result['duration_seconds']:.2f} seconds")
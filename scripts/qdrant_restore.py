@@ -2,19 +2,23 @@
 """
 Qdrant Snapshot Restore Script for Cloud Run
 
-This script downloads the latest snapshot from Google Cloud Storage and restores it
-to a Qdrant instance on Cloud Run startup. It's designed to run before Qdrant starts
-to ensure data is available immediately.
+This script streams the latest snapshot from Google Cloud Storage into a shadow
+collection on a Qdrant instance, verifies its checksum, and then swaps the collection
+alias to it, so reads keep being served while the restore runs.
 """
 
+import hashlib
 import logging
 import os
-import tempfile
+import uuid
+from collections.abc import Iterator
 from datetime import datetime
 from typing import Any
 
+import requests
 from google.cloud import storage
 from qdrant_client import QdrantClient
+from qdrant_client.http import models
 
 # Configure logging
 logging.basicConfig(
@@ -22,6 +26,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+CHUNK_SIZE = int(os.getenv("SNAPSHOT_CHUNK_SIZE_MB", "32")) * 1024 * 1024
+RESTORE_TIMEOUT_SECONDS = int(os.getenv("SNAPSHOT_RESTORE_TIMEOUT_SECONDS", "3600"))
+
 
 def get_qdrant_client() -> QdrantClient:
     """Initialize and return Qdrant client for local Docker instance."""
@@ -62,95 +69,168 @@ def find_latest_snapshot(bucket_name: str = "qdrant-snapshots") -> str | None:
         raise
 
 
-def download_snapshot_from_gcs(
-    blob_name: str, bucket_name: str = "qdrant-snapshots"
-) -> str:
-    """Download snapshot from GCS to local temporary file."""
-    logger.info(f"Downloading snapshot: {blob_name}")
+def iter_gcs_chunks(
+    blob: storage.Blob, chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Stream a blob in chunks; each chunk is a retried ranged read."""
+    with blob.open("rb", chunk_size=chunk_size) as reader:
+        while chunk := reader.read(chunk_size):
+            yield chunk
 
-    try:
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(bucket_name)
-        blob = bucket.blob(blob_name)
-
-        # Create temporary file
-        temp_dir = tempfile.mkdtemp()
-        snapshot_filename = os.path.basename(blob_name)
-        snapshot_path = os.path.join(temp_dir, snapshot_filename)
-
-        # Download the blob
-        blob.download_to_filename(snapshot_path)
-
-        # Verify download
-        if os.path.exists(snapshot_path) and os.path.getsize(snapshot_path) > 0:
-            file_size = os.path.getsize(snapshot_path)
-            logger.info(f"Snapshot downloaded successfully to: {snapshot_path}")
-            logger.info(f"Downloaded size: {file_size} bytes")
-            return snapshot_path
-        else:
-            raise FileNotFoundError(
-                f"Downloaded snapshot file not found or empty: {snapshot_path}"
-            )
 
-    except Exception as e:
-        logger.error(f"Failed to download snapshot from GCS: {str(e)}")
-        raise
+def stream_snapshot_to_qdrant(blob: storage.Blob, collection_name: str) -> str:
+    """
+    Stream a snapshot blob from GCS into Qdrant's snapshot upload endpoint.
 
+    The multipart body is generated chunk by chunk, so the snapshot is never
+    written to local disk. When the blob carries the SHA-256 recorded at backup
+    time, Qdrant verifies it before recovering and so does this function.
 
-def restore_snapshot_to_qdrant(snapshot_path: str, collection_name: str) -> bool:
-    """Restore snapshot to Qdrant collection."""
-    logger.info(f"Restoring snapshot to collection: {collection_name}")
+    Returns:
+        SHA-256 of the streamed bytes
 
-    try:
-        client = get_qdrant_client()
+    Raises:
+        ValueError: If the streamed bytes do not match the recorded checksum
+    """
+    qdrant_url = os.getenv("QDRANT_URL", "http://localhost:6333").rstrip("/")
+    expected_sha256 = (blob.metadata or {}).get("sha256")
+    sha256 = hashlib.sha256()
+    boundary = uuid.uuid4().hex
+
+    def multipart_body() -> Iterator[bytes]:
+        yield (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="snapshot"; '
+            f'filename="{os.path.basename(blob.name)}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode()
+        for chunk in iter_gcs_chunks(blob):
+            sha256.update(chunk)
+            yield chunk
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    params = {"priority": "snapshot", "wait": "true"}
+    if expected_sha256:
+        params["checksum"] = expected_sha256
+    headers = {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+    api_key = os.getenv("QDRANT_API_KEY")
+    if api_key:
+        headers["api-key"] = api_key
+
+    logger.info(f"Streaming {blob.name} into collection '{collection_name}'")
+    response = requests.post(
+        f"{qdrant_url}/collections/{collection_name}/snapshots/upload",
+        params=params,
+        data=multipart_body(),
+        headers=headers,
+        timeout=RESTORE_TIMEOUT_SECONDS,
+    )
+    response.raise_for_status()
+
+    if expected_sha256 and sha256.hexdigest() != expected_sha256:
+        raise ValueError(
+            f"Snapshot checksum mismatch: expected {expected_sha256}, "
+            f"streamed {sha256.hexdigest()}"
+        )
+    return sha256.hexdigest()
 
-        # Check if collection already exists
-        if client.collection_exists(collection_name):
-            logger.info(
-                f"Collection '{collection_name}' already exists, deleting it first"
-            )
-            client.delete_collection(collection_name)
 
-        # Restore snapshot
-        client.restore_snapshot(collection_name=collection_name, location=snapshot_path)
+def swap_alias(
+    client: QdrantClient, alias_name: str, collection_name: str
+) -> str | None:
+    """
+    Atomically point ``alias_name`` at ``collection_name``.
 
-        # Verify restoration
-        if client.collection_exists(collection_name):
-            collection_info = client.get_collection(collection_name)
-            logger.info(
-                f"Snapshot restored successfully to collection '{collection_name}'"
+    A concrete collection that still holds the alias name (deployments from
+    before restores used aliases) is deleted first; this is the only moment
+    reads are unavailable.
+
+    Returns:
+        The collection the alias pointed at before, if any
+    """
+    previous = None
+    for alias in client.get_aliases().aliases:
+        if alias.alias_name == alias_name:
+            previous = alias.collection_name
+
+    operations = []
+    if previous:
+        operations.append(
+            models.DeleteAliasOperation(
+                delete_alias=models.DeleteAlias(alias_name=alias_name)
             )
-            logger.info(f"Collection info: {collection_info}")
-            return True
-        else:
-            logger.error(f"Collection '{collection_name}' not found after restoration")
-            return False
+        )
+    elif client.collection_exists(alias_name):
+        logger.warning(
+            f"Replacing concrete collection '{alias_name}' with an alias of the same name"
+        )
+        client.delete_collection(alias_name)
 
-    except Exception as e:
-        logger.error(f"Failed to restore snapshot: {str(e)}")
-        raise
+    operations.append(
+        models.CreateAliasOperation(
+            create_alias=models.CreateAlias(
+                collection_name=collection_name, alias_name=alias_name
+            )
+        )
+    )
+    client.update_collection_aliases(change_aliases_operations=operations)
+    logger.info(f"Alias '{alias_name}' now points at '{collection_name}'")
+    return previous
+
+
+def restore_snapshot_to_qdrant(
+    blob_name: str, collection_name: str, bucket_name: str = "qdrant-snapshots"
+) -> dict[str, Any]:
+    """
+    Restore a snapshot into a shadow collection, then swap the alias to it.
+
+    Reads keep hitting the current collection while the snapshot streams in.
+    The previous collection is dropped after the swap unless
+    KEEP_PREVIOUS_COLLECTION is set; on failure the shadow is dropped instead.
+
+    Returns:
+        Dict with the restored shadow collection, the previous collection and
+        the snapshot's SHA-256
+    """
+    client = get_qdrant_client()
+    storage_client = storage.Client()
+    blob = storage_client.bucket(bucket_name).get_blob(blob_name)
+    if blob is None:
+        raise FileNotFoundError(
+            f"Snapshot blob not found: gs://{bucket_name}/{blob_name}"
+        )
 
+    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    shadow_collection = f"{collection_name}_restore_{timestamp}"
 
-def cleanup_local_file(file_path: str):
-    """Clean up the local snapshot file and its directory."""
     try:
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            logger.info(f"Cleaned up local file: {file_path}")
+        sha256 = stream_snapshot_to_qdrant(blob, shadow_collection)
+        if not client.collection_exists(shadow_collection):
+            raise RuntimeError(
+                f"Collection '{shadow_collection}' not found after restoration"
+            )
+        collection_info = client.get_collection(shadow_collection)
+        logger.info(f"Snapshot restored to '{shadow_collection}': {collection_info}")
+    except Exception:
+        if client.collection_exists(shadow_collection):
+            client.delete_collection(shadow_collection)
+        raise
 
-            # Also remove the temp directory if it's empty
-            temp_dir = os.path.dirname(file_path)
-            if os.path.exists(temp_dir) and not os.listdir(temp_dir):
-                os.rmdir(temp_dir)
-                logger.info(f"Cleaned up temp directory: {temp_dir}")
+    previous = swap_alias(client, collection_name, shadow_collection)
+    if previous and os.getenv("KEEP_PREVIOUS_COLLECTION", "").lower() != "true":
+        client.delete_collection(previous)
+        logger.info(f"Dropped previous collection '{previous}'")
 
-    except Exception as e:
-        logger.warning(f"Failed to clean up local file {file_path}: {str(e)}")
+    return {
+        "restored_collection": shadow_collection,
+        "previous_collection": previous,
+        "sha256": sha256,
+    }
 
 
 def download_and_restore_snapshot() -> dict[str, Any]:
     """
-    Main function to download and restore the latest snapshot from GCS.
+    Main function to stream and restore the latest snapshot from GCS.
 
     Returns:
         Dict containing status and details of the operation
@@ -165,8 +245,6 @@ def download_and_restore_snapshot() -> dict[str, Any]:
         "duration_seconds": None,
     }
 
-    snapshot_path = None
-
     try:
         # Get configuration
         collection_name = os.getenv("QDRANT_COLLECTION_NAME", "my_collection")
@@ -189,20 +267,13 @@ def download_and_restore_snapshot() -> dict[str, Any]:
 
         result["snapshot_name"] = latest_snapshot_blob
 
-        # Download snapshot
-        snapshot_path = download_snapshot_from_gcs(latest_snapshot_blob, bucket_name)
-
-        # Restore snapshot
-        restore_success = restore_snapshot_to_qdrant(snapshot_path, collection_name)
-
-        if restore_success:
-            result["status"] = "success"
-            logger.info(
-                f"Snapshot restore completed successfully: {latest_snapshot_blob}"
-            )
-        else:
-            result["status"] = "failed"
-            result["error"] = "Restoration verification failed"
+        # Stream into a shadow collection and swap the alias
+        restore = restore_snapshot_to_qdrant(
+            latest_snapshot_blob, collection_name, bucket_name
+        )
+        result.update(restore)
+        result["status"] = "success"
+        logger.info(f"Snapshot restore completed successfully: {latest_snapshot_blob}")
 
     except Exception as e:
         result["status"] = "failed"
@@ -210,10 +281,6 @@ def download_and_restore_snapshot() -> dict[str, Any]:
         logger.error(f"Snapshot restore process failed: {str(e)}", exc_info=True)
 
     finally:
-        # Always clean up local file
-        if snapshot_path:
-            cleanup_local_file(snapshot_path)
-
         end_time = datetime.utcnow()
         result["end_time"] = end_time.isoformat()
         result["duration_seconds"] = (end_time - start_time).total_seconds()
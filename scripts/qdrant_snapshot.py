@@ -2,18 +2,23 @@
 """
 Qdrant Snapshot and GCS Upload Script
 
-This script creates snapshots of Qdrant collections and uploads them to Google Cloud Storage.
-It's designed to run every 6 hours via cron job to maintain regular backups.
+This script creates snapshots of Qdrant collections and streams them to Google Cloud
+Storage in chunks, without a local copy. It's designed to run every 6 hours via cron
+job to maintain regular backups.
 """
 
+import base64
+import hashlib
 import logging
 import os
-import tempfile
+from collections.abc import Iterator
 from datetime import datetime
 from typing import Any
 
+import requests
 from google.cloud import storage
 from qdrant_client import QdrantClient
+from qdrant_client.http import models
 
 # Configure logging
 logging.basicConfig(
@@ -21,6 +26,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# GCS resumable uploads need chunk sizes that are a multiple of 256 KiB
+CHUNK_SIZE = int(os.getenv("SNAPSHOT_CHUNK_SIZE_MB", "32")) * 1024 * 1024
+MAX_STREAM_RETRIES = 3
+
 
 def get_qdrant_client() -> QdrantClient:
     """Initialize and return Qdrant client using environment variables."""
@@ -39,111 +48,167 @@ def get_qdrant_client() -> QdrantClient:
     return QdrantClient(url=qdrant_url, api_key=api_key, timeout=30)
 
 
-def create_snapshot(client: QdrantClient, collection_name: str) -> str:
-    """Create a snapshot of the specified collection."""
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    snapshot_name = f"snapshot_{collection_name}_{timestamp}"
+def _qdrant_base_url() -> str:
+    qdrant_url = os.getenv("QDRANT_URL")
+    if not qdrant_url:
+        raise ValueError("QDRANT_URL environment variable not set")
+    return qdrant_url.rstrip("/")
+
 
-    logger.info(
-        f"Creating snapshot '{snapshot_name}' for collection '{collection_name}'"
-    )
+def _qdrant_headers() -> dict[str, str]:
+    api_key = os.getenv("QDRANT_API_KEY")
+    return {"api-key": api_key} if api_key else {}
+
+
+def resolve_collection(client: QdrantClient, collection_name: str) -> str:
+    """Return the collection behind an alias, or the name itself."""
+    for alias in client.get_aliases().aliases:
+        if alias.alias_name == collection_name:
+            logger.info(f"'{collection_name}' is an alias of '{alias.collection_name}'")
+            return alias.collection_name
+    return collection_name
+
+
+def create_snapshot(
+    client: QdrantClient, collection_name: str
+) -> models.SnapshotDescription:
+    """Create a snapshot of the specified collection on the Qdrant server."""
+    logger.info(f"Creating snapshot for collection '{collection_name}'")
 
     try:
-        # Create snapshot
-        snapshot_info = client.create_snapshot(
-            collection_name=collection_name, snapshot_name=snapshot_name
-        )
+        snapshot_info = client.create_snapshot(collection_name=collection_name)
         logger.info(f"Snapshot created successfully: {snapshot_info}")
-        return snapshot_name
+        return snapshot_info
     except Exception as e:
         logger.error(f"Failed to create snapshot: {str(e)}")
         raise
 
 
-def download_snapshot(
-    client: QdrantClient, collection_name: str, snapshot_name: str
-) -> str:
-    """Download the snapshot to a temporary file and return the file path."""
-    # Create temporary file
-    temp_dir = tempfile.mkdtemp()
-    snapshot_path = os.path.join(temp_dir, f"{snapshot_name}.snapshot")
-
-    logger.info(f"Downloading snapshot to: {snapshot_path}")
+def iter_snapshot_chunks(
+    collection_name: str, snapshot_name: str, chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Stream a snapshot from Qdrant in chunks.
 
-    try:
-        # Download snapshot
-        client.download_snapshot(
-            collection_name=collection_name,
-            snapshot_name=snapshot_name,
-            location=snapshot_path,
-        )
+    A dropped connection is resumed with a Range request from the last byte
+    received, up to MAX_STREAM_RETRIES times.
+    """
+    url = (
+        f"{_qdrant_base_url()}/collections/{collection_name}"
+        f"/snapshots/{snapshot_name}"
+    )
+    received = 0
+    retries = 0
 
-        # Verify file exists and has content
-        if os.path.exists(snapshot_path) and os.path.getsize(snapshot_path) > 0:
-            file_size = os.path.getsize(snapshot_path)
-            logger.info(f"Snapshot downloaded successfully. Size: {file_size} bytes")
-            return snapshot_path
-        else:
-            raise FileNotFoundError(
-                f"Downloaded snapshot file not found or empty: {snapshot_path}"
+    while True:
+        headers = _qdrant_headers()
+        if received:
+            headers["Range"] = f"bytes={received}-"
+        try:
+            with requests.get(
+                url, headers=headers, stream=True, timeout=60
+            ) as response:
+                response.raise_for_status()
+                if received and response.status_code != 206:
+                    raise RuntimeError(
+                        "Qdrant ignored the Range request, cannot resume snapshot download"
+                    )
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    received += len(chunk)
+                    yield chunk
+            return
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.ChunkedEncodingError,
+        ) as e:
+            retries += 1
+            if retries > MAX_STREAM_RETRIES:
+                raise
+            logger.warning(
+                f"Snapshot download interrupted at {received} bytes, resuming "
+                f"(retry {retries}/{MAX_STREAM_RETRIES}): {e}"
             )
 
-    except Exception as e:
-        logger.error(f"Failed to download snapshot: {str(e)}")
-        # Clean up temp directory on failure
-        if os.path.exists(temp_dir):
-            import shutil
 
-            shutil.rmtree(temp_dir)
-        raise
+def stream_snapshot_to_gcs(
+    collection_name: str,
+    snapshot: models.SnapshotDescription,
+    bucket_name: str = "qdrant-snapshots",
+    source_collection: str | None = None,
+) -> dict[str, Any]:
+    """
+    Stream a snapshot from Qdrant into a GCS resumable upload.
 
+    Nothing is written to local disk. The upload is verified against the MD5
+    GCS computes and, when Qdrant reports one, the snapshot's SHA-256; the
+    SHA-256 is stored in the blob metadata so restores can verify it.
 
-def upload_to_gcs(
-    snapshot_path: str, snapshot_name: str, bucket_name: str = "qdrant-snapshots"
-) -> str:
-    """Upload the snapshot file to Google Cloud Storage."""
-    logger.info(f"Uploading snapshot to GCS bucket: {bucket_name}")
+    Args:
+        collection_name: Collection name the backup is stored under
+        snapshot: Snapshot created on the Qdrant server
+        bucket_name: Target GCS bucket
+        source_collection: Collection the snapshot was taken from, when
+            collection_name is an alias
 
+    Returns:
+        Dict with gcs_path, size and sha256 of the uploaded snapshot
+    """
+    logger.info(f"Streaming snapshot to GCS bucket: {bucket_name}")
+
+    storage_client = storage.Client()
+    bucket = storage_client.bucket(bucket_name)
+
+    # Create blob path with timestamp folder structure
+    now = datetime.utcnow()
+    snapshot_name = f"snapshot_{collection_name}_{now.strftime('%Y%m%d_%H%M%S')}"
+    blob_name = f"snapshots/{now.strftime('%Y/%m/%d')}/{snapshot_name}.snapshot"
+    blob = bucket.blob(blob_name)
+
+    sha256 = hashlib.sha256()
+    md5 = hashlib.md5()
+    size = 0
+    # if_generation_match=0 makes every chunk retry safe; an exception cancels
+    # the resumable session instead of finalizing a truncated object
+    with blob.open("wb", chunk_size=CHUNK_SIZE, if_generation_match=0) as writer:
+        for chunk in iter_snapshot_chunks(
+            source_collection or collection_name, snapshot.name
+        ):
+            sha256.update(chunk)
+            md5.update(chunk)
+            writer.write(chunk)
+            size += len(chunk)
+
+    blob.reload()
     try:
-        # Initialize GCS client
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(bucket_name)
-
-        # Create blob path with timestamp folder structure
-        timestamp = datetime.utcnow().strftime("%Y/%m/%d")
-        blob_name = f"snapshots/{timestamp}/{snapshot_name}.snapshot"
-        blob = bucket.blob(blob_name)
-
-        # Upload file
-        blob.upload_from_filename(snapshot_path)
-
-        # Verify upload
-        blob.reload()
-        logger.info(f"Snapshot uploaded successfully to gs://{bucket_name}/{blob_name}")
-        logger.info(f"Upload size: {blob.size} bytes")
-
-        return f"gs://{bucket_name}/{blob_name}"
-
-    except Exception as e:
-        logger.error(f"Failed to upload to GCS: {str(e)}")
+        if blob.size != size:
+            raise ValueError(f"Uploaded size {blob.size} != streamed size {size}")
+        if blob.md5_hash != base64.b64encode(md5.digest()).decode():
+            raise ValueError("Uploaded snapshot MD5 does not match streamed bytes")
+        if snapshot.checksum and snapshot.checksum != sha256.hexdigest():
+            raise ValueError("Streamed snapshot SHA-256 does not match Qdrant checksum")
+    except ValueError:
+        blob.delete()
         raise
 
+    blob.metadata = {"sha256": sha256.hexdigest(), "collection": collection_name}
+    blob.patch()
 
-def cleanup_local_file(file_path: str):
-    """Clean up the local snapshot file and its directory."""
-    try:
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            logger.info(f"Cleaned up local file: {file_path}")
+    gcs_path = f"gs://{bucket_name}/{blob_name}"
+    logger.info(f"Snapshot streamed successfully to {gcs_path} ({size} bytes)")
+    return {"gcs_path": gcs_path, "size": size, "sha256": sha256.hexdigest()}
 
-            # Also remove the temp directory if it's empty
-            temp_dir = os.path.dirname(file_path)
-            if os.path.exists(temp_dir) and not os.listdir(temp_dir):
-                os.rmdir(temp_dir)
-                logger.info(f"Cleaned up temp directory: {temp_dir}")
 
+def delete_server_snapshot(
+    client: QdrantClient, collection_name: str, snapshot_name: str
+):
+    """Remove the snapshot file from the Qdrant server once it is in GCS."""
+    try:
+        client.delete_snapshot(
+            collection_name=collection_name, snapshot_name=snapshot_name
+        )
+        logger.info(f"Deleted server-side snapshot: {snapshot_name}")
     except Exception as e:
-        logger.warning(f"Failed to clean up local file {file_path}: {str(e)}")
+        logger.warning(f"Failed to delete server-side snapshot {snapshot_name}: {e}")
 
 
 def take_and_upload_snapshot() -> dict[str, Any]:
@@ -174,29 +239,33 @@ def take_and_upload_snapshot() -> dict[str, Any]:
         # Initialize Qdrant client
         client = get_qdrant_client()
 
+        # Restores serve the collection name through an alias
+        source_collection = resolve_collection(client, collection_name)
+
         # Verify collection exists
-        if not client.collection_exists(collection_name):
-            raise ValueError(f"Collection '{collection_name}' does not exist")
+        if not client.collection_exists(source_collection):
+            raise ValueError(f"Collection '{source_collection}' does not exist")
 
         # Create snapshot
-        snapshot_name = create_snapshot(client, collection_name)
-        result["snapshot_name"] = snapshot_name
-
-        # Download snapshot
-        snapshot_path = download_snapshot(client, collection_name, snapshot_name)
+        snapshot = create_snapshot(client, source_collection)
+        result["snapshot_name"] = snapshot.name
 
         try:
-            # Upload to GCS
-            gcs_path = upload_to_gcs(snapshot_path, snapshot_name)
-            result["gcs_path"] = gcs_path
+            # Stream from Qdrant to GCS
+            upload = stream_snapshot_to_gcs(
+                collection_name, snapshot, source_collection=source_collection
+            )
+            result["gcs_path"] = upload["gcs_path"]
+            result["size"] = upload["size"]
+            result["sha256"] = upload["sha256"]
 
             # Success
             result["status"] = "success"
-            logger.info(f"Snapshot process completed successfully: {snapshot_name}")
+            logger.info(f"Snapshot process completed successfully: {snapshot.name}")
 
         finally:
-            # Always clean up local file
-            cleanup_local_file(snapshot_path)
+            # Always free the snapshot's disk space on the Qdrant server
+            delete_server_snapshot(client, source_collection, snapshot.name)
 
     except Exception as e:
         result["status"] = "failed"
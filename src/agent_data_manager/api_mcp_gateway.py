@@ -7,11 +7,10 @@ import asyncio
 import builtins
 import logging
 import os
-import threading
+import random
 import time
-from collections import OrderedDict
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
 import uvicorn
 from fastapi import BackgroundTasks, Depends, FastAPI, HTTPException, Request, status
@@ -33,25 +32,44 @@ from tenacity import (
 from agent_data_manager.auth.auth_manager import AuthManager
 from agent_data_manager.auth.user_manager import UserManager
 from agent_data_manager.config.settings import settings
+from agent_data_manager.embedding.vector_spaces import get_vector_space
+from agent_data_manager.event.event_manager import shutdown_event_manager
 from agent_data_manager.tools.prometheus_metrics import (
     MetricsTimer,
     record_a2a_api_error,
     record_a2a_api_request,
     record_cskh_query,
+    record_rag_cache_event,
     record_rag_search,
     # record_qdrant_request,  # Unused import
+    record_semantic_cache_lookup,
+    record_semantic_cache_sample,
     record_semantic_search,
 )
 from agent_data_manager.tools.qdrant_vectorization_tool import (
     QdrantVectorizationTool,
     qdrant_rag_search,
 )
+from agent_data_manager.tools.reembedding_job import (
+    get_reembedding_job,
+    start_reembedding,
+)
+from agent_data_manager.utils.event_loop_monitor import EventLoopLagMonitor
+from agent_data_manager.utils.resilience import request_deadline
+from agent_data_manager.utils.result_cache import create_result_cache
+from agent_data_manager.utils.semantic_cache import SemanticQueryCache
 from agent_data_manager.vector_store.firestore_metadata_manager import (
     FirestoreMetadataManager,
 )
 
 # Import Agent Data components
-from agent_data_manager.vector_store.qdrant_store import QdrantStore
+from agent_data_manager.vector_store.qdrant_store import (
+    QdrantStore,
+    add_write_listener,
+    bump_collection_generation,
+    close_pooled_clients,
+    get_qdrant_store,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -59,64 +77,91 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Enhanced LRU cache for RAG optimization (CLI 140e)
+# RAG result cache (CLI 140e); backend selected by settings.get_cache_config()
+_rag_cache = create_result_cache(settings.get_cache_config())
+
+
+# Generation bumps of a shared RAG cache still running in worker threads
+_pending_generation_bumps: set[asyncio.Future] = set()
+
+
+def _rag_cache_blocks() -> bool:
+    """Whether _rag_cache calls do disk or network I/O (SQLite, Redis)."""
+    return getattr(_rag_cache, "backend", "memory") != "memory"
+
+
+async def _run_cache_call(func, *args, on_error=None):
+    """
+    Call a RAG cache function, in a worker thread for blocking backends.
+
+    A failing backend is treated as a miss: the error is logged and counted,
+    and ``on_error`` is returned instead.
+    """
+    try:
+        if not _rag_cache_blocks():
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+    except Exception as e:
+        logger.warning(f"RAG cache backend call failed, treating as miss: {e}")
+        record_rag_cache_event("error")
+        return on_error
 
 
-class LRUCache:
-    """Thread-safe LRU cache with TTL support for performance optimization."""
+def _finish_generation_bump(bump: asyncio.Future):
+    """Forget a finished generation bump, logging it if it failed."""
+    _pending_generation_bumps.discard(bump)
+    if not bump.cancelled() and bump.exception() is not None:
+        logger.error(f"RAG cache generation bump failed: {bump.exception()}")
+        record_rag_cache_event("error")
 
-    def __init__(self, max_size: int = 1000, ttl: int = 3600):
-        self.max_size = max_size
-        self.ttl = ttl
-        self.cache = OrderedDict()
-        self.timestamps = {}
-        self.lock = threading.RLock()
 
-    def get(self, key: str):
-        """Get item from cache, return None if not found or expired."""
-        with self.lock:
-            if key not in self.cache:
-                return None
+def _on_collection_write(collection_name: str):
+    """Advance the RAG cache generation after a write to a collection."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is None or not _rag_cache_blocks():
+        _rag_cache.bump_generation(collection_name)
+        return
 
-            # Check TTL
-            if time.time() - self.timestamps[key] > self.ttl:
-                del self.cache[key]
-                del self.timestamps[key]
-                return None
+    # Keep the event loop free; lookups wait for the bump in _rag_generation
+    bump = loop.run_in_executor(None, _rag_cache.bump_generation, collection_name)
+    _pending_generation_bumps.add(bump)
+    bump.add_done_callback(_finish_generation_bump)
 
-            # Move to end (most recently used)
-            self.cache.move_to_end(key)
-            return self.cache[key]
 
-    def put(self, key: str, value):
-        """Put item in cache, evict oldest if necessary."""
-        with self.lock:
-            if key in self.cache:
-                self.cache.move_to_end(key)
-            else:
-                if len(self.cache) >= self.max_size:
-                    # Remove oldest item
-                    oldest_key = next(iter(self.cache))
-                    del self.cache[oldest_key]
-                    del self.timestamps[oldest_key]
+async def _rag_generation(collection: str) -> int | None:
+    """
+    Current RAG cache generation of a collection, including pending bumps.
 
-            self.cache[key] = value
-            self.timestamps[key] = time.time()
+    Returns:
+        The generation, or None when the cache backend is unavailable
+    """
+    loop = asyncio.get_running_loop()
+    pending = [bump for bump in _pending_generation_bumps if bump.get_loop() is loop]
+    if pending:
+        await asyncio.wait(pending)
+    return await _run_cache_call(_rag_cache.get_generation, collection)
 
-    def clear(self):
-        """Clear all cache entries."""
-        with self.lock:
-            self.cache.clear()
-            self.timestamps.clear()
 
-    def size(self) -> int:
-        """Get current cache size."""
-        with self.lock:
-            return len(self.cache)
+add_write_listener(_on_collection_write)
 
+# Background refreshes of stale RAG cache entries, one per cache key
+_rag_refresh_tasks: dict[str, asyncio.Task] = {}
 
-# Initialize enhanced cache
-_rag_cache = LRUCache(max_size=settings.RAG_CACHE_MAX_SIZE, ttl=settings.RAG_CACHE_TTL)
+# Semantic tier serving paraphrased CSKH queries; off unless SEMANTIC_CACHE_ENABLED
+_semantic_cache = (
+    SemanticQueryCache(
+        max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+        similarity_threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+        ttl=settings.RAG_CACHE_TTL,
+    )
+    if settings.SEMANTIC_CACHE_ENABLED
+    else None
+)
+_semantic_sample_rate = settings.SEMANTIC_CACHE_SAMPLE_RATE
+_semantic_sample_tasks: set[asyncio.Task] = set()
 
 
 # Enhanced error classes for better error categorization
@@ -223,6 +268,7 @@ firestore_manager: FirestoreMetadataManager | None = None
 vectorization_tool: QdrantVectorizationTool | None = None
 auth_manager: AuthManager | None = None
 user_manager: UserManager | None = None
+event_loop_monitor: EventLoopLagMonitor | None = None
 
 # OAuth2 scheme for token handling
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
@@ -262,6 +308,17 @@ class QueryVectorsRequest(BaseModel):
     score_threshold: float | None = Field(
         default=0.7, ge=0.0, le=1.0, description="Minimum similarity score"
     )
+    fields: list[str] | None = Field(
+        default=None,
+        description=(
+            "Result fields to return, e.g. ['id', 'score', 'metadata.title']; "
+            "vectors are only returned when 'vector' is listed"
+        ),
+    )
+    vector_space: str | None = Field(
+        default=None,
+        description="Vector space to search; defaults to the VECTOR_SPACE setting",
+    )
 
 
 class QueryVectorsResponse(BaseModel):
@@ -324,12 +381,19 @@ class UserRegistrationResponse(BaseModel):
     error: str | None = None
 
 
+class ReembedJobResponse(BaseModel):
+    status: str
+    vector_space: str
+    progress: dict[str, Any]
+
+
 class HealthResponse(BaseModel):
     status: str
     timestamp: str
     version: str
     services: dict[str, str]
     authentication: dict[str, Any]
+    event_loop: dict[str, Any] | None = None
 
 
 # New Batch Operation Models
@@ -396,9 +460,31 @@ class CSKHQueryRequest(BaseModel):
     score_threshold: float = Field(
         default=0.6, ge=0.0, le=1.0, description="Minimum similarity score"
     )
+    search_mode: Literal["vector", "hybrid"] | None = Field(
+        default=None,
+        description="'hybrid' adds keyword (BM25) matches to vector search",
+    )
+    lexical_weight: float | None = Field(
+        default=None,
+        ge=0.0,
+        le=1.0,
+        description="Share of the hybrid ranking from keyword matches",
+    )
+    rerank: bool | None = Field(
+        default=None,
+        description="Rerank candidates against the query before the limit",
+    )
+    vector_space: str | None = Field(
+        default=None,
+        description="Vector space to search; defaults to the VECTOR_SPACE setting",
+    )
     include_context: bool = Field(
         default=True, description="Include customer context in response"
     )
+    fields: list[str] | None = Field(
+        default=None,
+        description="Result fields to return, e.g. ['doc_id', 'content', 'score']",
+    )
 
 
 class CSKHQueryResponse(BaseModel):
@@ -420,9 +506,14 @@ class CSKHQueryResponse(BaseModel):
 async def startup_event():
     """Initialize connections to Qdrant, Firestore, and Authentication on startup"""
     global qdrant_store, firestore_manager, vectorization_tool, auth_manager, user_manager
+    global event_loop_monitor
 
     logger.info("Initializing API A2A Gateway services...")
 
+    # Start event loop lag monitoring first so startup stalls are visible too
+    event_loop_monitor = EventLoopLagMonitor(interval=settings.EVENT_LOOP_LAG_INTERVAL)
+    event_loop_monitor.start()
+
     try:
         # Initialize Authentication Manager
         if settings.ENABLE_AUTHENTICATION:
@@ -437,20 +528,17 @@ async def startup_event():
             )
             logger.info("UserManager initialized successfully")
 
+            # Keep cached principals in sync with user deactivation/scope changes
+            user_manager.add_change_listener(auth_manager.on_user_changed)
+
             # Create test user for development
             try:
                 await user_manager.create_test_user()
             except Exception as e:
                 logger.info(f"Test user creation: {e}")
 
-        # Initialize QdrantStore
-        qdrant_config = settings.get_qdrant_config()
-        qdrant_store = QdrantStore(
-            url=qdrant_config["url"],
-            api_key=qdrant_config["api_key"],
-            collection_name=qdrant_config["collection_name"],
-            vector_size=qdrant_config["vector_size"],
-        )
+        # Initialize QdrantStore (shared with the tools using the same collection)
+        qdrant_store = get_qdrant_store()
         logger.info("QdrantStore initialized successfully")
 
         # Initialize FirestoreMetadataManager
@@ -474,6 +562,19 @@ async def startup_event():
         raise
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background monitors, flush queued events and close Qdrant clients"""
+    global event_loop_monitor
+
+    if event_loop_monitor:
+        await event_loop_monitor.stop()
+        event_loop_monitor = None
+
+    await shutdown_event_manager()
+    close_pooled_clients()
+
+
 # Authentication dependency
 async def get_current_user_dependency():
     """Create the current user dependency"""
@@ -512,8 +613,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict[str, Any
         )
 
     try:
-        user_data = await auth_manager.verify_token(token)
-        return user_data
+        return auth_manager.get_principal(token)
     except Exception as e:
         logger.error(f"Token verification failed: {e}")
         raise HTTPException(
@@ -523,34 +623,282 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict[str, Any
 
 
 def _get_cache_key(
-    query_text: str, metadata_filters: dict[str, Any], tags: list[str], path_query: str
+    query_text: str,
+    metadata_filters: dict[str, Any] | None = None,
+    tags: list[str] | None = None,
+    path_query: str | None = None,
+    **params: Any,
 ) -> str:
-    """Generate cache key for RAG queries."""
+    """Generate cache key for RAG queries.
+
+    Any extra keyword arguments (limit, score_threshold, collection, ...) are
+    part of the key, so every parameter that changes the result must be passed.
+    """
     import hashlib
     import json
 
     cache_data = {
         "query": query_text.lower().strip(),
-        "filters": metadata_filters,
+        "filters": metadata_filters or {},
         "tags": sorted(tags) if tags else [],
         "path": path_query or "",
+        "params": params,
     }
-    cache_str = json.dumps(cache_data, sort_keys=True)
+    cache_str = json.dumps(cache_data, sort_keys=True, default=str)
     return hashlib.md5(cache_str.encode()).hexdigest()
 
 
-def _get_cached_result(cache_key: str) -> dict[str, Any] | None:
-    """Get cached RAG result if valid."""
+def _projection_for_fields(
+    fields: list[str] | None,
+) -> tuple[bool | list[str], bool]:
+    """Map requested result fields to Qdrant (with_payload, with_vectors)."""
+    if fields is None:
+        return True, False
+    with_vectors = "vector" in fields
+    if "metadata" in fields:
+        return True, with_vectors
+    payload_keys = [
+        field.split(".", 1)[1] for field in fields if field.startswith("metadata.")
+    ]
+    return payload_keys or False, with_vectors
+
+
+def _project_results(
+    results: list[dict[str, Any]], fields: list[str] | None
+) -> list[dict[str, Any]]:
+    """Keep only the requested fields ("key" or "key.subkey") of each result."""
+    if fields is None:
+        return results
+
+    whole = {field for field in fields if "." not in field}
+    nested: dict[str, list[str]] = {}
+    for field in fields:
+        key, _, subkey = field.partition(".")
+        if subkey and key not in whole:
+            nested.setdefault(key, []).append(subkey)
+
+    projected = []
+    for result in results:
+        item = {key: result[key] for key in whole if key in result}
+        for key, subkeys in nested.items():
+            value = result.get(key)
+            if isinstance(value, dict):
+                item[key] = {sub: value[sub] for sub in subkeys if sub in value}
+        projected.append(item)
+    return projected
+
+
+def _rag_collection() -> str:
+    """Name of the collection RAG results are computed from."""
+    return str(getattr(qdrant_store, "collection_name", "") or "")
+
+
+def _lookup_cached_result(
+    cache_key: str, collection: str = ""
+) -> tuple[dict[str, Any] | None, str]:
+    """Get cached RAG result and its state ("fresh", "stale" or "miss")."""
     if not settings.RAG_CACHE_ENABLED:
-        return None
-    return _rag_cache.get(cache_key)
+        return None, "miss"
+    result, state = _rag_cache.lookup(cache_key, _rag_cache.get_generation(collection))
+    if state == "invalidated":
+        record_rag_cache_event("invalidated")
+        return None, "miss"
+    return result, state
+
+
+def _get_cached_result(cache_key: str, collection: str = "") -> dict[str, Any] | None:
+    """Get cached RAG result if valid."""
+    result, _ = _lookup_cached_result(cache_key, collection)
+    return result
+
 
+def _cache_result(cache_key: str, result: dict[str, Any], generation: int = 0):
+    """Cache RAG result with enhanced LRU cache.
 
-def _cache_result(cache_key: str, result: dict[str, Any]):
-    """Cache RAG result with enhanced LRU cache."""
+    ``generation`` must be the collection generation read before the search
+    started, so a write that lands during the search invalidates the entry.
+    """
     if not settings.RAG_CACHE_ENABLED:
         return
-    _rag_cache.put(cache_key, result)
+    _rag_cache.put(cache_key, result, generation)
+
+
+def _invalidate_rag_cache():
+    """Drop cached RAG results computed before the latest write."""
+    # QdrantStore bumps the generation on upsert; bumping again once the whole
+    # save (including Firestore metadata) has finished covers results cached
+    # in between. The write listener forwards the bump to _rag_cache.
+    bump_collection_generation(_rag_collection())
+
+
+async def _run_cskh_rag_search(
+    query_data: CSKHQueryRequest, query_vector: list[float] | None = None
+) -> dict[str, Any]:
+    """Run the RAG search behind a CSKH query."""
+    # Upstream retries stop in time to answer within the timeout
+    with MetricsTimer("cskh_rag_search"), request_deadline(10.0):
+        return await asyncio.wait_for(
+            qdrant_rag_search(
+                query_text=query_data.query_text,
+                metadata_filters=query_data.metadata_filters,
+                tags=query_data.tags,
+                path_query=query_data.path_query,
+                limit=query_data.limit,
+                score_threshold=query_data.score_threshold,
+                query_vector=query_vector,
+                search_mode=query_data.search_mode,
+                lexical_weight=query_data.lexical_weight,
+                rerank=query_data.rerank,
+                vector_space=query_data.vector_space,
+            ),
+            timeout=10.0,  # 10 second timeout for CSKH queries
+        )
+
+
+def _build_cskh_cache_data(
+    query_data: CSKHQueryRequest, rag_result: dict[str, Any]
+) -> dict[str, Any]:
+    """Build the cacheable CSKH response body from a successful RAG result."""
+    # Enrich results with customer context if requested
+    enriched_results = rag_result["results"]
+    if query_data.include_context and query_data.customer_context:
+        for result in enriched_results:
+            result["customer_context"] = query_data.customer_context
+
+    return {
+        "results": enriched_results,
+        "total_found": rag_result["count"],
+        "rag_info": rag_result.get("rag_info", {}),
+    }
+
+
+async def _refresh_rag_cache_entry(
+    cache_key: str, query_data: CSKHQueryRequest, collection: str
+):
+    """Recompute a stale CSKH cache entry."""
+    try:
+        generation = await _rag_generation(collection)
+        if generation is None:
+            record_rag_cache_event("refresh_error")
+            return
+        rag_result = await _run_cskh_rag_search(query_data)
+        if rag_result["status"] == "success":
+            await _run_cache_call(
+                _cache_result,
+                cache_key,
+                _build_cskh_cache_data(query_data, rag_result),
+                generation,
+            )
+            record_rag_cache_event("refresh")
+        else:
+            record_rag_cache_event("refresh_error")
+    except Exception as e:
+        logger.warning(f"Background refresh of CSKH cache entry failed: {e}")
+        record_rag_cache_event("refresh_error")
+    finally:
+        _rag_refresh_tasks.pop(cache_key, None)
+
+
+def _schedule_rag_refresh(
+    cache_key: str, query_data: CSKHQueryRequest, collection: str
+):
+    """Refresh a stale cache entry in the background unless already in flight."""
+    task = _rag_refresh_tasks.get(cache_key)
+    if task is not None and not task.done():
+        return
+    _rag_refresh_tasks[cache_key] = asyncio.get_running_loop().create_task(
+        _refresh_rag_cache_entry(cache_key, query_data, collection)
+    )
+
+
+async def _lookup_semantic_result(
+    query_data: CSKHQueryRequest, filter_key: str, generation: int
+) -> tuple[dict[str, Any] | None, list[float] | None, dict[str, Any] | None]:
+    """
+    Look for a cached near-duplicate of the query.
+
+    Returns:
+        (cached result, query embedding, match info); the embedding is reused
+        by the RAG search on a miss
+    """
+    if _semantic_cache is None or not settings.RAG_CACHE_ENABLED:
+        return None, None, None
+    search_mode = (
+        query_data.search_mode or settings.get_hybrid_search_config()["default_mode"]
+    )
+    if search_mode == "hybrid":
+        # Near-duplicate embeddings can differ in the exact codes hybrid
+        # search is asked to match (e.g. ERR-1042 vs ERR-1043)
+        return None, None, None
+    if query_data.vector_space not in (
+        None,
+        settings.get_vector_space_config()["active"],
+    ):
+        # Cached queries are embedded in the active space only
+        return None, None, None
+
+    try:
+        query_vector = await qdrant_store.embed_query(query_data.query_text)
+    except Exception as e:
+        logger.warning(f"Semantic cache lookup skipped, embedding failed: {e}")
+        return None, None, None
+    if not query_vector:
+        return None, None, None
+
+    match = _semantic_cache.lookup(query_vector, filter_key, generation)
+    if match is None:
+        record_semantic_cache_lookup(False)
+        return None, query_vector, None
+
+    result, similarity, matched_query = match
+    record_semantic_cache_lookup(True, similarity)
+    return (
+        result,
+        query_vector,
+        {"similarity": similarity, "matched_query": matched_query},
+    )
+
+
+async def _sample_semantic_hit(
+    query_data: CSKHQueryRequest,
+    query_vector: list[float],
+    served: dict[str, Any],
+    match_info: dict[str, Any],
+):
+    """Compare a semantic cache hit with a live search to measure false hits."""
+    try:
+        rag_result = await _run_cskh_rag_search(query_data, query_vector)
+    except Exception as e:
+        logger.debug(f"Semantic cache sample search failed: {e}")
+        return
+    if rag_result.get("status") != "success":
+        return
+
+    live_ids = {r.get("doc_id") for r in rag_result.get("results", [])}
+    served_ids = {r.get("doc_id") for r in served.get("results", [])}
+    false_hit = live_ids != served_ids
+    record_semantic_cache_sample(false_hit)
+    if false_hit:
+        logger.info(
+            f"Semantic cache false hit at similarity {match_info['similarity']:.4f}: "
+            f"'{query_data.query_text[:100]}' served by '{match_info['matched_query'][:100]}'"
+        )
+
+
+def _schedule_semantic_sample(
+    query_data: CSKHQueryRequest,
+    query_vector: list[float],
+    served: dict[str, Any],
+    match_info: dict[str, Any],
+):
+    """Re-check a sampled fraction of semantic hits in the background."""
+    if random.random() >= _semantic_sample_rate:
+        return
+    task = asyncio.get_running_loop().create_task(
+        _sample_semantic_hit(query_data, query_vector, served, match_info)
+    )
+    _semantic_sample_tasks.add(task)
+    task.add_done_callback(_semantic_sample_tasks.discard)
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -567,6 +915,7 @@ async def health_check():
         "auth_manager": "available" if auth_manager else "unavailable",
         "user_manager": "available" if user_manager else "unavailable",
         "registration_allowed": settings.ALLOW_REGISTRATION,
+        "token_cache": auth_manager.token_cache.get_stats() if auth_manager else None,
     }
 
     return HealthResponse(
@@ -579,6 +928,7 @@ async def health_check():
         version="1.0.0",
         services=services,
         authentication=auth_status,
+        event_loop=event_loop_monitor.get_stats() if event_loop_monitor else None,
     )
 
 
@@ -638,6 +988,30 @@ async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends
         )
 
 
+@app.post("/auth/logout")
+async def logout(token: str = Depends(oauth2_scheme)):
+    """Revoke the caller's JWT token"""
+    if not settings.ENABLE_AUTHENTICATION:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Authentication is disabled",
+        )
+
+    if not auth_manager:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication services unavailable",
+        )
+
+    if not token or not auth_manager.revoke_token(token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication token",
+        )
+
+    return {"status": "success", "message": "Token revoked"}
+
+
 @app.post("/auth/register", response_model=UserRegistrationResponse)
 @limiter.limit("3/minute")  # Very strict rate limit for registration
 async def register(request: Request, registration_data: UserRegistrationRequest):
@@ -737,6 +1111,7 @@ async def save_document(
         )
 
         if result.get("status") == "success":
+            _invalidate_rag_cache()
             return SaveDocumentResponse(
                 status="success",
                 doc_id=document_data.doc_id,
@@ -793,18 +1168,27 @@ async def query_vectors(
             f"Processing semantic query: {query_data.query_text[:50]}... by user: {current_user.get('user_id', 'anonymous')}"
         )
 
-        # Use QdrantStore to perform semantic search
+        if query_data.vector_space:
+            get_vector_space(query_data.vector_space)
+
+        # Use QdrantStore to perform semantic search, fetching only what is returned
+        with_payload, with_vectors = _projection_for_fields(query_data.fields)
         search_results = await qdrant_store.semantic_search(
             query_text=query_data.query_text,
             limit=query_data.limit,
             tag=query_data.tag,
             score_threshold=query_data.score_threshold,
+            with_payload=with_payload,
+            with_vectors=with_vectors,
+            vector_space=query_data.vector_space,
         )
 
         return QueryVectorsResponse(
             status="success",
             query_text=query_data.query_text,
-            results=search_results.get("results", []),
+            results=_project_results(
+                search_results.get("results", []), query_data.fields
+            ),
             total_found=len(search_results.get("results", [])),
             message=f"Found {len(search_results.get('results', []))} results for semantic query",
         )
@@ -851,12 +1235,17 @@ async def search_documents(
         # Use QdrantStore to search by tag
         if search_data.tag:
             search_results = await qdrant_store.query_vectors_by_tag(
-                tag=search_data.tag, offset=search_data.offset, limit=search_data.limit
+                tag=search_data.tag,
+                offset=search_data.offset,
+                limit=search_data.limit,
+                with_vectors=search_data.include_vectors,
             )
         else:
             # If no tag specified, get recent documents
             search_results = await qdrant_store.get_recent_documents(
-                limit=search_data.limit, offset=search_data.offset
+                limit=search_data.limit,
+                offset=search_data.offset,
+                with_vectors=search_data.include_vectors,
             )
 
         # Process results to include/exclude vectors as requested
@@ -940,16 +1329,17 @@ async def batch_save_documents(
 
                 # Use vectorization tool with timeout and enhanced error handling
                 try:
-                    result = await asyncio.wait_for(
-                        vectorization_tool.vectorize_document(
-                            doc_id=doc_request.doc_id,
-                            content=doc_request.content,
-                            metadata=enhanced_metadata,
-                            tag=doc_request.tag,
-                            update_firestore=doc_request.update_firestore,
-                        ),
-                        timeout=30.0,  # 30 second timeout per document
-                    )
+                    with request_deadline(30.0):
+                        result = await asyncio.wait_for(
+                            vectorization_tool.vectorize_document(
+                                doc_id=doc_request.doc_id,
+                                content=doc_request.content,
+                                metadata=enhanced_metadata,
+                                tag=doc_request.tag,
+                                update_firestore=doc_request.update_firestore,
+                            ),
+                            timeout=30.0,  # 30 second timeout per document
+                        )
                 except builtins.TimeoutError:
                     raise TimeoutError(
                         f"Document processing timed out for {doc_request.doc_id}"
@@ -991,9 +1381,6 @@ async def batch_save_documents(
 
                 results.append(response)
 
-                # Add small delay to avoid rate limiting
-                await asyncio.sleep(0.1)
-
             except (RateLimitError, ValidationError, ServerError, TimeoutError) as e:
                 failed_saves += 1
                 logger.error(
@@ -1021,6 +1408,9 @@ async def batch_save_documents(
                     )
                 )
 
+        if successful_saves:
+            _invalidate_rag_cache()
+
         return BatchSaveResponse(
             status="completed",
             batch_id=batch_id,
@@ -1084,16 +1474,22 @@ async def batch_query_vectors(
         for query_request in batch_data.queries:
             try:
                 # Use QdrantStore to perform semantic search with timeout and enhanced error handling
+                with_payload, with_vectors = _projection_for_fields(
+                    query_request.fields
+                )
                 try:
-                    search_results = await asyncio.wait_for(
-                        qdrant_store.semantic_search(
-                            query_text=query_request.query_text,
-                            limit=query_request.limit,
-                            tag=query_request.tag,
-                            score_threshold=query_request.score_threshold,
-                        ),
-                        timeout=15.0,  # 15 second timeout per query
-                    )
+                    with request_deadline(15.0):
+                        search_results = await asyncio.wait_for(
+                            qdrant_store.semantic_search(
+                                query_text=query_request.query_text,
+                                limit=query_request.limit,
+                                tag=query_request.tag,
+                                score_threshold=query_request.score_threshold,
+                                with_payload=with_payload,
+                                with_vectors=with_vectors,
+                            ),
+                            timeout=15.0,  # 15 second timeout per query
+                        )
                 except builtins.TimeoutError:
                     raise TimeoutError(
                         f"Query processing timed out for '{query_request.query_text[:50]}...'"
@@ -1103,16 +1499,15 @@ async def batch_query_vectors(
                 response = QueryVectorsResponse(
                     status="success",
                     query_text=query_request.query_text,
-                    results=search_results.get("results", []),
+                    results=_project_results(
+                        search_results.get("results", []), query_request.fields
+                    ),
                     total_found=len(search_results.get("results", [])),
                     message=f"Found {len(search_results.get('results', []))} results for query in batch",
                 )
 
                 results.append(response)
 
-                # Add small delay to avoid rate limiting
-                await asyncio.sleep(0.05)
-
             except (RateLimitError, ValidationError, ServerError, TimeoutError) as e:
                 failed_queries += 1
                 logger.error(
@@ -1201,20 +1596,76 @@ async def cskh_query(
     )
 
     try:
-        # Generate cache key for optimization
+        # Generate cache key covering every parameter that shapes the results
+        collection = _rag_collection()
+        cache_params = {
+            "collection": collection,
+            "limit": query_data.limit,
+            "score_threshold": query_data.score_threshold,
+            "search_mode": query_data.search_mode,
+            "lexical_weight": query_data.lexical_weight,
+            "rerank": query_data.rerank,
+            "vector_space": query_data.vector_space,
+            "customer_context": (
+                query_data.customer_context
+                if query_data.include_context and query_data.customer_context
+                else None
+            ),
+        }
         cache_key = _get_cache_key(
             query_data.query_text,
             query_data.metadata_filters or {},
             query_data.tags or [],
             query_data.path_query or "",
+            **cache_params,
         )
+        # An unavailable cache backend is a miss and nothing is cached
+        generation = await _rag_generation(collection)
+        cached_result, cache_state = None, "miss"
+        if generation is not None:
+            # Check cache first
+            cached_result, cache_state = await _run_cache_call(
+                _lookup_cached_result, cache_key, collection, on_error=(None, "miss")
+            )
+
+        # Then a near-duplicate query with exactly the same filters
+        query_vector = None
+        if not cached_result and generation is not None:
+            filter_key = _get_cache_key(
+                "",
+                query_data.metadata_filters or {},
+                query_data.tags or [],
+                query_data.path_query or "",
+                **cache_params,
+            )
+            cached_result, query_vector, semantic_match = await _lookup_semantic_result(
+                query_data, filter_key, generation
+            )
+            if cached_result:
+                cache_state = "semantic"
+                await _run_cache_call(
+                    _cache_result, cache_key, cached_result, generation
+                )
+                _schedule_semantic_sample(
+                    query_data, query_vector, cached_result, semantic_match
+                )
+                cached_result = {
+                    **cached_result,
+                    "rag_info": {
+                        **cached_result["rag_info"],
+                        "semantic_cache": semantic_match,
+                    },
+                }
 
-        # Check cache first
-        cached_result = _get_cached_result(cache_key)
         if cached_result:
             response_time = (time.time() - start_time) * 1000
             logger.info(f"CSKH query cache hit for user {current_user.get('user_id')}")
 
+            # Serve the stale entry now and refresh it off the request path
+            if cache_state == "stale":
+                record_rag_cache_event("stale_hit")
+                _schedule_rag_refresh(cache_key, query_data, collection)
+
             # Record cache hit metrics
             cache_duration = time.time() - start_time
             record_cskh_query("success", cache_duration)
@@ -1227,7 +1678,7 @@ async def cskh_query(
                 status="success",
                 query_text=query_data.query_text,
                 customer_context=query_data.customer_context or {},
-                results=cached_result["results"],
+                results=_project_results(cached_result["results"], query_data.fields),
                 total_found=cached_result["total_found"],
                 rag_info=cached_result["rag_info"],
                 response_time_ms=response_time,
@@ -1236,37 +1687,26 @@ async def cskh_query(
             )
 
         # Perform RAG search with metrics
-        with MetricsTimer("cskh_rag_search"):
-            rag_result = await asyncio.wait_for(
-                qdrant_rag_search(
-                    query_text=query_data.query_text,
-                    metadata_filters=query_data.metadata_filters,
-                    tags=query_data.tags,
-                    path_query=query_data.path_query,
-                    limit=query_data.limit,
-                    score_threshold=query_data.score_threshold,
-                ),
-                timeout=10.0,  # 10 second timeout for CSKH queries
-            )
+        rag_result = await _run_cskh_rag_search(query_data, query_vector)
 
         # Record metrics
         record_semantic_search()
         search_duration = time.time() - start_time
 
         if rag_result["status"] == "success":
-            # Enrich results with customer context if requested
-            enriched_results = rag_result["results"]
-            if query_data.include_context and query_data.customer_context:
-                for result in enriched_results:
-                    result["customer_context"] = query_data.customer_context
-
             # Cache successful results
-            cache_data = {
-                "results": enriched_results,
-                "total_found": rag_result["count"],
-                "rag_info": rag_result.get("rag_info", {}),
-            }
-            _cache_result(cache_key, cache_data)
+            cache_data = _build_cskh_cache_data(query_data, rag_result)
+            enriched_results = cache_data["results"]
+            if generation is not None:
+                await _run_cache_call(_cache_result, cache_key, cache_data, generation)
+            if query_vector and _semantic_cache is not None:
+                _semantic_cache.put(
+                    query_vector,
+                    filter_key,
+                    cache_data,
+                    generation,
+                    query_text=query_data.query_text,
+                )
 
             response_time = (time.time() - start_time) * 1000
 
@@ -1281,7 +1721,7 @@ async def cskh_query(
                 status="success",
                 query_text=query_data.query_text,
                 customer_context=query_data.customer_context or {},
-                results=enriched_results,
+                results=_project_results(enriched_results, query_data.fields),
                 total_found=rag_result["count"],
                 rag_info=rag_result.get("rag_info", {}),
                 response_time_ms=response_time,
@@ -1354,6 +1794,77 @@ async def cskh_query(
         )
 
 
+@app.post("/vector_spaces/{vector_space}/reembed", response_model=ReembedJobResponse)
+@limiter.limit("5/minute")
+async def start_vector_space_reembedding(
+    request: Request,
+    vector_space: str,
+    current_user: dict[str, Any] = Depends(get_current_user),
+):
+    """
+    Start filling a vector space from the stored point texts in the background
+    """
+    if not qdrant_store:
+        raise HTTPException(status_code=503, detail="Qdrant service unavailable")
+
+    if settings.ENABLE_AUTHENTICATION and not auth_manager.validate_user_access(
+        current_user, "write"
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient permissions to re-embed documents",
+        )
+
+    try:
+        job = start_reembedding(vector_space, qdrant_store)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    logger.info(
+        f"Re-embedding into {job.vector_space} started by user: {current_user.get('user_id', 'anonymous')}"
+    )
+    return ReembedJobResponse(
+        status="running", vector_space=job.vector_space, progress=job.progress
+    )
+
+
+@app.get("/vector_spaces/{vector_space}/reembed", response_model=ReembedJobResponse)
+@limiter.limit("60/minute")
+async def get_vector_space_reembedding(
+    request: Request,
+    vector_space: str,
+    current_user: dict[str, Any] = Depends(get_current_user),
+):
+    """
+    Get the progress of the latest re-embedding job of a vector space
+    """
+    if not qdrant_store:
+        raise HTTPException(status_code=503, detail="Qdrant service unavailable")
+
+    if settings.ENABLE_AUTHENTICATION and not auth_manager.validate_user_access(
+        current_user, "read"
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient permissions to read re-embedding jobs",
+        )
+
+    try:
+        job = get_reembedding_job(vector_space, qdrant_store)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    if job is None:
+        raise HTTPException(
+            status_code=404, detail=f"No re-embedding job for {vector_space}"
+        )
+
+    return ReembedJobResponse(
+        status=job.progress["status"],
+        vector_space=job.vector_space,
+        progress=job.progress,
+    )
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
@@ -1365,6 +1876,7 @@ async def root():
             "health": "/health",
             "auth": {
                 "login": "/auth/login",
+                "logout": "/auth/logout",
                 "register": (
                     "/auth/register" if settings.ALLOW_REGISTRATION else "disabled"
                 ),
@@ -1376,6 +1888,7 @@ async def root():
                 "batch_save": "/batch_save",
                 "batch_query": "/batch_query",
                 "cskh_query": "/cskh_query",
+                "reembed": "/vector_spaces/{vector_space}/reembed",
             },
             "docs": "/docs",
         },
@@ -1,6 +1,7 @@
 """Authentication package for Agent Data API A2A Gateway"""
 
 from .auth_manager import AuthManager
+from .token_cache import RevocationRegistry, TokenCache
 from .user_manager import UserManager
 
-__all__ = ["AuthManager", "UserManager"]
+__all__ = ["AuthManager", "RevocationRegistry", "TokenCache", "UserManager"]
@@ -5,6 +5,8 @@ Handles JWT token generation, validation, and OAuth2 integration
 
 import logging
 import os
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -14,6 +16,10 @@ from google.cloud import secretmanager
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from ..config.settings import settings
+from ..tools.prometheus_metrics import record_auth_token_cache
+from .token_cache import RevocationRegistry, TokenCache
+
 logger = logging.getLogger(__name__)
 
 # Password context for hashing
@@ -31,6 +37,17 @@ class AuthManager:
         self.algorithm = "HS256"
         self.access_token_expire_minutes = 30
 
+        # Verified token cache, revocations and per-user state refreshed from Firestore
+        self.token_cache_enabled = settings.AUTH_TOKEN_CACHE_ENABLED
+        self.token_cache = TokenCache(max_size=settings.AUTH_TOKEN_CACHE_MAX_SIZE)
+        self.revocations = RevocationRegistry(
+            max_token_age=self.access_token_expire_minutes * 60
+        )
+        # user_id -> (scopes, time set); dropped once older than any live token
+        self.scope_overrides: dict[str, tuple[list[str], float]] = {}
+        # Orders caching a verified principal against revocations and scope updates
+        self._principal_lock = threading.Lock()
+
         if not self.secret_key:
             logger.error("JWT_SECRET_KEY not found in environment or Secret Manager")
             raise ValueError("JWT secret key is required for authentication")
@@ -93,6 +110,7 @@ class AuthManager:
         )
 
         to_encode.update({"exp": exp_timestamp, "iat": current_timestamp})
+        self.revocations.note_token_lifetime(exp_timestamp - current_timestamp)
 
         logger.debug(
             f"Creating JWT: current_ts={current_timestamp}, exp_ts={exp_timestamp}, delta={exp_timestamp-current_timestamp}s"
@@ -141,28 +159,101 @@ class AuthManager:
                 logger.warning("JWT token missing 'sub' field")
                 raise credentials_exception
 
+            if self.revocations.is_revoked(token, payload):
+                logger.warning(f"JWT token revoked for user: {user_id}")
+                raise credentials_exception
+
             logger.debug(f"Successfully validated JWT token for user: {user_id}")
             return payload
 
         except JWTError as e:
             logger.warning(f"JWT validation failed: {e}")
             raise credentials_exception
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Unexpected error during token validation: {e}")
             raise credentials_exception
 
+    def get_principal(self, token: str) -> dict[str, Any]:
+        """Get the principal for a token, serving repeat tokens from the cache"""
+        if self.token_cache_enabled:
+            principal = self.token_cache.get(token)
+            record_auth_token_cache(principal is not None)
+            if principal is not None:
+                return principal
+
+        payload = self.verify_token(token)
+        user_id = payload.get("sub")
+        with self._principal_lock:
+            override = self.scope_overrides.get(user_id)
+            principal = {
+                "user_id": user_id,
+                "email": payload.get("email"),
+                "scopes": list(override[0] if override else payload.get("scopes", [])),
+                "exp": payload.get("exp"),
+                "iat": payload.get("iat"),
+            }
+
+            # A revocation that landed while verifying must not be cached over
+            if (
+                self.token_cache_enabled
+                and payload.get("exp")
+                and not self.revocations.is_revoked(token, payload)
+            ):
+                self.token_cache.put(token, principal, payload["exp"])
+        return principal
+
     async def get_current_user(
         self, token: str = Depends(oauth2_scheme)
     ) -> dict[str, Any]:
         """Get current user from JWT token (FastAPI dependency)"""
-        payload = self.verify_token(token)
-        return {
-            "user_id": payload.get("sub"),
-            "email": payload.get("email"),
-            "scopes": payload.get("scopes", []),
-            "exp": payload.get("exp"),
-            "iat": payload.get("iat"),
-        }
+        return self.get_principal(token)
+
+    def revoke_token(self, token: str) -> bool:
+        """Revoke a single token (logout) until it would have expired anyway"""
+        try:
+            payload = self.verify_token(token)
+        except HTTPException:
+            return False
+
+        with self._principal_lock:
+            self.revocations.revoke_token(token, payload.get("exp", 0))
+            self.token_cache.invalidate_token(token)
+        logger.info(f"Revoked JWT token for user: {payload.get('sub')}")
+        return True
+
+    def revoke_user(self, user_id: str):
+        """Revoke every token issued to a user so far"""
+        with self._principal_lock:
+            self.revocations.revoke_user(user_id)
+            dropped = self.token_cache.invalidate_user(user_id)
+        logger.info(f"Revoked tokens for user {user_id} ({dropped} cached)")
+
+    def refresh_user_scopes(self, user_id: str, scopes: list[str]):
+        """Apply updated scopes to existing tokens of a user"""
+        now = time.time()
+        with self._principal_lock:
+            self.scope_overrides[user_id] = (list(scopes), now)
+            max_age = self.revocations.max_token_age
+            for stale in [
+                uid
+                for uid, (_, set_at) in self.scope_overrides.items()
+                if set_at + max_age <= now
+            ]:
+                del self.scope_overrides[stale]
+            self.token_cache.invalidate_user(user_id)
+        logger.info(f"Refreshed scopes for user {user_id}: {scopes}")
+
+    def on_user_changed(self, user_id: str, changes: dict[str, Any]):
+        """UserManager change listener keeping cached principals consistent"""
+        if changes.get("is_active") is False:
+            self.revoke_user(user_id)
+        elif "scopes" in changes:
+            self.refresh_user_scopes(user_id, changes["scopes"])
+        else:
+            with self._principal_lock:
+                self.token_cache.invalidate_user(user_id)
 
     def create_user_token(self, user_id: str, email: str, scopes: list = None) -> str:
         """Create a JWT token for a specific user"""
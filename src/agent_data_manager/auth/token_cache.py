@@ -0,0 +1,183 @@
+"""
+Verified token cache for Agent Data API A2A Gateway
+Caches JWT verification results and tracks revocations so that repeated
+requests with the same bearer token skip HMAC decoding and claims checks
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def _token_key(token: str) -> str:
+    """Hash a raw token so cache keys never hold bearer credentials"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _copy_principal(principal: dict[str, Any]) -> dict[str, Any]:
+    """Copy a principal so callers cannot mutate the cached one"""
+    return {
+        key: list(value) if isinstance(value, list) else value
+        for key, value in principal.items()
+    }
+
+
+class TokenCache:
+    """Thread-safe bounded LRU of verified token -> principal, expiring at token exp"""
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self.cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self.expiry: dict[str, float] = {}
+        self.user_tokens: dict[str, set[str]] = {}
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        """Return the cached principal for a token, or None if absent or expired"""
+        key = _token_key(token)
+        with self.lock:
+            principal = self.cache.get(key)
+            if principal is None:
+                self.misses += 1
+                return None
+
+            if self.expiry[key] <= time.time():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return _copy_principal(principal)
+
+    def put(self, token: str, principal: dict[str, Any], exp: float):
+        """Cache a verified principal until the token's exp timestamp"""
+        key = _token_key(token)
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+            elif len(self.cache) >= self.max_size:
+                oldest_key = next(iter(self.cache))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+            self.cache[key] = _copy_principal(principal)
+            self.expiry[key] = exp
+            user_id = principal.get("user_id")
+            if user_id:
+                self.user_tokens.setdefault(user_id, set()).add(key)
+
+    def invalidate_token(self, token: str) -> bool:
+        """Drop a single token from the cache"""
+        with self.lock:
+            return self._remove(_token_key(token))
+
+    def invalidate_user(self, user_id: str) -> int:
+        """Drop every cached token belonging to a user"""
+        with self.lock:
+            keys = list(self.user_tokens.get(user_id, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self):
+        """Clear all cache entries"""
+        with self.lock:
+            self.cache.clear()
+            self.expiry.clear()
+            self.user_tokens.clear()
+
+    def size(self) -> int:
+        """Get current cache size"""
+        with self.lock:
+            return len(self.cache)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache hit/miss statistics"""
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self.cache),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def _remove(self, key: str) -> bool:
+        """Remove a key and its user index entry; caller holds the lock"""
+        principal = self.cache.pop(key, None)
+        self.expiry.pop(key, None)
+        if principal is None:
+            return False
+
+        user_id = principal.get("user_id")
+        keys = self.user_tokens.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.user_tokens[user_id]
+        return True
+
+
+class RevocationRegistry:
+    """Tracks revoked tokens and per-user revocation cut-offs until they expire"""
+
+    def __init__(self, max_token_age: float = 1800):
+        self.revoked_tokens: dict[str, float] = {}
+        self.user_cutoffs: dict[str, float] = {}
+        # Longest token lifetime issued; a cut-off older than this covers no live token
+        self.max_token_age = max_token_age
+        self.lock = threading.RLock()
+
+    def note_token_lifetime(self, seconds: float):
+        """Keep cut-offs at least as long as a newly issued token lives"""
+        with self.lock:
+            self.max_token_age = max(self.max_token_age, seconds)
+
+    def revoke_token(self, token: str, exp: float):
+        """Reject this token until its exp timestamp"""
+        with self.lock:
+            self.revoked_tokens[_token_key(token)] = exp
+            self._prune()
+
+    def revoke_user(self, user_id: str, cutoff: float | None = None):
+        """Reject every token for a user issued at or before the cut-off"""
+        with self.lock:
+            self.user_cutoffs[user_id] = cutoff if cutoff is not None else time.time()
+            self._prune()
+
+    def is_revoked(self, token: str, payload: dict[str, Any]) -> bool:
+        """Check a decoded token against revoked tokens and user cut-offs"""
+        with self.lock:
+            if _token_key(token) in self.revoked_tokens:
+                return True
+
+            cutoff = self.user_cutoffs.get(payload.get("sub"))
+            if cutoff is not None and payload.get("iat", 0) <= cutoff:
+                return True
+            return False
+
+    def _prune(self):
+        """Forget revocations for tokens that have expired anyway"""
+        now = time.time()
+        expired = [key for key, exp in self.revoked_tokens.items() if exp <= now]
+        for key in expired:
+            del self.revoked_tokens[key]
+
+        stale = [
+            user_id
+            for user_id, cutoff in self.user_cutoffs.items()
+            if cutoff + self.max_token_age <= now
+        ]
+        for user_id in stale:
+            del self.user_cutoffs[user_id]
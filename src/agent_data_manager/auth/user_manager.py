@@ -3,19 +3,53 @@ User Manager for Agent Data API A2A Gateway
 Handles user storage and retrieval from Firestore
 """
 
+import asyncio
 import hashlib
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any
 
 from google.cloud import firestore
 from passlib.context import CryptContext
 
+from ..config.settings import settings
+from ..tools.prometheus_metrics import (
+    record_auth_login_stage,
+    update_auth_hash_in_flight,
+)
+
 logger = logging.getLogger(__name__)
 
 # Password context for hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Bounded worker pool for bcrypt so hashing never runs on the event loop
+_hash_executor = ThreadPoolExecutor(
+    max_workers=max(1, settings.AUTH_HASH_WORKERS), thread_name_prefix="auth-hash"
+)
+
+
+async def _run_in_hash_pool(func, *args):
+    """Run a CPU-bound password hashing call in the bounded worker pool."""
+    loop = asyncio.get_running_loop()
+    update_auth_hash_in_flight(1)
+    try:
+        return await loop.run_in_executor(_hash_executor, func, *args)
+    finally:
+        update_auth_hash_in_flight(-1)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its bcrypt hash off the event loop."""
+    return await _run_in_hash_pool(pwd_context.verify, plain_password, hashed_password)
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password with bcrypt off the event loop."""
+    return await _run_in_hash_pool(pwd_context.hash, password)
+
 
 class UserManager:
     """Manages user authentication data in Firestore"""
@@ -24,9 +58,10 @@ class UserManager:
         self.project_id = project_id or "chatgpt-db-project"
         self.database_id = database_id
         self.collection_name = "users"
+        self._change_listeners = []
 
         try:
-            self.firestore_client = firestore.Client(
+            self.firestore_client = firestore.AsyncClient(
                 project=self.project_id, database=self.database_id
             )
             logger.info(
@@ -36,12 +71,24 @@ class UserManager:
             logger.error(f"Failed to initialize Firestore client: {e}")
             raise
 
+    def add_change_listener(self, listener):
+        """Register a callback(user_id, changes) invoked after user updates"""
+        self._change_listeners.append(listener)
+
+    def _notify_change(self, user_id: str, changes: dict[str, Any]):
+        """Notify listeners (e.g. the token cache) that a user changed"""
+        for listener in self._change_listeners:
+            try:
+                listener(user_id, changes)
+            except Exception as e:
+                logger.error(f"User change listener failed for {user_id}: {e}")
+
     async def get_user_by_email(self, email: str) -> dict[str, Any] | None:
         """Get user by email address"""
         try:
             users_ref = self.firestore_client.collection(self.collection_name)
             query = users_ref.where("email", "==", email).limit(1)
-            docs = list(query.stream())
+            docs = [doc async for doc in query.stream()]
 
             if docs:
                 user_data = docs[0].to_dict()
@@ -62,7 +109,7 @@ class UserManager:
             user_ref = self.firestore_client.collection(self.collection_name).document(
                 user_id
             )
-            user_doc = user_ref.get()
+            user_doc = await user_ref.get()
 
             if user_doc.exists:
                 user_data = user_doc.to_dict()
@@ -90,7 +137,7 @@ class UserManager:
             raise ValueError(f"User with email {email} already exists")
 
         # Hash password
-        hashed_password = pwd_context.hash(password)
+        hashed_password = await hash_password(password)
 
         # Generate user ID from email hash for consistency
         user_id = hashlib.sha256(email.encode()).hexdigest()[:16]
@@ -112,7 +159,7 @@ class UserManager:
             user_ref = self.firestore_client.collection(self.collection_name).document(
                 user_id
             )
-            user_ref.set(user_data)
+            await user_ref.set(user_data)
 
             user_data["user_id"] = user_id
             logger.info(f"Created new user: {email} with ID: {user_id}")
@@ -126,8 +173,11 @@ class UserManager:
         self, email: str, password: str
     ) -> dict[str, Any] | None:
         """Authenticate user with email and password"""
+        start_time = time.perf_counter()
         try:
+            stage_start = time.perf_counter()
             user = await self.get_user_by_email(email)
+            record_auth_login_stage("lookup", time.perf_counter() - stage_start)
             if not user:
                 logger.warning(f"Authentication failed - user not found: {email}")
                 return None
@@ -136,13 +186,18 @@ class UserManager:
                 logger.warning(f"Authentication failed - user inactive: {email}")
                 return None
 
-            # Verify password
-            if not pwd_context.verify(password, user["password_hash"]):
+            # Verify password in the hashing pool
+            stage_start = time.perf_counter()
+            password_ok = await verify_password(password, user["password_hash"])
+            record_auth_login_stage("verify", time.perf_counter() - stage_start)
+            if not password_ok:
                 logger.warning(f"Authentication failed - invalid password: {email}")
                 return None
 
             # Update login statistics
+            stage_start = time.perf_counter()
             await self.update_login_stats(user["user_id"])
+            record_auth_login_stage("stats", time.perf_counter() - stage_start)
 
             logger.info(f"User authenticated successfully: {email}")
             return user
@@ -150,6 +205,8 @@ class UserManager:
         except Exception as e:
             logger.error(f"Error during authentication for {email}: {e}")
             return None
+        finally:
+            record_auth_login_stage("total", time.perf_counter() - start_time)
 
     async def update_login_stats(self, user_id: str):
         """Update user login statistics"""
@@ -157,7 +214,7 @@ class UserManager:
             user_ref = self.firestore_client.collection(self.collection_name).document(
                 user_id
             )
-            user_ref.update(
+            await user_ref.update(
                 {
                     "last_login": datetime.utcnow(),
                     "login_count": firestore.Increment(1),
@@ -175,8 +232,9 @@ class UserManager:
             user_ref = self.firestore_client.collection(self.collection_name).document(
                 user_id
             )
-            user_ref.update({"scopes": scopes, "updated_at": datetime.utcnow()})
+            await user_ref.update({"scopes": scopes, "updated_at": datetime.utcnow()})
             logger.info(f"Updated scopes for user {user_id}: {scopes}")
+            self._notify_change(user_id, {"scopes": scopes})
             return True
 
         except Exception as e:
@@ -189,8 +247,9 @@ class UserManager:
             user_ref = self.firestore_client.collection(self.collection_name).document(
                 user_id
             )
-            user_ref.update({"is_active": False, "updated_at": datetime.utcnow()})
+            await user_ref.update({"is_active": False, "updated_at": datetime.utcnow()})
             logger.info(f"Deactivated user: {user_id}")
+            self._notify_change(user_id, {"is_active": False})
             return True
 
         except Exception as e:
@@ -210,7 +269,7 @@ class UserManager:
             users_ref = users_ref.limit(limit)
 
             users = []
-            for doc in users_ref.stream():
+            async for doc in users_ref.stream():
                 user_data = doc.to_dict()
                 user_data["user_id"] = doc.id
                 # Remove sensitive data
@@ -19,6 +19,16 @@ class Settings:
         "QDRANT_COLLECTION_NAME", "agent_data_vectors"
     )
     QDRANT_REGION: str = "us-east4-0"  # Free tier region
+    QDRANT_PREFER_GRPC: bool = (
+        os.environ.get("QDRANT_PREFER_GRPC", "false").lower() == "true"
+    )
+    QDRANT_GRPC_PORT: int = int(os.environ.get("QDRANT_GRPC_PORT", "6334"))
+    QDRANT_POOL_MAX_CONNECTIONS: int = int(
+        os.environ.get("QDRANT_POOL_MAX_CONNECTIONS", "50")
+    )  # HTTP connections per pooled client
+    QDRANT_POOL_MAX_KEEPALIVE: int = int(
+        os.environ.get("QDRANT_POOL_MAX_KEEPALIVE", "20")
+    )
 
     # Vector configuration
     VECTOR_DIMENSION: int = int(
@@ -27,9 +37,53 @@ class Settings:
 
     # Qdrant batch processing configuration
     QDRANT_BATCH_SIZE: int = int(os.environ.get("QDRANT_BATCH_SIZE", "100"))
-    QDRANT_SLEEP: float = float(
-        os.environ.get("QDRANT_SLEEP", "0.35")
-    )  # Sleep between batches in seconds
+
+    # Upstream rate limits (0 disables a bucket)
+    OPENAI_REQUESTS_PER_MINUTE: int = int(
+        os.environ.get("OPENAI_REQUESTS_PER_MINUTE", "3000")
+    )
+    OPENAI_TOKENS_PER_MINUTE: int = int(
+        os.environ.get("OPENAI_TOKENS_PER_MINUTE", "1000000")
+    )
+    QDRANT_REQUESTS_PER_MINUTE: int = int(
+        os.environ.get("QDRANT_REQUESTS_PER_MINUTE", "200")
+    )  # Paces writes; one call per 300ms on the free tier
+    FIRESTORE_REQUESTS_PER_MINUTE: int = int(
+        os.environ.get("FIRESTORE_REQUESTS_PER_MINUTE", "6000")
+    )
+    RATE_LIMIT_BURST_SECONDS: float = float(
+        os.environ.get("RATE_LIMIT_BURST_SECONDS", "1.0")
+    )  # Bucket capacity, in seconds of refill
+
+    # Upstream retries, circuit breakers and hedged reads
+    UPSTREAM_RETRY_MAX_ATTEMPTS: int = int(
+        os.environ.get("UPSTREAM_RETRY_MAX_ATTEMPTS", "3")
+    )
+    UPSTREAM_RETRY_BASE_DELAY: float = float(
+        os.environ.get("UPSTREAM_RETRY_BASE_DELAY", "0.2")
+    )  # Backoff before the first retry, doubled per attempt, with full jitter
+    UPSTREAM_RETRY_MAX_DELAY: float = float(
+        os.environ.get("UPSTREAM_RETRY_MAX_DELAY", "5.0")
+    )
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = int(
+        os.environ.get("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "5")
+    )  # Consecutive transient failures that open the breaker
+    CIRCUIT_BREAKER_RESET_TIMEOUT: float = float(
+        os.environ.get("CIRCUIT_BREAKER_RESET_TIMEOUT", "30.0")
+    )  # Seconds open before a probe call is let through
+    OPENAI_HEDGE_DELAY: float = float(os.environ.get("OPENAI_HEDGE_DELAY", "0"))
+    QDRANT_HEDGE_DELAY: float = float(os.environ.get("QDRANT_HEDGE_DELAY", "0"))
+    FIRESTORE_HEDGE_DELAY: float = float(
+        os.environ.get("FIRESTORE_HEDGE_DELAY", "0")
+    )  # Seconds before a slow read is duplicated (0 disables hedging)
+
+    # Sync tool wrappers (run on one shared background event loop)
+    SYNC_TOOL_TIMEOUT: float = float(
+        os.environ.get("SYNC_TOOL_TIMEOUT", "30.0")
+    )  # Seconds a sync tool call may take, queueing included (0 disables)
+    SYNC_TOOL_MAX_CONCURRENCY: int = int(
+        os.environ.get("SYNC_TOOL_MAX_CONCURRENCY", "16")
+    )  # Tool coroutines running at once; further calls queue
 
     # JWT Authentication configuration
     JWT_SECRET_KEY: str = os.environ.get("JWT_SECRET_KEY", "")
@@ -45,6 +99,31 @@ class Settings:
     ALLOW_REGISTRATION: bool = (
         os.environ.get("ALLOW_REGISTRATION", "false").lower() == "true"
     )
+    AUTH_HASH_WORKERS: int = int(
+        os.environ.get("AUTH_HASH_WORKERS", "4")
+    )  # Worker threads for bcrypt hashing/verification
+    EVENT_LOOP_LAG_INTERVAL: float = float(
+        os.environ.get("EVENT_LOOP_LAG_INTERVAL", "0.5")
+    )  # Seconds between event loop lag probes
+    AUTH_TOKEN_CACHE_ENABLED: bool = (
+        os.environ.get("AUTH_TOKEN_CACHE_ENABLED", "true").lower() == "true"
+    )
+    AUTH_TOKEN_CACHE_MAX_SIZE: int = int(
+        os.environ.get("AUTH_TOKEN_CACHE_MAX_SIZE", "10000")
+    )  # Max verified tokens kept in memory
+
+    # Structured logging configuration
+    LOG_QUEUE_MAX_SIZE: int = int(
+        os.environ.get("LOG_QUEUE_MAX_SIZE", "10000")
+    )  # Records buffered between callers and the log writer thread
+    LOG_ERROR_FLUSH_TIMEOUT: float = float(
+        os.environ.get("LOG_ERROR_FLUSH_TIMEOUT", "2.0")
+    )  # Max seconds an ERROR record waits on the log writer before returning
+    LOG_INFO_SAMPLE_RATE: float = float(os.environ.get("LOG_INFO_SAMPLE_RATE", "0.1"))
+    LOG_RATE_LIMIT_PER_SECOND: float = float(
+        os.environ.get("LOG_RATE_LIMIT_PER_SECOND", "100")
+    )  # Per-logger cap for records below ERROR, 0 disables
+    LOG_RATE_LIMIT_BURST: int = int(os.environ.get("LOG_RATE_LIMIT_BURST", "200"))
 
     # Prometheus metrics configuration
     PUSHGATEWAY_URL: str = os.environ.get(
@@ -68,11 +147,102 @@ class Settings:
     # GCS configuration
     GCS_BUCKET_NAME: str = os.environ.get("GCS_BUCKET_NAME", "qdrant-snapshots")
 
+    # Event publishing configuration
+    EVENT_PUBLISH_MODE: str = os.environ.get(
+        "EVENT_PUBLISH_MODE", "sync"
+    )  # sync (await Pub/Sub) or async (queued, fire-and-forget)
+    EVENT_PUBLISHER: str = os.environ.get(
+        "EVENT_PUBLISHER", "pubsub"
+    )  # pubsub or local (offline stand-in)
+    EVENT_QUEUE_MAX_SIZE: int = int(os.environ.get("EVENT_QUEUE_MAX_SIZE", "1000"))
+    EVENT_BATCH_MAX_SIZE: int = int(os.environ.get("EVENT_BATCH_MAX_SIZE", "100"))
+    EVENT_BATCH_MAX_LATENCY: float = float(
+        os.environ.get("EVENT_BATCH_MAX_LATENCY", "0.1")
+    )  # Max seconds an event waits before its batch is flushed
+    EVENT_BACKPRESSURE_POLICY: str = os.environ.get(
+        "EVENT_BACKPRESSURE_POLICY", "drop_oldest"
+    )  # block, drop_oldest or spill
+    EVENT_SPILL_PATH: str = os.environ.get("EVENT_SPILL_PATH", "logs/event_spill.jsonl")
+
     # Embedding configuration
-    EMBEDDING_PROVIDER: str = os.environ.get("EMBEDDING_PROVIDER", "openai")
+    EMBEDDING_PROVIDER: str = os.environ.get(
+        "EMBEDDING_PROVIDER", "openai"
+    )  # openai, or deterministic for offline hash-seeded vectors
     OPENAI_EMBEDDING_MODEL: str = os.environ.get(
         "OPENAI_EMBEDDING_MODEL", "text-embedding-ada-002"
     )
+    EMBEDDING_BATCHING_ENABLED: bool = (
+        os.environ.get("EMBEDDING_BATCHING_ENABLED", "false").lower() == "true"
+    )  # Coalesce concurrent single-text embeddings into shared requests
+    EMBEDDING_BATCH_MAX_WAIT: float = float(
+        os.environ.get("EMBEDDING_BATCH_MAX_WAIT", "0.005")
+    )  # Max seconds a text waits for others to join its request
+    EMBEDDING_BATCH_MAX_SIZE: int = int(
+        os.environ.get("EMBEDDING_BATCH_MAX_SIZE", "64")
+    )
+    EMBEDDING_BATCH_MAX_TOKENS: int = int(
+        os.environ.get("EMBEDDING_BATCH_MAX_TOKENS", "32000")
+    )  # Estimated tokens per coalesced request
+    DETERMINISTIC_EMBEDDING_LATENCY_MS: float = float(
+        os.environ.get("DETERMINISTIC_EMBEDDING_LATENCY_MS", "0")
+    )  # Simulated per-request latency of the deterministic provider
+    VECTOR_SPACES: str = os.environ.get(
+        "VECTOR_SPACES", ""
+    )  # Extra named spaces, "name=model:dimension,..."; fixed at collection creation
+    VECTOR_SPACE: str = os.environ.get(
+        "VECTOR_SPACE", "default"
+    )  # Space ingestion writes first and searches use unless a request picks one
+    REEMBED_BATCH_SIZE: int = int(
+        os.environ.get("REEMBED_BATCH_SIZE", "64")
+    )  # Points per page of a vector space re-embedding job
+
+    # Document chunking configuration
+    CHUNKING_ENABLED: bool = (
+        os.environ.get("CHUNKING_ENABLED", "false").lower() == "true"
+    )  # Opt-in: /query and /batch_query return one result per chunk, not per doc_id
+    CHUNKING_STRATEGY: str = os.environ.get(
+        "CHUNKING_STRATEGY", "token"
+    )  # token, sentence or paragraph
+    CHUNK_SIZE_TOKENS: int = int(os.environ.get("CHUNK_SIZE_TOKENS", "512"))
+    CHUNK_OVERLAP_TOKENS: int = int(os.environ.get("CHUNK_OVERLAP_TOKENS", "64"))
+    CHUNK_EMBED_BATCH_SIZE: int = int(
+        os.environ.get("CHUNK_EMBED_BATCH_SIZE", "64")
+    )  # Chunks per embedding request
+
+    # Hybrid lexical + vector retrieval
+    HYBRID_SEARCH_ENABLED: bool = (
+        os.environ.get("HYBRID_SEARCH_ENABLED", "false").lower() == "true"
+    )  # Store BM25 sparse vectors; existing collections need recreating
+    RAG_SEARCH_MODE: str = os.environ.get(
+        "RAG_SEARCH_MODE", "vector"
+    )  # vector or hybrid; requests may override it
+    HYBRID_LEXICAL_WEIGHT: float = float(
+        os.environ.get("HYBRID_LEXICAL_WEIGHT", "0.5")
+    )  # Share of the fused score from the lexical ranking (0 to 1)
+    HYBRID_RRF_K: int = int(
+        os.environ.get("HYBRID_RRF_K", "60")
+    )  # Reciprocal-rank fusion constant; higher flattens rank differences
+    RERANK_ENABLED: bool = (
+        os.environ.get("RERANK_ENABLED", "false").lower() == "true"
+    )  # Rerank rag_search candidates by default; requests can opt in or out
+    RERANKER: str = os.environ.get(
+        "RERANKER", "lexical"
+    )  # Scorer: "lexical" (term overlap) or "cross-encoder" (sentence-transformers)
+    RERANK_CROSS_ENCODER_MODEL: str = os.environ.get(
+        "RERANK_CROSS_ENCODER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    )
+    RERANK_BUDGET_MS: float = float(
+        os.environ.get("RERANK_BUDGET_MS", "150")
+    )  # Over budget, results keep the vector order
+    RERANK_MIN_SCORE: float = float(
+        os.environ.get("RERANK_MIN_SCORE", "0.0")
+    )  # Reranked candidates scoring below this are cut off
+    RERANK_WORKERS: int = int(
+        os.environ.get("RERANK_WORKERS", "2")
+    )  # Threads scoring candidate batches
+    RERANK_CACHE_SIZE: int = int(
+        os.environ.get("RERANK_CACHE_SIZE", "10000")
+    )  # Cached (query, document version) scores
 
     # Cache configuration for performance optimization (CLI 140e)
     RAG_CACHE_ENABLED: bool = (
@@ -84,6 +254,30 @@ class Settings:
     RAG_CACHE_MAX_SIZE: int = int(
         os.environ.get("RAG_CACHE_MAX_SIZE", "1000")
     )  # Max cache entries
+    RAG_CACHE_REFRESH_AFTER: int = int(
+        os.environ.get("RAG_CACHE_REFRESH_AFTER", "300")
+    )  # Entries older than this are served and refreshed in the background
+    RAG_CACHE_BACKEND: str = os.environ.get(
+        "RAG_CACHE_BACKEND", "memory"
+    )  # memory, sqlite (shared by workers on one host) or redis
+    RAG_CACHE_SQLITE_PATH: str = os.environ.get(
+        "RAG_CACHE_SQLITE_PATH", "/tmp/agent_data_rag_cache.db"
+    )
+    RAG_CACHE_REDIS_URL: str = os.environ.get(
+        "RAG_CACHE_REDIS_URL", "redis://localhost:6379/0"
+    )
+    SEMANTIC_CACHE_ENABLED: bool = (
+        os.environ.get("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+    )
+    SEMANTIC_CACHE_THRESHOLD: float = float(
+        os.environ.get("SEMANTIC_CACHE_THRESHOLD", "0.95")
+    )  # Minimum cosine similarity to serve a near-duplicate query
+    SEMANTIC_CACHE_MAX_ENTRIES: int = int(
+        os.environ.get("SEMANTIC_CACHE_MAX_ENTRIES", "1000")
+    )
+    SEMANTIC_CACHE_SAMPLE_RATE: float = float(
+        os.environ.get("SEMANTIC_CACHE_SAMPLE_RATE", "0.05")
+    )  # Fraction of hits re-checked with a live search to measure false hits
     EMBEDDING_CACHE_ENABLED: bool = (
         os.environ.get("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
     )
@@ -100,6 +294,54 @@ class Settings:
         return {
             "provider": cls.EMBEDDING_PROVIDER,
             "openai_model": cls.OPENAI_EMBEDDING_MODEL,
+            "batching_enabled": cls.EMBEDDING_BATCHING_ENABLED,
+            "batch_max_wait": cls.EMBEDDING_BATCH_MAX_WAIT,
+            "batch_max_size": cls.EMBEDDING_BATCH_MAX_SIZE,
+            "batch_max_tokens": cls.EMBEDDING_BATCH_MAX_TOKENS,
+            "deterministic_latency": cls.DETERMINISTIC_EMBEDDING_LATENCY_MS / 1000,
+        }
+
+    @classmethod
+    def get_vector_space_config(cls) -> dict:
+        """Get named embedding space (multi-vector) configuration dictionary."""
+        return {
+            "spaces": cls.VECTOR_SPACES,
+            "active": cls.VECTOR_SPACE,
+            "reembed_batch_size": cls.REEMBED_BATCH_SIZE,
+        }
+
+    @classmethod
+    def get_chunking_config(cls) -> dict:
+        """Get document chunking configuration dictionary."""
+        return {
+            "enabled": cls.CHUNKING_ENABLED,
+            "strategy": cls.CHUNKING_STRATEGY,
+            "chunk_size": cls.CHUNK_SIZE_TOKENS,
+            "chunk_overlap": cls.CHUNK_OVERLAP_TOKENS,
+            "embed_batch_size": cls.CHUNK_EMBED_BATCH_SIZE,
+        }
+
+    @classmethod
+    def get_hybrid_search_config(cls) -> dict:
+        """Get hybrid lexical + vector retrieval configuration dictionary."""
+        return {
+            "enabled": cls.HYBRID_SEARCH_ENABLED,
+            "default_mode": cls.RAG_SEARCH_MODE,
+            "lexical_weight": cls.HYBRID_LEXICAL_WEIGHT,
+            "rrf_k": cls.HYBRID_RRF_K,
+        }
+
+    @classmethod
+    def get_rerank_config(cls) -> dict:
+        """Get rag_search reranking stage configuration dictionary."""
+        return {
+            "enabled": cls.RERANK_ENABLED,
+            "reranker": cls.RERANKER,
+            "cross_encoder_model": cls.RERANK_CROSS_ENCODER_MODEL,
+            "budget_ms": cls.RERANK_BUDGET_MS,
+            "min_score": cls.RERANK_MIN_SCORE,
+            "workers": cls.RERANK_WORKERS,
+            "cache_size": cls.RERANK_CACHE_SIZE,
         }
 
     @classmethod
@@ -112,7 +354,47 @@ class Settings:
             "vector_size": cls.VECTOR_DIMENSION,
             "region": cls.QDRANT_REGION,
             "batch_size": cls.QDRANT_BATCH_SIZE,
-            "sleep_between_batches": cls.QDRANT_SLEEP,
+            "prefer_grpc": cls.QDRANT_PREFER_GRPC,
+            "grpc_port": cls.QDRANT_GRPC_PORT,
+            "pool_max_connections": cls.QDRANT_POOL_MAX_CONNECTIONS,
+            "pool_max_keepalive": cls.QDRANT_POOL_MAX_KEEPALIVE,
+        }
+
+    @classmethod
+    def get_rate_limit_config(cls) -> dict:
+        """Get per-upstream rate limit configuration dictionary."""
+        return {
+            "openai": {
+                "requests_per_minute": cls.OPENAI_REQUESTS_PER_MINUTE,
+                "tokens_per_minute": cls.OPENAI_TOKENS_PER_MINUTE,
+            },
+            "qdrant": {"requests_per_minute": cls.QDRANT_REQUESTS_PER_MINUTE},
+            "firestore": {"requests_per_minute": cls.FIRESTORE_REQUESTS_PER_MINUTE},
+            "burst_seconds": cls.RATE_LIMIT_BURST_SECONDS,
+        }
+
+    @classmethod
+    def get_resilience_config(cls) -> dict:
+        """Get upstream retry, circuit breaker and hedging configuration dictionary."""
+        return {
+            "max_attempts": cls.UPSTREAM_RETRY_MAX_ATTEMPTS,
+            "base_delay": cls.UPSTREAM_RETRY_BASE_DELAY,
+            "max_delay": cls.UPSTREAM_RETRY_MAX_DELAY,
+            "failure_threshold": cls.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            "reset_timeout": cls.CIRCUIT_BREAKER_RESET_TIMEOUT,
+            "hedge_delay": {
+                "openai": cls.OPENAI_HEDGE_DELAY,
+                "qdrant": cls.QDRANT_HEDGE_DELAY,
+                "firestore": cls.FIRESTORE_HEDGE_DELAY,
+            },
+        }
+
+    @classmethod
+    def get_sync_tool_config(cls) -> dict:
+        """Get sync tool wrapper timeout and concurrency configuration dictionary."""
+        return {
+            "timeout": cls.SYNC_TOOL_TIMEOUT,
+            "max_concurrency": cls.SYNC_TOOL_MAX_CONCURRENCY,
         }
 
     @classmethod
@@ -124,6 +406,9 @@ class Settings:
             "access_token_expire_minutes": cls.JWT_ACCESS_TOKEN_EXPIRE_MINUTES,
             "enabled": cls.ENABLE_AUTHENTICATION,
             "allow_registration": cls.ALLOW_REGISTRATION,
+            "hash_workers": cls.AUTH_HASH_WORKERS,
+            "token_cache_enabled": cls.AUTH_TOKEN_CACHE_ENABLED,
+            "token_cache_max_size": cls.AUTH_TOKEN_CACHE_MAX_SIZE,
         }
 
     @classmethod
@@ -135,6 +420,17 @@ class Settings:
             "enabled": cls.ENABLE_METRICS,
         }
 
+    @classmethod
+    def get_logging_config(cls) -> dict:
+        """Get structured logging configuration dictionary."""
+        return {
+            "queue_max_size": cls.LOG_QUEUE_MAX_SIZE,
+            "error_flush_timeout": cls.LOG_ERROR_FLUSH_TIMEOUT,
+            "info_sample_rate": cls.LOG_INFO_SAMPLE_RATE,
+            "rate_limit_per_second": cls.LOG_RATE_LIMIT_PER_SECOND,
+            "rate_limit_burst": cls.LOG_RATE_LIMIT_BURST,
+        }
+
     @classmethod
     def get_firestore_config(cls) -> dict:
         """Get Firestore configuration dictionary."""
@@ -146,6 +442,19 @@ class Settings:
             "users_collection": "users",
         }
 
+    @classmethod
+    def get_event_config(cls) -> dict:
+        """Get event publishing configuration dictionary."""
+        return {
+            "mode": cls.EVENT_PUBLISH_MODE,
+            "publisher": cls.EVENT_PUBLISHER,
+            "max_queue_size": cls.EVENT_QUEUE_MAX_SIZE,
+            "max_batch_size": cls.EVENT_BATCH_MAX_SIZE,
+            "max_latency": cls.EVENT_BATCH_MAX_LATENCY,
+            "policy": cls.EVENT_BACKPRESSURE_POLICY,
+            "spill_path": cls.EVENT_SPILL_PATH,
+        }
+
     @classmethod
     def validate_qdrant_config(cls) -> bool:
         """Validate that required Qdrant configuration is present."""
@@ -169,6 +478,14 @@ class Settings:
             "rag_cache_enabled": cls.RAG_CACHE_ENABLED,
             "rag_cache_ttl": cls.RAG_CACHE_TTL,
             "rag_cache_max_size": cls.RAG_CACHE_MAX_SIZE,
+            "rag_cache_refresh_after": cls.RAG_CACHE_REFRESH_AFTER,
+            "rag_cache_backend": cls.RAG_CACHE_BACKEND,
+            "rag_cache_sqlite_path": cls.RAG_CACHE_SQLITE_PATH,
+            "rag_cache_redis_url": cls.RAG_CACHE_REDIS_URL,
+            "semantic_cache_enabled": cls.SEMANTIC_CACHE_ENABLED,
+            "semantic_cache_threshold": cls.SEMANTIC_CACHE_THRESHOLD,
+            "semantic_cache_max_entries": cls.SEMANTIC_CACHE_MAX_ENTRIES,
+            "semantic_cache_sample_rate": cls.SEMANTIC_CACHE_SAMPLE_RATE,
             "embedding_cache_enabled": cls.EMBEDDING_CACHE_ENABLED,
             "embedding_cache_ttl": cls.EMBEDDING_CACHE_TTL,
             "embedding_cache_max_size": cls.EMBEDDING_CACHE_MAX_SIZE,
@@ -1,6 +1,13 @@
 """Embedding provider interfaces and implementations for Agent Data system."""
 
+from .batching_embedding_provider import BatchingEmbeddingProvider
+from .deterministic_embedding_provider import DeterministicEmbeddingProvider
 from .embedding_provider import EmbeddingProvider
 from .openai_embedding_provider import OpenAIEmbeddingProvider
 
-__all__ = ["EmbeddingProvider", "OpenAIEmbeddingProvider"]
+__all__ = [
+    "BatchingEmbeddingProvider",
+    "DeterministicEmbeddingProvider",
+    "EmbeddingProvider",
+    "OpenAIEmbeddingProvider",
+]
@@ -0,0 +1,217 @@
+"""Cross-request micro-batching in front of an EmbeddingProvider.
+
+Under load the gateway serves many concurrent requests that each need one
+embedding (``/query``, ``/cskh_query``, ``/save``), and each used to pay its own
+OpenAI round trip. ``BatchingEmbeddingProvider`` queues ``embed_single`` calls
+and sends them as one ``embed`` request once any of these is reached:
+
+* ``max_wait`` seconds have passed since the first queued text
+* ``max_batch_size`` texts are queued
+* the queued texts reach ``max_batch_tokens`` estimated tokens
+
+Each caller then gets its own vector back. Identical texts in a batch are only
+embedded once. When the provider rejects a batch for a non-transient reason
+(e.g. one invalid input), its texts are retried one at a time so only the
+callers whose text is rejected get the error. ``max_wait`` trades a few milliseconds of latency per call for
+fewer, larger requests; the dispatcher metrics (queue depth, batch sizes and
+queued/total latency) show where that balance sits.
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from dataclasses import dataclass, field
+
+from ..config.settings import settings
+from ..tools.prometheus_metrics import (
+    record_embedding_dispatch_batch,
+    record_embedding_dispatch_latency,
+    update_embedding_dispatch_queue_depth,
+)
+from ..utils.chunking import estimate_tokens
+from ..utils.resilience import CircuitOpenError, is_retryable
+from .embedding_provider import EmbeddingError, EmbeddingProvider
+from .openai_embedding_provider import get_default_embedding_provider
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingText:
+    text: str
+    future: asyncio.Future
+    queued_at: float
+
+
+@dataclass
+class _LoopQueue:
+    """Texts waiting on one event loop, with the timer that flushes them."""
+
+    pending: list[_PendingText] = field(default_factory=list)
+    tokens: int = 0
+    timer: asyncio.TimerHandle | None = None
+    in_flight: set[asyncio.Task] = field(default_factory=set)
+
+
+class BatchingEmbeddingProvider:
+    """EmbeddingProvider that coalesces concurrent embed_single calls."""
+
+    def __init__(
+        self,
+        provider: EmbeddingProvider,
+        max_wait: float = 0.005,
+        max_batch_size: int = 64,
+        max_batch_tokens: int = 32000,
+    ):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            provider: Provider whose ``embed`` serves the coalesced batches
+            max_wait: Maximum seconds a text waits for others to join its batch
+            max_batch_size: Maximum texts per batch
+            max_batch_tokens: Maximum estimated tokens per batch
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.provider = provider
+        self.max_wait = max_wait
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        # Futures and timers belong to a loop, so each loop batches separately
+        self._queues: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _queue(self) -> _LoopQueue:
+        loop = asyncio.get_running_loop()
+        queue = self._queues.get(loop)
+        if queue is None:
+            queue = self._queues[loop] = _LoopQueue()
+        return queue
+
+    @property
+    def queue_depth(self) -> int:
+        """Texts waiting for their batch on the running loop."""
+        return len(self._queue().pending)
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed a list of texts; it is already a batch, so it is sent as is."""
+        return await self.provider.embed(texts)
+
+    async def embed_single(self, text: str) -> list[float]:
+        """
+        Embed one text in a batch shared with concurrent callers.
+
+        Raises:
+            EmbeddingError: When the batch request fails, or this text is rejected
+        """
+        queue = self._queue()
+        tokens = estimate_tokens(text)
+        if queue.pending and queue.tokens + tokens > self.max_batch_tokens:
+            self._flush(queue, "max_tokens")
+
+        future = asyncio.get_running_loop().create_future()
+        queue.pending.append(_PendingText(text, future, time.perf_counter()))
+        queue.tokens += tokens
+        update_embedding_dispatch_queue_depth(1)
+
+        if len(queue.pending) >= self.max_batch_size:
+            self._flush(queue, "max_size")
+        elif queue.tokens >= self.max_batch_tokens:
+            self._flush(queue, "max_tokens")
+        elif queue.timer is None:
+            queue.timer = asyncio.get_running_loop().call_later(
+                self.max_wait, self._flush, queue, "max_wait"
+            )
+
+        return await future
+
+    def _flush(self, queue: _LoopQueue, reason: str):
+        """Hand the queued texts to a task that sends them as one batch."""
+        if queue.timer is not None:
+            queue.timer.cancel()
+            queue.timer = None
+        batch, queue.pending, queue.tokens = queue.pending, [], 0
+        if not batch:
+            return
+
+        update_embedding_dispatch_queue_depth(-len(batch))
+        record_embedding_dispatch_batch(len(batch), reason)
+        task = asyncio.get_running_loop().create_task(self._send(batch))
+        queue.in_flight.add(task)
+        task.add_done_callback(queue.in_flight.discard)
+
+    async def _send(self, batch: list[_PendingText]):
+        """Embed a batch and resolve each caller's future."""
+        sent_at = time.perf_counter()
+        for item in batch:
+            record_embedding_dispatch_latency("queued", sent_at - item.queued_at)
+
+        texts = list(dict.fromkeys(item.text for item in batch))
+        try:
+            by_text = dict(zip(texts, await self._embed_texts(texts), strict=True))
+        except Exception as e:
+            logger.error(f"Embedding batch of {len(texts)} texts failed: {e}")
+            if len(texts) == 1 or is_retryable(e) or isinstance(e, CircuitOpenError):
+                by_text = dict.fromkeys(texts, e)
+            else:
+                # Find the texts the provider rejects instead of failing everyone
+                outcomes = await asyncio.gather(
+                    *(self._embed_texts([text]) for text in texts),
+                    return_exceptions=True,
+                )
+                by_text = {
+                    text: outcome if isinstance(outcome, BaseException) else outcome[0]
+                    for text, outcome in zip(texts, outcomes, strict=True)
+                }
+
+        done_at = time.perf_counter()
+        for item in batch:
+            if not item.future.done():  # The caller may have been cancelled
+                outcome = by_text[item.text]
+                if isinstance(outcome, BaseException):
+                    item.future.set_exception(outcome)
+                else:
+                    item.future.set_result(outcome)
+            record_embedding_dispatch_latency("total", done_at - item.queued_at)
+        logger.debug(
+            f"Embedded {len(texts)} unique texts for {len(batch)} callers "
+            f"in {(done_at - sent_at) * 1000:.1f}ms"
+        )
+
+    async def _embed_texts(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts, checking that the provider returned one vector per text."""
+        vectors = await self.provider.embed(texts)
+        if len(vectors) != len(texts):
+            raise EmbeddingError(
+                f"Provider returned {len(vectors)} embeddings for {len(texts)} texts"
+            )
+        return vectors
+
+    def get_embedding_dimension(self) -> int:
+        return self.provider.get_embedding_dimension()
+
+    def get_model_name(self) -> str:
+        return self.provider.get_model_name()
+
+
+_dispatcher: BatchingEmbeddingProvider | None = None
+
+
+def get_embedding_dispatcher() -> BatchingEmbeddingProvider:
+    """
+    Get the shared dispatcher around the default embedding provider.
+
+    Returns:
+        BatchingEmbeddingProvider configured from the embedding settings
+    """
+    global _dispatcher
+    if _dispatcher is None:
+        config = settings.get_embedding_config()
+        _dispatcher = BatchingEmbeddingProvider(
+            get_default_embedding_provider(),
+            max_wait=config["batch_max_wait"],
+            max_batch_size=config["batch_max_size"],
+            max_batch_tokens=config["batch_max_tokens"],
+        )
+    return _dispatcher
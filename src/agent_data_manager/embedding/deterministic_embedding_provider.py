@@ -0,0 +1,103 @@
+"""Deterministic offline embedding provider for local runs and benchmarks."""
+
+import asyncio
+import hashlib
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from .embedding_provider import EmbeddingError
+
+_TOKEN = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=65536)
+def _token_vector(token: str, dimension: int) -> np.ndarray:
+    """Random unit-variance vector seeded by the token's hash."""
+    seed = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest())
+    return np.random.default_rng(seed).standard_normal(dimension)
+
+
+class DeterministicEmbeddingProvider:
+    """Hash-seeded implementation of the EmbeddingProvider interface.
+
+    Each word is mapped to a random vector seeded by its hash and a text is the
+    normalized sum of its words, so the same text always gets the same vector
+    and texts sharing words score as similar. Needs no network access, which
+    lets ingestion and search run (and be benchmarked) without OpenAI.
+    """
+
+    def __init__(
+        self,
+        dimension: int = 1536,
+        latency: float = 0.0,
+        model_name: str = "deterministic-hash",
+    ):
+        """Initialize the deterministic embedding provider.
+
+        Args:
+            dimension: Size of the generated vectors
+            latency: Seconds each embed() call sleeps, to simulate a remote API
+            model_name: Name reported by get_model_name()
+        """
+        if dimension <= 0:
+            raise EmbeddingError(
+                "dimension must be positive", status_code=500, provider="deterministic"
+            )
+        self.dimension = dimension
+        self.latency = latency
+        self.model_name = model_name
+
+    def _vector(self, text: str) -> list[float]:
+        tokens = _TOKEN.findall(text.lower()) or [text]
+        vector = np.zeros(self.dimension)
+        for token in tokens:
+            vector += _token_vector(token, self.dimension)
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+        return vector.tolist()
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """Generate embeddings for a list of texts.
+
+        Args:
+            texts: List of text strings to embed
+
+        Returns:
+            List of unit-length embedding vectors, in the order of ``texts``
+        """
+        if not texts:
+            return []
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        return [self._vector(text) for text in texts]
+
+    async def embed_single(self, text: str) -> list[float]:
+        """Generate embedding for a single text.
+
+        Args:
+            text: Text string to embed
+
+        Returns:
+            Embedding vector as a list of floats
+        """
+        embeddings = await self.embed([text])
+        return embeddings[0]
+
+    def get_embedding_dimension(self) -> int:
+        """Get the dimension size of embeddings produced by this provider.
+
+        Returns:
+            Configured dimension
+        """
+        return self.dimension
+
+    def get_model_name(self) -> str:
+        """Get the model name used by this provider.
+
+        Returns:
+            Model name string
+        """
+        return self.model_name
@@ -3,15 +3,26 @@
 import logging
 import os
 
+from ..config.settings import settings
 from ..tools.external_tool_registry import (
+    EMBEDDING_MAX_INPUTS_PER_REQUEST,
+    EMBEDDING_MAX_TOKENS_PER_REQUEST,
     OPENAI_AVAILABLE,
-    get_openai_embedding,
+    get_openai_embeddings_batch,
     openai_async_client,
 )
-from .embedding_provider import EmbeddingError
+from .deterministic_embedding_provider import DeterministicEmbeddingProvider
+from .embedding_provider import EmbeddingError, EmbeddingProvider
 
 logger = logging.getLogger(__name__)
 
+# Native output dimension of each OpenAI embedding model
+MODEL_DIMENSIONS = {
+    "text-embedding-ada-002": 1536,
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+}
+
 
 class OpenAIEmbeddingProvider:
     """OpenAI implementation of the EmbeddingProvider interface.
@@ -25,6 +36,9 @@ class OpenAIEmbeddingProvider:
         model_name: str = "text-embedding-ada-002",
         api_key: str | None = None,
         encoding_format: str = "float",
+        max_inputs_per_request: int = EMBEDDING_MAX_INPUTS_PER_REQUEST,
+        max_tokens_per_request: int = EMBEDDING_MAX_TOKENS_PER_REQUEST,
+        dimensions: int | None = None,
     ):
         """Initialize the OpenAI embedding provider.
 
@@ -32,10 +46,21 @@ class OpenAIEmbeddingProvider:
             model_name: OpenAI embedding model to use
             api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
             encoding_format: Encoding format for embeddings
+            max_inputs_per_request: Most texts sent in one API request
+            max_tokens_per_request: Most (estimated) tokens sent in one API request
+            dimensions: Output dimension, for text-embedding-3 models that can
+                shorten their vectors; defaults to the model's native size
         """
         self.model_name = model_name
+        native = MODEL_DIMENSIONS.get(model_name)
+        # Only send a dimension the model would not produce anyway
+        self.dimensions = dimensions if dimensions != native else None
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         self.encoding_format = encoding_format
+        self.max_inputs_per_request = max_inputs_per_request
+        self.max_tokens_per_request = max_tokens_per_request
+        # Per-request token usage of the last embed() call
+        self.last_batch_usage: list[dict[str, int]] = []
 
         # Validate OpenAI availability
         if not OPENAI_AVAILABLE:
@@ -55,11 +80,14 @@ class OpenAIEmbeddingProvider:
     async def embed(self, texts: list[str]) -> list[list[float]]:
         """Generate embeddings for a list of texts.
 
+        Texts are sent in as few requests as the per-request input and token
+        limits allow; ``last_batch_usage`` holds the token usage of each.
+
         Args:
             texts: List of text strings to embed
 
         Returns:
-            List of embedding vectors, where each vector is a list of floats
+            List of embedding vectors, in the order of ``texts``
 
         Raises:
             EmbeddingError: When embedding generation fails
@@ -68,33 +96,34 @@ class OpenAIEmbeddingProvider:
             return []
 
         try:
-            # Use the existing get_openai_embedding function for each text
-            embeddings = []
-            for text in texts:
-                result = await get_openai_embedding(
-                    agent_context=None,
-                    text_to_embed=text,
-                    model_name=self.model_name,
-                    encoding_format=self.encoding_format,
-                )
-
-                if "error" in result:
-                    raise EmbeddingError(
-                        f"OpenAI API error: {result['error']}",
-                        status_code=result.get("status_code", 500),
-                        provider="openai",
-                    )
+            # One request per batch of texts, split to fit the API limits
+            result = await get_openai_embeddings_batch(
+                agent_context=None,
+                texts=texts,
+                model_name=self.model_name,
+                encoding_format=self.encoding_format,
+                max_inputs=self.max_inputs_per_request,
+                max_tokens=self.max_tokens_per_request,
+                dimensions=self.dimensions,
+            )
 
-                if "embedding" not in result:
-                    raise EmbeddingError(
-                        "No embedding in OpenAI response",
-                        status_code=500,
-                        provider="openai",
-                    )
+            if "error" in result:
+                raise EmbeddingError(
+                    f"OpenAI API error: {result['error']}",
+                    status_code=result.get("status_code", 500),
+                    provider="openai",
+                )
 
-                embeddings.append(result["embedding"])
+            self.last_batch_usage = result["batches"]
+            if result["errors"]:
+                position, error = next(iter(result["errors"].items()))
+                raise EmbeddingError(
+                    f"OpenAI API error for text {position}: {error}",
+                    status_code=400,
+                    provider="openai",
+                )
 
-            return embeddings
+            return result["embeddings"]
 
         except EmbeddingError:
             # Re-raise embedding errors
@@ -124,15 +153,9 @@ class OpenAIEmbeddingProvider:
         """Get the dimension size of embeddings produced by this provider.
 
         Returns:
-            Dimension size for OpenAI models
+            The requested dimension, else the model's native dimension
         """
-        # Map OpenAI models to their dimensions
-        model_dimensions = {
-            "text-embedding-ada-002": 1536,
-            "text-embedding-3-small": 1536,
-            "text-embedding-3-large": 3072,
-        }
-        return model_dimensions.get(self.model_name, 1536)
+        return self.dimensions or MODEL_DIMENSIONS.get(self.model_name, 1536)
 
     def get_model_name(self) -> str:
         """Get the model name used by this provider.
@@ -143,12 +166,19 @@ class OpenAIEmbeddingProvider:
         return self.model_name
 
 
-def get_default_embedding_provider() -> OpenAIEmbeddingProvider:
-    """Get the default OpenAI embedding provider instance.
+def get_default_embedding_provider() -> EmbeddingProvider:
+    """Get the embedding provider selected by the EMBEDDING_PROVIDER setting.
 
     Returns:
-        Configured OpenAIEmbeddingProvider instance
+        DeterministicEmbeddingProvider when the setting is ``deterministic``
+        (offline runs and benchmarks), otherwise an OpenAIEmbeddingProvider
     """
+    config = settings.get_embedding_config()
+    if config["provider"] == "deterministic":
+        return DeterministicEmbeddingProvider(
+            dimension=settings.get_qdrant_config()["vector_size"],
+            latency=config["deterministic_latency"],
+        )
     return OpenAIEmbeddingProvider(
         model_name=os.environ.get("OPENAI_EMBEDDING_MODEL", "text-embedding-ada-002")
     )
@@ -0,0 +1,146 @@
+"""Named embedding spaces stored side by side in one Qdrant collection.
+
+A vector space is an embedding model at a dimension. The ``default`` space is
+the collection's unnamed vector, embedded by the configured provider at
+VECTOR_DIMENSION, so collections created before spaces existed keep working.
+Further spaces come from VECTOR_SPACES, ``name=model:dimension`` entries
+separated by commas, e.g.::
+
+    VECTOR_SPACES="large=text-embedding-3-large:3072,small256=text-embedding-3-small:256"
+
+Each extra space is a named vector of the collection. Qdrant fixes a
+collection's named vectors when it is created, so spaces must be declared
+before the collection is created. VECTOR_SPACE selects the space that
+ingestion writes first and that searches use unless a request picks another.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+
+from ..config.settings import settings
+from .embedding_provider import EmbeddingProvider
+
+DEFAULT_VECTOR_SPACE = "default"
+
+_SPACE_NAME = re.compile(r"^[A-Za-z0-9_-]+$")
+
+_providers: dict[tuple, EmbeddingProvider] = {}
+
+
+@dataclass(frozen=True)
+class VectorSpace:
+    """An embedding model at a dimension, stored as one (named) vector."""
+
+    name: str
+    model: str
+    dimension: int
+
+    @property
+    def vector_name(self) -> str:
+        """Qdrant vector name; the default space is the unnamed vector."""
+        return "" if self.name == DEFAULT_VECTOR_SPACE else self.name
+
+
+def parse_vector_spaces(spec: str) -> list[VectorSpace]:
+    """
+    Parse a VECTOR_SPACES value.
+
+    Args:
+        spec: Comma-separated ``name=model:dimension`` entries
+
+    Returns:
+        The declared spaces, in order
+
+    Raises:
+        ValueError: On a malformed entry, a duplicate or a reserved name
+    """
+    spaces = []
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, model_dimension = entry.partition("=")
+        model, _, dimension = model_dimension.rpartition(":")
+        name = name.strip()
+        if not (_SPACE_NAME.match(name) and model and dimension.isdigit()):
+            raise ValueError(
+                f"Invalid vector space {entry!r}; expected name=model:dimension"
+            )
+        if name == DEFAULT_VECTOR_SPACE or name in (s.name for s in spaces):
+            raise ValueError(f"Vector space {name!r} is reserved or declared twice")
+        spaces.append(VectorSpace(name, model.strip(), int(dimension)))
+    return spaces
+
+
+def get_vector_spaces() -> dict[str, VectorSpace]:
+    """Get every configured vector space by name, the default space first."""
+    config = settings.get_vector_space_config()
+    embedding_config = settings.get_embedding_config()
+    default_model = (
+        "deterministic-hash"
+        if embedding_config["provider"] == "deterministic"
+        else os.environ.get("OPENAI_EMBEDDING_MODEL", "text-embedding-ada-002")
+    )
+    spaces = [
+        VectorSpace(
+            DEFAULT_VECTOR_SPACE,
+            default_model,
+            settings.get_qdrant_config()["vector_size"],
+        ),
+        *parse_vector_spaces(config["spaces"]),
+    ]
+    return {space.name: space for space in spaces}
+
+
+def get_vector_space(name: str | None = None) -> VectorSpace:
+    """
+    Get a vector space by name.
+
+    Args:
+        name: Space name; defaults to the VECTOR_SPACE setting
+
+    Raises:
+        ValueError: When no such space is configured
+    """
+    spaces = get_vector_spaces()
+    name = name or settings.get_vector_space_config()["active"]
+    if name not in spaces:
+        raise ValueError(
+            f"Unknown vector space {name!r}; configured: {', '.join(spaces)}"
+        )
+    return spaces[name]
+
+
+def get_space_embedding_provider(name: str | None = None) -> EmbeddingProvider:
+    """
+    Get the embedding provider of a vector space.
+
+    The default space uses the default embedding provider. Other spaces use
+    OpenAI with the space's model and dimension, or the deterministic provider
+    at the space's dimension for offline runs. Providers are reused per space.
+
+    Args:
+        name: Space name; defaults to the VECTOR_SPACE setting
+    """
+    from .deterministic_embedding_provider import DeterministicEmbeddingProvider
+    from .openai_embedding_provider import (
+        OpenAIEmbeddingProvider,
+        get_default_embedding_provider,
+    )
+
+    space = get_vector_space(name)
+    if space.name == DEFAULT_VECTOR_SPACE:
+        return get_default_embedding_provider()
+
+    embedding_config = settings.get_embedding_config()
+    key = (space, embedding_config["provider"])
+    if key not in _providers:
+        if embedding_config["provider"] == "deterministic":
+            _providers[key] = DeterministicEmbeddingProvider(
+                dimension=space.dimension,
+                latency=embedding_config["deterministic_latency"],
+                model_name=space.model,
+            )
+        else:
+            _providers[key] = OpenAIEmbeddingProvider(
+                model_name=space.model, dimensions=space.dimension
+            )
+    return _providers[key]
@@ -0,0 +1,487 @@
+"""Fire-and-forget event publishing with an in-process bounded queue.
+
+Events are enqueued without waiting on Pub/Sub and a background flusher sends
+them in batches once the batch is full or the oldest event has waited for
+``max_latency`` seconds. When the queue is full the configured backpressure
+policy decides what happens to new events:
+
+* ``block``: the producer waits until the flusher frees space
+* ``drop_oldest``: the oldest queued event is discarded
+* ``spill``: the event is appended to a local JSON-lines file and replayed
+  once the queue has drained
+
+With the ``spill`` policy batches that still fail after their retries are
+spilled as well. Spilled events are replayed right after a successful publish;
+after a failed one the replay waits for a growing backoff so an outage does
+not turn into a publish/spill/replay loop.
+
+The queue, its events and the flusher belong to one event loop. Calls made
+from another running loop are handed to that loop, and if it has stopped or
+closed the publisher moves to the caller's loop with the queued events.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Protocol
+
+from ..tools.prometheus_metrics import (
+    record_event_backpressure,
+    record_event_publish,
+    update_event_queue_depth,
+)
+
+logger = logging.getLogger(__name__)
+
+BACKPRESSURE_POLICIES = ("block", "drop_oldest", "spill")
+
+# Longest wait before spilled events are retried after failed publishes
+MAX_REPLAY_BACKOFF_SECONDS = 30.0
+
+
+class BatchPublisher(Protocol):
+    """Interface for backends that publish a batch of encoded events."""
+
+    async def publish_batch(self, messages: list[bytes]) -> list[str]:
+        """Publish messages and return their message IDs in order."""
+        ...
+
+
+class PubSubBatchPublisher:
+    """Publishes batches through a google-cloud-pubsub PublisherClient."""
+
+    def __init__(self, publisher, topic_path: str, executor=None):
+        """
+        Initialize the adapter.
+
+        Args:
+            publisher: pubsub_v1.PublisherClient (already configured for batching)
+            topic_path: Fully qualified topic path
+            executor: Optional executor used to wait on publish futures
+        """
+        self.publisher = publisher
+        self.topic_path = topic_path
+        self.executor = executor
+
+    async def publish_batch(self, messages: list[bytes]) -> list[str]:
+        """Hand all messages to the client, then wait on their futures off the loop."""
+        loop = asyncio.get_running_loop()
+        futures = [
+            self.publisher.publish(self.topic_path, message) for message in messages
+        ]
+        return list(
+            await asyncio.gather(
+                *(
+                    loop.run_in_executor(self.executor, future.result)
+                    for future in futures
+                )
+            )
+        )
+
+
+class LocalEventPublisher:
+    """In-memory stand-in for Pub/Sub used for offline runs and tests."""
+
+    def __init__(self, latency: float = 0.0, fail_batches: int = 0):
+        """
+        Initialize the local publisher.
+
+        Args:
+            latency: Simulated publish latency per batch in seconds
+            fail_batches: Number of initial batches that raise to simulate outages
+        """
+        self.latency = latency
+        self.fail_batches = fail_batches
+        self.published: list[dict[str, Any]] = []
+        self.batches: list[int] = []
+
+    async def publish_batch(self, messages: list[bytes]) -> list[str]:
+        """Record the decoded messages and return synthetic message IDs."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if self.fail_batches > 0:
+            self.fail_batches -= 1
+            raise ConnectionError("Simulated Pub/Sub outage")
+
+        self.batches.append(len(messages))
+        message_ids = []
+        for message in messages:
+            self.published.append(json.loads(message.decode("utf-8")))
+            message_ids.append(uuid.uuid4().hex)
+        return message_ids
+
+
+class BufferedEventPublisher:
+    """Bounded queue plus background flusher in front of a BatchPublisher."""
+
+    def __init__(
+        self,
+        publisher: BatchPublisher,
+        max_queue_size: int = 1000,
+        max_batch_size: int = 100,
+        max_latency: float = 0.1,
+        policy: str = "drop_oldest",
+        spill_path: str = "logs/event_spill.jsonl",
+        max_retries: int = 3,
+        replay_backoff: float = 0.5,
+    ):
+        """
+        Initialize the buffered publisher.
+
+        Args:
+            publisher: Backend that publishes encoded batches
+            max_queue_size: Maximum number of events held in memory
+            max_batch_size: Maximum events per publish call
+            max_latency: Maximum seconds an event waits before its batch is flushed
+            policy: Backpressure policy when the queue is full (block, drop_oldest, spill)
+            spill_path: JSON-lines file used by the spill policy
+            max_retries: Publish attempts per batch before it is spilled or dropped
+            replay_backoff: Seconds before spilled events are retried after a
+                failed publish, doubled for every further failure
+        """
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(
+                f"Unknown backpressure policy '{policy}', expected one of {BACKPRESSURE_POLICIES}"
+            )
+
+        self.publisher = publisher
+        self.max_queue_size = max_queue_size
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.policy = policy
+        self.spill_path = spill_path
+        self.max_retries = max_retries
+        self.replay_backoff = replay_backoff
+
+        self._queue: deque[bytes] = deque()
+        self._in_flight: list[bytes] = []
+        self._has_spill = policy == "spill" and os.path.exists(spill_path)
+        self._replay_delay = replay_backoff
+        self._replay_at = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._bind_lock = threading.Lock()
+        self._reset_loop_state()
+        self._closing = False
+
+        self.stats = {
+            "enqueued": 0,
+            "published": 0,
+            "dropped": 0,
+            "spilled": 0,
+            "replayed": 0,
+            "failed_batches": 0,
+        }
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of events waiting in memory."""
+        return len(self._queue)
+
+    def _reset_loop_state(self):
+        """Create the events and forget the flusher of the previous loop."""
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._idle = asyncio.Event()
+        self._flusher: asyncio.Task | None = None
+        self._spill_lock = asyncio.Lock()
+        if self._queue:
+            self._not_empty.set()
+        else:
+            self._idle.set()
+
+    def _owns_running_loop(self) -> bool:
+        """
+        Bind to the running loop unless another live loop already owns the queue.
+
+        Returns:
+            True when the caller runs on the owning loop, False when the call
+            has to be handed to it
+        """
+        loop = asyncio.get_running_loop()
+        with self._bind_lock:
+            if self._loop is loop:
+                return True
+            if (
+                self._loop is not None
+                and self._loop.is_running()
+                and not self._loop.is_closed()
+            ):
+                return False
+            if self._loop is not None:
+                logger.info("Event loop owning the event queue is gone, rebinding")
+            self._loop = loop
+            self._reset_loop_state()
+            return True
+
+    async def _on_owner_loop(self, coro):
+        """Run a coroutine on the owning loop and wait for it from this one."""
+        try:
+            future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        except RuntimeError:
+            # The owning loop closed between the check and the hand-off
+            coro.close()
+            with self._bind_lock:
+                self._loop = None
+            raise
+        return await asyncio.wrap_future(future)
+
+    def start(self):
+        """Start the background flusher on the owning event loop."""
+        if not self._owns_running_loop():
+            self._loop.call_soon_threadsafe(self.start)
+            return
+        if self._flusher is None or self._flusher.done():
+            self._closing = False
+            self._flusher = self._loop.create_task(self._flush_loop())
+
+    async def enqueue(self, event: dict[str, Any]) -> str:
+        """
+        Queue an event for publishing without waiting for Pub/Sub.
+
+        Returns:
+            "queued", "spilled" or "dropped_oldest" describing what happened
+        """
+        if not self._owns_running_loop():
+            return await self._on_owner_loop(self.enqueue(event))
+        self.start()
+        message = json.dumps(event).encode("utf-8")
+        outcome = "queued"
+
+        if len(self._queue) >= self.max_queue_size:
+            if self.policy == "block":
+                record_event_backpressure("block")
+                while len(self._queue) >= self.max_queue_size:
+                    self._not_full.clear()
+                    await self._not_full.wait()
+            elif self.policy == "drop_oldest":
+                self._queue.popleft()
+                self.stats["dropped"] += 1
+                record_event_backpressure("drop_oldest")
+                outcome = "dropped_oldest"
+            else:
+                await self._spill([message])
+                record_event_backpressure("spill")
+                return "spilled"
+
+        self._queue.append(message)
+        self.stats["enqueued"] += 1
+        self._idle.clear()
+        self._not_empty.set()
+        update_event_queue_depth(len(self._queue))
+        return outcome
+
+    async def flush(self, timeout: float | None = None):
+        """Wait until every queued event has been handed to the publisher."""
+        if not self._owns_running_loop():
+            return await self._on_owner_loop(self.flush(timeout))
+        if not self._queue and self._idle.is_set():
+            return
+        self.start()
+        await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+
+    async def close(self, timeout: float = 5.0):
+        """Flush remaining events and stop the flusher."""
+        if not self._owns_running_loop():
+            return await self._on_owner_loop(self.close(timeout))
+        try:
+            await self.flush(timeout=timeout)
+        except TimeoutError:
+            logger.warning(
+                f"Timed out flushing events on close, spilling {len(self._queue)}"
+            )
+            pending = list(self._queue)
+            self._queue.clear()
+            await self._spill(pending)
+
+        self._closing = True
+        if self._flusher:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        # A publish still running after the timeout was cancelled with its batch
+        if self._in_flight:
+            in_flight, self._in_flight = self._in_flight, []
+            logger.warning(
+                f"Spilling {len(in_flight)} events whose publish was cancelled"
+            )
+            await self._spill(in_flight)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get queue statistics."""
+        return {
+            **self.stats,
+            "queue_depth": len(self._queue),
+            "max_queue_size": self.max_queue_size,
+            "policy": self.policy,
+        }
+
+    async def _flush_loop(self):
+        """Collect batches by size/time and publish them."""
+        while not self._closing:
+            if not self._queue:
+                self._idle.set()
+                self._not_empty.clear()
+                await self._wait_for_events()
+                if not self._queue:
+                    continue
+
+            # Give producers up to max_latency to fill the batch
+            deadline = time.monotonic() + self.max_latency
+            while len(self._queue) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._not_empty.clear()
+                try:
+                    await asyncio.wait_for(self._not_empty.wait(), timeout=remaining)
+                except TimeoutError:
+                    break
+
+            batch = [
+                self._queue.popleft()
+                for _ in range(min(self.max_batch_size, len(self._queue)))
+            ]
+            self._not_full.set()
+            update_event_queue_depth(len(self._queue))
+
+            if not batch:
+                continue
+
+            self._in_flight = batch
+            published = await self._publish_with_retry(batch)
+            self._in_flight = []
+
+            if published:
+                self._replay_delay = self.replay_backoff
+                self._replay_at = 0.0
+                if not self._queue:
+                    await self._replay_spill()
+            else:
+                self._replay_at = time.monotonic() + self._replay_delay
+                self._replay_delay = min(
+                    self._replay_delay * 2, MAX_REPLAY_BACKOFF_SECONDS
+                )
+
+    async def _wait_for_events(self):
+        """Wait for new events, or until spilled events are due for replay."""
+        if not self._has_spill:
+            await self._not_empty.wait()
+            return
+
+        delay = self._replay_at - time.monotonic()
+        if delay > 0:
+            try:
+                await asyncio.wait_for(self._not_empty.wait(), timeout=delay)
+                return
+            except TimeoutError:
+                pass
+        await self._replay_spill()
+
+    async def _publish_with_retry(self, batch: list[bytes]) -> bool:
+        """
+        Publish a batch, retrying with backoff and spilling on final failure.
+
+        Returns:
+            True when the batch was published
+        """
+        for attempt in range(1, self.max_retries + 1):
+            start_time = time.perf_counter()
+            try:
+                await self.publisher.publish_batch(batch)
+                record_event_publish("success", time.perf_counter() - start_time)
+                self.stats["published"] += len(batch)
+                return True
+            except Exception as e:
+                record_event_publish("error", time.perf_counter() - start_time)
+                logger.warning(
+                    f"Event batch publish failed (attempt {attempt}/{self.max_retries}): {e}"
+                )
+                if attempt < self.max_retries:
+                    await asyncio.sleep(min(0.1 * 2 ** (attempt - 1), 2.0))
+
+        self.stats["failed_batches"] += 1
+        if self.policy == "spill":
+            await self._spill(batch)
+        else:
+            self.stats["dropped"] += len(batch)
+            logger.error(f"Dropped {len(batch)} events after repeated publish failures")
+        return False
+
+    async def _spill(self, messages: list[bytes]):
+        """Append messages to the local spill file, dropping them if it fails."""
+        if not messages:
+            return
+        async with self._spill_lock:
+            try:
+                await asyncio.to_thread(self._write_spill, messages)
+            except OSError as e:
+                self.stats["dropped"] += len(messages)
+                logger.error(f"Dropped {len(messages)} events, spilling failed: {e}")
+                return
+        self.stats["spilled"] += len(messages)
+        self._has_spill = self.policy == "spill"
+
+    def _write_spill(self, messages: list[bytes]):
+        """Append messages to the spill file (runs in a worker thread)."""
+        spill_dir = os.path.dirname(self.spill_path)
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+        with open(self.spill_path, "ab") as f:
+            for message in messages:
+                f.write(message + b"\n")
+
+    async def _replay_spill(self):
+        """Move spilled events back into the queue once there is room."""
+        if self.policy != "spill" or not self._has_spill:
+            return
+
+        room = self.max_queue_size - len(self._queue)
+        async with self._spill_lock:
+            try:
+                replay, self._has_spill = await asyncio.to_thread(
+                    self._take_spilled, room
+                )
+            except OSError as e:
+                logger.error(f"Could not replay spilled events: {e}")
+                self._replay_at = time.monotonic() + self._replay_delay
+                return
+
+        if replay:
+            self._queue.extend(replay)
+            self.stats["replayed"] += len(replay)
+            self._idle.clear()
+            self._not_empty.set()
+            update_event_queue_depth(len(self._queue))
+
+    def _take_spilled(self, room: int) -> tuple[list[bytes], bool]:
+        """
+        Remove up to ``room`` events from the spill file (runs in a worker thread).
+
+        Returns:
+            The removed events and whether the file still holds more
+        """
+        if not os.path.exists(self.spill_path):
+            return [], False
+
+        with open(self.spill_path, "rb") as f:
+            lines = [line.rstrip(b"\n") for line in f if line.strip()]
+
+        replay, remaining = lines[:room], lines[room:]
+        if remaining:
+            with open(self.spill_path, "wb") as f:
+                for line in remaining:
+                    f.write(line + b"\n")
+        else:
+            os.remove(self.spill_path)
+        return replay, bool(remaining)
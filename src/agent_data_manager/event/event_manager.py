@@ -9,6 +9,12 @@ from typing import Any
 
 from ..config.settings import settings
 from ..utils.structured_logger import get_logger
+from .buffered_publisher import (
+    BatchPublisher,
+    BufferedEventPublisher,
+    LocalEventPublisher,
+    PubSubBatchPublisher,
+)
 
 # Import Google Cloud Pub/Sub client
 try:
@@ -33,13 +39,21 @@ class EventManager:
     """Manages Agent-to-Agent event publishing via Google Cloud Pub/Sub with optimizations for concurrent operations."""
 
     def __init__(
-        self, project_id: str | None = None, topic_name: str = "agent-data-events"
+        self,
+        project_id: str | None = None,
+        topic_name: str = "agent-data-events",
+        mode: str | None = None,
+        batch_publisher: BatchPublisher | None = None,
     ):
         """Initialize the event manager.
 
         Args:
             project_id: Optional Google Cloud project ID. Defaults to settings value.
             topic_name: Pub/Sub topic name for publishing events.
+            mode: "sync" awaits each publish, "async" queues events and returns
+                immediately. Defaults to settings value.
+            batch_publisher: Optional publishing backend, e.g. LocalEventPublisher
+                for offline runs. Defaults to Pub/Sub.
         """
         self.project_id = project_id
         self.topic_name = topic_name
@@ -49,11 +63,30 @@ class EventManager:
         self._executor = ThreadPoolExecutor(max_workers=4)  # For concurrent publishing
         self._batch_settings = None
 
+        self._event_config = settings.get_event_config()
+        self.mode = mode or self._event_config["mode"]
+        if batch_publisher is None and self._event_config["publisher"] == "local":
+            batch_publisher = LocalEventPublisher()
+        self._batch_publisher = batch_publisher
+        self._buffer: BufferedEventPublisher | None = None
+
+    @property
+    def _publishing_available(self) -> bool:
+        """Whether any publishing backend can be used."""
+        return PUBSUB_AVAILABLE or self._batch_publisher is not None
+
     async def _ensure_initialized(self):
         """Ensure Pub/Sub publisher client is initialized with optimized settings."""
         if self._initialized:
             return
 
+        if self._batch_publisher is not None:
+            self._initialized = True
+            logger.info(
+                f"EventManager initialized with {type(self._batch_publisher).__name__}"
+            )
+            return
+
         if not PUBSUB_AVAILABLE:
             logger.warning("Pub/Sub not available, events will not be published")
             return
@@ -79,6 +112,9 @@ class EventManager:
                 self.project_id, self.topic_name
             )
             self._batch_settings = batch_settings
+            self._batch_publisher = PubSubBatchPublisher(
+                self.publisher, self.topic_path, self._executor
+            )
 
             self._initialized = True
             logger.info(
@@ -101,13 +137,13 @@ class EventManager:
         Returns:
             Batch publishing operation result
         """
-        if not PUBSUB_AVAILABLE:
+        if not self._publishing_available:
             logger.debug("Pub/Sub not available, skipping batch event publishing")
             return {"status": "skipped", "reason": "pubsub_not_available"}
 
         await self._ensure_initialized()
 
-        if not self.publisher:
+        if not self._batch_publisher:
             logger.warning("Publisher not initialized, skipping batch event publishing")
             return {"status": "skipped", "reason": "publisher_not_initialized"}
 
@@ -181,10 +217,8 @@ class EventManager:
             if len(message_data) > 10 * 1024 * 1024:  # 10MB limit
                 raise MessageTooLargeError("Event message too large")
 
-            # Publish message using executor for non-blocking operation
-            loop = asyncio.get_event_loop()
-            future = self.publisher.publish(self.topic_path, message_data)
-            message_id = await loop.run_in_executor(self._executor, future.result)
+            # Publish without blocking the event loop on the publish future
+            message_id = (await self._batch_publisher.publish_batch([message_data]))[0]
 
             return {
                 "status": "success",
@@ -220,13 +254,13 @@ class EventManager:
         Returns:
             Publishing operation result
         """
-        if not PUBSUB_AVAILABLE:
+        if not self._publishing_available:
             logger.debug("Pub/Sub not available, skipping event publishing")
             return {"status": "skipped", "reason": "pubsub_not_available"}
 
         await self._ensure_initialized()
 
-        if not self.publisher:
+        if not self._batch_publisher:
             logger.warning("Publisher not initialized, skipping event publishing")
             return {"status": "skipped", "reason": "publisher_not_initialized"}
 
@@ -240,12 +274,20 @@ class EventManager:
                 "metadata": metadata or {},
             }
 
+            if self.mode == "async":
+                outcome = await self._get_buffer().enqueue(event_data)
+                return {
+                    "status": "queued",
+                    "queue_outcome": outcome,
+                    "doc_id": doc_id,
+                    "timestamp": event_data["timestamp"],
+                }
+
             # Convert to JSON bytes
             message_data = json.dumps(event_data).encode("utf-8")
 
-            # Publish message
-            future = self.publisher.publish(self.topic_path, message_data)
-            message_id = future.result()  # Wait for the publish to complete
+            # Publish message without blocking the event loop
+            message_id = (await self._batch_publisher.publish_batch([message_data]))[0]
 
             logger.info(
                 "Published save_document event",
@@ -286,13 +328,13 @@ class EventManager:
         Returns:
             Publishing operation result
         """
-        if not PUBSUB_AVAILABLE:
+        if not self._publishing_available:
             logger.debug("Pub/Sub not available, skipping event publishing")
             return {"status": "skipped", "reason": "pubsub_not_available"}
 
         await self._ensure_initialized()
 
-        if not self.publisher:
+        if not self._batch_publisher:
             logger.warning("Publisher not initialized, skipping event publishing")
             return {"status": "skipped", "reason": "publisher_not_initialized"}
 
@@ -305,12 +347,20 @@ class EventManager:
                 **event_data,
             }
 
+            if self.mode == "async":
+                outcome = await self._get_buffer().enqueue(full_event_data)
+                return {
+                    "status": "queued",
+                    "queue_outcome": outcome,
+                    "event_type": event_type,
+                    "timestamp": full_event_data["timestamp"],
+                }
+
             # Convert to JSON bytes
             message_data = json.dumps(full_event_data).encode("utf-8")
 
-            # Publish message
-            future = self.publisher.publish(self.topic_path, message_data)
-            message_id = future.result()  # Wait for the publish to complete
+            # Publish message without blocking the event loop
+            message_id = (await self._batch_publisher.publish_batch([message_data]))[0]
 
             logger.info(f"Published {event_type} event, message_id: {message_id}")
             return {
@@ -324,6 +374,34 @@ class EventManager:
             logger.error(f"Failed to publish {event_type} event: {e}")
             return {"status": "failed", "error": str(e), "event_type": event_type}
 
+    def _get_buffer(self) -> BufferedEventPublisher:
+        """Get or create the bounded queue used by async mode."""
+        if self._buffer is None:
+            self._buffer = BufferedEventPublisher(
+                self._batch_publisher,
+                max_queue_size=self._event_config["max_queue_size"],
+                max_batch_size=self._event_config["max_batch_size"],
+                max_latency=self._event_config["max_latency"],
+                policy=self._event_config["policy"],
+                spill_path=self._event_config["spill_path"],
+            )
+        return self._buffer
+
+    def get_queue_stats(self) -> dict[str, Any] | None:
+        """Get async publish queue statistics, or None if no event was queued yet."""
+        return self._buffer.get_stats() if self._buffer else None
+
+    async def flush(self, timeout: float | None = None):
+        """Wait until all queued events have been handed to the publisher."""
+        if self._buffer:
+            await self._buffer.flush(timeout=timeout)
+
+    async def close(self, timeout: float = 5.0):
+        """Flush queued events and stop the background flusher."""
+        if self._buffer:
+            await self._buffer.close(timeout=timeout)
+            self._buffer = None
+
     async def get_topic_info(self) -> dict[str, Any]:
         """
         Get information about the Pub/Sub topic.
@@ -331,12 +409,12 @@ class EventManager:
         Returns:
             Topic information or error
         """
-        if not PUBSUB_AVAILABLE:
+        if not self._publishing_available:
             return {"status": "unavailable", "reason": "pubsub_not_available"}
 
         await self._ensure_initialized()
 
-        if not self.publisher:
+        if not self._batch_publisher:
             return {"status": "unavailable", "reason": "publisher_not_initialized"}
 
         try:
@@ -345,6 +423,8 @@ class EventManager:
                 "project_id": self.project_id,
                 "topic_name": self.topic_name,
                 "topic_path": self.topic_path,
+                "mode": self.mode,
+                "queue": self.get_queue_stats(),
             }
 
         except Exception as e:
@@ -375,3 +455,12 @@ def get_event_manager(
         _event_manager = EventManager(project_id, topic_name)
 
     return _event_manager
+
+
+async def shutdown_event_manager(timeout: float = 5.0):
+    """Flush queued events and release the global event manager."""
+    global _event_manager
+
+    if _event_manager is not None:
+        await _event_manager.close(timeout=timeout)
+        _event_manager = None
@@ -9,7 +9,10 @@ from agent_data_manager.tools.register_tools import register_tools
 
 # Import QdrantStore for vector operations
 try:
-    from agent_data_manager.vector_store.qdrant_store import QdrantStore
+    from agent_data_manager.vector_store.qdrant_store import (
+        QdrantStore,
+        get_qdrant_store,
+    )
 except ImportError:
     QdrantStore = None
     logging.warning("QdrantStore not found. Vector operations will be unavailable.")
@@ -86,7 +89,7 @@ def main():
             logging.error(f"Failed to initialize MockQdrantStore: {e}")
     elif QdrantStore:
         try:
-            qdrant_store = QdrantStore()
+            qdrant_store = get_qdrant_store()
             logging.info("QdrantStore initialized successfully.")
         except Exception as e:
             logging.error(f"Failed to initialize QdrantStore: {e}")
@@ -102,7 +105,8 @@ def main():
             if not line:
                 continue
 
-            logging.info(f"Received raw input: {line}")
+            # Raw payloads can carry document content; keep them at DEBUG
+            logging.debug("Received raw input (%d bytes): %s", len(line), line)
             try:
                 input_data = json.loads(line)
             except json.JSONDecodeError as e:
@@ -117,9 +121,8 @@ def main():
                 print(error_response, flush=True)
                 continue
 
-            logging.info(f"Parsed input data: {input_data}")
-
             tool_name = input_data.get("tool_name")
+            logging.info("Received request for tool '%s'", tool_name)
 
             if not tool_name:
                 logging.error("Missing 'tool_name' in input JSON.")
@@ -147,8 +150,8 @@ def main():
                         }
                     )
                     print(result_json, flush=True)
-                    logging.info(
-                        f"Sent Cursor integration result to stdout: {result_json}"
+                    logging.debug(
+                        "Sent Cursor integration result to stdout: %s", result_json
                     )
                     continue
                 except Exception as e:
@@ -170,7 +173,7 @@ def main():
                         {"result": result, "meta": {"status": "success"}}
                     )
                     print(result_json, flush=True)
-                    logging.info(f"Sent QdrantStore result to stdout: {result_json}")
+                    logging.debug("Sent QdrantStore result to stdout: %s", result_json)
                     continue
                 except Exception as e:
                     logging.exception(
@@ -192,17 +195,19 @@ def main():
 
             # Based on main.py, agent.run takes the whole JSON dict.
             try:
-                logging.info(
-                    f"Calling agent.run with data for tool '{tool_name}': {input_data}"
+                logging.debug(
+                    "Calling agent.run with data for tool '%s': %s",
+                    tool_name,
+                    input_data,
                 )
                 # Use the global main loop to run the async agent.run method
                 result = main_loop.run_until_complete(agent.run(input_data))
-                logging.info(f"Agent execution finished. Result: {result}")
+                logging.info("Agent execution finished for tool '%s'", tool_name)
 
                 # Send result back to stdout
                 result_json = json.dumps({"result": result})
                 print(result_json, flush=True)
-                logging.info(f"Sent result to stdout: {result_json}")
+                logging.debug("Sent result to stdout: %s", result_json)
 
             except Exception as e:
                 logging.exception(
@@ -7,9 +7,13 @@ from typing import Any
 # Imports adjusted for Docker structure (/app is root)
 from agent.agent_data_agent import AgentDataAgent
 from agent_data_manager.tools.register_tools import register_tools
+from agent_data_manager.utils.background_loop import BackgroundEventLoop
 
 # --- Configuration ---
-TOOL_EXECUTION_TIMEOUT_SECONDS = 10.0  # Increased timeout for synchronous execution
+# Opt-in execution timeouts per tool name; a request may set "timeout_seconds"
+# instead. Tools with neither run until they finish.
+TOOL_TIMEOUTS_SECONDS: dict[str, float] = {}
+MAX_BATCH_CONCURRENCY = 8  # Tool calls of one batch running at the same time
 
 # --- Enhanced Logging Setup ---
 # Basic setup, assuming configuration might happen elsewhere (like in the Flask app)
@@ -56,7 +60,11 @@ logger_adapter = RequestLogAdapter(logger, {"request_id": "CORE-INIT"})
 
 # --- Core Agent Class ---
 class MCPAgent:
-    """Core logic for Minimal Compute Platform Agent. Handles tool execution synchronously."""
+    """Core logic for Minimal Compute Platform Agent. Handles tool execution synchronously.
+
+    Tools run on a long-lived event loop owned by the agent (in its own thread),
+    so async clients keep their connections between requests.
+    """
 
     def __init__(self):
         logger_adapter.info("Initializing MCPAgent Core...")
@@ -67,6 +75,7 @@ class MCPAgent:
             f"MCPAgent Core initialized. Available tools: {registered_tool_names}"
         )
         self.request_counter = 0
+        self._event_loop = BackgroundEventLoop(name="mcp-agent-loop")
 
     def _get_next_request_id(self, provided_id=None) -> str:
         """Generates a unique request ID."""
@@ -96,7 +105,43 @@ class MCPAgent:
         return response
 
     def _execute_tool_sync(self, request_data: dict[str, Any]) -> dict[str, Any]:
-        """Synchronously executes a single tool request with error handling."""
+        """Synchronously executes a single tool request on the agent's event loop."""
+        loop_setup_ms = self._event_loop.start()
+        response = self._event_loop.run(self._execute_tool(request_data))
+        response["meta"]["loop_setup_ms"] = round(loop_setup_ms, 2)
+        return response
+
+    def _execute_batch_sync(self, requests: list[Any]) -> list[dict[str, Any]]:
+        """Executes a batch of tool requests concurrently; one response per request."""
+        loop_setup_ms = self._event_loop.start()
+        start_time = time.monotonic()
+        responses = self._event_loop.run(self._execute_batch(requests))
+        batch_duration_ms = round((time.monotonic() - start_time) * 1000, 2)
+        for response in responses:
+            response["meta"]["loop_setup_ms"] = round(loop_setup_ms, 2)
+            response["meta"]["batch_size"] = len(requests)
+            response["meta"]["batch_duration_ms"] = batch_duration_ms
+        return responses
+
+    async def _execute_batch(self, requests: list[Any]) -> list[dict[str, Any]]:
+        """Runs the requests of a batch with bounded concurrency, keeping order."""
+        semaphore = asyncio.Semaphore(MAX_BATCH_CONCURRENCY)
+
+        async def execute_one(request_data: Any) -> dict[str, Any]:
+            if not isinstance(request_data, dict):
+                return self._create_response(
+                    self._get_next_request_id(),
+                    "failed",
+                    error="Each batch entry must be a JSON object (dict).",
+                    meta={"duration_ms": 0.0},
+                )
+            async with semaphore:
+                return await self._execute_tool(request_data)
+
+        return await asyncio.gather(*(execute_one(item) for item in requests))
+
+    async def _execute_tool(self, request_data: dict[str, Any]) -> dict[str, Any]:
+        """Executes a single tool request with error handling."""
         start_time = time.monotonic()
         request_id_in = request_data.get("id")
         # Ensure we have a request ID for logging and response
@@ -106,7 +151,7 @@ class MCPAgent:
         local_logger = RequestLogAdapter(logger, {"request_id": request_id})
 
         # Log the entire received request_data
-        local_logger.info(f"[_execute_tool_sync] Received request_data: {request_data}")
+        local_logger.info(f"[_execute_tool] Received request_data: {request_data}")
 
         tool_name = request_data.get("tool_name")
         # Explicitly name the payload from the request
@@ -114,16 +159,17 @@ class MCPAgent:
 
         # Log the extracted input_payload and its type
         local_logger.info(
-            f"[_execute_tool_sync] Extracted input_payload_from_request: {input_payload_from_request}"
+            f"[_execute_tool] Extracted input_payload_from_request: {input_payload_from_request}"
         )
         local_logger.info(
-            f"[_execute_tool_sync] Type of input_payload_from_request: {type(input_payload_from_request)}"
+            f"[_execute_tool] Type of input_payload_from_request: {type(input_payload_from_request)}"
         )
 
         response_status = "failed"
         response_error = None
         response_result = None
         duration_ms = None
+        tool_duration_ms = None
 
         try:
             # --- Input Validation ---
@@ -153,25 +199,31 @@ class MCPAgent:
             local_logger.info(
                 f"Final check before calling execute_tool - Args: {final_args}, Kwargs: {final_kwargs}"
             )
-            # Log before asyncio.run
-            local_logger.info(f"Attempting asyncio.run for tool: {tool_name}")
-            # Updated to use asyncio.run and argument unpacking
-            tool_result_data = asyncio.run(
+            # Run on the agent's event loop (no per-call loop setup)
+            timeout = request_data.get(
+                "timeout_seconds", TOOL_TIMEOUTS_SECONDS.get(tool_name)
+            )
+            tool_start_time = time.monotonic()
+            tool_result_data = await asyncio.wait_for(
                 self.core_agent.tools_manager.execute_tool(
                     tool_name,  # tool_name is the first positional argument
                     *final_args,  # Unpack final_args list into positional arguments
                     **final_kwargs,  # Unpack final_kwargs dict into keyword arguments
-                )
+                ),
+                timeout=timeout,
             )
-            # Log after asyncio.run and the type of its result
+            tool_duration_ms = (time.monotonic() - tool_start_time) * 1000
             local_logger.info(
-                f"Completed asyncio.run for tool: {tool_name}. Result type: {type(tool_result_data)}"
+                f"Completed tool: {tool_name}. Result type: {type(tool_result_data)}"
             )
             response_status = "success"
             # Assuming execute_tool returns the direct result needed
             response_result = tool_result_data
             local_logger.info(f"Tool '{tool_name}' executed successfully.")
 
+        except TimeoutError:
+            response_error = f"Tool '{tool_name}' timed out after {timeout} seconds"
+            local_logger.error(response_error)
         except (KeyError, ValueError, TypeError) as validation_error:
             response_error = f"Input validation error: {validation_error}"
             local_logger.error(
@@ -184,6 +236,8 @@ class MCPAgent:
         finally:
             duration_ms = (time.monotonic() - start_time) * 1000
             final_meta = {"duration_ms": round(duration_ms, 2)}
+            if tool_duration_ms is not None:
+                final_meta["tool_duration_ms"] = round(tool_duration_ms, 2)
             # Log final outcome (optional, depends on desired log verbosity)
             final_logger_extra = {
                 "request_id": request_id,
@@ -207,8 +261,17 @@ class MCPAgent:
         )
         return response_data
 
-    def run(self, request_data: dict, request_id: str | None = None) -> dict:
-        """Processes a single tool request synchronously."""
+    def run(
+        self, request_data: dict | list, request_id: str | None = None
+    ) -> dict | list[dict]:
+        """Processes a tool request, or a JSON-RPC-style batch (list) of them, synchronously."""
+        if isinstance(request_data, list):
+            batch_logger = RequestLogAdapter(
+                logger, {"request_id": request_id or "batch"}
+            )
+            batch_logger.info(f"Processing batch of {len(request_data)} requests")
+            return self._execute_batch_sync(request_data)
+
         exec_request_id = self._get_next_request_id(request_id)
         request_data["id"] = exec_request_id  # Ensure ID is set in the input data
 
@@ -223,3 +286,7 @@ class MCPAgent:
         # Directly execute the single request
         result = self._execute_tool_sync(request_data)
         return result
+
+    def close(self):
+        """Stop the agent's event loop thread."""
+        self._event_loop.stop()
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 import sys
@@ -15,6 +16,7 @@ try:
         OPENAI_AVAILABLE,
     )
     from agent_data_manager.tools.register_tools import get_all_tool_functions
+    from agent_data_manager.utils.background_loop import BackgroundEventLoop
 
     REGISTRY_IMPORTED = True
 except ImportError as e1:
@@ -31,6 +33,7 @@ except ImportError as e1:
             OPENAI_AVAILABLE,
         )
         from agent_data_manager.tools.register_tools import get_all_tool_functions
+        from agent_data_manager.utils.background_loop import BackgroundEventLoop
 
         REGISTRY_IMPORTED = True
         print("Successfully imported registry after path adjustment.")
@@ -61,6 +64,11 @@ else:
     )
 # -->> END STARTUP LOGGING <<--
 
+# Async tools run on one long-lived loop instead of a new loop per request
+tool_event_loop = (
+    BackgroundEventLoop(name="web-server-tool-loop") if REGISTRY_IMPORTED else None
+)
+
 # Load tools at startup - REMOVED
 # ALL_TOOLS = get_all_tool_functions()
 # logger.info(f"Initial tool discovery (may be lazy): {list(ALL_TOOLS.keys())}")
@@ -154,6 +162,8 @@ def execute_tool():
             f"Request {request_id}: Executing tool: {tool_name} with args: {args}"
         )
         result = tool_function(*args)  # Unpack args for the function call
+        if asyncio.iscoroutine(result):
+            result = tool_event_loop.run(result)
         logger.info(f"Request {request_id}: Tool {tool_name} executed successfully.")
         # Attempt to return JSON directly, handle potential serialization errors
         try:
@@ -0,0 +1,15 @@
+"""Reranker interfaces and implementations for the rag_search reranking stage."""
+
+from .cross_encoder_reranker import CrossEncoderReranker
+from .lexical_overlap_reranker import LexicalOverlapReranker
+from .rerank_stage import RerankStage, get_rerank_stage
+from .reranker import Reranker, RerankError
+
+__all__ = [
+    "CrossEncoderReranker",
+    "LexicalOverlapReranker",
+    "RerankError",
+    "RerankStage",
+    "Reranker",
+    "get_rerank_stage",
+]
@@ -0,0 +1,80 @@
+"""Cross-encoder reranker backed by sentence-transformers (optional dependency)."""
+
+import logging
+import threading
+
+from .reranker import RerankError
+
+try:
+    from sentence_transformers import CrossEncoder
+
+    CROSS_ENCODER_AVAILABLE = True
+except ImportError:
+    CrossEncoder = None
+    CROSS_ENCODER_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class CrossEncoderReranker:
+    """Cross-encoder implementation of the Reranker interface.
+
+    Reads the query and each passage together, which ranks far better than
+    term overlap at a few milliseconds per passage on CPU. The model is
+    loaded on first use, so a misconfigured model fails the first rerank
+    (which falls back to vector order) rather than startup.
+    """
+
+    def __init__(self, model_name: str, batch_size: int = 32):
+        """Initialize the cross-encoder reranker.
+
+        Args:
+            model_name: sentence-transformers cross-encoder model name or path
+            batch_size: Passages scored per forward pass
+
+        Raises:
+            RerankError: If sentence-transformers is not installed
+        """
+        if not CROSS_ENCODER_AVAILABLE:
+            raise RerankError(
+                "sentence-transformers is not installed; "
+                "pip install sentence-transformers to use the cross-encoder reranker",
+                reranker="cross-encoder",
+            )
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.name = f"cross-encoder:{model_name}"
+        self._model = None
+        self._load_lock = threading.Lock()
+
+    def _get_model(self):
+        with self._load_lock:
+            if self._model is None:
+                logger.info(f"Loading cross-encoder model {self.model_name}")
+                self._model = CrossEncoder(self.model_name)
+            return self._model
+
+    def score(self, query: str, passages: list[str]) -> list[float]:
+        """Score (query, passage) pairs with the cross-encoder.
+
+        Args:
+            query: Query text
+            passages: Candidate passage texts
+
+        Returns:
+            One relevance logit per passage
+
+        Raises:
+            RerankError: When the model cannot be loaded or scoring fails
+        """
+        if not passages:
+            return []
+        try:
+            scores = self._get_model().predict(
+                [(query, passage) for passage in passages],
+                batch_size=self.batch_size,
+                show_progress_bar=False,
+            )
+        except Exception as e:
+            raise RerankError(str(e), reranker=self.name) from e
+        return [float(score) for score in scores]
@@ -0,0 +1,174 @@
+"""Reranking stage run on rag_search candidates before they are cut to the limit.
+
+Vector scores rank by embedding similarity, so mediocre passages that happen
+to sit close to the query still reach the LLM. The stage rescores the
+filtered candidates with a Reranker:
+
+- scoring runs in a bounded worker pool, never on the event loop
+- scores are cached per (reranker, query, document version), so repeated
+  queries only score new or changed documents
+- the stage has a latency budget; when scoring overruns it or fails, the
+  caller keeps the vector order. Scoring that overran still finishes in the
+  pool and fills the cache for the next identical query
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from ..config.settings import settings
+from ..tools.prometheus_metrics import record_rerank, record_rerank_cache_lookups
+from ..utils.result_cache import LRUCache
+from .cross_encoder_reranker import CrossEncoderReranker
+from .lexical_overlap_reranker import LexicalOverlapReranker
+from .reranker import Reranker, RerankError
+
+logger = logging.getLogger(__name__)
+
+# Scores are keyed by document version, so the TTL only bounds memory
+RERANK_CACHE_TTL = 24 * 3600
+
+
+class RerankStage:
+    """Scores search candidates with a Reranker under a latency budget."""
+
+    def __init__(
+        self,
+        reranker: Reranker,
+        workers: int = 2,
+        budget_ms: float = 150.0,
+        cache_size: int = 10000,
+    ):
+        """Initialize the reranking stage.
+
+        Args:
+            reranker: Scorer applied to the candidates
+            workers: Worker threads; candidates are split into one batch per worker
+            budget_ms: Latency budget of a rerank call, 0 for none
+            cache_size: Maximum number of cached scores
+        """
+        self.reranker = reranker
+        self.workers = max(1, workers)
+        self.budget_ms = budget_ms
+        self._cache = LRUCache(max_size=cache_size, ttl=RERANK_CACHE_TTL)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="rerank"
+        )
+
+    def _cache_key(self, query: str, version_key: str) -> str:
+        raw = json.dumps([self.reranker.name, query, version_key])
+        return hashlib.md5(raw.encode()).hexdigest()
+
+    def _score_batch(self, query: str, batch: list[tuple[str, str]]) -> list[float]:
+        """Score one batch in a worker thread and cache the scores."""
+        scores = self.reranker.score(query, [text for _, text in batch])
+        for (cache_key, _), score in zip(batch, scores, strict=True):
+            self._cache.put(cache_key, score)
+        return scores
+
+    async def rerank(
+        self, query: str, candidates: list[tuple[str, str]]
+    ) -> tuple[list[float] | None, dict[str, Any]]:
+        """
+        Score candidates against the query.
+
+        Args:
+            query: Query text
+            candidates: (version key, passage text) per candidate, where the
+                version key changes whenever the document does
+
+        Returns:
+            (one score per candidate, or None when the caller should keep the
+            vector order; stage info with reranker, candidates, cached,
+            latency_ms and fallback)
+        """
+        started = time.perf_counter()
+        cache_keys = [self._cache_key(query, key) for key, _ in candidates]
+        scores: list[float | None] = [self._cache.get(key) for key in cache_keys]
+        misses = [i for i, score in enumerate(scores) if score is None]
+        record_rerank_cache_lookups(len(candidates) - len(misses), len(misses))
+
+        info: dict[str, Any] = {
+            "reranker": self.reranker.name,
+            "candidates": len(candidates),
+            "cached": len(candidates) - len(misses),
+        }
+        outcome = "success"
+        if misses:
+            size = -(-len(misses) // self.workers)
+            batches = [misses[i : i + size] for i in range(0, len(misses), size)]
+            loop = asyncio.get_running_loop()
+            scoring = asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        self._executor,
+                        self._score_batch,
+                        query,
+                        [(cache_keys[i], candidates[i][1]) for i in batch],
+                    )
+                    for batch in batches
+                ),
+                return_exceptions=True,
+            )
+            remaining = self.budget_ms / 1000 - (time.perf_counter() - started)
+            try:
+                batch_scores = await asyncio.wait_for(
+                    scoring, timeout=max(remaining, 0) if self.budget_ms > 0 else None
+                )
+            except TimeoutError:
+                outcome = "timeout"
+            else:
+                errors = [s for s in batch_scores if isinstance(s, BaseException)]
+                if errors:
+                    outcome = "error"
+                    info["error"] = str(errors[0])
+                    logger.warning(
+                        f"Reranking failed, keeping vector order: {errors[0]}"
+                    )
+                else:
+                    for batch, values in zip(batches, batch_scores, strict=True):
+                        for i, score in zip(batch, values, strict=True):
+                            scores[i] = score
+
+        duration = time.perf_counter() - started
+        record_rerank(self.reranker.name, outcome, duration)
+        info["latency_ms"] = round(duration * 1000, 3)
+        info["fallback"] = None if outcome == "success" else outcome
+        return (scores if outcome == "success" else None), info
+
+
+def get_default_reranker() -> Reranker:
+    """Get the reranker selected by the RERANKER setting.
+
+    Returns:
+        CrossEncoderReranker when the setting is ``cross-encoder`` and
+        sentence-transformers is installed, otherwise a LexicalOverlapReranker
+    """
+    config = settings.get_rerank_config()
+    if config["reranker"] == "cross-encoder":
+        try:
+            return CrossEncoderReranker(config["cross_encoder_model"])
+        except RerankError as e:
+            logger.warning(f"{e.message}; using the lexical-overlap reranker")
+    return LexicalOverlapReranker()
+
+
+_stage: RerankStage | None = None
+
+
+def get_rerank_stage() -> RerankStage:
+    """Get the process-wide reranking stage, built from the rerank settings."""
+    global _stage
+    if _stage is None:
+        config = settings.get_rerank_config()
+        _stage = RerankStage(
+            get_default_reranker(),
+            workers=config["workers"],
+            budget_ms=config["budget_ms"],
+            cache_size=config["cache_size"],
+        )
+    return _stage
@@ -0,0 +1,37 @@
+"""Reranker protocol for rescoring search candidates against the query."""
+
+from typing import Protocol
+
+
+class Reranker(Protocol):
+    """Protocol for rerankers that rescore retrieved passages.
+
+    Scoring is synchronous: rerankers are CPU-bound and the reranking stage
+    runs them in a worker pool, off the event loop.
+    """
+
+    name: str
+
+    def score(self, query: str, passages: list[str]) -> list[float]:
+        """Score how well each passage answers the query.
+
+        Args:
+            query: Query text
+            passages: Candidate passage texts
+
+        Returns:
+            One score per passage, higher is more relevant
+
+        Raises:
+            RerankError: When scoring fails
+        """
+        ...
+
+
+class RerankError(Exception):
+    """Exception raised when reranking fails."""
+
+    def __init__(self, message: str, reranker: str = "unknown"):
+        self.message = message
+        self.reranker = reranker
+        super().__init__(self.message)
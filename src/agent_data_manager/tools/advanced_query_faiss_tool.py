@@ -1,8 +1,9 @@
 import os
-import pickle
 import time
 from typing import Any
 
+from .faiss_metadata_journal import load_metadata
+
 FAISS_DIR = "ADK/agent_data/faiss_indices"
 MAX_RETRIES = 3
 RETRY_DELAY = 1  # seconds
@@ -43,8 +44,7 @@ def advanced_query_faiss(
     loaded_data = None
     for attempt in range(MAX_RETRIES):
         try:
-            with open(meta_path, "rb") as f:
-                loaded_data = pickle.load(f)
+            loaded_data = load_metadata(meta_path)
             break  # Success
         except FileNotFoundError:
             print(
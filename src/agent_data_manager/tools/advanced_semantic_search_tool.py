@@ -1,8 +1,9 @@
 import os
-import pickle
 import time
 from typing import Any
 
+from .faiss_metadata_journal import load_metadata
+
 
 # Assuming helper from semantic_filter_metadata_tool is available or redefined here
 # Let's redefine it for clarity and self-containment
@@ -71,8 +72,7 @@ def advanced_semantic_search(
     # --- Load with Retry ---
     for attempt in range(MAX_RETRIES):
         try:
-            with open(meta_path, "rb") as f:
-                loaded_data = pickle.load(f)
+            loaded_data = load_metadata(meta_path)
             break
         except FileNotFoundError:
             return {
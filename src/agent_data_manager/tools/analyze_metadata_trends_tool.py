@@ -1,9 +1,10 @@
 import os
-import pickle
 import time
 from collections import Counter
 from typing import Any
 
+from .faiss_metadata_journal import load_metadata
+
 FAISS_DIR = "ADK/agent_data/faiss_indices"
 MAX_RETRIES = 3
 RETRY_DELAY = 1  # seconds
@@ -38,8 +39,7 @@ def analyze_metadata_trends(
     loaded_data = None
     for attempt in range(MAX_RETRIES):
         try:
-            with open(meta_path, "rb") as f:
-                loaded_data = pickle.load(f)
+            loaded_data = load_metadata(meta_path)
             break  # Success
         except FileNotFoundError:
             return {
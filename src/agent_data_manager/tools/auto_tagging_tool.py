@@ -141,8 +141,7 @@ class AutoTaggingTool:
         Returns:
             Dictionary with generated tags and metadata
         """
-        await self._ensure_initialized()
-
+        # Checked first so offline runs never open the Firestore tag cache
         if not OPENAI_AVAILABLE or not openai_client:
             return {
                 "status": "failed",
@@ -150,6 +149,8 @@ class AutoTaggingTool:
                 "tags": [],
             }
 
+        await self._ensure_initialized()
+
         try:
             content_hash = self._generate_content_hash(content)
 
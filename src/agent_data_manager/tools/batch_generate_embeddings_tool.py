@@ -1,10 +1,15 @@
 import os
-import pickle
 import time
 from typing import Any
 
 import numpy as np
 
+from .faiss_metadata_journal import (
+    load_metadata,
+    metadata_lock,
+    write_metadata_snapshot,
+)
+
 FAISS_DIR = "ADK/agent_data/faiss_indices"
 MAX_RETRIES = 3
 RETRY_DELAY = 1  # seconds
@@ -38,12 +43,20 @@ def batch_generate_embeddings(
             "error": f"FAISS index or metadata file not found for '{index_name}'.",
         }
 
+    # Hold the lock from load to write so concurrent journal appends are not lost
+    with metadata_lock(meta_path):
+        return _batch_generate_locked(index_name, meta_path, overwrite)
+
+
+def _batch_generate_locked(
+    index_name: str, meta_path: str, overwrite: bool
+) -> dict[str, Any]:
+    """Fill in embeddings and write a new snapshot; caller holds the lock."""
     loaded_data = None
     # --- Load with Retry ---
     for attempt in range(MAX_RETRIES):
         try:
-            with open(meta_path, "rb") as f:
-                loaded_data = pickle.load(f)
+            loaded_data = load_metadata(meta_path)
             break
         except FileNotFoundError:
             return {
@@ -103,8 +116,7 @@ def batch_generate_embeddings(
     # --- Save with Retry ---
     for attempt in range(MAX_RETRIES):
         try:
-            with open(meta_path, "wb") as f:
-                pickle.dump(loaded_data, f)
+            write_metadata_snapshot(meta_path, loaded_data)
 
             print(
                 f"Successfully batch generated/updated {generated_count} embeddings for index '{index_name}'. Processed {processed_count} nodes."
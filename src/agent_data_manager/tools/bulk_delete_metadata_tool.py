@@ -1,10 +1,13 @@
 import os
-import pickle
 import time
 from typing import Any
 
-import faiss  # Needed to rebuild the FAISS index
-import numpy as np
+from .faiss_metadata_journal import (
+    append_records,
+    compact,
+    load_metadata,
+    metadata_lock,
+)
 
 FAISS_DIR = "ADK/agent_data/faiss_indices"
 MAX_RETRIES = 3
@@ -16,7 +19,8 @@ def bulk_delete_metadata(
 ) -> dict[str, Any]:
     """
     Deletes multiple metadata nodes that match a simple filter condition (field == value).
-    This operation rebuilds the underlying FAISS index and metadata file.
+    The deletion is journaled; the FAISS index and metadata snapshot are rewritten
+    when the journal is compacted, or immediately when no node remains.
 
     Args:
         index_name: The name of the FAISS index whose metadata to modify.
@@ -38,20 +42,31 @@ def bulk_delete_metadata(
             "error": "Filter condition must contain exactly one key-value pair.",
         }
 
-    filter_field, filter_value = list(filter_condition.items())[0]
-
     if not os.path.exists(meta_path) or not os.path.exists(index_path):
         return {
             "status": "failed",
             "error": f"FAISS index or metadata file not found for '{index_name}'.",
         }
 
+    # Hold the lock from load to append so the filter sees every earlier update
+    with metadata_lock(meta_path):
+        return _bulk_delete_locked(index_name, meta_path, index_path, filter_condition)
+
+
+def _bulk_delete_locked(
+    index_name: str,
+    meta_path: str,
+    index_path: str,
+    filter_condition: dict[str, Any],
+) -> dict[str, Any]:
+    """Find matching nodes and journal one delete record; caller holds the lock."""
+    filter_field, filter_value = list(filter_condition.items())[0]
+
     loaded_data = None
     # --- Load with Retry ---
     for attempt in range(MAX_RETRIES):
         try:
-            with open(meta_path, "rb") as f:
-                loaded_data = pickle.load(f)
+            loaded_data = load_metadata(meta_path)
             break
         except FileNotFoundError:
             return {
@@ -74,23 +89,15 @@ def bulk_delete_metadata(
             f"Invalid metadata file format for '{index_name}'. Missing 'metadata' key."
         )
 
-    original_metadata_dict = loaded_data["metadata"]
-    metadata_to_keep = {}
-    deleted_keys = []
-
-    # --- Filter Data ---
-    for key, item_metadata in original_metadata_dict.items():
-        if (
-            isinstance(item_metadata, dict)
-            and item_metadata.get(filter_field) == filter_value
-        ):
-            # This item matches the filter, so we delete it (i.e., don't add to metadata_to_keep)
-            deleted_keys.append(key)
-        else:
-            # Keep this item
-            metadata_to_keep[key] = item_metadata
-
+    metadata_dict = loaded_data["metadata"]
+    deleted_keys = [
+        key
+        for key, item_metadata in metadata_dict.items()
+        if isinstance(item_metadata, dict)
+        and item_metadata.get(filter_field) == filter_value
+    ]
     deleted_count = len(deleted_keys)
+    remaining_count = len(metadata_dict) - deleted_count
 
     if deleted_count == 0:
         print(
@@ -102,13 +109,28 @@ def bulk_delete_metadata(
             "message": "No matching nodes found.",
         }
 
-    # --- Rebuild FAISS Index and Metadata ---
-    # Similar logic to save_metadata_to_faiss_tool, but with filtered data
-    if not metadata_to_keep:
+    # --- Journal the Delete with Retry ---
+    # Deleted vectors leave the FAISS index when the journal is compacted
+    record = {"op": "delete", "keys": deleted_keys}
+    for attempt in range(MAX_RETRIES):
+        try:
+            append_records(meta_path, [record], index_path=index_path)
+            break
+        except Exception as e:
+            print(
+                f"Attempt {attempt + 1} failed to journal bulk delete for '{index_name}': {e}"
+            )
+            if attempt < MAX_RETRIES - 1:
+                time.sleep(RETRY_DELAY)
+            else:
+                raise OSError(
+                    f"Failed to journal bulk delete for '{index_name}' after {MAX_RETRIES} attempts."
+                ) from e
+
+    if remaining_count == 0:
         # If deletion results in an empty index, remove the files
         try:
-            os.remove(index_path)
-            os.remove(meta_path)
+            compact(meta_path, index_path)
             print(
                 f"Successfully deleted all {deleted_count} matching nodes. Index '{index_name}' is now empty and files removed."
             )
@@ -123,57 +145,14 @@ def bulk_delete_metadata(
                 "error": f"Failed to remove empty index files for '{index_name}': {e}",
             }
 
-    dimension = 1  # Dummy dimension from save tool
-    keys = list(metadata_to_keep.keys())
-    num_items = len(keys)
-    id_to_key = {i: key for i, key in enumerate(keys)}
-    key_to_id = {key: i for i, key in id_to_key.items()}
-    ids_to_add = np.array(list(id_to_key.keys()), dtype="int64")
-    dummy_vectors = np.zeros((num_items, dimension), dtype="float32")
-
-    new_data_to_save = {
-        "metadata": metadata_to_keep,
-        "id_to_key": id_to_key,
-        "key_to_id": key_to_id,
-    }
-
-    # --- Save Rebuilt Index/Metadata with Retry ---
-    for attempt in range(MAX_RETRIES):
-        try:
-            # Create and populate the FAISS index
-            index_flat = faiss.IndexFlatL2(dimension)
-            new_index = faiss.IndexIDMap(index_flat)
-            new_index.add_with_ids(dummy_vectors, ids_to_add)
-            faiss.write_index(new_index, index_path)
-
-            # Save metadata
-            with open(meta_path, "wb") as f:
-                pickle.dump(new_data_to_save, f)
-
-            print(
-                f"Successfully performed bulk delete on {deleted_count} nodes in index '{index_name}' matching {filter_condition}."
-            )
-            return {
-                "status": "success",
-                "deleted_count": deleted_count,
-                "remaining_count": num_items,
-                "deleted_keys": deleted_keys,
-            }
-
-        except Exception as e:
-            print(
-                f"Attempt {attempt + 1} failed to save rebuilt metadata/index after bulk delete for '{index_name}': {e}"
-            )
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(RETRY_DELAY)
-            else:
-                raise OSError(
-                    f"Failed to save rebuilt index/metadata for '{index_name}' after {MAX_RETRIES} attempts."
-                ) from e
-
+    print(
+        f"Successfully performed bulk delete on {deleted_count} nodes in index '{index_name}' matching {filter_condition}."
+    )
     return {
-        "status": "failed",
-        "error": "Unknown error after bulk delete and save attempts.",
+        "status": "success",
+        "deleted_count": deleted_count,
+        "remaining_count": remaining_count,
+        "deleted_keys": deleted_keys,
     }
 
 
@@ -1,8 +1,9 @@
 import os
-import pickle
 import time
 from typing import Any
 
+from .faiss_metadata_journal import append_records, load_metadata, metadata_lock
+
 FAISS_DIR = "ADK/agent_data/faiss_indices"
 MAX_RETRIES = 3
 RETRY_DELAY = 1  # seconds
@@ -37,20 +38,34 @@ def bulk_update_metadata(
     if not updates:
         return {"status": "failed", "error": "Updates dictionary cannot be empty."}
 
-    filter_field, filter_value = list(filter_condition.items())[0]
-
     if not os.path.exists(meta_path) or not os.path.exists(index_path):
         return {
             "status": "failed",
             "error": f"FAISS index or metadata file not found for '{index_name}'.",
         }
 
+    # Hold the lock from load to append so the filter sees every earlier update
+    with metadata_lock(meta_path):
+        return _bulk_update_locked(
+            index_name, meta_path, index_path, filter_condition, updates
+        )
+
+
+def _bulk_update_locked(
+    index_name: str,
+    meta_path: str,
+    index_path: str,
+    filter_condition: dict[str, Any],
+    updates: dict[str, Any],
+) -> dict[str, Any]:
+    """Find matching nodes and journal one update record; caller holds the lock."""
+    filter_field, filter_value = list(filter_condition.items())[0]
+
     loaded_data = None
     # --- Load with Retry ---
     for attempt in range(MAX_RETRIES):
         try:
-            with open(meta_path, "rb") as f:
-                loaded_data = pickle.load(f)
+            loaded_data = load_metadata(meta_path)
             break
         except FileNotFoundError:
             return {
@@ -77,20 +92,13 @@ def bulk_update_metadata(
         raise ValueError(f"Invalid metadata file format for '{index_name}'.")
 
     metadata_dict = loaded_data["metadata"]
-    updated_count = 0
-    updated_keys = []
-
-    # --- Perform Update ---
-    for key, item_metadata in metadata_dict.items():
-        if (
-            isinstance(item_metadata, dict)
-            and item_metadata.get(filter_field) == filter_value
-        ):
-            item_metadata.update(updates)
-            updated_count += 1
-            updated_keys.append(key)
-            # Ensure the change is reflected in the main dict being saved
-            metadata_dict[key] = item_metadata
+    updated_keys = [
+        key
+        for key, item_metadata in metadata_dict.items()
+        if isinstance(item_metadata, dict)
+        and item_metadata.get(filter_field) == filter_value
+    ]
+    updated_count = len(updated_keys)
 
     if updated_count == 0:
         print(
@@ -102,13 +110,11 @@ def bulk_update_metadata(
             "message": "No matching nodes found.",
         }
 
-    loaded_data["metadata"] = metadata_dict
-
-    # --- Save with Retry ---
+    # --- Journal the Update with Retry ---
+    record = {"op": "update", "keys": updated_keys, "fields": updates}
     for attempt in range(MAX_RETRIES):
         try:
-            with open(meta_path, "wb") as f:
-                pickle.dump(loaded_data, f)
+            append_records(meta_path, [record], index_path=index_path)
 
             print(
                 f"Successfully performed bulk update on {updated_count} nodes in index '{index_name}' matching {filter_condition}."
@@ -70,7 +70,7 @@ async def bulk_upload(
             }
 
         # Use the client's upsert method for batch uploading
-        result = qdrant_store.client.upsert(
+        result = await qdrant_store.async_client.upsert(
             collection_name=collection_name.strip(), points=formatted_points
         )
 
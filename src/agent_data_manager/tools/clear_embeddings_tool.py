@@ -1,11 +1,11 @@
 import logging
 import os
-import pickle
 import time
 from typing import Any
 
 # Import FAISS_AVAILABLE check from registry
 from .external_tool_registry import FAISS_AVAILABLE
+from .faiss_metadata_journal import append_records, load_metadata
 
 logger = logging.getLogger(__name__)
 
@@ -38,8 +38,7 @@ def clear_embeddings(index_name: str) -> dict[str, Any]:
     # Load with Retry
     for attempt in range(MAX_RETRIES):
         try:
-            with open(meta_path, "rb") as f:
-                loaded_data = pickle.load(f)
+            loaded_data = load_metadata(meta_path)
             break
         except FileNotFoundError:
             return {
@@ -66,6 +65,7 @@ def clear_embeddings(index_name: str) -> dict[str, Any]:
 
     metadata_dict = loaded_data["metadata"]
     cleared_count = 0
+    cleared_keys = []
     needs_saving = False
 
     # Remove Embeddings
@@ -74,6 +74,7 @@ def clear_embeddings(index_name: str) -> dict[str, Any]:
             del item_metadata["embedding"]
             # No need to update metadata_dict[key] = item_metadata, deletion modifies the original dict item
             cleared_count += 1
+            cleared_keys.append(key)
             needs_saving = True
 
     if not needs_saving:
@@ -87,8 +88,10 @@ def clear_embeddings(index_name: str) -> dict[str, Any]:
     # Save with Retry
     for attempt in range(MAX_RETRIES):
         try:
-            with open(meta_path, "wb") as f:
-                pickle.dump(loaded_data, f)
+            append_records(
+                meta_path,
+                [{"op": "unset", "keys": cleared_keys, "fields": ["embedding"]}],
+            )
             logger.info(
                 f"Successfully cleared embeddings from {cleared_count} nodes in '{index_name}'."
             )
@@ -1,8 +1,9 @@
 import os
-import pickle
 import time
 from typing import Any
 
+from .faiss_metadata_journal import load_metadata
+
 FAISS_DIR = "ADK/agent_data/faiss_indices"
 MAX_RETRIES = 3
 RETRY_DELAY = 1  # seconds
@@ -41,8 +42,7 @@ def detect_anomalies(index_name: str) -> dict[str, Any]:
     # --- Load with Retry ---
     for attempt in range(MAX_RETRIES):
         try:
-            with open(meta_path, "rb") as f:
-                loaded_data = pickle.load(f)
+            loaded_data = load_metadata(meta_path)
             break
         except FileNotFoundError:
             return {
@@ -1,7 +1,6 @@
 import asyncio
 import logging
 import os
-import pickle
 import sys
 import time
 from typing import Any
@@ -11,6 +10,12 @@ from sklearn.metrics.pairwise import cosine_similarity
 
 from agent_data_manager.agent.agent_data_agent import AgentDataAgent
 
+from ..utils.chunking import estimate_tokens
+from ..utils.rate_limiter import get_rate_limiter
+from ..utils.resilience import CircuitOpenError, call_upstream
+from .faiss_metadata_journal import append_records, load_metadata
+from .prometheus_metrics import record_embedding_request
+
 # --- Setup Logger ---
 # Moved logger initialization to the top
 logger = logging.getLogger(__name__)
@@ -19,39 +24,18 @@ logging.basicConfig(level=logging.INFO)  # Add basic config if not configured el
 # Attempt to import external dependencies, handle gracefully if not present
 try:
     import openai
-    from retry import retry as retry_decorator
 
     OPENAI_AVAILABLE = True
     logger.info("OpenAI import successful.")
-    # Define the actual retry decorator only if openai is available
-    openai_retry = retry_decorator(
-        openai.APIError, tries=3, delay=2, backoff=2, logger=logging.getLogger(__name__)
-    )
 except ImportError as e:
     logger.error(f"OpenAI import failed: {e}", exc_info=True)
     print(f"ERROR: OpenAI import failed: {e}", file=sys.stderr)
     openai = None
-
-    # Define dummy decorator if retry or openai is not installed
-    def retry_decorator(*args, **kwargs):
-        return lambda f: f
-
-    def openai_retry(f):
-        return f  # Dummy decorator that does nothing
-
     OPENAI_AVAILABLE = False
 except Exception as e:
     logger.error(f"Unexpected error during OpenAI import: {e}", exc_info=True)
     print(f"ERROR: Unexpected OpenAI import error: {e}", file=sys.stderr)
     openai = None
-
-    # Define dummy decorator if retry or openai is not installed
-    def retry_decorator(*args, **kwargs):
-        return lambda f: f
-
-    def openai_retry(f):
-        return f  # Dummy decorator that does nothing
-
     OPENAI_AVAILABLE = False
 
 try:
@@ -80,6 +64,17 @@ RETRY_DELAY_API = 2  # seconds for external API calls
 RETRY_DELAY_IO = 1  # seconds for local I/O
 EMBEDDING_MODEL = "text-embedding-3-small"  # Or another model
 TOP_N_DEFAULT = 5  # Max number of similar items to return
+# Per-request limits of the OpenAI embeddings endpoint
+EMBEDDING_MAX_INPUTS_PER_REQUEST = 2048
+EMBEDDING_MAX_TOKENS_PER_REQUEST = 300_000
+# How the API reports a request over its token or input limits
+REQUEST_TOO_LARGE_CODES = ("context_length_exceeded", "max_tokens_per_request")
+REQUEST_TOO_LARGE_MESSAGES = (
+    "maximum context length",
+    "tokens per request",
+    "too many tokens",
+    "too many inputs",
+)
 
 # --- OpenAI Client Setup ---
 openai_client = None
@@ -91,7 +86,8 @@ openai_api_key = os.environ.get(
 if OPENAI_AVAILABLE and openai_api_key:
     try:
         openai_client = openai.OpenAI(api_key=openai_api_key)
-        openai_async_client = openai.AsyncOpenAI(api_key=openai_api_key)
+        # Retries go through utils.resilience, not the SDK's own retry loop
+        openai_async_client = openai.AsyncOpenAI(api_key=openai_api_key, max_retries=0)
         logger.info("OpenAI client initialized successfully via external registry.")
     except openai.OpenAIError as e:
         logger.error(f"Error initializing OpenAI client in external registry: {e}")
@@ -111,19 +107,42 @@ else:
 # --- Tool Implementations (Moved from individual files) ---
 
 
+async def _create_embeddings(
+    texts: list[str],
+    model_name: str,
+    encoding_format: str,
+    tokens: int,
+    dimensions: int | None = None,
+):
+    """One embeddings request, paced and adapted by the shared OpenAI rate limiter."""
+    limiter = get_rate_limiter("openai")
+    await limiter.acquire(tokens)
+    # Only text-embedding-3 models accept a reduced output dimension
+    extra = {"dimensions": dimensions} if dimensions else {}
+    try:
+        response = await openai_async_client.embeddings.create(
+            input=texts, model=model_name, encoding_format=encoding_format, **extra
+        )
+    except openai.APIStatusError as e:
+        limiter.observe_response(e.status_code, e.response.headers)
+        raise
+    limiter.observe_response(200)
+    return response
+
+
 # --- generate_embedding_real_tool ---
-@openai_retry
 async def get_openai_embedding(
     agent_context: AgentDataAgent,
     text_to_embed: str | list[str],
     model_name: str = EMBEDDING_MODEL,
     encoding_format: str = "float",
 ) -> dict[str, Any]:
-    """Gets embedding for a text or list of texts using OpenAI API with retries."""
-    print(
-        "<<<< DEBUG: GET_OPENAI_EMBEDDING ENTERED (external_tool_registry.py) >>>>"
-    )  # DEBUG ADDED
-    # print(f"INSIDE get_openai_embedding, type of agent_context: {type(agent_context)}")
+    """
+    Gets embedding for a text or list of texts using OpenAI API.
+
+    Transient failures are retried by ``call_upstream``; the error that ends
+    the retries is returned as an ``error``/``status_code`` dict.
+    """
     if not openai_async_client:
         logger.warning("OpenAI async client not initialized. Cannot get embedding.")
         # Consistent error return for awaitable function
@@ -137,34 +156,35 @@ async def get_openai_embedding(
     # API recommendation: replace newlines
     processed_texts = [text.replace("\\n", " ") for text in input_texts]
 
+    tokens = sum(estimate_tokens(text) for text in processed_texts)
     try:
-        # logger.debug(f"Requesting OpenAI embedding for: {processed_texts} with model: {model_name}, format: {encoding_format}")
-        print(
-            "<<<< DEBUG: GET_OPENAI_EMBEDDING BEFORE openai_async_client.embeddings.create >>>>"
-        )  # DEBUG ADDED
-        response = await openai_async_client.embeddings.create(
-            input=processed_texts, model=model_name, encoding_format=encoding_format
+        logger.debug(
+            "Requesting OpenAI embedding for %d text(s) with model %s",
+            len(processed_texts),
+            model_name,
+        )
+        response = await call_upstream(
+            "openai",
+            lambda: _create_embeddings(
+                processed_texts, model_name, encoding_format, tokens
+            ),
+            idempotent=True,
         )
-        print(
-            "<<<< DEBUG: GET_OPENAI_EMBEDDING AFTER openai_async_client.embeddings.create >>>>"
-        )  # DEBUG ADDED
-        # logger.debug(f"OpenAI embedding response received. Usage: {response.usage}")
-        # Assuming a single embedding or first if multiple texts were for a single conceptual embedding
+        # "embedding" is the first vector, kept for single-text callers
+        embeddings = [
+            item.embedding for item in sorted(response.data, key=lambda d: d.index)
+        ]
         result_dict = {
-            "embedding": response.data[0].embedding,
+            "embedding": embeddings[0],
+            "embeddings": embeddings,
             "total_tokens": response.usage.total_tokens if response.usage else 0,
             "model_used": response.model,
         }
-        # print(f"DEBUG get_openai_embedding returning: {result_dict.keys()}") # DEBUG REMOVED
         return result_dict
     except (
         openai.APIError
     ) as e:  # Renamed from APIConnectionError, RateLimitError, APIStatusError for broader catch
         logger.error(f"OpenAI API request failed to connect: {e}")
-        # Consider if retry decorator handles this, or if specific return is needed.
-        # For now, let retry handle it by re-raising, or return error if retry is exhausted.
-        # If retry_decorator is a no-op (OPENAI_AVAILABLE=False), this will just propagate.
-        # However, OPENAI_AVAILABLE check above should prevent this path if false.
         return {
             "error": f"OpenAI APIConnectionError: {e}",
             "status_code": e.status_code if hasattr(e, "status_code") else 503,
@@ -181,10 +201,150 @@ async def get_openai_embedding(
             "error": f"OpenAI APIStatusError: {e.message}",
             "status_code": e.status_code,
         }
+    except CircuitOpenError as e:
+        logger.error(f"OpenAI embedding request not sent: {e}")
+        return {"error": str(e), "status_code": 503}
+    except Exception as e:
+        logger.error(
+            f"An unexpected error occurred during OpenAI API call: {e}", exc_info=True
+        )
+        return {
+            "error": f"Unexpected error during OpenAI API call: {e}",
+            "status_code": 500,
+        }
+
+
+def plan_embedding_batches(
+    texts: list[str],
+    max_inputs: int = EMBEDDING_MAX_INPUTS_PER_REQUEST,
+    max_tokens: int = EMBEDDING_MAX_TOKENS_PER_REQUEST,
+    token_counts: list[int] | None = None,
+) -> list[list[int]]:
+    """
+    Group text positions into requests within the per-request limits.
+
+    Texts keep their order; a text over ``max_tokens`` on its own gets a request
+    to itself so the API can reject it without failing its neighbours.
+    ``token_counts`` are estimated from the texts when not given.
+    """
+    if token_counts is None:
+        token_counts = [estimate_tokens(text) for text in texts]
+    batches: list[list[int]] = []
+    current: list[int] = []
+    current_tokens = 0
+    for i, tokens in enumerate(token_counts):
+        if current and (
+            len(current) >= max_inputs or current_tokens + tokens > max_tokens
+        ):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _is_request_too_large(error: "openai.BadRequestError") -> bool:
+    """Whether a 400 says the request exceeded a token or input limit."""
+    if getattr(error, "code", None) in REQUEST_TOO_LARGE_CODES:
+        return True
+    message = str(error).lower()
+    return any(fragment in message for fragment in REQUEST_TOO_LARGE_MESSAGES)
+
+
+async def get_openai_embeddings_batch(
+    agent_context: AgentDataAgent | None,
+    texts: list[str],
+    model_name: str = EMBEDDING_MODEL,
+    encoding_format: str = "float",
+    max_inputs: int = EMBEDDING_MAX_INPUTS_PER_REQUEST,
+    max_tokens: int = EMBEDDING_MAX_TOKENS_PER_REQUEST,
+    dimensions: int | None = None,
+) -> dict[str, Any]:
+    """
+    Embed many texts with as few OpenAI requests as the limits allow.
+
+    Texts are packed into requests of at most ``max_inputs`` texts and
+    ``max_tokens`` estimated tokens. A request the API rejects as too large
+    (a 400 for the context length or per-request limits) is split in half and
+    retried, down to single texts, whose failures are reported in ``errors``;
+    other 400s fail the whole call. Each request first waits
+    on the shared OpenAI rate limiter (a 429 pauses it for ``Retry-After``) and
+    transient failures are retried by ``call_upstream``. Any other API error,
+    or a transient one that outlasts the retries, aborts the call.
+    ``dimensions`` asks text-embedding-3 models for shortened vectors.
+
+    Returns:
+        ``embeddings`` in input order (None for texts in ``errors``),
+        ``total_tokens``, ``model_used`` and per-request ``batches`` usage; or
+        ``error`` and ``status_code`` when the call failed
+    """
+    if not openai_async_client:
+        logger.warning("OpenAI async client not initialized. Cannot get embeddings.")
+        return {"error": "OpenAI async client not initialized", "status_code": 500}
+
+    processed_texts = [text.replace("\\n", " ") for text in texts]
+    token_counts = [estimate_tokens(text) for text in processed_texts]
+    embeddings: list[list[float] | None] = [None] * len(texts)
+    errors: dict[int, str] = {}
+    batches: list[dict[str, int]] = []
+    model_used = model_name
+
+    async def embed_positions(positions: list[int]):
+        nonlocal model_used
+        texts_to_embed = [processed_texts[i] for i in positions]
+        tokens = sum(token_counts[i] for i in positions)
+        try:
+            response = await call_upstream(
+                "openai",
+                lambda: _create_embeddings(
+                    texts_to_embed, model_name, encoding_format, tokens, dimensions
+                ),
+            )
+        except openai.BadRequestError as e:
+            if not _is_request_too_large(e):
+                raise
+            if len(positions) == 1:
+                logger.error(f"OpenAI rejected text {positions[0]} for embedding: {e}")
+                errors[positions[0]] = f"OpenAI BadRequestError: {e}"
+                return
+            middle = len(positions) // 2
+            logger.warning(
+                f"OpenAI rejected a {len(positions)}-text embedding request, splitting it: {e}"
+            )
+            await embed_positions(positions[:middle])
+            await embed_positions(positions[middle:])
+            return
+
+        for item in response.data:
+            embeddings[positions[item.index]] = item.embedding
+        tokens = response.usage.total_tokens if response.usage else 0
+        model_used = response.model
+        batches.append({"inputs": len(positions), "total_tokens": tokens})
+        record_embedding_request(model_used, len(positions), tokens)
+        logger.debug(
+            f"Embedded {len(positions)} text(s) with {model_used} using {tokens} tokens"
+        )
+
+    try:
+        for positions in plan_embedding_batches(
+            texts, max_inputs, max_tokens, token_counts
+        ):
+            await embed_positions(positions)
+    except openai.APIStatusError as e:
+        logger.error(f"OpenAI API returned an API Error: {e.status_code} {e.response}")
+        return {
+            "error": f"OpenAI APIStatusError: {e.message}",
+            "status_code": e.status_code,
+        }
+    except openai.APIError as e:
+        logger.error(f"OpenAI API request failed: {e}")
+        return {"error": f"OpenAI APIError: {e}", "status_code": 503}
+    except CircuitOpenError as e:
+        logger.error(f"OpenAI embedding request not sent: {e}")
+        return {"error": str(e), "status_code": 503}
     except Exception as e:
-        print(
-            f"<<<< DEBUG: GET_OPENAI_EMBEDDING CAUGHT EXCEPTION: {type(e).__name__} - {str(e)} >>>>"
-        )  # DEBUG ADDED
         logger.error(
             f"An unexpected error occurred during OpenAI API call: {e}", exc_info=True
         )
@@ -193,6 +353,14 @@ async def get_openai_embedding(
             "status_code": 500,
         }
 
+    return {
+        "embeddings": embeddings,
+        "total_tokens": sum(batch["total_tokens"] for batch in batches),
+        "model_used": model_used,
+        "batches": batches,
+        "errors": errors,
+    }
+
 
 def generate_embedding_real(
     index_name: str, key: str, text_field: str = "content"
@@ -234,8 +402,7 @@ def generate_embedding_real(
     # Load existing data
     try:
         # Simple load, retry handled by caller if needed, but critical failure if meta is bad
-        with open(meta_path, "rb") as f:
-            loaded_data = pickle.load(f)
+        loaded_data = load_metadata(meta_path)
     except Exception as e:
         return {
             "status": "failed",
@@ -330,8 +497,16 @@ def generate_embedding_real(
     # --- Save Metadata with Retry ---
     for attempt in range(MAX_RETRIES):
         try:
-            with open(meta_path, "wb") as f:
-                pickle.dump(loaded_data, f)
+            append_records(
+                meta_path,
+                [
+                    {
+                        "op": "update",
+                        "keys": [key],
+                        "fields": {"embedding": real_embedding},
+                    }
+                ],
+            )
 
             embedding_dim = len(real_embedding)
             logger.info(
@@ -431,8 +606,7 @@ def semantic_search_cosine(
     loaded_data = None
     # --- Load metadata --- (Simple load, critical failure if meta is bad)
     try:
-        with open(meta_path, "rb") as f:
-            loaded_data = pickle.load(f)
+        loaded_data = load_metadata(meta_path)
     except FileNotFoundError:
         return {
             "status": "failed",
@@ -565,8 +739,7 @@ def clear_embeddings(index_name: str) -> dict[str, Any]:
     # --- Load with Retry ---
     for attempt in range(MAX_RETRIES):
         try:
-            with open(meta_path, "rb") as f:
-                loaded_data = pickle.load(f)
+            loaded_data = load_metadata(meta_path)
             break  # Success
         except FileNotFoundError:
             return {
@@ -593,6 +766,7 @@ def clear_embeddings(index_name: str) -> dict[str, Any]:
 
     metadata_dict = loaded_data["metadata"]
     cleared_count = 0
+    cleared_keys = []
     needs_saving = False
 
     # --- Remove Embeddings ---
@@ -602,6 +776,7 @@ def clear_embeddings(index_name: str) -> dict[str, Any]:
             del item_metadata["embedding"]
             metadata_dict[key] = item_metadata  # Update dict in place
             cleared_count += 1
+            cleared_keys.append(key)
             needs_saving = True
 
     if not needs_saving:
@@ -619,8 +794,10 @@ def clear_embeddings(index_name: str) -> dict[str, Any]:
     # --- Save with Retry ---
     for attempt in range(MAX_RETRIES):
         try:
-            with open(meta_path, "wb") as f:
-                pickle.dump(loaded_data, f)
+            append_records(
+                meta_path,
+                [{"op": "unset", "keys": cleared_keys, "fields": ["embedding"]}],
+            )
 
             logger.info(
                 f"Successfully cleared embeddings from {cleared_count} nodes in index '{index_name}'."
@@ -0,0 +1,299 @@
+"""Append-only mutation journal for local FAISS ``.meta`` files.
+
+The metadata tools used to unpickle the whole ``{index}.meta`` snapshot, change
+a few fields and pickle the whole file back, without any locking: concurrent
+callers silently lost each other's updates and a one-field edit rewrote the
+entire file. Mutations are now appended to ``{index}.meta.journal`` instead:
+
+- each record is a length- and CRC-framed pickle, flushed and fsync'd before
+  the append returns
+- writers hold an exclusive advisory lock on ``{index}.meta.lock``, readers a
+  shared one, so a reader never sees a half-compacted index
+- ``load_metadata`` replays the journal over the snapshot; a torn record at the
+  tail (crash mid-append) is ignored, and the next append truncates it first
+- once the journal passes ``COMPACT_THRESHOLD_BYTES`` it is folded into a new
+  snapshot, which is written to a temp file and renamed into place
+
+Record operations:
+
+- ``{"op": "update", "keys": [...], "fields": {...}}`` sets fields on nodes
+- ``{"op": "unset", "keys": [...], "fields": [...]}`` removes fields from nodes
+- ``{"op": "delete", "keys": [...]}`` removes nodes and their FAISS id mapping
+
+Tools that rewrite every node (batch embedding generation) keep writing whole
+snapshots through ``write_metadata_snapshot``, which also resets the journal.
+"""
+
+import contextlib
+import logging
+import os
+import pickle
+import struct
+import threading
+import zlib
+from collections.abc import Iterator
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_SUFFIX = ".journal"
+LOCK_SUFFIX = ".lock"
+COMPACT_THRESHOLD_BYTES = 1024 * 1024  # 1 MiB
+
+_HEADER = struct.Struct(">II")  # payload length, crc32
+_OPS = ("update", "unset", "delete")
+
+# Lock modes held by the current thread, so nested calls do not re-lock
+_held_locks = threading.local()
+# Fallback when fcntl is unavailable: serialize within the process only
+_process_locks: dict[str, threading.RLock] = {}
+_process_locks_guard = threading.Lock()
+
+
+def journal_path(meta_path: str) -> str:
+    return meta_path + JOURNAL_SUFFIX
+
+
+@contextlib.contextmanager
+def metadata_lock(meta_path: str, exclusive: bool = True) -> Iterator[None]:
+    """
+    Hold an advisory lock for a metadata snapshot and its journal.
+
+    Re-entrant per thread; a thread holding a shared lock cannot upgrade it.
+    """
+    held = getattr(_held_locks, "modes", None)
+    if held is None:
+        held = _held_locks.modes = {}
+
+    key = os.path.abspath(meta_path)
+    if key in held:
+        if exclusive and not held[key]:
+            raise RuntimeError(f"Cannot upgrade shared lock on '{meta_path}'")
+        yield
+        return
+
+    held[key] = exclusive
+    try:
+        if fcntl is None:
+            with _process_locks_guard:
+                lock = _process_locks.setdefault(key, threading.RLock())
+            with lock:
+                yield
+            return
+
+        with open(meta_path + LOCK_SUFFIX, "a+b") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    finally:
+        del held[key]
+
+
+def _fsync_dir(path: str):
+    """Persist a rename by syncing the containing directory, where supported."""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _intact_payloads(data: bytes) -> tuple[list[bytes], int]:
+    """
+    Split journal bytes into record payloads up to the first torn or corrupt frame.
+
+    Returns:
+        The intact payloads and the offset where the intact frames end
+    """
+    payloads = []
+    offset = 0
+    while offset + _HEADER.size <= len(data):
+        length, crc = _HEADER.unpack_from(data, offset)
+        payload = data[offset + _HEADER.size : offset + _HEADER.size + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            break
+        payloads.append(payload)
+        offset += _HEADER.size + length
+    return payloads, offset
+
+
+def _read_records(meta_path: str) -> list[dict[str, Any]]:
+    """Read intact journal records, stopping at a torn or corrupt tail."""
+    try:
+        with open(journal_path(meta_path), "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return []
+
+    payloads, offset = _intact_payloads(data)
+    records = [pickle.loads(payload) for payload in payloads]
+    if offset < len(data):
+        logger.warning(
+            f"Ignoring {len(data) - offset} trailing bytes in journal for '{meta_path}'"
+        )
+    return records
+
+
+def apply_records(loaded_data: dict[str, Any], records: list[dict[str, Any]]) -> set:
+    """
+    Apply journal records to loaded metadata in place.
+
+    Returns:
+        FAISS ids whose nodes were deleted
+    """
+    metadata = loaded_data["metadata"]
+    id_to_key = loaded_data.get("id_to_key")
+    key_to_id = loaded_data.get("key_to_id")
+    removed_ids = set()
+
+    for record in records:
+        op = record["op"]
+        for key in record["keys"]:
+            node = metadata.get(key)
+            if op == "update" and isinstance(node, dict):
+                node.update(record["fields"])
+            elif op == "unset" and isinstance(node, dict):
+                for field in record["fields"]:
+                    node.pop(field, None)
+            elif op == "delete" and key in metadata:
+                del metadata[key]
+                faiss_id = key_to_id.pop(key, None) if key_to_id is not None else None
+                if faiss_id is not None:
+                    removed_ids.add(faiss_id)
+                    if id_to_key is not None:
+                        id_to_key.pop(faiss_id, None)
+    return removed_ids
+
+
+def load_metadata(meta_path: str) -> Any:
+    """Load a metadata snapshot with its journal replayed over it."""
+    with metadata_lock(meta_path, exclusive=False):
+        with open(meta_path, "rb") as f:
+            loaded_data = pickle.load(f)
+        records = _read_records(meta_path)
+
+    if records and isinstance(loaded_data, dict) and "metadata" in loaded_data:
+        apply_records(loaded_data, records)
+    return loaded_data
+
+
+def write_metadata_snapshot(meta_path: str, loaded_data: Any):
+    """Atomically replace the snapshot and discard the journal it supersedes."""
+    with metadata_lock(meta_path):
+        tmp_path = f"{meta_path}.tmp.{os.getpid()}.{threading.get_ident()}"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(loaded_data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, meta_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(journal_path(meta_path))
+        _fsync_dir(meta_path)
+
+
+def _remove_faiss_ids(index_path: str, loaded_data: dict[str, Any], removed: set):
+    """Drop deleted vectors from the FAISS index next to the snapshot."""
+    import faiss
+    import numpy as np
+
+    index = faiss.read_index(index_path)
+    index.remove_ids(np.array(sorted(removed), dtype="int64"))
+    if not isinstance(index, faiss.IndexIDMap) and loaded_data.get("id_to_key"):
+        # Plain indexes renumber remaining vectors sequentially
+        surviving = sorted(loaded_data["id_to_key"].items())
+        loaded_data["id_to_key"] = {i: key for i, (_, key) in enumerate(surviving)}
+        loaded_data["key_to_id"] = {
+            key: i for i, key in loaded_data["id_to_key"].items()
+        }
+    faiss.write_index(index, index_path)
+
+
+def compact(meta_path: str, index_path: str | None = None) -> int:
+    """
+    Fold the journal into a new snapshot.
+
+    Deleted nodes are also removed from the FAISS index at ``index_path``; when
+    no node is left, the index, snapshot and journal files are removed.
+
+    Returns:
+        Number of journal records folded
+    """
+    with metadata_lock(meta_path):
+        records = _read_records(meta_path)
+        if not records:
+            return 0
+
+        with open(meta_path, "rb") as f:
+            loaded_data = pickle.load(f)
+        removed_ids = apply_records(loaded_data, records)
+
+        if not loaded_data["metadata"]:
+            for path in (index_path, meta_path, journal_path(meta_path)):
+                if path and os.path.exists(path):
+                    os.remove(path)
+            return len(records)
+
+        if removed_ids and index_path and os.path.exists(index_path):
+            _remove_faiss_ids(index_path, loaded_data, removed_ids)
+        write_metadata_snapshot(meta_path, loaded_data)
+
+    logger.info(f"Compacted {len(records)} journal records into '{meta_path}'")
+    return len(records)
+
+
+def append_records(
+    meta_path: str, records: list[dict[str, Any]], index_path: str | None = None
+):
+    """
+    Durably append mutation records, compacting once the journal is large.
+
+    Raises:
+        ValueError: If a record has an unknown operation
+    """
+    frames = []
+    for record in records:
+        if record.get("op") not in _OPS:
+            raise ValueError(f"Unknown journal operation: {record.get('op')!r}")
+        payload = pickle.dumps(record)
+        frames.append(_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+
+    with metadata_lock(meta_path):
+        with open(journal_path(meta_path), "a+b") as f:
+            f.seek(0)
+            data = f.read()
+            start = _intact_payloads(data)[1]
+            if start < len(data):
+                # Records appended behind a torn frame would never be read back
+                logger.warning(
+                    f"Truncating {len(data) - start} torn bytes from journal for '{meta_path}'"
+                )
+                f.truncate(start)
+            try:
+                f.write(b"".join(frames))
+                f.flush()
+                os.fsync(f.fileno())
+            except Exception:
+                # Never leave a torn frame in front of later appends
+                f.truncate(start)
+                raise
+            journal_size = f.tell()
+
+        if journal_size >= COMPACT_THRESHOLD_BYTES:
+            compact(meta_path, index_path)
@@ -1,9 +1,11 @@
 import logging
 import os
-import pickle
 import time
 from typing import Any
 
+from .external_tool_registry import FAISS_AVAILABLE, get_openai_embedding, openai_client
+from .faiss_metadata_journal import append_records, load_metadata
+
 # Removed direct OpenAI client import/setup and get_secret - handled by external registry
 # Removed direct retry import - handled by external registry
 # Removed direct secret manager import - handled by external registry
@@ -17,7 +19,6 @@ RETRY_DELAY_IO = 1
 
 # The actual tool function - expects get_openai_embedding to be available if called
 # It will be called *by* the external registry, which handles client setup.
-from .external_tool_registry import FAISS_AVAILABLE, get_openai_embedding, openai_client
 
 
 def generate_embedding_real(
@@ -41,8 +42,7 @@ def generate_embedding_real(
         }
 
     try:
-        with open(meta_path, "rb") as f:
-            loaded_data = pickle.load(f)
+        loaded_data = load_metadata(meta_path)
     except Exception as e:
         return {
             "status": "failed",
@@ -102,8 +102,16 @@ def generate_embedding_real(
     # Save Metadata with Retry
     for attempt in range(MAX_RETRIES):
         try:
-            with open(meta_path, "wb") as f:
-                pickle.dump(loaded_data, f)
+            append_records(
+                meta_path,
+                [
+                    {
+                        "op": "update",
+                        "keys": [key],
+                        "fields": {"embedding": real_embedding},
+                    }
+                ],
+            )
             embedding_dim = len(real_embedding)
             logger.info(
                 f"Successfully generated/saved real embedding (dim={embedding_dim}) for key '{key}'."
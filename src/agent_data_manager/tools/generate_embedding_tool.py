@@ -1,10 +1,11 @@
 import os
-import pickle
 import time
 from typing import Any
 
 import numpy as np
 
+from .faiss_metadata_journal import append_records, load_metadata
+
 FAISS_DIR = "ADK/agent_data/faiss_indices"
 MAX_RETRIES = 3
 RETRY_DELAY = 1  # seconds
@@ -40,8 +41,7 @@ def generate_embedding(index_name: str, key: str) -> dict[str, Any]:
     # --- Load with Retry ---
     for attempt in range(MAX_RETRIES):
         try:
-            with open(meta_path, "rb") as f:
-                loaded_data = pickle.load(f)
+            loaded_data = load_metadata(meta_path)
             break
         except FileNotFoundError:
             return {
@@ -89,8 +89,17 @@ def generate_embedding(index_name: str, key: str) -> dict[str, Any]:
     # --- Save with Retry ---
     for attempt in range(MAX_RETRIES):
         try:
-            with open(meta_path, "wb") as f:
-                pickle.dump(loaded_data, f)
+            append_records(
+                meta_path,
+                [
+                    {
+                        "op": "update",
+                        "keys": [key],
+                        "fields": {"embedding": mock_embedding},
+                    }
+                ],
+                index_path=index_path,
+            )
 
             print(
                 f"Successfully generated and saved embedding for key '{key}' in index '{index_name}'."
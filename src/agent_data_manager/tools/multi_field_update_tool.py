@@ -1,8 +1,9 @@
 import os
-import pickle
 import time
 from typing import Any
 
+from .faiss_metadata_journal import append_records, load_metadata
+
 FAISS_DIR = "ADK/agent_data/faiss_indices"
 MAX_RETRIES = 3
 RETRY_DELAY = 1  # seconds
@@ -43,8 +44,7 @@ def multi_field_update(
     # --- Load with Retry ---
     for attempt in range(MAX_RETRIES):
         try:
-            with open(meta_path, "rb") as f:
-                loaded_data = pickle.load(f)
+            loaded_data = load_metadata(meta_path)
             break
         except FileNotFoundError:
             return {
@@ -93,8 +93,11 @@ def multi_field_update(
     # --- Save with Retry ---
     for attempt in range(MAX_RETRIES):
         try:
-            with open(meta_path, "wb") as f:
-                pickle.dump(loaded_data, f)
+            append_records(
+                meta_path,
+                [{"op": "update", "keys": [key], "fields": updates}],
+                index_path=index_path,
+            )
 
             # Optionally: Reload to confirm save? For now, assume success.
             print(
@@ -69,6 +69,123 @@ embedding_generation_duration_seconds = Histogram(
     registry=qdrant_registry,
 )
 
+embedding_request_inputs = Histogram(
+    "embedding_request_inputs",
+    "Texts sent per embedding API request",
+    buckets=(1, 4, 16, 64, 256, 1024, 2048),
+    registry=qdrant_registry,
+)
+
+embedding_tokens_total = Counter(
+    "embedding_tokens_total",
+    "Tokens consumed by embedding API requests",
+    ["model"],
+    registry=qdrant_registry,
+)
+
+embedding_dispatch_queue_depth = Gauge(
+    "embedding_dispatch_queue_depth",
+    "Texts waiting in the embedding dispatcher for their batch to be sent",
+    registry=qdrant_registry,
+)
+
+embedding_dispatch_batch_size = Histogram(
+    "embedding_dispatch_batch_size",
+    "Texts coalesced into one embedding dispatcher request",
+    ["reason"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+    registry=qdrant_registry,
+)
+
+embedding_dispatch_latency_seconds = Histogram(
+    "embedding_dispatch_latency_seconds",
+    "Time from queueing a text in the embedding dispatcher to its vector",
+    ["stage"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+    registry=qdrant_registry,
+)
+
+# Upstream rate limiter metrics
+rate_limiter_wait_seconds = Histogram(
+    "rate_limiter_wait_seconds",
+    "Time calls waited on an upstream rate limiter before being sent",
+    ["upstream"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+    registry=qdrant_registry,
+)
+
+rate_limiter_throttled_total = Counter(
+    "rate_limiter_throttled_total",
+    "Rate-limit (429) responses received from an upstream",
+    ["upstream"],
+    registry=qdrant_registry,
+)
+
+rate_limiter_rate_per_minute = Gauge(
+    "rate_limiter_rate_per_minute",
+    "Current refill rate of an upstream rate limiter bucket",
+    ["upstream", "bucket"],
+    registry=qdrant_registry,
+)
+
+# Upstream retry, hedging and circuit breaker metrics
+upstream_retries_total = Counter(
+    "upstream_retries_total",
+    "Upstream calls retried after a transient failure",
+    ["upstream"],
+    registry=qdrant_registry,
+)
+
+upstream_hedged_requests_total = Counter(
+    "upstream_hedged_requests_total",
+    "Hedged upstream reads, by which request answered first",
+    ["upstream", "winner"],
+    registry=qdrant_registry,
+)
+
+circuit_breaker_state = Gauge(
+    "circuit_breaker_state",
+    "Upstream circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ["upstream"],
+    registry=qdrant_registry,
+)
+
+circuit_breaker_rejections_total = Counter(
+    "circuit_breaker_rejections_total",
+    "Upstream calls rejected because the circuit breaker was open",
+    ["upstream"],
+    registry=qdrant_registry,
+)
+
+# Shared QdrantStore registry and client pool metrics
+qdrant_store_registry_lookups_total = Counter(
+    "qdrant_store_registry_lookups_total",
+    "QdrantStore registry lookups, by whether a shared store was reused",
+    ["result"],
+    registry=qdrant_registry,
+)
+
+qdrant_client_pool_clients = Gauge(
+    "qdrant_client_pool_clients",
+    "Pooled Qdrant clients",
+    ["transport"],
+    registry=qdrant_registry,
+)
+
+qdrant_client_pool_in_flight = Gauge(
+    "qdrant_client_pool_in_flight",
+    "Qdrant calls in flight on pooled clients",
+    ["transport"],
+    registry=qdrant_registry,
+)
+
+qdrant_client_pool_utilization = Gauge(
+    "qdrant_client_pool_utilization",
+    "Qdrant calls in flight as a fraction of the pooled connections",
+    ["transport"],
+    registry=qdrant_registry,
+)
+
 # A2A API metrics
 a2a_api_requests_total = Counter(
     "a2a_api_requests_total",
@@ -109,6 +226,34 @@ rag_cache_misses_total = Counter(
     registry=qdrant_registry,
 )
 
+rag_cache_events_total = Counter(
+    "rag_cache_events_total",
+    "RAG cache stale serves, background refreshes, write invalidations and backend errors",
+    ["event"],
+    registry=qdrant_registry,
+)
+
+semantic_cache_lookups_total = Counter(
+    "semantic_cache_lookups_total",
+    "Semantic (near-duplicate query) cache lookups",
+    ["result"],
+    registry=qdrant_registry,
+)
+
+semantic_cache_hit_similarity = Histogram(
+    "semantic_cache_hit_similarity",
+    "Cosine similarity between a query and the cached query that served it",
+    buckets=(0.8, 0.85, 0.9, 0.925, 0.95, 0.96, 0.97, 0.98, 0.99, 1.0),
+    registry=qdrant_registry,
+)
+
+semantic_cache_samples_total = Counter(
+    "semantic_cache_samples_total",
+    "Semantic cache hits re-checked against a live search",
+    ["outcome"],
+    registry=qdrant_registry,
+)
+
 rag_results_count = Histogram(
     "rag_results_count",
     "Number of results returned by RAG searches",
@@ -130,6 +275,100 @@ cskh_query_duration_seconds = Histogram(
     registry=qdrant_registry,
 )
 
+# Authentication and event loop health metrics
+auth_login_duration_seconds = Histogram(
+    "auth_login_duration_seconds",
+    "Duration of login path stages in seconds",
+    ["stage"],
+    registry=qdrant_registry,
+)
+
+auth_token_cache_requests_total = Counter(
+    "auth_token_cache_requests_total",
+    "Verified token cache lookups",
+    ["result"],
+    registry=qdrant_registry,
+)
+
+auth_hash_pool_in_flight = Gauge(
+    "auth_hash_pool_in_flight",
+    "Password hashing jobs submitted to the worker pool and not yet finished",
+    registry=qdrant_registry,
+)
+
+event_loop_lag_seconds = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between scheduled and actual wake-up of the event loop probe",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+    registry=qdrant_registry,
+)
+
+# Sync tool wrapper metrics
+sync_tool_duration_seconds = Histogram(
+    "sync_tool_duration_seconds",
+    "Duration of sync tool wrapper calls in seconds, queueing included",
+    ["tool", "status"],
+    registry=qdrant_registry,
+)
+
+sync_tool_in_flight = Gauge(
+    "sync_tool_in_flight",
+    "Sync tool wrapper calls submitted to the tool loop and not yet finished",
+    registry=qdrant_registry,
+)
+
+# Reranking metrics
+rerank_duration_seconds = Histogram(
+    "rerank_duration_seconds",
+    "Duration of the rag_search reranking stage in seconds",
+    ["reranker", "outcome"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+    registry=qdrant_registry,
+)
+
+rerank_cache_lookups_total = Counter(
+    "rerank_cache_lookups_total",
+    "Reranking score cache lookups by result",
+    ["result"],
+    registry=qdrant_registry,
+)
+
+# Vector space re-embedding metrics
+reembed_points_total = Counter(
+    "vector_space_reembed_points_total",
+    "Points visited by vector space re-embedding jobs, by result",
+    ["space", "result"],
+    registry=qdrant_registry,
+)
+
+reembed_progress = Gauge(
+    "vector_space_reembed_progress",
+    "Share of the collection scanned by the latest re-embedding job of a space",
+    ["space"],
+    registry=qdrant_registry,
+)
+
+# Event publishing metrics
+event_queue_depth = Gauge(
+    "event_queue_depth",
+    "Events waiting in the in-process publish queue",
+    registry=qdrant_registry,
+)
+
+event_publish_duration_seconds = Histogram(
+    "event_publish_duration_seconds",
+    "Duration of Pub/Sub batch publish calls in seconds",
+    ["status"],
+    registry=qdrant_registry,
+)
+
+event_backpressure_total = Counter(
+    "event_backpressure_total",
+    "Events affected by publish queue backpressure",
+    ["policy"],
+    registry=qdrant_registry,
+)
+
 
 def push_to_pushgateway(
     gateway_url: str, job: str, registry: CollectorRegistry, timeout: int = 10
@@ -331,6 +570,157 @@ def record_embedding_generation(duration: float):
     embedding_generation_duration_seconds.observe(duration)
 
 
+def record_embedding_request(model: str, inputs: int, tokens: int):
+    """
+    Record one embedding API request.
+
+    Args:
+        model: Embedding model that served the request
+        inputs: Number of texts in the request
+        tokens: Tokens reported in the response usage
+    """
+    embedding_request_inputs.observe(inputs)
+    embedding_tokens_total.labels(model=model).inc(tokens)
+
+
+def update_embedding_dispatch_queue_depth(delta: int):
+    """
+    Adjust the number of texts waiting in the embedding dispatcher.
+
+    Args:
+        delta: Texts added (positive) or sent (negative)
+    """
+    embedding_dispatch_queue_depth.inc(delta)
+
+
+def record_embedding_dispatch_batch(size: int, reason: str):
+    """
+    Record a batch sent by the embedding dispatcher.
+
+    Args:
+        size: Texts in the batch
+        reason: Why it was sent (max_wait, max_size, max_tokens)
+    """
+    embedding_dispatch_batch_size.labels(reason=reason).observe(size)
+
+
+def record_embedding_dispatch_latency(stage: str, duration: float):
+    """
+    Record embedding dispatcher latency.
+
+    Args:
+        stage: "queued" (waiting for the batch) or "total" (until the vector)
+        duration: Duration in seconds
+    """
+    embedding_dispatch_latency_seconds.labels(stage=stage).observe(duration)
+
+
+def record_rate_limiter_wait(upstream: str, duration: float):
+    """
+    Record time a call waited on an upstream rate limiter.
+
+    Args:
+        upstream: Upstream service name (openai, qdrant, firestore)
+        duration: Wait in seconds
+    """
+    rate_limiter_wait_seconds.labels(upstream=upstream).observe(duration)
+
+
+def record_rate_limiter_throttle(upstream: str):
+    """
+    Record a rate-limit response from an upstream.
+
+    Args:
+        upstream: Upstream service name
+    """
+    rate_limiter_throttled_total.labels(upstream=upstream).inc()
+
+
+def update_rate_limiter_rate(upstream: str, bucket: str, rate_per_minute: float):
+    """
+    Update the current refill rate of a rate limiter bucket.
+
+    Args:
+        upstream: Upstream service name
+        bucket: "requests" or "tokens"
+        rate_per_minute: Refill rate after adapting to the upstream
+    """
+    rate_limiter_rate_per_minute.labels(upstream=upstream, bucket=bucket).set(
+        rate_per_minute
+    )
+
+
+def record_upstream_retry(upstream: str):
+    """
+    Record a retried upstream call.
+
+    Args:
+        upstream: Upstream service name (openai, qdrant, firestore)
+    """
+    upstream_retries_total.labels(upstream=upstream).inc()
+
+
+def record_upstream_hedge(upstream: str, winner: str):
+    """
+    Record a hedged upstream read.
+
+    Args:
+        upstream: Upstream service name
+        winner: "primary" or "hedge", whichever answered first
+    """
+    upstream_hedged_requests_total.labels(upstream=upstream, winner=winner).inc()
+
+
+def update_circuit_breaker_state(upstream: str, state: int):
+    """
+    Update the circuit breaker state of an upstream.
+
+    Args:
+        upstream: Upstream service name
+        state: 0 closed, 1 half-open, 2 open
+    """
+    circuit_breaker_state.labels(upstream=upstream).set(state)
+
+
+def record_circuit_breaker_rejection(upstream: str):
+    """
+    Record a call rejected by an open circuit breaker.
+
+    Args:
+        upstream: Upstream service name
+    """
+    circuit_breaker_rejections_total.labels(upstream=upstream).inc()
+
+
+def record_qdrant_store_lookup(reused: bool):
+    """
+    Record a QdrantStore registry lookup.
+
+    Args:
+        reused: Whether an existing shared store was returned
+    """
+    qdrant_store_registry_lookups_total.labels(result="hit" if reused else "miss").inc()
+
+
+def update_qdrant_client_pool(
+    transport: str, clients: int, in_flight: int, capacity: int
+):
+    """
+    Update the size and utilization of the pooled Qdrant clients.
+
+    Args:
+        transport: "http", "grpc" or "local"
+        clients: Pooled clients using the transport
+        in_flight: Calls in flight on those clients
+        capacity: Connections the clients may open in total
+    """
+    qdrant_client_pool_clients.labels(transport=transport).set(clients)
+    qdrant_client_pool_in_flight.labels(transport=transport).set(in_flight)
+    qdrant_client_pool_utilization.labels(transport=transport).set(
+        in_flight / capacity if capacity else 0
+    )
+
+
 def record_a2a_api_request(endpoint: str, status: str, duration: float):
     """
     Record A2A API request metrics.
@@ -376,6 +766,42 @@ def record_rag_search(
         rag_cache_misses_total.inc()
 
 
+def record_rag_cache_event(event: str):
+    """
+    Record a RAG cache lifecycle event.
+
+    Args:
+        event: Event type ('stale_hit', 'refresh', 'refresh_error', 'invalidated',
+            'error' for failing cache backend calls)
+    """
+    rag_cache_events_total.labels(event=event).inc()
+
+
+def record_semantic_cache_lookup(hit: bool, similarity: float | None = None):
+    """
+    Record a semantic cache lookup.
+
+    Args:
+        hit: Whether a near-duplicate cached query served the request
+        similarity: Similarity of the serving query for hits
+    """
+    semantic_cache_lookups_total.labels(result="hit" if hit else "miss").inc()
+    if hit and similarity is not None:
+        semantic_cache_hit_similarity.observe(similarity)
+
+
+def record_semantic_cache_sample(false_hit: bool):
+    """
+    Record the outcome of re-checking a semantic cache hit with a live search.
+
+    Args:
+        false_hit: Whether the live results differed from the served ones
+    """
+    semantic_cache_samples_total.labels(
+        outcome="false_hit" if false_hit else "match"
+    ).inc()
+
+
 def record_cskh_query(status: str, duration: float):
     """
     Record CSKH agent query metrics.
@@ -388,6 +814,150 @@ def record_cskh_query(status: str, duration: float):
     cskh_query_duration_seconds.observe(duration)
 
 
+def record_auth_login_stage(stage: str, duration: float):
+    """
+    Record the duration of a login path stage.
+
+    Args:
+        stage: Login stage ('lookup', 'verify', 'stats', 'total')
+        duration: Stage duration in seconds
+    """
+    auth_login_duration_seconds.labels(stage=stage).observe(duration)
+
+
+def record_auth_token_cache(hit: bool):
+    """
+    Record a verified token cache lookup.
+
+    Args:
+        hit: Whether the token was served from cache
+    """
+    auth_token_cache_requests_total.labels(result="hit" if hit else "miss").inc()
+
+
+def update_auth_hash_in_flight(delta: int):
+    """
+    Adjust the number of in-flight password hashing jobs.
+
+    Args:
+        delta: +1 when a job is submitted, -1 when it finishes
+    """
+    auth_hash_pool_in_flight.inc(delta)
+
+
+def record_event_loop_lag(lag: float):
+    """
+    Record an event loop lag sample.
+
+    Args:
+        lag: Observed lag in seconds
+    """
+    event_loop_lag_seconds.observe(lag)
+
+
+def record_sync_tool_call(tool: str, status: str, duration: float):
+    """
+    Record a sync tool wrapper call.
+
+    Args:
+        tool: Name of the async tool function
+        status: Call outcome (success, error, timeout)
+        duration: Call duration in seconds
+    """
+    sync_tool_duration_seconds.labels(tool=tool, status=status).observe(duration)
+
+
+def update_sync_tool_in_flight(delta: int):
+    """
+    Adjust the number of in-flight sync tool calls.
+
+    Args:
+        delta: +1 when a call is submitted, -1 when it finishes
+    """
+    sync_tool_in_flight.inc(delta)
+
+
+def record_rerank(reranker: str, outcome: str, duration: float):
+    """
+    Record a run of the reranking stage.
+
+    Args:
+        reranker: Name of the scorer
+        outcome: Stage outcome (success, timeout, error)
+        duration: Stage duration in seconds, cache lookups included
+    """
+    rerank_duration_seconds.labels(reranker=reranker, outcome=outcome).observe(duration)
+
+
+def record_rerank_cache_lookups(hits: int, misses: int):
+    """
+    Record reranking score cache lookups.
+
+    Args:
+        hits: Candidates whose score was cached
+        misses: Candidates that had to be scored
+    """
+    if hits:
+        rerank_cache_lookups_total.labels(result="hit").inc(hits)
+    if misses:
+        rerank_cache_lookups_total.labels(result="miss").inc(misses)
+
+
+def record_reembed_points(space: str, result: str, count: int):
+    """
+    Record points visited by a re-embedding job.
+
+    Args:
+        space: Vector space being filled
+        result: embedded, present (already had the vector), no_text or failed
+        count: Number of points
+    """
+    if count:
+        reembed_points_total.labels(space=space, result=result).inc(count)
+
+
+def update_reembed_progress(space: str, fraction: float):
+    """
+    Update the progress of a re-embedding job.
+
+    Args:
+        space: Vector space being filled
+        fraction: Share of the collection scanned, 0 to 1
+    """
+    reembed_progress.labels(space=space).set(fraction)
+
+
+def update_event_queue_depth(depth: int):
+    """
+    Update the event publish queue depth.
+
+    Args:
+        depth: Number of queued events
+    """
+    event_queue_depth.set(depth)
+
+
+def record_event_publish(status: str, duration: float):
+    """
+    Record an event batch publish call.
+
+    Args:
+        status: Publish status (success, error)
+        duration: Publish duration in seconds
+    """
+    event_publish_duration_seconds.labels(status=status).observe(duration)
+
+
+def record_event_backpressure(policy: str):
+    """
+    Record an event affected by queue backpressure.
+
+    Args:
+        policy: Backpressure policy applied (block, drop_oldest, spill)
+    """
+    event_backpressure_total.labels(policy=policy).inc()
+
+
 # Context manager for timing operations
 class MetricsTimer:
     """Context manager for timing operations and recording metrics."""
@@ -4,8 +4,8 @@ import asyncio
 import logging
 from typing import Any
 
-from ..config.settings import settings
 from ..vector_store.qdrant_store import QdrantStore
+from ..vector_store.qdrant_store import get_qdrant_store as get_shared_qdrant_store
 from .external_tool_registry import (
     OPENAI_AVAILABLE,
     get_openai_embedding,
@@ -16,14 +16,8 @@ logger = logging.getLogger(__name__)
 
 
 def get_qdrant_store() -> QdrantStore:
-    """Get or create QdrantStore instance."""
-    config = settings.get_qdrant_config()
-    return QdrantStore(
-        url=config["url"],
-        api_key=config["api_key"],
-        collection_name=config["collection_name"],
-        vector_size=config["vector_size"],
-    )
+    """Get the shared QdrantStore for the configured collection."""
+    return get_shared_qdrant_store()
 
 
 async def qdrant_generate_and_store_embedding(
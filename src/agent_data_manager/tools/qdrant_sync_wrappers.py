@@ -2,8 +2,12 @@
 
 import asyncio
 import logging
+import time
 from typing import Any
 
+from ..config.settings import settings
+from ..utils.background_loop import BackgroundEventLoop
+from .prometheus_metrics import record_sync_tool_call, update_sync_tool_in_flight
 from .qdrant_embedding_tools import (
     qdrant_generate_and_store_embedding as async_qdrant_generate_and_store_embedding,
 )
@@ -32,24 +36,54 @@ from .qdrant_vector_tools import (
 logger = logging.getLogger(__name__)
 
 
+# Every sync tool call runs on this one long-lived loop instead of a new loop
+# (and thread) per call, so async Qdrant and OpenAI clients keep their
+# connections between calls.
+_tool_loop = BackgroundEventLoop(name="sync-tool-loop")
+_concurrency: tuple[asyncio.AbstractEventLoop, asyncio.Semaphore] | None = None
+
+
+async def _run_limited(async_func, args, kwargs, max_concurrency: int):
+    """Run the tool on the tool loop, at most ``max_concurrency`` at a time."""
+    global _concurrency
+    loop = asyncio.get_running_loop()
+    # Only touched from the loop thread; a restarted loop gets a new semaphore
+    if _concurrency is None or _concurrency[0] is not loop:
+        _concurrency = (loop, asyncio.Semaphore(max(1, max_concurrency)))
+    async with _concurrency[1]:
+        return await async_func(*args, **kwargs)
+
+
 def run_async_tool(async_func, *args, **kwargs):
-    """Helper function to run async tools synchronously."""
+    """
+    Run an async tool synchronously on the shared tool loop.
+
+    Works the same whether or not the calling thread has an event loop
+    running; the caller blocks until the tool finishes.
+
+    Raises:
+        TimeoutError: When the call, queueing included, takes longer than
+            SYNC_TOOL_TIMEOUT seconds; the tool coroutine is cancelled.
+    """
+    config = settings.get_sync_tool_config()
+    tool = getattr(async_func, "__name__", repr(async_func))
+    status = "error"
+    start_time = time.perf_counter()
+    update_sync_tool_in_flight(1)
     try:
-        # Try to get the current event loop
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If loop is running, we need to create a new thread
-            import concurrent.futures
-
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(asyncio.run, async_func(*args, **kwargs))
-                return future.result()
-        else:
-            # If no loop is running, we can use run_until_complete
-            return loop.run_until_complete(async_func(*args, **kwargs))
-    except RuntimeError:
-        # If no event loop exists, create one
-        return asyncio.run(async_func(*args, **kwargs))
+        result = _tool_loop.run(
+            _run_limited(async_func, args, kwargs, config["max_concurrency"]),
+            timeout=config["timeout"] or None,
+        )
+        status = "success"
+        return result
+    except TimeoutError:
+        status = "timeout"
+        logger.warning(f"Sync tool {tool} timed out after {config['timeout']}s")
+        raise
+    finally:
+        update_sync_tool_in_flight(-1)
+        record_sync_tool_call(tool, status, time.perf_counter() - start_time)
 
 
 def qdrant_health_check_sync() -> dict[str, Any]:
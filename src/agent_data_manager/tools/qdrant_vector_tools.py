@@ -5,27 +5,15 @@ from typing import Any
 
 import numpy as np
 
-from ..config.settings import settings
 from ..vector_store.qdrant_store import QdrantStore
+from ..vector_store.qdrant_store import get_qdrant_store as get_shared_qdrant_store
 
 logger = logging.getLogger(__name__)
 
-# Global QdrantStore instance for tool operations
-_qdrant_store = None
-
 
 def get_qdrant_store() -> QdrantStore:
-    """Get or create QdrantStore instance."""
-    global _qdrant_store
-    if _qdrant_store is None:
-        config = settings.get_qdrant_config()
-        _qdrant_store = QdrantStore(
-            url=config["url"],
-            api_key=config["api_key"],
-            collection_name=config["collection_name"],
-            vector_size=config["vector_size"],
-        )
-    return _qdrant_store
+    """Get the shared QdrantStore for the configured collection."""
+    return get_shared_qdrant_store()
 
 
 async def qdrant_upsert_vector(
@@ -2,38 +2,65 @@
 
 import asyncio
 import logging
-import time
 from datetime import datetime
 from typing import Any
 
 from ..config.settings import settings
+from ..embedding.batching_embedding_provider import get_embedding_dispatcher
 from ..embedding.embedding_provider import EmbeddingError, EmbeddingProvider
 from ..embedding.openai_embedding_provider import get_default_embedding_provider
+from ..embedding.vector_spaces import (
+    DEFAULT_VECTOR_SPACE,
+    get_space_embedding_provider,
+    get_vector_space,
+    get_vector_spaces,
+)
 from ..event.event_manager import get_event_manager
+from ..reranking.rerank_stage import get_rerank_stage
+from ..utils.chunking import TextChunker
+from ..utils.rate_limiter import get_rate_limiter
 from ..vector_store.firestore_metadata_manager import FirestoreMetadataManager
 from ..vector_store.qdrant_store import QdrantStore
 from .auto_tagging_tool import get_auto_tagging_tool
 
 logger = logging.getLogger(__name__)
 
+# Read once at import; per-instance overrides go through the chunker argument
+_chunking_config = settings.get_chunking_config()
+
+SEARCH_MODES = ("vector", "hybrid")
+
 
 class QdrantVectorizationTool:
     """Tool for vectorizing documents and syncing status with Firestore."""
 
-    def __init__(self, embedding_provider: EmbeddingProvider | None = None):
+    def __init__(
+        self,
+        embedding_provider: EmbeddingProvider | None = None,
+        chunker: TextChunker | None = None,
+    ):
         """Initialize the vectorization tool.
 
         Args:
             embedding_provider: Optional embedding provider. Defaults to OpenAI provider.
+            chunker: Optional text chunker. Defaults to one built from the
+                chunking settings (None when chunking is disabled).
         """
         self.qdrant_store = None
         self.firestore_manager = None
         self.embedding_provider = embedding_provider
+
+        if chunker is None and _chunking_config["enabled"]:
+            chunker = TextChunker(
+                chunk_size=_chunking_config["chunk_size"],
+                chunk_overlap=_chunking_config["chunk_overlap"],
+                strategy=_chunking_config["strategy"],
+            )
+        self.chunker = chunker
+        self.embed_batch_size = _chunking_config["embed_batch_size"]
         self._initialized = False
-        self._rate_limiter = {
-            "last_call": 0,
-            "min_interval": 0.3,
-        }  # 300ms between calls for free tier
+        # Shared with every other Qdrant caller in the process
+        self._rate_limiter = get_rate_limiter("qdrant")
 
     async def _ensure_initialized(self):
         """Ensure QdrantStore, FirestoreMetadataManager, and EmbeddingProvider are initialized."""
@@ -61,7 +88,13 @@ class QdrantVectorizationTool:
 
             # Initialize EmbeddingProvider if not provided
             if self.embedding_provider is None:
-                self.embedding_provider = get_default_embedding_provider()
+                if get_vector_space().name != DEFAULT_VECTOR_SPACE:
+                    # Ingestion writes the active space's vectors first
+                    self.embedding_provider = get_space_embedding_provider()
+                elif settings.get_embedding_config()["batching_enabled"]:
+                    self.embedding_provider = get_embedding_dispatcher()
+                else:
+                    self.embedding_provider = get_default_embedding_provider()
 
             self._initialized = True
             logger.info("QdrantVectorizationTool initialized successfully")
@@ -71,15 +104,49 @@ class QdrantVectorizationTool:
             raise
 
     async def _rate_limit(self):
-        """Ensure rate limiting for free tier constraints."""
-        current_time = time.time()
-        time_since_last = current_time - self._rate_limiter["last_call"]
-
-        if time_since_last < self._rate_limiter["min_interval"]:
-            sleep_time = self._rate_limiter["min_interval"] - time_since_last
-            await asyncio.sleep(sleep_time)
+        """Wait for the Qdrant rate limiter before a write."""
+        await self._rate_limiter.acquire()
+
+    async def _embed_chunks(self, texts: list[str]) -> list[list[float]]:
+        """Embed chunk texts in batched provider requests."""
+        embeddings = []
+        for start in range(0, len(texts), self.embed_batch_size):
+            batch = texts[start : start + self.embed_batch_size]
+            embeddings.extend(await self.embedding_provider.embed(batch))
+        return embeddings
+
+    async def _fill_vector_spaces(
+        self, vector_result: dict[str, Any], texts: list[str]
+    ) -> None:
+        """
+        Embed just-saved points into the collection's other vector spaces.
 
-        self._rate_limiter["last_call"] = time.time()
+        Keeps a space being migrated to (or rolled back to) current for new
+        writes. Failures are logged and left to the re-embedding job.
+        """
+        if not settings.get_vector_space_config()["spaces"]:
+            return  # Only the default space, which the upsert already wrote
+        spaces = get_vector_spaces()
+        if len(spaces) < 2:
+            return
+        store = self.qdrant_store
+        point_ids = vector_result.get("point_ids") or [vector_result["point_id"]]
+        active = get_vector_space().name
+        for space in spaces.values():
+            if space.name == active or space.vector_name not in store.dense_vectors:
+                continue
+            try:
+                vectors = await get_space_embedding_provider(space.name).embed(texts)
+                result = await store.update_space_vectors(
+                    space.name, dict(zip(point_ids, vectors, strict=True))
+                )
+                if not result["success"]:
+                    raise RuntimeError(result["error"])
+            except Exception as e:
+                logger.warning(
+                    f"Could not fill vector space {space.name} for "
+                    f"{vector_result.get('vector_id')}: {e}"
+                )
 
     async def vectorize_document(
         self,
@@ -93,6 +160,9 @@ class QdrantVectorizationTool:
         """
         Vectorize a document and store in Qdrant with optional Firestore sync and auto-tagging.
 
+        Documents longer than the chunk size are split into overlapping chunks
+        and stored as one point per chunk, sharing the document's doc_id.
+
         Args:
             doc_id: Unique document identifier
             content: Document content to vectorize
@@ -111,8 +181,15 @@ class QdrantVectorizationTool:
             if update_firestore:
                 await self._update_vector_status(doc_id, "pending", metadata)
 
-            # Generate embedding using the provider interface
-            embedding = await self.embedding_provider.embed_single(content)
+            # Generate embeddings using the provider interface, one per chunk
+            chunks = self.chunker.split(content) if self.chunker else []
+            if len(chunks) > 1:
+                chunk_embeddings = await self._embed_chunks(
+                    [chunk.text for chunk in chunks]
+                )
+                embedding = chunk_embeddings[0]
+            else:
+                embedding = await self.embedding_provider.embed_single(content)
 
             # Prepare metadata for Qdrant
             qdrant_metadata = metadata.copy() if metadata else {}
@@ -147,10 +224,32 @@ class QdrantVectorizationTool:
                     )
                     # Continue without auto-tags
 
-            # Upsert vector to Qdrant
-            vector_result = await self.qdrant_store.upsert_vector(
-                vector_id=doc_id, vector=embedding, metadata=qdrant_metadata, tag=tag
-            )
+            # Upsert vector(s) to Qdrant
+            await self._rate_limit()
+            if len(chunks) > 1:
+                vector_result = await self.qdrant_store.upsert_chunks(
+                    doc_id=doc_id,
+                    vectors=chunk_embeddings,
+                    chunk_payloads=[
+                        {
+                            "chunk_index": chunk.index,
+                            "chunk_text": chunk.text,
+                            "chunk_tokens": chunk.token_count,
+                        }
+                        for chunk in chunks
+                    ],
+                    metadata=qdrant_metadata,
+                    tag=tag,
+                )
+            else:
+                vector_result = await self.qdrant_store.upsert_vector(
+                    vector_id=doc_id,
+                    vector=embedding,
+                    metadata=qdrant_metadata,
+                    tag=tag,
+                    text=content,
+                    replace_document=True,
+                )
 
             if not vector_result.get("success"):
                 error_msg = f"Failed to upsert vector: {vector_result.get('error', 'Unknown error')}"
@@ -159,6 +258,10 @@ class QdrantVectorizationTool:
                         doc_id, "failed", metadata, error_msg
                     )
                 return {"status": "failed", "error": error_msg, "doc_id": doc_id}
+            await self._fill_vector_spaces(
+                vector_result,
+                [chunk.text for chunk in chunks] if len(chunks) > 1 else [content],
+            )
 
             # Update vectorStatus to completed in Firestore
             if update_firestore:
@@ -188,6 +291,7 @@ class QdrantVectorizationTool:
                 "doc_id": doc_id,
                 "vector_id": vector_result.get("vector_id"),
                 "embedding_dimension": len(embedding),
+                "chunk_count": max(len(chunks), 1),
                 "metadata_keys": list(qdrant_metadata.keys()),
                 "firestore_updated": update_firestore,
             }
@@ -232,6 +336,7 @@ class QdrantVectorizationTool:
             if error_message and status == "failed":
                 firestore_metadata["error"] = error_message
 
+            await get_rate_limiter("firestore").acquire()
             await self.firestore_manager.save_metadata(doc_id, firestore_metadata)
             logger.debug(f"Updated vectorStatus to '{status}' for doc_id: {doc_id}")
 
@@ -248,7 +353,10 @@ class QdrantVectorizationTool:
         update_firestore: bool = True,
     ) -> dict[str, Any]:
         """
-        Vectorize multiple documents in batch with rate-limit protection.
+        Vectorize multiple documents in batch.
+
+        Pacing comes from the shared OpenAI, Qdrant and Firestore rate
+        limiters each document goes through, not from fixed sleeps.
 
         Args:
             documents: List of document dictionaries with 'doc_id' and 'content' keys
@@ -263,7 +371,6 @@ class QdrantVectorizationTool:
         # Get batch configuration from settings
         config = settings.get_qdrant_config()
         batch_size = config.get("batch_size", 100)
-        sleep_between_batches = config.get("sleep_between_batches", 0.35)
 
         results = []
         successful = 0
@@ -296,9 +403,6 @@ class QdrantVectorizationTool:
                     failed += 1
                     continue
 
-                # Apply rate limiting per document
-                await self._rate_limit()
-
                 result = await self.vectorize_document(
                     doc_id=doc_id,
                     content=content,
@@ -313,13 +417,6 @@ class QdrantVectorizationTool:
                 else:
                     failed += 1
 
-            # Sleep between batches to prevent rate limits (except for the last batch)
-            if i + batch_size < len(documents):
-                logger.debug(
-                    f"Sleeping {sleep_between_batches}s between batches to prevent rate limits"
-                )
-                await asyncio.sleep(sleep_between_batches)
-
         return {
             "status": "completed",
             "total_documents": len(documents),
@@ -327,7 +424,6 @@ class QdrantVectorizationTool:
             "failed": failed,
             "batches_processed": batch_count,
             "batch_size": batch_size,
-            "sleep_between_batches": sleep_between_batches,
             "results": results,
         }
 
@@ -340,11 +436,26 @@ class QdrantVectorizationTool:
         limit: int = 10,
         score_threshold: float = 0.5,
         qdrant_tag: str | None = None,
+        query_vector: list[float] | None = None,
+        search_mode: str | None = None,
+        lexical_weight: float | None = None,
+        rerank: bool | None = None,
+        vector_space: str | None = None,
     ) -> dict[str, Any]:
         """
         Perform RAG (Retrieval-Augmented Generation) search combining Qdrant semantic search
         with Firestore metadata filtering.
 
+        In ``hybrid`` mode a BM25 keyword search runs concurrently with the
+        vector search and the two rankings are combined with weighted
+        reciprocal-rank fusion, so exact codes, error strings and names are
+        found even when their embeddings are not close to the query's.
+
+        With reranking, the filtered candidates are rescored against the
+        query before the limit is applied and candidates below
+        RERANK_MIN_SCORE are cut off. When the reranker overruns
+        RERANK_BUDGET_MS or fails, results keep the vector order.
+
         Args:
             query_text: Text to search for semantically similar content
             metadata_filters: Optional metadata filters (e.g., {"author": "John Doe", "year": 2024})
@@ -352,7 +463,15 @@ class QdrantVectorizationTool:
             path_query: Optional path segment to search in hierarchy
             limit: Maximum number of results
             score_threshold: Minimum similarity threshold for Qdrant search
+                (vector hits only; keyword hits are not thresholded)
             qdrant_tag: Optional Qdrant tag filter for vector search
+            query_vector: Optional precomputed embedding of query_text
+            search_mode: "vector" or "hybrid"; defaults to RAG_SEARCH_MODE
+            lexical_weight: Share of the fused score from the keyword ranking,
+                0 to 1; defaults to HYBRID_LEXICAL_WEIGHT
+            rerank: Rerank the candidates; defaults to RERANK_ENABLED
+            vector_space: Embedding space searched; defaults to VECTOR_SPACE.
+                A ``query_vector`` must come from the same space's model
 
         Returns:
             Dictionary with enriched search results combining vector similarity and metadata
@@ -360,13 +479,68 @@ class QdrantVectorizationTool:
         await self._ensure_initialized()
 
         try:
-            # Step 1: Perform semantic search in Qdrant
-            qdrant_results = await self.qdrant_store.semantic_search(
+            vector_space = get_vector_space(vector_space).name
+        except ValueError as e:
+            return {
+                "status": "failed",
+                "error": str(e),
+                "query": query_text,
+                "results": [],
+            }
+
+        hybrid_config = settings.get_hybrid_search_config()
+        search_mode = search_mode or hybrid_config["default_mode"]
+        if lexical_weight is None:
+            lexical_weight = hybrid_config["lexical_weight"]
+        rerank_config = settings.get_rerank_config()
+        if rerank is None:
+            rerank = rerank_config["enabled"]
+        if search_mode not in SEARCH_MODES or not 0 <= lexical_weight <= 1:
+            return {
+                "status": "failed",
+                "error": (
+                    f"Invalid search_mode {search_mode!r} or lexical_weight "
+                    f"{lexical_weight!r}; expected one of {SEARCH_MODES} and 0-1"
+                ),
+                "query": query_text,
+                "results": [],
+            }
+
+        try:
+            # Step 1: Perform semantic search in Qdrant, grouping chunk hits so
+            # each document appears once with its best passage
+            search_payload = ["doc_id", "chunk_index", "chunk_text"]
+            vector_search = self.qdrant_store.semantic_search(
                 query_text=query_text,
                 limit=limit * 2,  # Get more results to account for filtering
                 tag=qdrant_tag,
                 score_threshold=score_threshold,
+                query_vector=query_vector,
+                with_payload=search_payload,
+                group_by="doc_id",
+                vector_space=vector_space,
             )
+            hybrid_info = {"search_mode": "vector", "vector_space": vector_space}
+            if search_mode == "hybrid":
+                qdrant_results, lexical_results = await asyncio.gather(
+                    vector_search,
+                    self.qdrant_store.lexical_search(
+                        query_text=query_text,
+                        limit=limit * 2,
+                        tag=qdrant_tag,
+                        with_payload=search_payload,
+                        group_by="doc_id",
+                    ),
+                )
+                qdrant_results, hybrid_info = self._fuse_rankings(
+                    qdrant_results,
+                    lexical_results,
+                    lexical_weight,
+                    hybrid_config["rrf_k"],
+                )
+                hybrid_info["vector_space"] = vector_space
+            else:
+                qdrant_results = await vector_search
 
             if qdrant_results["status"] != "success":
                 return {
@@ -379,11 +553,20 @@ class QdrantVectorizationTool:
             # Extract doc_ids from Qdrant results
             qdrant_doc_ids = []
             qdrant_scores = {}
+            best_passages = {}
+            hybrid_ranks = {}
             for result in qdrant_results["results"]:
                 doc_id = result["metadata"].get("doc_id")
-                if doc_id:
+                if doc_id and doc_id not in qdrant_scores:
                     qdrant_doc_ids.append(doc_id)
                     qdrant_scores[doc_id] = result["score"]
+                    if "hybrid" in result:
+                        hybrid_ranks[doc_id] = result["hybrid"]
+                    if "chunk_text" in result["metadata"]:
+                        best_passages[doc_id] = {
+                            "chunk_index": result["metadata"].get("chunk_index"),
+                            "text": result["metadata"]["chunk_text"],
+                        }
 
             if not qdrant_doc_ids:
                 return {
@@ -397,6 +580,7 @@ class QdrantVectorizationTool:
                         "metadata_filters": metadata_filters,
                         "tags": tags,
                         "path_query": path_query,
+                        **hybrid_info,
                     },
                 }
 
@@ -451,8 +635,16 @@ class QdrantVectorizationTool:
             if path_query:
                 filtered_results = self._filter_by_path(filtered_results, path_query)
 
-            # Step 4: Sort by Qdrant score and limit results
+            # Step 4: Sort by Qdrant score, optionally rerank, and limit results
             filtered_results.sort(key=lambda x: x.get("_qdrant_score", 0), reverse=True)
+            rerank_info = {}
+            if rerank:
+                filtered_results, rerank_info = await self._rerank(
+                    query_text,
+                    filtered_results,
+                    best_passages,
+                    rerank_config["min_score"],
+                )
             final_results = filtered_results[:limit]
 
             # Step 5: Enrich results with RAG information
@@ -470,6 +662,12 @@ class QdrantVectorizationTool:
                     "last_updated": result.get("lastUpdated"),
                     "version": result.get("version", 1),
                 }
+                if result["_doc_id"] in best_passages:
+                    enriched_result["best_passage"] = best_passages[result["_doc_id"]]
+                if result["_doc_id"] in hybrid_ranks:
+                    enriched_result["hybrid"] = hybrid_ranks[result["_doc_id"]]
+                if "_rerank_score" in result:
+                    enriched_result["rerank_score"] = result["_rerank_score"]
                 enriched_results.append(enriched_result)
 
             return {
@@ -484,6 +682,8 @@ class QdrantVectorizationTool:
                     "tags": tags,
                     "path_query": path_query,
                     "score_threshold": score_threshold,
+                    **hybrid_info,
+                    **rerank_info,
                 },
             }
 
@@ -496,6 +696,102 @@ class QdrantVectorizationTool:
                 "results": [],
             }
 
+    async def _rerank(
+        self,
+        query_text: str,
+        results: list[dict[str, Any]],
+        best_passages: dict[str, dict[str, Any]],
+        min_score: float,
+    ) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+        """
+        Rerank filtered candidates and cut off those scoring below min_score.
+
+        Each candidate is scored on its best passage, or its content preview
+        for unchunked documents. Ties keep the vector order.
+
+        Returns:
+            (candidates in rerank order, or unchanged on fallback; rag_info
+            fields with the stage info under ``rerank``)
+        """
+        candidates = []
+        for result in results:
+            doc_id = result["_doc_id"]
+            passage = best_passages.get(doc_id, {}).get("text")
+            version_key = (
+                f"{doc_id}:{result.get('version', 1)}:{result.get('lastUpdated')}"
+            )
+            candidates.append(
+                (version_key, passage or result.get("content_preview", ""))
+            )
+
+        scores, info = await get_rerank_stage().rerank(query_text, candidates)
+        if scores is None:
+            return results, {"rerank": info}
+
+        for result, score in zip(results, scores, strict=True):
+            result["_rerank_score"] = score
+        ranked = sorted(
+            (result for result in results if result["_rerank_score"] >= min_score),
+            key=lambda result: result["_rerank_score"],
+            reverse=True,
+        )
+        info["cut_off"] = len(results) - len(ranked)
+        return ranked, {"rerank": info}
+
+    @staticmethod
+    def _fuse_rankings(
+        vector_results: dict[str, Any],
+        lexical_results: dict[str, Any],
+        lexical_weight: float,
+        rrf_k: int,
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """
+        Combine vector and keyword rankings with weighted reciprocal-rank fusion.
+
+        A document scores ``(1 - w) / (k + vector_rank) + w / (k + lexical_rank)``
+        (a term is 0 when the document is missing from that ranking). When
+        one search failed, the other's ranking is used alone.
+
+        Returns:
+            (search results shaped like semantic_search's, rag_info fields)
+        """
+        info = {"search_mode": "hybrid", "lexical_weight": lexical_weight}
+        if lexical_results["status"] != "success":
+            # e.g. a collection created before hybrid search was enabled
+            info.update(
+                search_mode="vector", lexical_error=lexical_results.get("error")
+            )
+            return vector_results, info
+        if vector_results["status"] != "success":
+            info["vector_error"] = vector_results.get("error")
+            vector_results = {"status": "success", "results": []}
+
+        fused: dict[str, dict[str, Any]] = {}
+        for source, results, weight in (
+            ("vector", vector_results["results"], 1 - lexical_weight),
+            ("lexical", lexical_results["results"], lexical_weight),
+        ):
+            ranked_ids = set()
+            for result in results:
+                doc_id = result["metadata"].get("doc_id")
+                if not doc_id or doc_id in ranked_ids:
+                    continue
+                ranked_ids.add(doc_id)
+                rank = len(ranked_ids)
+                entry = fused.setdefault(doc_id, {**result, "score": 0.0, "hybrid": {}})
+                entry["score"] += weight / (rrf_k + rank)
+                entry["hybrid"][f"{source}_rank"] = rank
+                entry["hybrid"][f"{source}_score"] = result["score"]
+
+        ranked = sorted(
+            (entry for entry in fused.values() if entry["score"] > 0),
+            key=lambda entry: entry["score"],
+            reverse=True,
+        )
+        info["vector_results"] = len(vector_results["results"])
+        info["lexical_results"] = len(lexical_results["results"])
+        return {"status": "success", "results": ranked}, info
+
     def _filter_by_metadata(
         self, results: list[dict[str, Any]], filters: dict[str, Any]
     ) -> list[dict[str, Any]]:
@@ -706,6 +1002,11 @@ async def qdrant_rag_search(
     limit: int = 10,
     score_threshold: float = 0.5,
     qdrant_tag: str | None = None,
+    query_vector: list[float] | None = None,
+    search_mode: str | None = None,
+    lexical_weight: float | None = None,
+    rerank: bool | None = None,
+    vector_space: str | None = None,
 ) -> dict[str, Any]:
     """
     Perform RAG (Retrieval-Augmented Generation) search combining Qdrant semantic search
@@ -719,11 +1020,29 @@ async def qdrant_rag_search(
         limit: Maximum number of results
         score_threshold: Minimum similarity threshold for Qdrant search
         qdrant_tag: Optional Qdrant tag filter for vector search
+        query_vector: Optional precomputed embedding of query_text
+        search_mode: "vector" or "hybrid"; defaults to RAG_SEARCH_MODE
+        lexical_weight: Keyword share of the hybrid score; defaults to
+            HYBRID_LEXICAL_WEIGHT
+        rerank: Rerank the candidates; defaults to RERANK_ENABLED
+        vector_space: Embedding space searched; defaults to VECTOR_SPACE
 
     Returns:
         Dictionary with enriched search results combining vector similarity and metadata
     """
     tool = get_vectorization_tool()
+    # Only forward options the caller set (e.g. an embedding from the semantic cache)
+    extra = {
+        name: value
+        for name, value in (
+            ("query_vector", query_vector),
+            ("search_mode", search_mode),
+            ("lexical_weight", lexical_weight),
+            ("rerank", rerank),
+            ("vector_space", vector_space),
+        )
+        if value is not None
+    }
     return await tool.rag_search(
         query_text=query_text,
         metadata_filters=metadata_filters,
@@ -732,4 +1051,5 @@ async def qdrant_rag_search(
         limit=limit,
         score_threshold=score_threshold,
         qdrant_tag=qdrant_tag,
+        **extra,
     )
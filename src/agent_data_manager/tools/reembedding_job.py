@@ -0,0 +1,229 @@
+"""Background job that fills a vector space from the text stored with each point.
+
+Moving to another embedding model does not need a reindex with downtime: the
+new space is declared next to the current one (see
+``embedding/vector_spaces.py``), this job embeds every point that has no
+vector in it yet, requests move over one at a time with ``vector_space``,
+and finally VECTOR_SPACE is switched. Points are embedded again from their
+``chunk_text`` or ``embedded_text`` payload; points stored before the text
+was kept (other than short documents whose preview is their whole text) are
+counted as ``no_text`` and need saving again.
+
+The job pages through the collection in point-ID order. Running it again
+only embeds points still missing the vector, such as points rewritten while
+it ran, so it can be repeated until the space is complete. Progress is kept
+in ``progress`` and exported as metrics; an interrupted job is resumed from
+its last page offset.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any
+
+from ..config.settings import settings
+from ..embedding.embedding_provider import EmbeddingProvider
+from ..embedding.vector_spaces import get_space_embedding_provider, get_vector_space
+from ..vector_store.qdrant_store import QdrantStore, get_qdrant_store
+from .prometheus_metrics import record_reembed_points, update_reembed_progress
+
+logger = logging.getLogger(__name__)
+
+
+def point_text(payload: dict[str, Any]) -> str | None:
+    """The text a point was embedded from, when its payload holds all of it."""
+    text = payload.get("chunk_text") or payload.get("embedded_text")
+    if text:
+        return text
+    # Short documents are stored whole in their preview
+    preview = payload.get("content_preview")
+    if preview and payload.get("content_length") == len(preview):
+        return preview
+    return None
+
+
+class ReembeddingJob:
+    """Embeds the points of a collection that lack a vector in one space."""
+
+    def __init__(
+        self,
+        store: QdrantStore,
+        vector_space: str,
+        provider: EmbeddingProvider | None = None,
+        batch_size: int | None = None,
+        offset: str | int | None = None,
+    ):
+        """Initialize the re-embedding job.
+
+        Args:
+            store: Store of the collection to fill
+            vector_space: Space to fill
+            provider: Embedding provider; defaults to the space's provider
+            batch_size: Points per page and embedding request; defaults to
+                REEMBED_BATCH_SIZE
+            offset: Page offset to resume from, None to start at the beginning
+
+        Raises:
+            ValueError: When the vector space is not configured
+        """
+        self.store = store
+        self.vector_space = get_vector_space(vector_space).name
+        self.provider = provider
+        self.batch_size = (
+            batch_size or settings.get_vector_space_config()["reembed_batch_size"]
+        )
+        self.progress: dict[str, Any] = {
+            "vector_space": self.vector_space,
+            "collection": store.collection_name,
+            "status": "pending",
+            "total": None,
+            "scanned": 0,
+            "embedded": 0,
+            "present": 0,
+            "no_text": 0,
+            "failed": 0,
+            "offset": offset,
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+        }
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the job's background task is still running."""
+        return self._task is not None and not self._task.done()
+
+    async def run_page(self) -> bool:
+        """
+        Embed the points of one page that lack the space's vector.
+
+        A failed embedding or update is counted and skipped; a later run
+        picks those points up again.
+
+        Returns:
+            Whether more pages remain
+        """
+        points, next_offset = await self.store.scroll_vector_space(
+            self.vector_space, limit=self.batch_size, offset=self.progress["offset"]
+        )
+        missing = [point for point in points if not point["has_vector"]]
+        texts = {point["id"]: point_text(point["metadata"]) for point in missing}
+        texts = {point_id: text for point_id, text in texts.items() if text}
+        counts = {
+            "present": len(points) - len(missing),
+            "no_text": len(missing) - len(texts),
+            "embedded": 0,
+            "failed": 0,
+        }
+        if texts:
+            try:
+                vectors = await self.provider.embed(list(texts.values()))
+                result = await self.store.update_space_vectors(
+                    self.vector_space, dict(zip(texts, vectors, strict=True))
+                )
+                error = result.get("error")
+            except Exception as e:
+                error = str(e)
+            if error:
+                logger.warning(
+                    f"Re-embedding {len(texts)} points into {self.vector_space} failed: {error}"
+                )
+                counts["failed"] = len(texts)
+            else:
+                counts["embedded"] = len(texts)
+
+        for result, count in counts.items():
+            self.progress[result] += count
+            record_reembed_points(self.vector_space, result, count)
+        self.progress["scanned"] += len(points)
+        self.progress["offset"] = next_offset
+        total = self.progress["total"]
+        update_reembed_progress(
+            self.vector_space,
+            min(self.progress["scanned"] / total, 1.0) if total else 1.0,
+        )
+        return next_offset is not None
+
+    async def run(self) -> dict[str, Any]:
+        """
+        Run pages until the whole collection has been scanned.
+
+        Returns:
+            The final progress; status is "completed", "failed" or "cancelled"
+        """
+        self.progress.update(
+            status="running",
+            started_at=datetime.utcnow().isoformat(),
+            finished_at=None,
+            error=None,
+        )
+        try:
+            if self.provider is None:
+                self.provider = get_space_embedding_provider(self.vector_space)
+            self.progress["total"] = await self.store.get_vector_count()
+            while await self.run_page():
+                pass
+            self.progress["status"] = "completed"
+        except asyncio.CancelledError:
+            self.progress["status"] = "cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"Re-embedding job for {self.vector_space} failed: {e}")
+            self.progress.update(status="failed", error=str(e))
+        finally:
+            self.progress["finished_at"] = datetime.utcnow().isoformat()
+            logger.info(f"Re-embedding job progress: {self.progress}")
+        return self.progress
+
+    def start(self) -> asyncio.Task:
+        """Run the job as a background task on the running event loop."""
+        self._task = asyncio.create_task(self.run())
+        return self._task
+
+    def cancel(self):
+        """Stop the background task after its current page."""
+        if self._task is not None:
+            self._task.cancel()
+
+
+_jobs: dict[tuple[str, str], ReembeddingJob] = {}
+
+
+def get_reembedding_job(
+    vector_space: str, store: QdrantStore | None = None
+) -> ReembeddingJob | None:
+    """Get the latest re-embedding job of a space in the store's collection."""
+    store = store or get_qdrant_store()
+    return _jobs.get((store.collection_name, get_vector_space(vector_space).name))
+
+
+def start_reembedding(
+    vector_space: str, store: QdrantStore | None = None, **job_kwargs
+) -> ReembeddingJob:
+    """
+    Start filling a vector space in the background, unless a job already runs.
+
+    A job that failed or was cancelled is resumed from its last page.
+
+    Args:
+        vector_space: Space to fill
+        store: Store of the collection; defaults to the shared store
+        **job_kwargs: Further ReembeddingJob arguments
+
+    Returns:
+        The running job
+
+    Raises:
+        ValueError: When the vector space is not configured
+    """
+    store = store or get_qdrant_store()
+    key = (store.collection_name, get_vector_space(vector_space).name)
+    job = _jobs.get(key)
+    if job is not None and job.running:
+        return job
+    if job is not None and job.progress["status"] in ("failed", "cancelled"):
+        job_kwargs.setdefault("offset", job.progress["offset"])
+    job = _jobs[key] = ReembeddingJob(store, vector_space, **job_kwargs)
+    job.start()
+    return job
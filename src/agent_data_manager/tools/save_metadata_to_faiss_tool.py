@@ -18,8 +18,9 @@ from google.cloud import (
 
 # Import for embedding generation
 from agent_data_manager.tools.external_tool_registry import (
+    EMBEDDING_MAX_INPUTS_PER_REQUEST,
     OPENAI_AVAILABLE,
-    get_openai_embedding,
+    get_openai_embeddings_batch,
     openai_client,
 )
 
@@ -78,7 +79,7 @@ if not GCS_BUCKET_NAME:
 async def _generate_embeddings_batch(
     texts_to_embed_with_ids: list[tuple[str, str]],
     agent_context: AgentDataAgent | None,
-    batch_size: int = 32,  # Default batch size
+    batch_size: int | None = None,
 ) -> dict[str, dict[str, Any]]:
     """
     Generates embeddings for a list of (doc_id, text_content) tuples in batches.
@@ -86,68 +87,55 @@ async def _generate_embeddings_batch(
     Args:
         texts_to_embed_with_ids: List of tuples, where each tuple is (doc_id, text_content).
         agent_context: The agent context, potentially containing an OpenAI client.
-        batch_size: The number of texts to process in each batch.
+        batch_size: Most texts per API request; defaults to the API's per-request limit.
+            Requests are also kept under the per-request token limit.
 
     Returns:
-        A dictionary mapping doc_id to the embedding result dictionary.
-        If an embedding fails for a document, its ID might be missing from the map
-        or associated with an error indicator if get_openai_embedding returns one.
+        A dictionary mapping doc_id to the embedding result dictionary
+        ("status": "success" with a float32 "embedding" array, or "status": "error").
     """
-    embedding_results_map: dict[str, dict[str, Any]] = {}
+    texts = [text_content for _, text_content in texts_to_embed_with_ids]
+    try:
+        batch_response = await get_openai_embeddings_batch(
+            agent_context=agent_context,
+            texts=texts,
+            max_inputs=batch_size or EMBEDDING_MAX_INPUTS_PER_REQUEST,
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error generating embeddings: {e}", exc_info=True)
+        batch_response = {"error": str(e), "error_type": type(e).__name__}
 
-    for i in range(0, len(texts_to_embed_with_ids), batch_size):
-        batch_items = texts_to_embed_with_ids[i : i + batch_size]
-        # For now, assuming get_openai_embedding processes one text at a time.
-        # If get_openai_embedding could take a list of texts, this would be more efficient.
-        for doc_id, text_content in batch_items:
-            try:
-                logger.debug(f"Requesting embedding for doc_id: {doc_id}")
-                # Assuming get_openai_embedding is async and handles its own retries/errors appropriately
-                embedding_response = await get_openai_embedding(
-                    agent_context=agent_context, text_to_embed=text_content
-                )
-                embedding_value = embedding_response.get(
-                    "embedding"
-                )  # Extract embedding value
-                # Check if embedding_value is a non-empty numpy array
-                if (
-                    embedding_response
-                    and isinstance(embedding_value, np.ndarray)
-                    and embedding_value.size > 0
-                ):
-                    embedding_results_map[doc_id] = embedding_response
-                    logger.debug(
-                        f"Successfully received embedding for doc_id: {doc_id}"
-                    )
-                else:
-                    logger.error(
-                        f"Failed to generate or received invalid embedding for doc_id: {doc_id}. Response: {embedding_response}"
-                    )
-                    # Optionally, store an error marker: embedding_results_map[doc_id] = {"error": "failed_to_generate"}
-            except (
-                EmbeddingGenerationError
-            ) as e:  # Catch specific error from get_openai_embedding
-                logger.error(
-                    f"EmbeddingGenerationError for doc_id {doc_id}: {e}", exc_info=True
-                )
-                embedding_results_map[doc_id] = {
-                    "error": str(e),
-                    "status": "error",
-                    "error_type": type(e).__name__,
-                }
-            except Exception as e:
-                logger.error(
-                    f"Unexpected error generating embedding for doc_id {doc_id}: {e}",
-                    exc_info=True,
-                )
-                # Store a generic error marker in the map for this doc_id
-                embedding_results_map[doc_id] = {
-                    "error": str(e),
-                    "status": "error",
-                    "error_type": type(e).__name__,
-                }
-                # Depending on policy, might re-raise if it's critical for the whole batch
+    if "error" in batch_response:
+        error = {
+            "error": batch_response["error"],
+            "status": "error",
+            "error_type": batch_response.get(
+                "error_type", EmbeddingGenerationError.__name__
+            ),
+        }
+        return {doc_id: dict(error) for doc_id, _ in texts_to_embed_with_ids}
 
+    logger.info(
+        f"Embedded {len(texts)} texts in {len(batch_response['batches'])} request(s) "
+        f"using {batch_response['total_tokens']} tokens"
+    )
+    embedding_results_map: dict[str, dict[str, Any]] = {}
+    for position, (doc_id, _) in enumerate(texts_to_embed_with_ids):
+        embedding = batch_response["embeddings"][position]
+        if embedding is None:
+            embedding_results_map[doc_id] = {
+                "error": batch_response["errors"].get(
+                    position, "No embedding returned"
+                ),
+                "status": "error",
+                "error_type": EmbeddingGenerationError.__name__,
+            }
+            continue
+        embedding_results_map[doc_id] = {
+            "status": "success",
+            "embedding": np.asarray(embedding, dtype=np.float32),
+            "model_used": batch_response["model_used"],
+        }
     return embedding_results_map
 
 
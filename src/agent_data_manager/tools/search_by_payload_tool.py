@@ -70,7 +70,7 @@ async def search_by_payload(
         )
 
         # Use scroll to search by payload (more efficient for payload-only searches)
-        results, next_page_offset = qdrant_store.client.scroll(
+        results, next_page_offset = await qdrant_store.async_client.scroll(
             collection_name=target_collection,
             scroll_filter=search_filter,
             limit=limit,
@@ -1,6 +1,5 @@
 import logging
 import os
-import pickle
 from typing import Any
 
 import numpy as np
@@ -13,6 +12,7 @@ from .external_tool_registry import (
     get_openai_embedding,
     openai_client,
 )
+from .faiss_metadata_journal import load_metadata
 
 logger = logging.getLogger(__name__)
 
@@ -57,8 +57,7 @@ def semantic_search_cosine(
 
     # Load metadata (simple load)
     try:
-        with open(meta_path, "rb") as f:
-            loaded_data = pickle.load(f)
+        loaded_data = load_metadata(meta_path)
     except Exception as e:
         logger.error(f"Failed to load metadata '{meta_path}': {e}")
         return {"status": "failed", "error": f"Metadata load error: {e}"}
@@ -1,11 +1,11 @@
 import os
-import pickle
 from typing import Any
 
 # Reuse or adapt anomaly detection logic
 from .detect_anomalies_tool import (
     detect_anomalies as run_anomaly_detection,
 )  # Rename for clarity
+from .faiss_metadata_journal import load_metadata
 
 FAISS_DIR = "ADK/agent_data/faiss_indices"
 MAX_RETRIES = 3
@@ -48,8 +48,7 @@ def validate_metadata_tree(index_name: str) -> dict[str, Any]:
             }
             # Add total node count - requires another load, maybe optimize later
             try:
-                with open(meta_path, "rb") as f:
-                    loaded_data = pickle.load(f)
+                loaded_data = load_metadata(meta_path)
                 if loaded_data and "metadata" in loaded_data:
                     validation_summary["total_nodes_checked"] = len(
                         loaded_data["metadata"]
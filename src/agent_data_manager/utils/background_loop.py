@@ -0,0 +1,130 @@
+"""Long-lived asyncio event loop running in a dedicated thread.
+
+Sync callers (Flask handlers, sync tool wrappers) used to drive coroutines with
+``asyncio.run``, which creates and tears down an event loop per call. Async
+clients (AsyncOpenAI, Qdrant) bind their connection pools to the loop they were
+first used on, so a fresh loop per call also throws away connection reuse.
+``BackgroundEventLoop`` starts one loop in a daemon thread on first use and
+runs submitted coroutines on it via ``run_coroutine_threadsafe``.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from collections.abc import Coroutine
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundEventLoop:
+    """An event loop owned by a daemon thread, shared by sync callers."""
+
+    def __init__(self, name: str = "background-event-loop"):
+        """
+        Initialize the loop holder; the thread starts on first use.
+
+        Args:
+            name: Name of the loop thread
+        """
+        self.name = name
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.setup_ms: float | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> float:
+        """
+        Start the loop thread if needed.
+
+        Returns:
+            Milliseconds spent starting the loop in this call (0.0 if it was running)
+        """
+        with self._lock:
+            if self.is_running:
+                return 0.0
+
+            start_time = time.perf_counter()
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def run_loop():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(started.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=run_loop, name=self.name, daemon=True)
+            thread.start()
+            started.wait()
+
+            self.loop = loop
+            self._thread = thread
+            self.setup_ms = (time.perf_counter() - start_time) * 1000
+            logger.info(f"Started event loop thread '{self.name}'")
+            return self.setup_ms
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedule a coroutine on the loop and return its future."""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: float | None = None) -> Any:
+        """
+        Run a coroutine on the loop and block until it finishes.
+
+        Raises:
+            TimeoutError: When the coroutine does not finish within ``timeout``
+                seconds; it is cancelled on the loop.
+            RuntimeError: When called from the loop thread itself, which would
+                deadlock.
+        """
+        if self.is_running and threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError(f"Cannot block on '{self.name}' from its own thread")
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(
+                f"Coroutine did not finish within {timeout} seconds"
+            ) from None
+
+    @staticmethod
+    async def _shutdown():
+        """Cancel outstanding tasks and release the default executor."""
+        tasks = [
+            task for task in asyncio.all_tasks() if task is not asyncio.current_task()
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.get_running_loop().shutdown_default_executor()
+
+    def stop(self, timeout: float = 5.0):
+        """Cancel pending work, stop the loop, join its thread and close it."""
+        with self._lock:
+            if not self.is_running:
+                return
+            loop, thread = self.loop, self._thread
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(
+                    timeout=timeout
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Event loop '{self.name}' did not shut down cleanly: {e}"
+                )
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=timeout)
+            if not thread.is_alive():
+                loop.close()
+            self.loop = None
+            self._thread = None
@@ -0,0 +1,191 @@
+"""Token-aware document chunking for per-chunk embeddings.
+
+Embedding a long document as a single vector either exceeds the embedding
+model's token limit or dilutes the vector until it ranks poorly. The chunker
+splits text into windows of at most ``chunk_size`` tokens that overlap by
+``chunk_overlap`` tokens. Strategies:
+
+- ``token``: fixed token windows
+- ``sentence``: pack whole sentences into each window
+- ``paragraph``: pack whole paragraphs (blank-line separated) into each window
+
+Units longer than ``chunk_size`` always fall back to token windows. Tokens are
+counted with tiktoken when it is installed, otherwise whitespace-delimited
+words are used as an approximation.
+"""
+
+import functools
+import logging
+import re
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+
+CHUNKING_STRATEGIES = ("token", "sentence", "paragraph")
+
+_SENTENCE_RE = re.compile(r"[^.!?\n]+(?:[.!?]+|\n|$)\s*")
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+_WORD_RE = re.compile(r"\S+\s*")
+
+
+@functools.cache
+def _get_encoding(encoding_name: str):
+    """Load a tiktoken encoding once; None when tiktoken cannot provide it."""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        logger.warning(f"tiktoken encoding unavailable, counting words: {e}")
+        return None
+
+
+def estimate_tokens(text: str, encoding_name: str = "cl100k_base") -> int:
+    """
+    Count the tokens of a text for request budgeting.
+
+    Without tiktoken this over-estimates (about three characters per token), so
+    budgets computed from it stay within the real limit.
+    """
+    encoding = _get_encoding(encoding_name)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return len(text) // 3 + 1
+
+
+@dataclass
+class TextChunk:
+    """A chunk of a document and its position in the chunk sequence."""
+
+    index: int
+    text: str
+    token_count: int
+
+
+class TextChunker:
+    """Split text into overlapping, token-bounded chunks."""
+
+    def __init__(
+        self,
+        chunk_size: int = 512,
+        chunk_overlap: int = 64,
+        strategy: str = "token",
+        encoding_name: str = "cl100k_base",
+    ):
+        """
+        Initialize the chunker.
+
+        Args:
+            chunk_size: Maximum tokens per chunk
+            chunk_overlap: Tokens repeated from the end of the previous chunk
+            strategy: One of "token", "sentence" or "paragraph"
+            encoding_name: tiktoken encoding used to count tokens
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if not 0 <= chunk_overlap < chunk_size:
+            raise ValueError("chunk_overlap must be >= 0 and smaller than chunk_size")
+        if strategy not in CHUNKING_STRATEGIES:
+            raise ValueError(
+                f"Unknown chunking strategy '{strategy}', "
+                f"expected one of {CHUNKING_STRATEGIES}"
+            )
+
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.strategy = strategy
+        self._encoding = _get_encoding(encoding_name)
+
+    def _encode(self, text: str) -> list:
+        if self._encoding is not None:
+            return self._encoding.encode(text)
+        return _WORD_RE.findall(text)
+
+    def _decode(self, tokens: list) -> str:
+        if self._encoding is not None:
+            return self._encoding.decode(tokens)
+        return "".join(tokens)
+
+    def count_tokens(self, text: str) -> int:
+        """Count the tokens of a text."""
+        return len(self._encode(text))
+
+    def _token_windows(self, tokens: list) -> list[list]:
+        step = self.chunk_size - self.chunk_overlap
+        windows = []
+        for start in range(0, len(tokens), step):
+            windows.append(tokens[start : start + self.chunk_size])
+            if start + self.chunk_size >= len(tokens):
+                break
+        return windows
+
+    def _split_units(self, text: str) -> list[str]:
+        if self.strategy == "paragraph":
+            return [unit for unit in _PARAGRAPH_RE.split(text) if unit.strip()]
+        return [unit for unit in _SENTENCE_RE.findall(text) if unit.strip()]
+
+    def _pack_units(self, text: str) -> list[list]:
+        """Pack whole units into windows, carrying trailing units as overlap."""
+        windows: list[list] = []
+        current: list[list] = []
+        current_size = 0
+
+        for unit in self._split_units(text):
+            tokens = self._encode(unit)
+            if len(tokens) > self.chunk_size:
+                # Oversized unit: flush and split it by tokens
+                if current:
+                    windows.append([t for u in current for t in u])
+                windows.extend(self._token_windows(tokens))
+                current, current_size = [], 0
+                continue
+
+            if current and current_size + len(tokens) > self.chunk_size:
+                windows.append([t for u in current for t in u])
+                # Keep trailing units that fit in the overlap budget
+                overlap: list[list] = []
+                overlap_size = 0
+                for previous in reversed(current):
+                    if overlap_size + len(previous) > self.chunk_overlap:
+                        break
+                    overlap.insert(0, previous)
+                    overlap_size += len(previous)
+                current, current_size = overlap, overlap_size
+                if current_size + len(tokens) > self.chunk_size:
+                    current, current_size = [], 0
+
+            current.append(tokens)
+            current_size += len(tokens)
+
+        if current:
+            windows.append([t for u in current for t in u])
+        return windows
+
+    def split(self, text: str) -> list[TextChunk]:
+        """Split text into chunks; text within ``chunk_size`` is a single chunk."""
+        if not text or not text.strip():
+            return []
+
+        tokens = self._encode(text)
+        if len(tokens) <= self.chunk_size:
+            return [TextChunk(index=0, text=text, token_count=len(tokens))]
+
+        if self.strategy == "token":
+            windows = self._token_windows(tokens)
+        else:
+            windows = self._pack_units(text)
+
+        return [
+            TextChunk(
+                index=i, text=self._decode(window).strip(), token_count=len(window)
+            )
+            for i, window in enumerate(windows)
+        ]
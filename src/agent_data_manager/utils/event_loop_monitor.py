@@ -0,0 +1,83 @@
+"""Event loop lag monitor for detecting blocking calls in async services."""
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+from ..tools.prometheus_metrics import record_event_loop_lag
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopLagMonitor:
+    """
+    Periodically measures how late the event loop wakes a sleeping task.
+
+    A healthy loop wakes the probe within a millisecond or two of the requested
+    interval; anything larger means some coroutine held the loop with blocking work.
+    """
+
+    def __init__(self, interval: float = 0.5, warn_threshold: float = 0.1):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval: Seconds between probes
+            warn_threshold: Lag in seconds above which a warning is logged
+        """
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.samples = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the probe task is active."""
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the probe task on the running event loop."""
+        if self.running:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._probe_loop())
+        logger.info(f"EventLoopLagMonitor started with {self.interval}s interval")
+
+    async def stop(self):
+        """Stop the probe task."""
+        if not self._task:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("EventLoopLagMonitor stopped")
+
+    async def _probe_loop(self):
+        """Sleep for the interval and record how late the wake-up was."""
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - expected)
+
+            self.samples += 1
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            record_event_loop_lag(lag)
+
+            if lag > self.warn_threshold:
+                logger.warning(f"Event loop lag of {lag * 1000:.1f}ms detected")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get a summary of observed lag."""
+        return {
+            "running": self.running,
+            "interval": self.interval,
+            "samples": self.samples,
+            "last_lag_ms": self.last_lag * 1000,
+            "max_lag_ms": self.max_lag * 1000,
+        }
@@ -0,0 +1,79 @@
+"""BM25 sparse vectors for lexical (keyword) retrieval.
+
+Dense embeddings rank by meaning and often miss text users paste verbatim:
+product codes, error strings, names. The functions here turn text into sparse
+term-weight vectors that Qdrant stores next to the dense vector:
+
+- terms are hashed to 32-bit indices, so no vocabulary has to be kept
+- document weights are BM25 term-frequency saturation with length
+  normalization against a fixed average length
+- query weights are 1 per distinct term
+
+IDF is not computed here; the sparse vector is configured with Qdrant's IDF
+modifier, which applies it from collection statistics at query time. Codes
+such as ``ERR-1042`` or ``v2.3.1`` are kept whole and also split into their
+parts, so both the exact code and its pieces match.
+"""
+
+import hashlib
+import re
+from collections import Counter
+
+# Words, optionally joined by - _ . / : (keeps codes and versions whole)
+_TERM_RE = re.compile(r"\w+(?:[-./:]\w+)*")
+_PART_RE = re.compile(r"[^\W_]+")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Typical chunk length in terms; the real average would need collection stats
+BM25_AVG_LENGTH = 256
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased terms of ``text``; compound terms are followed by their parts."""
+    terms = []
+    for term in _TERM_RE.findall(text.lower()):
+        terms.append(term)
+        parts = _PART_RE.findall(term)
+        if len(parts) > 1:
+            terms.extend(parts)
+    return terms
+
+
+def term_index(term: str) -> int:
+    """Stable 32-bit index of a term."""
+    return int.from_bytes(hashlib.blake2b(term.encode(), digest_size=4).digest())
+
+
+def _to_sparse(weights: dict[int, float]) -> tuple[list[int], list[float]]:
+    indices = sorted(weights)
+    return indices, [weights[index] for index in indices]
+
+
+def document_vector(text: str) -> tuple[list[int], list[float]]:
+    """
+    BM25 document-side sparse vector of ``text``.
+
+    Returns:
+        (indices, values), sorted by index; empty for text without terms
+    """
+    terms = tokenize(text)
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * len(terms) / BM25_AVG_LENGTH)
+    weights: dict[int, float] = {}
+    for term, count in Counter(terms).items():
+        index = term_index(term)
+        # Hash collisions add up, like the terms sharing the index
+        weights[index] = weights.get(index, 0.0) + count * (BM25_K1 + 1) / (
+            count + norm
+        )
+    return _to_sparse(weights)
+
+
+def query_vector(text: str) -> tuple[list[int], list[float]]:
+    """
+    Query-side sparse vector of ``text``: weight 1 per distinct term.
+
+    Returns:
+        (indices, values), sorted by index; empty for text without terms
+    """
+    return _to_sparse({term_index(term): 1.0 for term in set(tokenize(text))})
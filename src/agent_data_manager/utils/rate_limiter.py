@@ -0,0 +1,277 @@
+"""Adaptive token-bucket rate limiting for upstream services.
+
+Ingestion used to pace itself with fixed sleeps (300ms per document, 350ms
+between batches, 100ms per ``/batch_save`` item), which is too slow when the
+upstream has headroom and still trips 429s when it does not. Each upstream
+(OpenAI, Qdrant, Firestore) now has one shared ``UpstreamRateLimiter`` with a
+requests-per-minute bucket and, where the upstream meters them, a
+tokens-per-minute bucket. Callers ``acquire`` before each call and report the
+response with ``observe_response``:
+
+* a 429 pauses every caller until ``Retry-After`` and halves the refill rate
+* successful responses restore the rate step by step
+* ``x-ratelimit-limit-*`` headers lower the rate to the account's real limit,
+  ``x-ratelimit-remaining-*`` drains the bucket to what is actually left
+"""
+
+import asyncio
+import logging
+import re
+import threading
+import time
+from collections.abc import Mapping
+from email.utils import parsedate_to_datetime
+
+from ..config.settings import settings
+from ..tools.prometheus_metrics import (
+    record_rate_limiter_throttle,
+    record_rate_limiter_wait,
+    update_rate_limiter_rate,
+)
+
+logger = logging.getLogger(__name__)
+
+UPSTREAMS = ("openai", "qdrant", "firestore")
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _header_number(headers: Mapping[str, str], name: str) -> float | None:
+    try:
+        return float(headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+def parse_duration(value: str | None) -> float | None:
+    """Parse a reset header such as ``"20ms"``, ``"1s"``, ``"6m0s"`` or ``"2.5"``."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(number) * _DURATION_SECONDS[unit] for number, unit in parts)
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> float | None:
+    """Seconds to wait from ``retry-after-ms`` or ``retry-after`` (seconds or HTTP date)."""
+    if "retry-after-ms" in headers:
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Token bucket whose refill rate can be lowered and restored at runtime.
+
+    Not thread-safe on its own; ``UpstreamRateLimiter`` serializes access.
+    """
+
+    def __init__(self, rate_per_minute: float, burst_seconds: float = 1.0):
+        """
+        Initialize the bucket full.
+
+        Args:
+            rate_per_minute: Configured refill rate, the most the bucket will allow
+            burst_seconds: Capacity expressed as seconds of refill (at least 1)
+        """
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.configured_rate = float(rate_per_minute)
+        self.ceiling = self.configured_rate
+        self.rate = self.configured_rate
+        self.capacity = max(1.0, self.configured_rate * burst_seconds / 60)
+        self.available = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = max(now - self._updated, 0.0)
+        self.available = min(self.capacity, self.available + elapsed * self.rate / 60)
+        self._updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Take ``amount`` and return the seconds to wait before using it.
+
+        Callers wait until ``min(amount, capacity)`` has refilled, so a request
+        larger than the bucket still goes through; the debt it leaves delays
+        the callers after it.
+        """
+        self._refill(now)
+        needed = min(amount, self.capacity)
+        wait = max(needed - self.available, 0.0) * 60 / self.rate
+        self.available -= amount
+        return wait
+
+    def drain_to(self, remaining: float, now: float):
+        """Lower the available amount to what the upstream reports as left."""
+        self._refill(now)
+        self.available = min(self.available, remaining)
+
+    def limit_to(self, limit: float):
+        """Cap the rate at the limit the upstream advertises."""
+        self.ceiling = min(self.configured_rate, limit)
+        self.rate = min(self.rate, self.ceiling)
+
+    def slow_down(self, factor: float = 0.5, floor: float = 0.1):
+        """Cut the rate after a rate-limit response, to no less than floor * ceiling."""
+        self.rate = max(self.ceiling * floor, self.rate * factor)
+
+    def speed_up(self, step: float = 0.05):
+        """Restore the rate by step * ceiling after a successful response."""
+        self.rate = min(self.ceiling, self.rate + self.ceiling * step)
+
+
+class UpstreamRateLimiter:
+    """Requests- and tokens-per-minute limits for one upstream service."""
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float | None,
+        tokens_per_minute: float | None = None,
+        burst_seconds: float = 1.0,
+        default_retry_after: float = 1.0,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            name: Upstream name, used in logs and metric labels
+            requests_per_minute: Request rate, or None/0 for no request limit
+            tokens_per_minute: Token rate, or None/0 for no token limit
+            burst_seconds: Bucket capacities, in seconds of refill
+            default_retry_after: Pause after a 429 without a Retry-After header
+        """
+        self.name = name
+        self.default_retry_after = default_retry_after
+        self.buckets: dict[str, TokenBucket] = {}
+        if requests_per_minute:
+            self.buckets["requests"] = TokenBucket(requests_per_minute, burst_seconds)
+        if tokens_per_minute:
+            self.buckets["tokens"] = TokenBucket(tokens_per_minute, burst_seconds)
+        self._blocked_until = 0.0
+        # Shared by every event loop that calls the upstream
+        self._lock = threading.Lock()
+        self._publish_rates()
+
+    def _publish_rates(self):
+        for kind, bucket in self.buckets.items():
+            update_rate_limiter_rate(self.name, kind, bucket.rate)
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """
+        Wait until one request (and ``tokens`` tokens) may be sent.
+
+        Args:
+            tokens: Estimated tokens the request will consume
+
+        Returns:
+            Seconds waited
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(self._blocked_until - now, 0.0)
+            if "requests" in self.buckets:
+                wait = max(wait, self.buckets["requests"].reserve(1, now))
+            if tokens and "tokens" in self.buckets:
+                wait = max(wait, self.buckets["tokens"].reserve(tokens, now))
+
+        if wait > 0:
+            record_rate_limiter_wait(self.name, wait)
+            logger.debug(f"Waiting {wait:.3f}s for the {self.name} rate limit")
+            await asyncio.sleep(wait)
+        return wait
+
+    def observe_response(
+        self, status_code: int, headers: Mapping[str, str] | None = None
+    ):
+        """
+        Adapt to an upstream response.
+
+        Args:
+            status_code: HTTP status of the response (429 means rate limited)
+            headers: Response headers, if the client exposes them
+        """
+        headers = {key.lower(): value for key, value in (headers or {}).items()}
+        with self._lock:
+            now = time.monotonic()
+            if status_code == 429:
+                delay = parse_retry_after(headers)
+                if delay is None:
+                    delay = self.default_retry_after
+                self._blocked_until = max(self._blocked_until, now + delay)
+                for bucket in self.buckets.values():
+                    bucket.slow_down()
+                record_rate_limiter_throttle(self.name)
+                logger.warning(
+                    f"{self.name} rate limited the client; pausing {delay:.2f}s"
+                )
+            else:
+                for bucket in self.buckets.values():
+                    bucket.speed_up()
+
+            for kind, bucket in self.buckets.items():
+                limit = _header_number(headers, f"x-ratelimit-limit-{kind}")
+                if limit:
+                    bucket.limit_to(limit)
+                remaining = _header_number(headers, f"x-ratelimit-remaining-{kind}")
+                if remaining is None:
+                    continue
+                bucket.drain_to(remaining, now)
+                reset = parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+                if remaining <= 0 and reset:
+                    self._blocked_until = max(self._blocked_until, now + reset)
+            self._publish_rates()
+
+    def rates(self) -> dict[str, float]:
+        """Current refill rate per bucket, per minute."""
+        with self._lock:
+            return {kind: bucket.rate for kind, bucket in self.buckets.items()}
+
+
+_limiters: dict[str, UpstreamRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(upstream: str) -> UpstreamRateLimiter:
+    """
+    Get the shared rate limiter for an upstream.
+
+    Args:
+        upstream: One of ``UPSTREAMS``
+
+    Returns:
+        UpstreamRateLimiter configured from the rate limit settings
+    """
+    if upstream not in UPSTREAMS:
+        raise ValueError(f"Unknown upstream {upstream!r}, expected one of {UPSTREAMS}")
+    with _limiters_lock:
+        limiter = _limiters.get(upstream)
+        if limiter is None:
+            config = settings.get_rate_limit_config()
+            limiter = _limiters[upstream] = UpstreamRateLimiter(
+                upstream,
+                requests_per_minute=config[upstream]["requests_per_minute"],
+                tokens_per_minute=config[upstream].get("tokens_per_minute"),
+                burst_seconds=config["burst_seconds"],
+            )
+        return limiter
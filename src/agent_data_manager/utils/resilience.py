@@ -0,0 +1,352 @@
+"""Async retries, circuit breakers and hedged reads for upstream calls.
+
+``call_upstream`` wraps one call to OpenAI, Qdrant or Firestore:
+
+* transient failures (timeouts, connection errors, 408/429/5xx) are retried
+  with full-jitter exponential backoff, up to ``max_attempts``
+* inside ``request_deadline(seconds)`` every attempt is bounded by the time
+  left, and a retry whose backoff would outlive the deadline is not made
+* each upstream has one circuit breaker; after ``failure_threshold``
+  consecutive transient failures calls fail fast with ``CircuitOpenError``
+  until ``reset_timeout`` has passed and a probe call succeeds
+* idempotent reads can be hedged: when the first request has not answered
+  after ``hedge_delay`` seconds a second one is sent and the first answer wins
+
+Errors are raised, not converted; callers keep their own error reporting.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TypeVar
+
+from ..config.settings import settings
+from ..tools.prometheus_metrics import (
+    record_circuit_breaker_rejection,
+    record_upstream_hedge,
+    record_upstream_retry,
+    update_circuit_breaker_state,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+_TRANSIENT_ERRORS: tuple[type[BaseException], ...] = (TimeoutError, ConnectionError)
+try:
+    import httpx
+
+    _TRANSIENT_ERRORS += (httpx.TransportError,)
+except ImportError:
+    pass
+try:
+    import openai
+
+    _TRANSIENT_ERRORS += (openai.APIConnectionError,)
+except ImportError:
+    pass
+try:
+    from qdrant_client.http.exceptions import ResponseHandlingException
+
+    _TRANSIENT_ERRORS += (ResponseHandlingException,)
+except ImportError:
+    pass
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open."""
+
+
+def _status_code(error: BaseException) -> int | None:
+    # openai and qdrant errors carry status_code; google.api_core errors carry code
+    for attribute in ("status_code", "code"):
+        value = getattr(error, attribute, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a failed upstream call is worth retrying."""
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, _TRANSIENT_ERRORS):
+        return True
+    return _status_code(error) in RETRYABLE_STATUS_CODES
+
+
+_deadline: ContextVar[float | None] = ContextVar("upstream_deadline", default=None)
+
+
+@contextmanager
+def request_deadline(seconds: float) -> Iterator[None]:
+    """Bound the retries of every upstream call made inside the block."""
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_budget() -> float | None:
+    """Seconds left before the current request deadline, or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+@dataclass
+class RetryPolicy:
+    """Attempts and full-jitter exponential backoff for one upstream call."""
+
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retrying after failed attempt number ``attempt``."""
+        return random.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        )
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker shared by every caller of an upstream."""
+
+    CLOSED, HALF_OPEN, OPEN = 0, 1, 2
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0
+    ):
+        """
+        Initialize the breaker closed.
+
+        Args:
+            name: Upstream name, used in errors and metric labels
+            failure_threshold: Consecutive transient failures that open the breaker
+            reset_timeout: Seconds open before one probe call is let through
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        # Shared by every event loop that calls the upstream
+        self._lock = threading.Lock()
+        update_circuit_breaker_state(name, self._state)
+
+    @property
+    def state(self) -> int:
+        """Current state: CLOSED, HALF_OPEN or OPEN."""
+        with self._lock:
+            return self._state
+
+    def _set_state(self, state: int):
+        if state != self._state:
+            logger.warning(
+                f"{self.name} circuit breaker {('closed', 'half-open', 'open')[state]}"
+            )
+            self._state = state
+            update_circuit_breaker_state(self.name, state)
+
+    def before_call(self):
+        """
+        Let a call through or reject it.
+
+        Raises:
+            CircuitOpenError: While the breaker is open, or half-open with a
+                probe call already in flight
+        """
+        with self._lock:
+            if (
+                self._state == self.OPEN
+                and time.monotonic() - self._opened_at >= self.reset_timeout
+            ):
+                self._set_state(self.HALF_OPEN)
+            if self._state == self.CLOSED:
+                return
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+        record_circuit_breaker_rejection(self.name)
+        raise CircuitOpenError(f"{self.name} circuit breaker is open")
+
+    def record_success(self):
+        """Close the breaker after an answered call."""
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            self._set_state(self.CLOSED)
+
+    def release_probe(self):
+        """Let another probe through after one ended without an answer (cancelled)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        """Count a transient failure; open the breaker at the threshold or a failed probe."""
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if (
+                self._state == self.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                self._opened_at = time.monotonic()
+                self._set_state(self.OPEN)
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(upstream: str) -> CircuitBreaker:
+    """
+    Get the shared circuit breaker for an upstream.
+
+    Args:
+        upstream: Upstream name (openai, qdrant, firestore)
+
+    Returns:
+        CircuitBreaker configured from the resilience settings
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(upstream)
+        if breaker is None:
+            config = settings.get_resilience_config()
+            breaker = _breakers[upstream] = CircuitBreaker(
+                upstream,
+                failure_threshold=config["failure_threshold"],
+                reset_timeout=config["reset_timeout"],
+            )
+        return breaker
+
+
+async def _within_deadline(awaitable: Awaitable[T]) -> T:
+    remaining = remaining_budget()
+    if remaining is None:
+        return await awaitable
+    if remaining <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise TimeoutError("Request deadline exceeded before the upstream call")
+    return await asyncio.wait_for(awaitable, remaining)
+
+
+async def _hedged(
+    upstream: str, operation: Callable[[], Awaitable[T]], hedge_delay: float
+) -> T:
+    """Send a second request if the first is slow; return the first answer."""
+    tasks = [asyncio.ensure_future(operation())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+        if not done:
+            tasks.append(asyncio.ensure_future(operation()))
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    if len(tasks) > 1:
+                        winner = "primary" if task is tasks[0] else "hedge"
+                        record_upstream_hedge(upstream, winner)
+                    return task.result()
+        # Every request failed; report the original request's error
+        return tasks[0].result()
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+async def call_upstream(
+    upstream: str,
+    operation: Callable[[], Awaitable[T]],
+    *,
+    idempotent: bool = False,
+    hedge_delay: float | None = None,
+    policy: RetryPolicy | None = None,
+) -> T:
+    """
+    Call an upstream with retries, its circuit breaker and optional hedging.
+
+    Args:
+        upstream: Upstream name (openai, qdrant, firestore)
+        operation: Zero-argument function returning a fresh awaitable per attempt
+        idempotent: Whether the call is a read that may be sent twice (hedged)
+        hedge_delay: Seconds before hedging; defaults to the upstream's setting
+        policy: Retry policy; defaults to the resilience settings
+
+    Returns:
+        The operation's result
+
+    Raises:
+        CircuitOpenError: When the upstream's circuit breaker is open
+        Exception: The last error once retries, or the deadline, are exhausted
+    """
+    config = settings.get_resilience_config()
+    if policy is None:
+        policy = RetryPolicy(
+            max_attempts=config["max_attempts"],
+            base_delay=config["base_delay"],
+            max_delay=config["max_delay"],
+        )
+    if hedge_delay is None:
+        hedge_delay = config["hedge_delay"].get(upstream, 0)
+    breaker = get_circuit_breaker(upstream)
+
+    attempt = 1
+    while True:
+        breaker.before_call()
+        try:
+            if idempotent and hedge_delay > 0:
+                result = await _within_deadline(
+                    _hedged(upstream, operation, hedge_delay)
+                )
+            else:
+                result = await _within_deadline(operation())
+        except Exception as e:
+            retryable = is_retryable(e)
+            if retryable and _status_code(e) != 429:
+                breaker.record_failure()
+            else:
+                # The upstream answered (or was only rate limiting us)
+                breaker.record_success()
+            if not retryable or attempt >= policy.max_attempts:
+                raise
+            delay = policy.backoff(attempt)
+            remaining = remaining_budget()
+            if remaining is not None and delay >= remaining:
+                logger.warning(
+                    f"Not retrying {upstream} call, {remaining:.2f}s left before "
+                    f"the request deadline: {e}"
+                )
+                raise
+            logger.warning(
+                f"{upstream} call failed (attempt {attempt}/{policy.max_attempts}), "
+                f"retrying in {delay:.2f}s: {e}"
+            )
+            record_upstream_retry(upstream)
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+        except BaseException:
+            # Cancelled mid-call: a half-open breaker must not wait on this probe
+            breaker.release_probe()
+            raise
+
+        breaker.record_success()
+        return result
@@ -0,0 +1,447 @@
+"""Result cache backends for the API gateway.
+
+All backends share one interface so ``_rag_cache`` can be swapped via
+``settings.get_cache_config()``:
+
+* ``memory``: per-process LRU dict (default, fastest, not shared)
+* ``sqlite``: a SQLite file in WAL mode, shared by every worker on one host
+* ``redis``: any Redis-protocol server, shared across hosts and instances
+
+Entries carry the write generation of the collection they were computed from.
+Generations live in the backend too, so a write seen by one worker invalidates
+the entries of every worker sharing the backend.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Protocol
+
+try:
+    import redis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CACHE_BACKENDS = ("memory", "sqlite", "redis")
+
+
+def _entry_state(age: float, ttl: float, refresh_after: float | None) -> str | None:
+    """Classify an entry by age: None when expired, else "fresh" or "stale"."""
+    if age > ttl:
+        return None
+    if refresh_after is not None and age > refresh_after:
+        return "stale"
+    return "fresh"
+
+
+class ResultCache(Protocol):
+    """Interface implemented by every result cache backend."""
+
+    def lookup(self, key: str, generation: int = 0) -> tuple[Any, str]:
+        """Return (value, state) with state "fresh", "stale", "invalidated" or "miss"."""
+        ...
+
+    def get(self, key: str, generation: int = 0) -> Any:
+        """Return the cached value or None."""
+        ...
+
+    def put(self, key: str, value: Any, generation: int = 0):
+        """Store a value computed at the given generation."""
+        ...
+
+    def get_generation(self, namespace: str) -> int:
+        """Current write generation of a namespace (collection)."""
+        ...
+
+    def bump_generation(self, namespace: str) -> int:
+        """Advance the write generation of a namespace and return it."""
+        ...
+
+    def clear(self):
+        """Remove all entries."""
+        ...
+
+    def size(self) -> int:
+        """Number of entries held."""
+        ...
+
+
+class LRUCache:
+    """Thread-safe LRU cache with TTL support for performance optimization.
+
+    Entries carry the write generation they were computed at; a lookup with a
+    newer generation drops the entry. Entries older than ``refresh_after`` are
+    still returned but reported as stale so callers can refresh them.
+    """
+
+    backend = "memory"
+
+    def __init__(
+        self, max_size: int = 1000, ttl: int = 3600, refresh_after: float | None = None
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.refresh_after = refresh_after
+        self.cache = OrderedDict()
+        self.timestamps = {}
+        self.generations = {}
+        self.namespace_generations: dict[str, int] = {}
+        self.lock = threading.RLock()
+
+    def _evict(self, key: str):
+        del self.cache[key]
+        del self.timestamps[key]
+        del self.generations[key]
+
+    def lookup(self, key: str, generation: int = 0) -> tuple[Any, str]:
+        """
+        Look up an entry and report its state.
+
+        Returns:
+            (value, state) where state is "fresh", "stale", "invalidated" or "miss"
+        """
+        with self.lock:
+            if key not in self.cache:
+                return None, "miss"
+
+            # Entry was computed before a later write to the collection
+            if self.generations[key] != generation:
+                self._evict(key)
+                return None, "invalidated"
+
+            # Check TTL
+            state = _entry_state(
+                time.time() - self.timestamps[key], self.ttl, self.refresh_after
+            )
+            if state is None:
+                self._evict(key)
+                return None, "miss"
+
+            # Move to end (most recently used)
+            self.cache.move_to_end(key)
+            return self.cache[key], state
+
+    def get(self, key: str, generation: int = 0):
+        """Get item from cache, return None if not found, expired or invalidated."""
+        value, _ = self.lookup(key, generation)
+        return value
+
+    def put(self, key: str, value, generation: int = 0):
+        """Put item in cache, evict oldest if necessary."""
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+            else:
+                if len(self.cache) >= self.max_size:
+                    # Remove oldest item
+                    self._evict(next(iter(self.cache)))
+
+            self.cache[key] = value
+            self.timestamps[key] = time.time()
+            self.generations[key] = generation
+
+    def get_generation(self, namespace: str) -> int:
+        """Current write generation of a namespace."""
+        with self.lock:
+            return self.namespace_generations.get(namespace, 0)
+
+    def bump_generation(self, namespace: str) -> int:
+        """Advance the write generation of a namespace."""
+        with self.lock:
+            generation = self.namespace_generations.get(namespace, 0) + 1
+            self.namespace_generations[namespace] = generation
+            return generation
+
+    def clear(self):
+        """Clear all cache entries."""
+        with self.lock:
+            self.cache.clear()
+            self.timestamps.clear()
+            self.generations.clear()
+
+    def size(self) -> int:
+        """Get current cache size."""
+        with self.lock:
+            return len(self.cache)
+
+
+class SQLiteResultCache:
+    """Result cache in a SQLite file shared by all workers on one host.
+
+    WAL mode lets readers proceed while another process writes. Each thread
+    gets its own connection; values are stored as JSON.
+    """
+
+    backend = "sqlite"
+
+    def __init__(
+        self,
+        path: str,
+        max_size: int = 1000,
+        ttl: int = 3600,
+        refresh_after: float | None = None,
+    ):
+        """
+        Initialize the SQLite cache.
+
+        Args:
+            path: Database file, created if missing
+            max_size: Maximum entries before least recently used ones are evicted
+            ttl: Seconds after which entries expire
+            refresh_after: Seconds after which entries are reported as stale
+        """
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.refresh_after = refresh_after
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rag_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, "
+            "accessed REAL NOT NULL, generation INTEGER NOT NULL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS rag_cache_accessed ON rag_cache (accessed)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rag_cache_generations ("
+            "namespace TEXT PRIMARY KEY, generation INTEGER NOT NULL)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        """Connection for the calling thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def lookup(self, key: str, generation: int = 0) -> tuple[Any, str]:
+        """Look up an entry and report its state."""
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT value, created, generation FROM rag_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None, "miss"
+
+        value, created, entry_generation = row
+        if entry_generation != generation:
+            conn.execute("DELETE FROM rag_cache WHERE key = ?", (key,))
+            return None, "invalidated"
+
+        now = time.time()
+        state = _entry_state(now - created, self.ttl, self.refresh_after)
+        if state is None:
+            conn.execute("DELETE FROM rag_cache WHERE key = ?", (key,))
+            return None, "miss"
+
+        conn.execute("UPDATE rag_cache SET accessed = ? WHERE key = ?", (now, key))
+        return json.loads(value), state
+
+    def get(self, key: str, generation: int = 0):
+        """Get item from cache, return None if not found, expired or invalidated."""
+        value, _ = self.lookup(key, generation)
+        return value
+
+    def put(self, key: str, value, generation: int = 0):
+        """Store an entry and evict least recently used ones over max_size."""
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO rag_cache (key, value, created, accessed, generation) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, json.dumps(value, default=str), now, now, generation),
+        )
+        (count,) = conn.execute("SELECT COUNT(*) FROM rag_cache").fetchone()
+        if count > self.max_size:
+            conn.execute(
+                "DELETE FROM rag_cache WHERE key IN "
+                "(SELECT key FROM rag_cache ORDER BY accessed LIMIT ?)",
+                (count - self.max_size,),
+            )
+
+    def get_generation(self, namespace: str) -> int:
+        """Current write generation of a namespace."""
+        row = (
+            self._conn()
+            .execute(
+                "SELECT generation FROM rag_cache_generations WHERE namespace = ?",
+                (namespace,),
+            )
+            .fetchone()
+        )
+        return row[0] if row else 0
+
+    def bump_generation(self, namespace: str) -> int:
+        """Advance the write generation of a namespace atomically."""
+        (generation,) = (
+            self._conn()
+            .execute(
+                "INSERT INTO rag_cache_generations (namespace, generation) VALUES (?, 1) "
+                "ON CONFLICT(namespace) DO UPDATE SET generation = generation + 1 "
+                "RETURNING generation",
+                (namespace,),
+            )
+            .fetchone()
+        )
+        return generation
+
+    def clear(self):
+        """Clear all cache entries."""
+        self._conn().execute("DELETE FROM rag_cache")
+
+    def size(self) -> int:
+        """Get current cache size."""
+        (count,) = self._conn().execute("SELECT COUNT(*) FROM rag_cache").fetchone()
+        return count
+
+
+class RedisResultCache:
+    """Result cache on a Redis-protocol server shared across hosts.
+
+    Expiry uses Redis key TTLs; size is bounded by the server's maxmemory
+    policy rather than ``max_size``.
+    """
+
+    backend = "redis"
+
+    def __init__(
+        self,
+        client,
+        ttl: int = 3600,
+        refresh_after: float | None = None,
+        prefix: str = "agent_data:rag:",
+    ):
+        """
+        Initialize the Redis cache.
+
+        Args:
+            client: redis.Redis-compatible client (e.g. fakeredis.FakeRedis in tests)
+            ttl: Seconds after which entries expire
+            refresh_after: Seconds after which entries are reported as stale
+            prefix: Key prefix isolating this cache from other data
+        """
+        self.client = client
+        self.ttl = ttl
+        self.refresh_after = refresh_after
+        self.prefix = prefix
+
+    def _entry_key(self, key: str) -> str:
+        return f"{self.prefix}entry:{key}"
+
+    def _generation_key(self, namespace: str) -> str:
+        return f"{self.prefix}generation:{namespace}"
+
+    def lookup(self, key: str, generation: int = 0) -> tuple[Any, str]:
+        """Look up an entry and report its state."""
+        raw = self.client.get(self._entry_key(key))
+        if raw is None:
+            return None, "miss"
+
+        entry = json.loads(raw)
+        if entry["generation"] != generation:
+            self.client.delete(self._entry_key(key))
+            return None, "invalidated"
+
+        state = _entry_state(
+            time.time() - entry["created"], self.ttl, self.refresh_after
+        )
+        if state is None:
+            return None, "miss"
+        return entry["value"], state
+
+    def get(self, key: str, generation: int = 0):
+        """Get item from cache, return None if not found, expired or invalidated."""
+        value, _ = self.lookup(key, generation)
+        return value
+
+    def put(self, key: str, value, generation: int = 0):
+        """Store an entry with the cache TTL."""
+        entry = {"value": value, "created": time.time(), "generation": generation}
+        self.client.set(
+            self._entry_key(key),
+            json.dumps(entry, default=str),
+            ex=max(1, int(self.ttl)),
+        )
+
+    def get_generation(self, namespace: str) -> int:
+        """Current write generation of a namespace."""
+        value = self.client.get(self._generation_key(namespace))
+        return int(value) if value is not None else 0
+
+    def bump_generation(self, namespace: str) -> int:
+        """Advance the write generation of a namespace atomically."""
+        return int(self.client.incr(self._generation_key(namespace)))
+
+    def clear(self):
+        """Clear all cache entries."""
+        keys = list(self.client.scan_iter(match=f"{self.prefix}entry:*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def size(self) -> int:
+        """Get current cache size."""
+        return sum(1 for _ in self.client.scan_iter(match=f"{self.prefix}entry:*"))
+
+
+def create_result_cache(config: dict[str, Any], client=None) -> ResultCache:
+    """
+    Build the RAG result cache selected by ``settings.get_cache_config()``.
+
+    Args:
+        config: Cache configuration dictionary
+        client: Optional Redis-protocol client overriding ``rag_cache_redis_url``
+
+    Returns:
+        Cache backend; falls back to the in-process cache if the shared one
+        cannot be set up or reached
+    """
+    backend = config.get("rag_cache_backend", "memory")
+    max_size = config.get("rag_cache_max_size", 1000)
+    ttl = config.get("rag_cache_ttl", 3600)
+    refresh_after = config.get("rag_cache_refresh_after")
+
+    if backend not in CACHE_BACKENDS:
+        logger.warning(f"Unknown RAG cache backend '{backend}', using in-process cache")
+        backend = "memory"
+
+    try:
+        if backend == "sqlite":
+            return SQLiteResultCache(
+                config.get("rag_cache_sqlite_path", "rag_cache.db"),
+                max_size=max_size,
+                ttl=ttl,
+                refresh_after=refresh_after,
+            )
+        if backend == "redis":
+            if client is None:
+                if not REDIS_AVAILABLE:
+                    raise ImportError("redis package is not installed")
+                client = redis.Redis.from_url(config.get("rag_cache_redis_url"))
+            # from_url connects lazily; fail over now rather than on every request
+            client.ping()
+            return RedisResultCache(client, ttl=ttl, refresh_after=refresh_after)
+    except Exception as e:
+        logger.warning(
+            f"Failed to set up {backend} RAG cache backend, using in-process cache: {e}"
+        )
+
+    return LRUCache(max_size=max_size, ttl=ttl, refresh_after=refresh_after)
@@ -0,0 +1,153 @@
+"""Semantic cache for near-duplicate queries.
+
+Paraphrases of the same question miss an exact-text cache. This cache keeps
+the embeddings of recent queries in a small in-memory matrix and serves the
+result of the most similar cached query when its cosine similarity reaches
+``similarity_threshold``. Only entries with exactly the same filter key
+(filters, tags, limit, threshold, ...) and collection generation are eligible.
+"""
+
+import threading
+import time
+from typing import Any
+
+import numpy as np
+
+
+class SemanticQueryCache:
+    """Nearest-neighbour cache of query embeddings and their results."""
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        similarity_threshold: float = 0.95,
+        ttl: float = 3600,
+    ):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            max_entries: Maximum cached queries; the least recently used is replaced
+            similarity_threshold: Minimum cosine similarity for a hit
+            ttl: Seconds after which entries expire
+        """
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self.lock = threading.RLock()
+
+        self._vectors: np.ndarray | None = None
+        self._entries: list[dict[str, Any] | None] = [None] * max_entries
+        self._last_used = np.zeros(max_entries)
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def _normalize(embedding: list[float]) -> np.ndarray | None:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if not norm:
+            return None
+        return vector / norm
+
+    def lookup(
+        self, embedding: list[float], filter_key: str, generation: int = 0
+    ) -> tuple[Any, float, str] | None:
+        """
+        Find the most similar cached query with the same filters and generation.
+
+        Returns:
+            (value, similarity, cached query text) on a hit, otherwise None
+        """
+        vector = self._normalize(embedding)
+        with self.lock:
+            if vector is None or self._vectors is None:
+                self.stats["misses"] += 1
+                return None
+            if vector.shape[0] != self._vectors.shape[1]:
+                self.stats["misses"] += 1
+                return None
+
+            now = time.time()
+            eligible = np.array(
+                [
+                    entry is not None
+                    and entry["filter_key"] == filter_key
+                    and entry["generation"] == generation
+                    and now - entry["created"] <= self.ttl
+                    for entry in self._entries
+                ]
+            )
+            if not eligible.any():
+                self.stats["misses"] += 1
+                return None
+
+            similarities = np.where(eligible, self._vectors @ vector, -np.inf)
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            if similarity < self.similarity_threshold:
+                self.stats["misses"] += 1
+                return None
+
+            self._last_used[best] = now
+            self.stats["hits"] += 1
+            entry = self._entries[best]
+            return entry["value"], similarity, entry["query_text"]
+
+    def put(
+        self,
+        embedding: list[float],
+        filter_key: str,
+        value: Any,
+        generation: int = 0,
+        query_text: str = "",
+    ):
+        """Store a query embedding and its result, replacing the LRU slot if full."""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        with self.lock:
+            if self._vectors is None or vector.shape[0] != self._vectors.shape[1]:
+                # First entry (or a new embedding model) sizes the index
+                self._vectors = np.zeros(
+                    (self.max_entries, vector.shape[0]), dtype=np.float32
+                )
+                self._entries = [None] * self.max_entries
+                self._last_used = np.zeros(self.max_entries)
+
+            free = [i for i, entry in enumerate(self._entries) if entry is None]
+            slot = free[0] if free else int(np.argmin(self._last_used))
+
+            now = time.time()
+            self._vectors[slot] = vector
+            self._last_used[slot] = now
+            self._entries[slot] = {
+                "filter_key": filter_key,
+                "generation": generation,
+                "created": now,
+                "value": value,
+                "query_text": query_text,
+            }
+
+    def clear(self):
+        """Clear all cache entries."""
+        with self.lock:
+            self._vectors = None
+            self._entries = [None] * self.max_entries
+            self._last_used = np.zeros(self.max_entries)
+
+    def size(self) -> int:
+        """Get current cache size."""
+        with self.lock:
+            return sum(entry is not None for entry in self._entries)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get hit/miss statistics."""
+        with self.lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+                "size": self.size(),
+                "similarity_threshold": self.similarity_threshold,
+            }
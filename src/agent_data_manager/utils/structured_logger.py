@@ -6,19 +6,28 @@ This module provides a structured logger that:
 3. Sends ERROR and above levels at 100% rate for reliability
 4. Exports error metrics to Cloud Monitoring using prometheus_client
 5. Outputs to both file (logs/agent_server.log) and stderr
+6. Hands records to a background writer thread through a bounded queue, so
+   JSON formatting and file I/O stay off the request path
+7. Rate limits chatty loggers below ERROR level
 
 Created for CLI 124 to standardize logging, reduce costs (<$1/day), and improve observability.
 """
 
+import atexit
 import json
 import logging
 import os
+import queue
 import random
 import sys
+import threading
 import time
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any
 
+from ..config.settings import settings
+
 # Import prometheus_client for Cloud Monitoring integration
 try:
     from prometheus_client import Counter, Gauge
@@ -86,16 +95,32 @@ class StructuredJSONFormatter(logging.Formatter):
 
 
 class SamplingFilter(logging.Filter):
-    """Filter that implements sampling for INFO level logs (10% rate)."""
+    """Filter that implements sampling for INFO level logs (10% rate).
+
+    Records below ERROR can additionally be rate limited per logger name with a
+    token bucket, so a single chatty module cannot flood the log pipeline.
+    """
 
-    def __init__(self, info_sample_rate: float = 0.1):
+    def __init__(
+        self,
+        info_sample_rate: float = 0.1,
+        max_per_second: float = 0.0,
+        burst: int | None = None,
+    ):
         """Initialize with sample rate for INFO logs.
 
         Args:
             info_sample_rate: Fraction of INFO logs to keep (0.0 to 1.0)
+            max_per_second: Per-logger limit for records below ERROR (0 disables)
+            burst: Token bucket capacity, defaults to max_per_second
         """
         super().__init__()
         self.info_sample_rate = info_sample_rate
+        self.max_per_second = max_per_second
+        self.burst = burst if burst is not None else max(1, int(max_per_second))
+        self.suppressed: dict[str, int] = {}
+        self._buckets: dict[str, list[float]] = {}  # name -> [tokens, last refill]
+        self._lock = threading.Lock()
 
     def filter(self, record: logging.LogRecord) -> bool:
         """Filter log records based on level and sampling."""
@@ -103,16 +128,41 @@ class SamplingFilter(logging.Filter):
         if record.levelno >= logging.ERROR:
             return True
 
-        # Always allow WARNING
+        # Always allow WARNING, subject only to rate limiting
         if record.levelno >= logging.WARNING:
-            return True
+            return self._within_rate(record.name)
 
         # Sample INFO and DEBUG logs
         if record.levelno >= logging.INFO:
-            return random.random() < self.info_sample_rate
+            sampled = random.random() < self.info_sample_rate
+        else:
+            # For DEBUG and below, sample at a lower rate
+            sampled = random.random() < (self.info_sample_rate * 0.1)
 
-        # For DEBUG and below, sample at a lower rate
-        return random.random() < (self.info_sample_rate * 0.1)
+        return sampled and self._within_rate(record.name)
+
+    def _within_rate(self, name: str) -> bool:
+        """Take a token from the logger's bucket, counting suppressed records."""
+        if self.max_per_second <= 0:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(name)
+            if bucket is None:
+                bucket = self._buckets[name] = [float(self.burst), now]
+
+            tokens = min(
+                self.burst, bucket[0] + (now - bucket[1]) * self.max_per_second
+            )
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                self.suppressed[name] = self.suppressed.get(name, 0) + 1
+                return False
+
+            bucket[0] = tokens - 1
+            return True
 
 
 class ErrorMetricsHandler(logging.Handler):
@@ -183,6 +233,167 @@ class ErrorMetricsHandler(logging.Handler):
             pass
 
 
+class _DrainingQueueListener(QueueListener):
+    """QueueListener whose stop sentinel waits for space in a full queue."""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class _LogPipeline:
+    """Bounded queue and writer thread shared by all loggers writing one file."""
+
+    def __init__(self, log_file: str, max_size: int, error_timeout: float):
+        json_formatter = StructuredJSONFormatter()
+
+        # File handler with JSON format
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(json_formatter)
+
+        # Stderr handler for errors only (no sampling)
+        stderr_handler = logging.StreamHandler(sys.stderr)
+        stderr_handler.setLevel(logging.ERROR)
+        stderr_handler.setFormatter(json_formatter)
+
+        self.log_file = log_file
+        self.queue: queue.Queue = queue.Queue(maxsize=max_size)
+        self.listener = _DrainingQueueListener(
+            self.queue, file_handler, stderr_handler, respect_handler_level=True
+        )
+        self.error_timeout = error_timeout
+        self.dropped = 0
+        self.listener.start()
+
+    @property
+    def thread(self) -> threading.Thread | None:
+        """Writer thread, or None once the listener is stopped."""
+        return self.listener._thread
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Block until every queued record has been written.
+
+        Args:
+            timeout: Maximum seconds to wait, None to wait indefinitely
+
+        Returns:
+            False if records were still queued when the timeout expired
+        """
+        if self.thread is None or threading.current_thread() is self.thread:
+            return True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stop(self):
+        """Write remaining records and stop the writer thread."""
+        if self.thread is not None:
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+
+
+class BoundedQueueHandler(QueueHandler):
+    """QueueHandler that never blocks the caller for records below ERROR.
+
+    Records are enqueued unformatted; the message, JSON encoding and traceback
+    are rendered on the writer thread. When the queue is full, records below
+    ERROR are dropped and counted, while ERROR and above wait for space and for
+    the queue to drain so they reach disk before the call returns. Both waits
+    are bounded by ``error_timeout``; an error that still finds no space is
+    written inline instead.
+    """
+
+    def __init__(self, pipeline: _LogPipeline):
+        super().__init__(pipeline.queue)
+        self.pipeline = pipeline
+        self.log_file = pipeline.log_file
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Pass the record through untouched to keep formatting lazy."""
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        """Put a record on the queue, dropping non-errors when it is full."""
+        if record.levelno >= logging.ERROR:
+            try:
+                self.queue.put(record, timeout=self.pipeline.error_timeout)
+            except queue.Full:
+                self.pipeline.listener.handle(record)
+            return
+
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.pipeline.dropped += 1
+
+    def emit(self, record: logging.LogRecord):
+        """Enqueue the record, writing inline if the writer thread is unavailable."""
+        pipeline = self.pipeline
+        if pipeline.thread is None or threading.current_thread() is pipeline.thread:
+            pipeline.listener.handle(record)
+            return
+
+        super().emit(record)
+        if record.levelno >= logging.ERROR:
+            pipeline.flush(timeout=pipeline.error_timeout)
+
+
+# Pipelines keyed by absolute log file path
+_pipelines: dict[str, _LogPipeline] = {}
+_pipelines_lock = threading.Lock()
+
+
+def _get_pipeline(log_file: str) -> _LogPipeline:
+    """Get or create the queue pipeline for a log file."""
+    path = os.path.abspath(log_file)
+    with _pipelines_lock:
+        pipeline = _pipelines.get(path)
+        if pipeline is None or pipeline.thread is None:
+            config = settings.get_logging_config()
+            pipeline = _pipelines[path] = _LogPipeline(
+                path, config["queue_max_size"], config["error_flush_timeout"]
+            )
+        return pipeline
+
+
+def flush_logs():
+    """Block until all queued log records have been written."""
+    for pipeline in list(_pipelines.values()):
+        pipeline.flush()
+
+
+def shutdown_logging():
+    """Drain and stop every log writer thread."""
+    with _pipelines_lock:
+        pipelines = list(_pipelines.values())
+        _pipelines.clear()
+    for pipeline in pipelines:
+        pipeline.stop()
+
+
+def get_logging_stats() -> dict[str, Any]:
+    """Get queue depth and dropped record counts per log file."""
+    return {
+        path: {
+            "queue_depth": pipeline.queue.qsize(),
+            "max_size": pipeline.queue.maxsize,
+            "dropped": pipeline.dropped,
+        }
+        for path, pipeline in list(_pipelines.items())
+    }
+
+
+atexit.register(shutdown_logging)
+
+
 class StructuredLogger:
     """Main structured logger class with JSON formatting and sampling."""
 
@@ -197,9 +408,9 @@ class StructuredLogger:
         self.logger.setLevel(logging.DEBUG)
 
         # Prevent duplicate handlers if logger already configured
+        log_path = os.path.abspath(log_file)
         if any(
-            isinstance(h, logging.FileHandler)
-            and getattr(h, "baseFilename", "").endswith(log_file)
+            isinstance(h, BoundedQueueHandler) and h.log_file == log_path
             for h in self.logger.handlers
         ):
             return
@@ -209,55 +420,63 @@ class StructuredLogger:
         if log_dir and not os.path.exists(log_dir):
             os.makedirs(log_dir, exist_ok=True)
 
-        # Create JSON formatter
-        json_formatter = StructuredJSONFormatter()
-
-        # Create sampling filter
-        sampling_filter = SamplingFilter(info_sample_rate=0.1)
-
-        # File handler with JSON format and sampling
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(json_formatter)
-        file_handler.addFilter(sampling_filter)
+        # Create sampling and rate limiting filter
+        logging_config = settings.get_logging_config()
+        sampling_filter = SamplingFilter(
+            info_sample_rate=logging_config["info_sample_rate"],
+            max_per_second=logging_config["rate_limit_per_second"],
+            burst=logging_config["rate_limit_burst"],
+        )
 
-        # Stderr handler for errors only (no sampling)
-        stderr_handler = logging.StreamHandler(sys.stderr)
-        stderr_handler.setLevel(logging.ERROR)
-        stderr_handler.setFormatter(json_formatter)
+        # Queue handler feeding the shared file/stderr writer thread; filtering
+        # happens on the caller so sampled-out records never reach the queue
+        queue_handler = BoundedQueueHandler(_get_pipeline(log_file))
+        queue_handler.setLevel(logging.DEBUG)
+        queue_handler.addFilter(sampling_filter)
 
         # Error metrics handler
         metrics_handler = ErrorMetricsHandler()
 
         # Add handlers to logger
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(stderr_handler)
+        self.logger.addHandler(queue_handler)
         self.logger.addHandler(metrics_handler)
 
-    def debug(self, message: str, **context):
-        """Log debug message with optional context."""
-        self._log(logging.DEBUG, message, context)
+    def debug(self, message: str, *args, **context):
+        """Log debug message with optional %-style args and context."""
+        self._log(logging.DEBUG, message, context, args=args)
 
-    def info(self, message: str, **context):
-        """Log info message with optional context."""
-        self._log(logging.INFO, message, context)
+    def info(self, message: str, *args, **context):
+        """Log info message with optional %-style args and context."""
+        self._log(logging.INFO, message, context, args=args)
 
-    def warning(self, message: str, **context):
-        """Log warning message with optional context."""
-        self._log(logging.WARNING, message, context)
+    def warning(self, message: str, *args, **context):
+        """Log warning message with optional %-style args and context."""
+        self._log(logging.WARNING, message, context, args=args)
 
-    def error(self, message: str, exc_info: bool = False, **context):
+    def error(self, message: str, *args, exc_info: bool = False, **context):
         """Log error message with optional context and exception info."""
-        self._log(logging.ERROR, message, context, exc_info=exc_info)
+        self._log(logging.ERROR, message, context, exc_info=exc_info, args=args)
 
-    def critical(self, message: str, exc_info: bool = False, **context):
+    def critical(self, message: str, *args, exc_info: bool = False, **context):
         """Log critical message with optional context and exception info."""
-        self._log(logging.CRITICAL, message, context, exc_info=exc_info)
+        self._log(logging.CRITICAL, message, context, exc_info=exc_info, args=args)
 
     def _log(
-        self, level: int, message: str, context: dict[str, Any], exc_info: bool = False
+        self,
+        level: int,
+        message: str,
+        context: dict[str, Any],
+        exc_info: bool = False,
+        args: tuple = (),
     ):
-        """Internal logging method."""
+        """Internal logging method.
+
+        %-style args are interpolated on the writer thread, so pass values as
+        args rather than pre-formatting them when the record may be sampled out.
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+
         # Create log record with extra context
         extra = {"extra_fields": context} if context else {}
 
@@ -267,7 +486,7 @@ class StructuredLogger:
 
             exc_info = sys.exc_info()
 
-        self.logger.log(level, message, exc_info=exc_info, extra=extra)
+        self.logger.log(level, message, *args, exc_info=exc_info, extra=extra)
 
 
 # Global logger registry
@@ -27,6 +27,8 @@ except ImportError:
     firestore = None
     FirestoreAsyncClient = None
 
+from ..utils.resilience import call_upstream
+
 logger = logging.getLogger(__name__)
 
 
@@ -90,7 +92,9 @@ class FirestoreMetadataManager:
 
         try:
             # Get existing document to handle versioning
-            existing_doc = await doc_ref.get()
+            existing_doc = await call_upstream(
+                "firestore", doc_ref.get, idempotent=True
+            )
 
             # Validate version increment if document exists
             if existing_doc.exists:
@@ -104,7 +108,7 @@ class FirestoreMetadataManager:
             )
 
             # Save with versioning and hierarchy support
-            await doc_ref.set(versioned_metadata)
+            await call_upstream("firestore", lambda: doc_ref.set(versioned_metadata))
             logger.debug(
                 f"Successfully saved metadata for point_id '{doc_id}' in Firestore collection '{self.collection_name}' with version {versioned_metadata.get('version', 1)}."
             )
@@ -396,7 +400,7 @@ class FirestoreMetadataManager:
         doc_ref = self.db.collection(self.collection_name).document(doc_id)
 
         try:
-            doc = await doc_ref.get()
+            doc = await call_upstream("firestore", doc_ref.get, idempotent=True)
             if not doc.exists:
                 return None
 
@@ -533,7 +537,7 @@ class FirestoreMetadataManager:
         doc_id = str(point_id)  # Firestore document IDs must be strings
         doc_ref = self.db.collection(self.collection_name).document(doc_id)
         try:
-            await doc_ref.delete()
+            await call_upstream("firestore", doc_ref.delete)
             logger.debug(
                 f"Successfully deleted metadata for point_id '{doc_id}' from Firestore collection '{self.collection_name}'."
             )
@@ -872,7 +876,7 @@ class FirestoreMetadataManager:
         doc_ref = self.db.collection(self.collection_name).document(doc_id)
 
         try:
-            doc = await doc_ref.get()
+            doc = await call_upstream("firestore", doc_ref.get, idempotent=True)
             if not doc.exists:
                 logger.warning(f"Document {doc_id} not found for path retrieval.")
                 return None
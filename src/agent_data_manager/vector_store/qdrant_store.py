@@ -2,12 +2,16 @@
 
 import asyncio
 import logging
+import threading
 import uuid
+import weakref
 from typing import Any
 
+import httpx
 import numpy as np
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
+from qdrant_client.http.exceptions import UnexpectedResponse
 from qdrant_client.http.models import (
     Distance,
     FieldCondition,
@@ -16,10 +20,26 @@ from qdrant_client.http.models import (
     VectorParams,
 )
 
+from ..utils import lexical
+from ..utils.rate_limiter import get_rate_limiter
+from ..utils.resilience import call_upstream
 from .base import VectorStore
 
 logger = logging.getLogger(__name__)
 
+
+def _observe_rate_limit(error: Exception | None = None):
+    """
+    Report a Qdrant call to the shared rate limiter.
+
+    A 429 makes it back off; successful calls let it restore its rate.
+    """
+    if error is None:
+        get_rate_limiter("qdrant").observe_response(200)
+    elif isinstance(error, UnexpectedResponse) and error.status_code == 429:
+        get_rate_limiter("qdrant").observe_response(429, error.headers)
+
+
 # Initialize API key masking for this module
 try:
     from ..tools.api_key_middleware import mask_config_dict, setup_api_key_masking
@@ -40,7 +60,9 @@ try:
         MetricsTimer,
         initialize_metrics_pusher,
         record_qdrant_error,
+        record_qdrant_store_lookup,
         record_semantic_search,
+        update_qdrant_client_pool,
         update_qdrant_connection_status,
         update_vector_count,
     )
@@ -73,12 +95,200 @@ except ImportError:
     def record_semantic_search():
         pass
 
+    def record_qdrant_store_lookup(reused: bool):
+        pass
+
+    def update_qdrant_client_pool(
+        transport: str, clients: int, in_flight: int, capacity: int
+    ):
+        pass
+
     def initialize_metrics_pusher(
         pushgateway_url: str | None = None, push_interval: int = 60
     ):
         pass
 
 
+# Write generation per collection. Every successful write bumps it so result
+# caches can tell that an entry was computed against older data.
+_collection_generations: dict[str, int] = {}
+_generations_lock = threading.Lock()
+_write_listeners = []
+
+
+def add_write_listener(listener):
+    """Register a callback(collection_name) invoked after every successful write."""
+    _write_listeners.append(listener)
+
+
+def get_collection_generation(collection_name: str) -> int:
+    """Get the current write generation of a collection."""
+    with _generations_lock:
+        return _collection_generations.get(collection_name, 0)
+
+
+def bump_collection_generation(collection_name: str) -> int:
+    """Advance the write generation of a collection and return the new value."""
+    with _generations_lock:
+        generation = _collection_generations.get(collection_name, 0) + 1
+        _collection_generations[collection_name] = generation
+
+    # Let shared caches (e.g. the gateway RAG cache) advance their own counters
+    for listener in _write_listeners:
+        try:
+            listener(collection_name)
+        except Exception as e:
+            logger.error(f"Write listener failed for {collection_name}: {e}")
+    return generation
+
+
+def _is_local_location(url: str) -> bool:
+    """Whether QDRANT_URL selects Qdrant's local mode (``:memory:`` or ``file://``)."""
+    return url == ":memory:" or url.startswith("file://")
+
+
+class _SerializedClient:
+    """Run a local-mode client's methods one at a time.
+
+    Local mode keeps points in plain Python and numpy structures that are not
+    thread-safe, while the store calls the client from worker threads.
+    """
+
+    def __init__(self, client: QdrantClient):
+        self._client = client
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._client, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            with self._lock:
+                return attribute(*args, **kwargs)
+
+        return call
+
+
+# Clients are pooled per (client class, url, api_key, transport) so every
+# QdrantStore pointing at the same cluster reuses one connection pool; the class
+# is part of the key so a patched client never leaks to other callers. Local
+# mode clients must be shared too: every store has to see the same in-memory
+# data, and a local storage directory can only be opened by one client.
+_clients: dict[tuple, Any] = {}
+_client_capacity: dict[tuple, int] = {}
+_in_flight: dict[str, int] = {}
+_clients_lock = threading.Lock()
+# Collections known to exist, per client, so stores skip the setup round trips;
+# each maps to the vectors it stores (see QdrantStore._vector_state)
+_ensured_collections: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+# Name of the BM25 sparse vector stored next to the (unnamed) dense vector
+LEXICAL_VECTOR_NAME = "bm25"
+
+
+def _publish_pool(transport: str):
+    # Called with _clients_lock held
+    keys = [key for key in _clients if key[-1] == transport]
+    update_qdrant_client_pool(
+        transport,
+        clients=len(keys),
+        in_flight=_in_flight.get(transport, 0),
+        capacity=sum(_client_capacity[key] for key in keys),
+    )
+
+
+def get_pooled_client(
+    url: str,
+    api_key: str | None,
+    prefer_grpc: bool = False,
+    grpc_port: int = 6334,
+    max_connections: int = 50,
+    max_keepalive: int = 20,
+) -> QdrantClient:
+    """
+    Get the process-wide client for a Qdrant endpoint.
+
+    Args:
+        url: Cluster URL, ``:memory:`` or ``file://<path>`` for local mode
+        api_key: Qdrant API key
+        prefer_grpc: Use the gRPC transport instead of REST
+        grpc_port: gRPC port of the cluster
+        max_connections: HTTP connections the client may open
+        max_keepalive: Idle HTTP connections kept open for reuse
+
+    Returns:
+        Shared client (local-mode clients run one call at a time)
+    """
+    transport = _pool_transport(url, prefer_grpc)
+    key = (QdrantClient, url, api_key, transport)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            if transport == "local":
+                if url == ":memory:":
+                    client = QdrantClient(location=":memory:")
+                else:
+                    client = QdrantClient(path=url.removeprefix("file://"))
+                client = _SerializedClient(client)
+                capacity = 1
+                logger.info(f"Using local-mode Qdrant at {url}")
+            else:
+                client = QdrantClient(
+                    url=url,
+                    api_key=api_key,
+                    timeout=30.0,
+                    prefer_grpc=prefer_grpc,
+                    grpc_port=grpc_port,
+                    limits=httpx.Limits(
+                        max_connections=max_connections,
+                        max_keepalive_connections=max_keepalive,
+                    ),
+                )
+                capacity = max_connections
+            _clients[key] = client
+            _client_capacity[key] = capacity
+            _publish_pool(transport)
+        return client
+
+
+def _pool_transport(url: str, prefer_grpc: bool) -> str:
+    if _is_local_location(url):
+        return "local"
+    return "grpc" if prefer_grpc else "http"
+
+
+def _track_in_flight(transport: str, delta: int):
+    with _clients_lock:
+        _in_flight[transport] = _in_flight.get(transport, 0) + delta
+        _publish_pool(transport)
+
+
+def close_pooled_clients():
+    """
+    Close every pooled client and forget the shared stores.
+
+    Stores still held elsewhere drop their client and collection set-up state,
+    so they reconnect and re-check their collection on their next call.
+    """
+    with _stores_lock:
+        stores = list(_stores.values())
+        _stores.clear()
+    for store in stores:
+        store.close()
+
+    with _clients_lock:
+        clients = list(_clients.values())
+        transports = {key[-1] for key in _clients}
+        _clients.clear()
+        _client_capacity.clear()
+        _ensured_collections.clear()
+        for transport in transports:
+            _publish_pool(transport)
+    for client in clients:
+        client.close()
+
+
 class QdrantStore(VectorStore):
     """Qdrant implementation of VectorStore interface."""
 
@@ -106,7 +316,14 @@ class QdrantStore(VectorStore):
         self.vector_size = vector_size
         self.distance = distance
         self._client = None
+        self._transport = _pool_transport(url, False)
         self._collection_initialized = False
+        # Set by _ensure_collection: whether points carry BM25 sparse vectors
+        self.has_lexical_index = False
+        # Set by _ensure_collection: dense vector names ("" is the unnamed
+        # vector) and whether the collection was created with named vectors
+        self.dense_vectors: frozenset[str] = frozenset({""})
+        self._named_vectors = False
 
         # Initialize metrics pusher if enabled
         if METRICS_AVAILABLE:
@@ -125,53 +342,235 @@ class QdrantStore(VectorStore):
 
     @property
     def client(self) -> QdrantClient:
-        """Get or create Qdrant client."""
+        """Get the pooled Qdrant client for this store's endpoint."""
         if self._client is None:
-            self._client = QdrantClient(
-                url=self.url, api_key=self.api_key, timeout=30.0
+            from ..config.settings import settings
+
+            config = settings.get_qdrant_config()
+            self._client = get_pooled_client(
+                self.url,
+                self.api_key,
+                prefer_grpc=config["prefer_grpc"],
+                grpc_port=config["grpc_port"],
+                max_connections=config["pool_max_connections"],
+                max_keepalive=config["pool_max_keepalive"],
             )
+            self._transport = _pool_transport(self.url, config["prefer_grpc"])
         return self._client
 
+    async def _call(self, method, /, read: bool = False, **kwargs):
+        """
+        Run a client method in a thread through the shared Qdrant retry layer.
+
+        Reads (``read=True``) may be hedged; writes here are idempotent by
+        deterministic point ID or filter, so they are retried but never hedged.
+        A timed-out attempt may still finish in its thread alongside the retry,
+        which then writes the same points. Every attempt is reported to the
+        Qdrant rate limiter.
+        """
+
+        async def attempt():
+            _track_in_flight(self._transport, 1)
+            try:
+                result = await asyncio.to_thread(method, **kwargs)
+            except Exception as e:
+                _observe_rate_limit(e)
+                if isinstance(e, UnexpectedResponse) and e.status_code == 404:
+                    # Deleted behind our back; set it up again on the next call
+                    self._forget_collection()
+                raise
+            finally:
+                _track_in_flight(self._transport, -1)
+            _observe_rate_limit()
+            return result
+
+        return await call_upstream("qdrant", attempt, idempotent=read)
+
+    def _forget_collection(self) -> None:
+        """Drop the cached set-up state of this store's collection."""
+        self._collection_initialized = False
+        if self._client is not None:
+            _ensured_collections.get(self._client, {}).pop(self.collection_name, None)
+
+    async def _is_alias(self) -> bool:
+        """Whether the collection name is an alias (snapshot restores swap one in)."""
+        try:
+            response = await asyncio.to_thread(self.client.get_aliases)
+        except Exception as e:
+            logger.warning(f"Failed to list Qdrant collection aliases: {e}")
+            return False
+        return any(
+            alias.alias_name == self.collection_name for alias in response.aliases
+        )
+
+    async def _read_vectors(self, hybrid_enabled: bool, spaces: dict) -> None:
+        """Read which dense and sparse vectors the collection stores."""
+        try:
+            info = await asyncio.to_thread(
+                self.client.get_collection, self.collection_name
+            )
+            params = info.config.params
+        except Exception as e:
+            logger.warning(f"Could not read vectors of {self.collection_name}: {e}")
+            return
+        if isinstance(params.vectors, dict):
+            self._named_vectors = True
+            self.dense_vectors = frozenset(params.vectors)
+
+        # Neither sparse nor named vectors can be added to an existing collection
+        if hybrid_enabled:
+            self.has_lexical_index = LEXICAL_VECTOR_NAME in (
+                params.sparse_vectors or {}
+            )
+            if not self.has_lexical_index:
+                logger.warning(
+                    f"Collection {self.collection_name} has no '{LEXICAL_VECTOR_NAME}' "
+                    "sparse vector; hybrid search falls back to vector search until "
+                    "it is recreated"
+                )
+        missing = [
+            space.name
+            for space in spaces.values()
+            if space.vector_name not in self.dense_vectors
+        ]
+        if missing:
+            logger.warning(
+                f"Collection {self.collection_name} has no vector space(s) "
+                f"{', '.join(missing)}; they are only available in collections "
+                "created after they were declared"
+            )
+
+    def _vector_state(self) -> dict[str, Any]:
+        return {
+            "lexical": self.has_lexical_index,
+            "dense": self.dense_vectors,
+            "named": self._named_vectors,
+        }
+
+    def _resolve_space(self, vector_space: str | None):
+        """
+        The configured vector space, checked against the collection.
+
+        Raises:
+            ValueError: When the space is not configured or not in the collection
+        """
+        from ..embedding.vector_spaces import get_vector_space
+
+        space = get_vector_space(vector_space)
+        if space.vector_name not in self.dense_vectors:
+            raise ValueError(
+                f"Collection {self.collection_name} has no vector space {space.name!r}"
+            )
+        return space
+
+    def _point_vector(self, vector: list[float], text: str | None):
+        """
+        The point's vectors: the dense vector in the active space (VECTOR_SPACE),
+        plus the BM25 sparse vector of ``text`` when stored.
+        """
+        vector_name = self._resolve_space(None).vector_name
+        lexical_text = text if self.has_lexical_index else None
+        if not (lexical_text or vector_name or self._named_vectors):
+            return vector
+        vectors = {vector_name: vector}
+        if lexical_text:
+            indices, values = lexical.document_vector(lexical_text)
+            vectors[LEXICAL_VECTOR_NAME] = models.SparseVector(
+                indices=indices, values=values
+            )
+        return vectors
+
     async def _ensure_collection(self) -> None:
         """Ensure the collection exists with proper configuration."""
         if self._collection_initialized:
             return
+        ensured = _ensured_collections.setdefault(self.client, {})
+        if self.collection_name in ensured:
+            # Another store on the same client already set the collection up
+            state = ensured[self.collection_name]
+            self.has_lexical_index = state["lexical"]
+            self.dense_vectors = state["dense"]
+            self._named_vectors = state["named"]
+            self._collection_initialized = True
+            return
 
+        from ..config.settings import settings
+        from ..embedding.vector_spaces import DEFAULT_VECTOR_SPACE, get_vector_spaces
+
+        hybrid_enabled = settings.get_hybrid_search_config()["enabled"]
+        spaces = get_vector_spaces()
         try:
             # Check if collection exists
             collections = await asyncio.to_thread(self.client.get_collections)
             collection_names = [col.name for col in collections.collections]
 
-            if self.collection_name not in collection_names:
+            if (
+                self.collection_name not in collection_names
+                and not await self._is_alias()
+            ):
                 # Create collection
-                await asyncio.to_thread(
-                    self.client.create_collection,
-                    collection_name=self.collection_name,
-                    vectors_config=VectorParams(
-                        size=self.vector_size, distance=self.distance
-                    ),
-                )
-                logger.info(f"Created Qdrant collection: {self.collection_name}")
-
-            # Ensure payload index for 'tag' field exists
-            try:
-                await asyncio.to_thread(
-                    self.client.create_payload_index,
-                    collection_name=self.collection_name,
-                    field_name="tag",
-                    field_schema=models.PayloadSchemaType.KEYWORD,
-                )
-                logger.info(
-                    f"Ensured payload index for field 'tag' (type KEYWORD) in collection '{self.collection_name}'."
-                )
-            except Exception as e:
-                # Log error if index creation fails for unexpected reasons.
-                # Qdrant might also raise specific exceptions for conflicts if an incompatible index exists.
-                logger.error(
-                    f"Failed to ensure payload index for 'tag' field: {e}. Filtering may fail or be inefficient."
+                create_kwargs = {}
+                if hybrid_enabled:
+                    create_kwargs["sparse_vectors_config"] = {
+                        LEXICAL_VECTOR_NAME: models.SparseVectorParams(
+                            modifier=models.Modifier.IDF
+                        )
+                    }
+                vectors_config = VectorParams(
+                    size=self.vector_size, distance=self.distance
                 )
+                if len(spaces) > 1:
+                    # One named vector per space; the default one stays unnamed
+                    vectors_config = {
+                        space.vector_name: VectorParams(
+                            size=(
+                                self.vector_size
+                                if space.name == DEFAULT_VECTOR_SPACE
+                                else space.dimension
+                            ),
+                            distance=self.distance,
+                        )
+                        for space in spaces.values()
+                    }
+                try:
+                    await asyncio.to_thread(
+                        self.client.create_collection,
+                        collection_name=self.collection_name,
+                        vectors_config=vectors_config,
+                        **create_kwargs,
+                    )
+                    logger.info(f"Created Qdrant collection: {self.collection_name}")
+                except Exception:
+                    # Concurrent first writes race to create it; one of them wins
+                    if not await asyncio.to_thread(
+                        self.client.collection_exists, self.collection_name
+                    ):
+                        raise
+
+            if hybrid_enabled or len(spaces) > 1:
+                await self._read_vectors(hybrid_enabled, spaces)
+
+            # Ensure payload indexes for 'tag' filters and 'doc_id' (chunk grouping)
+            for field_name in ("tag", "doc_id"):
+                try:
+                    await asyncio.to_thread(
+                        self.client.create_payload_index,
+                        collection_name=self.collection_name,
+                        field_name=field_name,
+                        field_schema=models.PayloadSchemaType.KEYWORD,
+                    )
+                    logger.info(
+                        f"Ensured payload index for field '{field_name}' (type KEYWORD) in collection '{self.collection_name}'."
+                    )
+                except Exception as e:
+                    # Log error if index creation fails for unexpected reasons.
+                    # Qdrant might also raise specific exceptions for conflicts if an incompatible index exists.
+                    logger.error(
+                        f"Failed to ensure payload index for '{field_name}' field: {e}. Filtering may fail or be inefficient."
+                    )
 
             self._collection_initialized = True
+            ensured[self.collection_name] = self._vector_state()
 
         except Exception as e:
             logger.error(f"Failed to ensure collection {self.collection_name}: {e}")
@@ -183,8 +582,17 @@ class QdrantStore(VectorStore):
         vector: list[float] | np.ndarray,
         metadata: dict[str, Any] | None = None,
         tag: str | None = None,
+        text: str | None = None,
+        replace_document: bool = False,
     ) -> dict[str, Any]:
-        """Upsert a vector with metadata."""
+        """Upsert a vector with metadata.
+
+        ``text`` is stored as ``embedded_text``, so the point can be embedded
+        again into other vector spaces, and is indexed for lexical search
+        when the collection has the BM25 sparse vector. With
+        ``replace_document`` every other point of the document (e.g. chunks
+        of a longer previous version) is deleted after the upsert.
+        """
         await self._ensure_collection()
 
         with MetricsTimer("upsert"):
@@ -200,22 +608,31 @@ class QdrantStore(VectorStore):
 
                 # Store original vector_id in payload for reference
                 payload["doc_id"] = vector_id
+                if text:
+                    payload["embedded_text"] = text
 
-                # Generate a valid UUID for Qdrant point ID
-                point_id = str(uuid.uuid4())
+                # Deterministic point ID, so a retried write cannot duplicate it
+                point_id = self._document_point_id(vector_id)
 
                 # Create point
-                point = PointStruct(id=point_id, vector=vector, payload=payload)
+                point = PointStruct(
+                    id=point_id,
+                    vector=self._point_vector(vector, text),
+                    payload=payload,
+                )
 
                 # Upsert the point
-                result = await asyncio.to_thread(
+                result = await self._call(
                     self.client.upsert,
                     collection_name=self.collection_name,
                     points=[point],
                 )
+                if replace_document:
+                    await self._delete_other_document_points(vector_id, [point_id])
 
                 # Update connection status on successful operation
                 update_qdrant_connection_status(True)
+                bump_collection_generation(self.collection_name)
 
                 return {
                     "success": True,
@@ -232,6 +649,116 @@ class QdrantStore(VectorStore):
                 update_qdrant_connection_status(False)
                 return {"success": False, "error": str(e), "vector_id": vector_id}
 
+    async def _delete_other_document_points(self, doc_id: str, keep_ids: list[str]):
+        """Delete the points of a document except the ones just written."""
+        await self._call(
+            self.client.delete,
+            collection_name=self.collection_name,
+            points_selector=models.FilterSelector(
+                filter=Filter(
+                    must=[
+                        FieldCondition(
+                            key="doc_id", match=models.MatchValue(value=doc_id)
+                        )
+                    ],
+                    must_not=[models.HasIdCondition(has_id=keep_ids)],
+                )
+            ),
+        )
+
+    def _document_point_id(self, doc_id: str) -> str:
+        """Deterministic point ID of an unchunked document."""
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{self.collection_name}/{doc_id}"))
+
+    def _chunk_point_id(self, doc_id: str, chunk_index: int) -> str:
+        """Deterministic point ID, so re-saving a document overwrites its chunks."""
+        return str(
+            uuid.uuid5(
+                uuid.NAMESPACE_URL, f"{self.collection_name}/{doc_id}/{chunk_index}"
+            )
+        )
+
+    async def upsert_chunks(
+        self,
+        doc_id: str,
+        vectors: list[list[float] | np.ndarray],
+        chunk_payloads: list[dict[str, Any]],
+        metadata: dict[str, Any] | None = None,
+        tag: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Store one point per document chunk and drop the document's older points.
+
+        Args:
+            doc_id: Parent document identifier, stored in every chunk payload
+            vectors: One embedding per chunk
+            chunk_payloads: Per-chunk payload (e.g. chunk_index, chunk_text);
+                chunk_text is indexed for lexical search when enabled
+            metadata: Document-level payload shared by all chunks
+            tag: Optional tag for grouping
+
+        Returns:
+            Result dictionary with operation status
+        """
+        await self._ensure_collection()
+
+        with MetricsTimer("upsert"):
+            try:
+                points = []
+                for chunk_index, (vector, chunk_payload) in enumerate(
+                    zip(vectors, chunk_payloads, strict=True)
+                ):
+                    if isinstance(vector, np.ndarray):
+                        vector = vector.tolist()
+                    payload = metadata.copy() if metadata else {}
+                    payload.update(chunk_payload)
+                    payload.setdefault("chunk_index", chunk_index)
+                    payload["chunk_count"] = len(vectors)
+                    payload["doc_id"] = doc_id
+                    if tag:
+                        payload["tag"] = tag
+                    point_id = self._chunk_point_id(doc_id, payload["chunk_index"])
+                    points.append(
+                        PointStruct(
+                            id=point_id,
+                            vector=self._point_vector(
+                                vector, chunk_payload.get("chunk_text")
+                            ),
+                            payload=payload,
+                        )
+                    )
+
+                result = await self._call(
+                    self.client.upsert,
+                    collection_name=self.collection_name,
+                    points=points,
+                )
+
+                # Remove chunks left over from a longer previous version (and
+                # unchunked points) only after the new chunks are in place
+                await self._delete_other_document_points(
+                    doc_id, [point.id for point in points]
+                )
+
+                update_qdrant_connection_status(True)
+                bump_collection_generation(self.collection_name)
+
+                return {
+                    "success": True,
+                    "vector_id": doc_id,
+                    "chunk_count": len(points),
+                    "point_ids": [point.id for point in points],
+                    "operation_id": (
+                        result.operation_id if hasattr(result, "operation_id") else None
+                    ),
+                }
+
+            except Exception as e:
+                logger.error(f"Failed to upsert chunks for {doc_id}: {e}")
+                record_qdrant_error("upsert")
+                update_qdrant_connection_status(False)
+                return {"success": False, "error": str(e), "vector_id": doc_id}
+
     async def query_vectors_by_tag(
         self,
         tag: str,
@@ -239,8 +766,14 @@ class QdrantStore(VectorStore):
         limit: int = 10,
         threshold: float = 0.0,
         offset: int = 0,
+        with_payload: bool | list[str] = True,
+        with_vectors: bool = False,
     ) -> dict[str, Any]:
-        """Query vectors by tag with optional similarity search."""
+        """Query vectors by tag with optional similarity search.
+
+        ``with_payload`` may be a list of payload keys to fetch; vectors are
+        only fetched and returned when ``with_vectors`` is set.
+        """
         await self._ensure_collection()
 
         with MetricsTimer("query_by_tag"):
@@ -260,21 +793,31 @@ class QdrantStore(VectorStore):
                         query_vector = query_vector.tolist()
 
                     # Perform similarity search
-                    results = await asyncio.to_thread(
+                    results = await self._call(
                         self.client.search,
+                        read=True,
                         collection_name=self.collection_name,
                         query_vector=query_vector,
                         query_filter=query_filter,
                         limit=limit,
                         score_threshold=threshold,
+                        with_payload=with_payload,
+                        with_vectors=with_vectors,
                     )
+                    formatted_results = [
+                        self._format_point(point, point.score, with_vectors)
+                        for point in results
+                    ]
                 else:
                     # Just get vectors with the tag (no similarity search)
-                    results = await asyncio.to_thread(
+                    results = await self._call(
                         self.client.scroll,
+                        read=True,
                         collection_name=self.collection_name,
                         scroll_filter=query_filter,
                         limit=limit,
+                        with_payload=with_payload,
+                        with_vectors=with_vectors,
                     )
                     # For scroll results, we need to extract points
                     if hasattr(results, "points"):
@@ -282,32 +825,10 @@ class QdrantStore(VectorStore):
                     else:
                         points = results[0]  # scroll returns (points, next_page_offset)
 
-                    # Convert scroll results to search-like format
-                    results = []
-                    for point in points:
-                        results.append(
-                            type(
-                                "ScoredPoint",
-                                (),
-                                {
-                                    "id": point.id,
-                                    "score": 1.0,  # No similarity score for scroll
-                                    "payload": point.payload,
-                                    "vector": point.vector,
-                                },
-                            )()
-                        )
-
-                # Format results
-                formatted_results = []
-                for point in results:
-                    result_dict = {
-                        "id": point.id,
-                        "score": getattr(point, "score", 1.0),
-                        "metadata": point.payload,
-                        "vector": getattr(point, "vector", None),
-                    }
-                    formatted_results.append(result_dict)
+                    # No similarity score for scroll
+                    formatted_results = [
+                        self._format_point(point, 1.0, with_vectors) for point in points
+                    ]
 
                 # Update connection status on successful operation
                 update_qdrant_connection_status(True)
@@ -320,12 +841,120 @@ class QdrantStore(VectorStore):
                 update_qdrant_connection_status(False)
                 return {"results": [], "total": 0}
 
+    @staticmethod
+    def _format_point(point, score: float, with_vectors: bool) -> dict[str, Any]:
+        """Convert a Qdrant point to a result dict; vectors only when requested."""
+        result = {"id": point.id, "score": score, "metadata": point.payload}
+        if with_vectors:
+            result["vector"] = getattr(point, "vector", None)
+        return result
+
+    async def _search_groups(
+        self,
+        query_vector: list[float] | tuple[str, list[float]],
+        search_filter: Filter | None,
+        limit: int,
+        score_threshold: float,
+        with_payload: bool | list[str],
+        with_vectors: bool,
+        group_by: str,
+        group_size: int,
+    ) -> list[dict[str, Any]]:
+        """Search with Qdrant group-by; one result (the best hit) per group."""
+        if isinstance(with_payload, list) and group_by not in with_payload:
+            with_payload = [*with_payload, group_by]
+
+        groups = await self._call(
+            self.client.search_groups,
+            read=True,
+            collection_name=self.collection_name,
+            query_vector=query_vector,
+            group_by=group_by,
+            query_filter=search_filter,
+            limit=limit,
+            group_size=group_size,
+            score_threshold=score_threshold,
+            with_payload=with_payload,
+            with_vectors=with_vectors,
+        )
+
+        formatted_results = []
+        for group in groups.groups:
+            if not group.hits:
+                continue
+            hits = [
+                self._format_point(point, point.score, with_vectors)
+                for point in group.hits
+            ]
+            best = dict(hits[0])
+            best["group_id"] = group.id
+            best["group_hits"] = hits
+            formatted_results.append(best)
+        return formatted_results
+
+    async def embed_query(
+        self, query_text: str, vector_space: str | None = None
+    ) -> list[float] | None:
+        """Generate the embedding used to search for a query in a vector space."""
+        from ..config.settings import settings
+        from ..embedding.vector_spaces import (
+            DEFAULT_VECTOR_SPACE,
+            get_space_embedding_provider,
+            get_vector_space,
+        )
+
+        try:
+            if get_vector_space(vector_space).name != DEFAULT_VECTOR_SPACE:
+                provider = get_space_embedding_provider(vector_space)
+                return await provider.embed_single(query_text)
+        except Exception as e:
+            logger.error(f"Query embedding in vector space {vector_space} failed: {e}")
+            return None
+
+        embedding_config = settings.get_embedding_config()
+        if embedding_config["batching_enabled"]:
+            # Share one embedding request with concurrent queries
+            from ..embedding.batching_embedding_provider import (
+                get_embedding_dispatcher,
+            )
+
+            try:
+                return await get_embedding_dispatcher().embed_single(query_text)
+            except Exception as e:
+                logger.error(f"Batched query embedding failed: {e}")
+                return None
+
+        if embedding_config["provider"] != "openai":
+            from ..embedding.openai_embedding_provider import (
+                get_default_embedding_provider,
+            )
+
+            try:
+                return await get_default_embedding_provider().embed_single(query_text)
+            except Exception as e:
+                logger.error(f"Query embedding failed: {e}")
+                return None
+
+        # Import the get_openai_embedding function
+        from ..tools.external_tool_registry import get_openai_embedding
+
+        embedding_result = await get_openai_embedding(
+            agent_context=None, text_to_embed=query_text
+        )
+        return embedding_result.get("embedding") or None
+
     async def semantic_search(
         self,
         query_text: str,
         limit: int = 10,
         tag: str | None = None,
         score_threshold: float = 0.5,
+        query_vector: list[float] | None = None,
+        with_payload: bool | list[str] = True,
+        with_vectors: bool = False,
+        group_by: str | None = None,
+        group_size: int = 1,
+        vector_space: str | None = None,
     ) -> dict[str, Any]:
         """
         Perform semantic search using OpenAI embeddings.
@@ -335,6 +964,14 @@ class QdrantStore(VectorStore):
             limit: Maximum number of results
             tag: Optional tag to filter results
             score_threshold: Minimum similarity threshold
+            query_vector: Precomputed embedding of query_text, skips embedding
+            with_payload: Return the payload, or only the listed payload keys
+            with_vectors: Return stored vectors with each result
+            group_by: Payload key (e.g. "doc_id") to group hits by; each group
+                is returned once as its best hit, and ``limit`` counts groups
+            group_size: Hits kept per group, returned under "group_hits"
+            vector_space: Embedding space to search; defaults to VECTOR_SPACE.
+                A ``query_vector`` must come from the same space's model
 
         Returns:
             Dictionary with search results
@@ -342,14 +979,12 @@ class QdrantStore(VectorStore):
         await self._ensure_collection()
 
         try:
-            # Import the get_openai_embedding function
-            from ..tools.external_tool_registry import get_openai_embedding
+            space = self._resolve_space(vector_space)
 
             # Generate embedding for the query text
-            embedding_result = await get_openai_embedding(
-                agent_context=None, text_to_embed=query_text
-            )
-            if "embedding" not in embedding_result or not embedding_result["embedding"]:
+            if query_vector is None:
+                query_vector = await self.embed_query(query_text, space.name)
+            if not query_vector:
                 logger.error(f"Failed to generate embedding for query: {query_text}")
                 return {
                     "status": "failed",
@@ -358,8 +993,6 @@ class QdrantStore(VectorStore):
                     "results": [],
                 }
 
-            query_vector = embedding_result["embedding"]
-
             # Create filter for tag if specified
             search_filter = None
             if tag:
@@ -367,38 +1000,51 @@ class QdrantStore(VectorStore):
                     must=[FieldCondition(key="tag", match=models.MatchValue(value=tag))]
                 )
 
+            # Named spaces are searched as (name, vector)
+            if space.vector_name:
+                query_vector = (space.vector_name, query_vector)
+
             # Perform vector search
             with MetricsTimer("semantic_search"):
-                results = await asyncio.to_thread(
-                    self.client.search,
-                    collection_name=self.collection_name,
-                    query_vector=query_vector,
-                    query_filter=search_filter,
-                    limit=limit,
-                    score_threshold=score_threshold,
-                )
+                if group_by:
+                    formatted_results = await self._search_groups(
+                        query_vector,
+                        search_filter,
+                        limit,
+                        score_threshold,
+                        with_payload,
+                        with_vectors,
+                        group_by,
+                        group_size,
+                    )
+                else:
+                    results = await self._call(
+                        self.client.search,
+                        read=True,
+                        collection_name=self.collection_name,
+                        query_vector=query_vector,
+                        query_filter=search_filter,
+                        limit=limit,
+                        score_threshold=score_threshold,
+                        with_payload=with_payload,
+                        with_vectors=with_vectors,
+                    )
+                    formatted_results = [
+                        self._format_point(point, point.score, with_vectors)
+                        for point in results
+                    ]
 
                 # Update metrics
                 record_semantic_search()
                 update_qdrant_connection_status(True)
 
-                # Format results
-                formatted_results = []
-                for point in results:
-                    result_dict = {
-                        "id": point.id,
-                        "score": point.score,
-                        "metadata": point.payload,
-                        "vector": getattr(point, "vector", None),
-                    }
-                    formatted_results.append(result_dict)
-
                 return {
                     "status": "success",
                     "query": query_text,
                     "results": formatted_results,
                     "count": len(formatted_results),
                     "tag": tag,
+                    "vector_space": space.name,
                 }
 
         except Exception as e:
@@ -412,8 +1058,217 @@ class QdrantStore(VectorStore):
                 "results": [],
             }
 
+    async def lexical_search(
+        self,
+        query_text: str,
+        limit: int = 10,
+        tag: str | None = None,
+        with_payload: bool | list[str] = True,
+        group_by: str | None = None,
+        group_size: int = 1,
+    ) -> dict[str, Any]:
+        """
+        Keyword search over the BM25 sparse vectors.
+
+        Matches exact terms (codes, error strings, names) that dense search
+        can miss. Scores are BM25 scores, not comparable to cosine similarity.
+
+        Args:
+            query_text: Text whose terms are searched for
+            limit: Maximum number of results (groups when grouping)
+            tag: Optional tag to filter results
+            with_payload: Return the payload, or only the listed payload keys
+            group_by: Payload key (e.g. "doc_id") to group hits by
+            group_size: Hits kept per group, returned under "group_hits"
+
+        Returns:
+            Dictionary with search results, shaped like semantic_search's
+        """
+        await self._ensure_collection()
+
+        if not self.has_lexical_index:
+            return {
+                "status": "failed",
+                "error": f"Collection {self.collection_name} has no lexical index",
+                "query": query_text,
+                "results": [],
+            }
+        indices, values = lexical.query_vector(query_text)
+        if not indices:
+            return {
+                "status": "success",
+                "query": query_text,
+                "results": [],
+                "count": 0,
+                "tag": tag,
+            }
+
+        try:
+            search_filter = None
+            if tag:
+                search_filter = Filter(
+                    must=[FieldCondition(key="tag", match=models.MatchValue(value=tag))]
+                )
+            query = models.SparseVector(indices=indices, values=values)
+
+            with MetricsTimer("lexical_search"):
+                if group_by:
+                    if isinstance(with_payload, list) and group_by not in with_payload:
+                        with_payload = [*with_payload, group_by]
+                    groups = await self._call(
+                        self.client.query_points_groups,
+                        read=True,
+                        collection_name=self.collection_name,
+                        query=query,
+                        using=LEXICAL_VECTOR_NAME,
+                        group_by=group_by,
+                        query_filter=search_filter,
+                        limit=limit,
+                        group_size=group_size,
+                        with_payload=with_payload,
+                    )
+                    formatted_results = []
+                    for group in groups.groups:
+                        if not group.hits:
+                            continue
+                        hits = [
+                            self._format_point(point, point.score, False)
+                            for point in group.hits
+                        ]
+                        best = dict(hits[0])
+                        best["group_id"] = group.id
+                        best["group_hits"] = hits
+                        formatted_results.append(best)
+                else:
+                    response = await self._call(
+                        self.client.query_points,
+                        read=True,
+                        collection_name=self.collection_name,
+                        query=query,
+                        using=LEXICAL_VECTOR_NAME,
+                        query_filter=search_filter,
+                        limit=limit,
+                        with_payload=with_payload,
+                    )
+                    formatted_results = [
+                        self._format_point(point, point.score, False)
+                        for point in response.points
+                    ]
+
+            update_qdrant_connection_status(True)
+            return {
+                "status": "success",
+                "query": query_text,
+                "results": formatted_results,
+                "count": len(formatted_results),
+                "tag": tag,
+            }
+
+        except Exception as e:
+            logger.error(f"Failed to perform lexical search for '{query_text}': {e}")
+            record_qdrant_error("lexical_search")
+            update_qdrant_connection_status(False)
+            return {
+                "status": "failed",
+                "error": str(e),
+                "query": query_text,
+                "results": [],
+            }
+
+    async def scroll_vector_space(
+        self,
+        vector_space: str,
+        limit: int = 64,
+        offset: str | int | None = None,
+    ) -> tuple[list[dict[str, Any]], str | int | None]:
+        """
+        Page through all points, with their vector in one space.
+
+        Args:
+            vector_space: Space whose vector is fetched
+            limit: Points per page
+            offset: Page start returned by the previous call, None for the first
+
+        Returns:
+            (points as dicts with id, metadata and ``has_vector``, next page
+            offset or None after the last page)
+
+        Raises:
+            ValueError: When the collection has no such vector space
+        """
+        await self._ensure_collection()
+        vector_name = self._resolve_space(vector_space).vector_name
+
+        points, next_offset = await self._call(
+            self.client.scroll,
+            read=True,
+            collection_name=self.collection_name,
+            limit=limit,
+            offset=offset,
+            with_payload=True,
+            with_vectors=[vector_name],
+        )
+        return [
+            {
+                "id": point.id,
+                "metadata": point.payload or {},
+                "has_vector": vector_name in (point.vector or {}),
+            }
+            for point in points
+        ], next_offset
+
+    async def update_space_vectors(
+        self, vector_space: str, vectors: dict[str | int, list[float]]
+    ) -> dict[str, Any]:
+        """
+        Set the vector of existing points in one space, keeping their other vectors.
+
+        Args:
+            vector_space: Space the vectors belong to
+            vectors: Vector per point ID
+
+        Returns:
+            Result dictionary with operation status and the number updated
+        """
+        await self._ensure_collection()
+
+        with MetricsTimer("update_vectors"):
+            try:
+                vector_name = self._resolve_space(vector_space).vector_name
+                await self._call(
+                    self.client.update_vectors,
+                    collection_name=self.collection_name,
+                    points=[
+                        models.PointVectors(
+                            id=point_id,
+                            vector={
+                                vector_name: (
+                                    vector.tolist()
+                                    if isinstance(vector, np.ndarray)
+                                    else vector
+                                )
+                            },
+                        )
+                        for point_id, vector in vectors.items()
+                    ],
+                )
+                update_qdrant_connection_status(True)
+                bump_collection_generation(self.collection_name)
+                return {"success": True, "updated": len(vectors)}
+
+            except Exception as e:
+                logger.error(
+                    f"Failed to update {len(vectors)} vectors in space {vector_space}: {e}"
+                )
+                record_qdrant_error("update_vectors")
+                return {"success": False, "error": str(e), "updated": 0}
+
     async def get_recent_documents(
-        self, limit: int = 10, offset: int = 0
+        self,
+        limit: int = 10,
+        offset: int = 0,
+        with_payload: bool | list[str] = True,
+        with_vectors: bool = False,
     ) -> dict[str, Any]:
         """
         Get recent documents from the collection.
@@ -421,6 +1276,8 @@ class QdrantStore(VectorStore):
         Args:
             limit: Maximum number of results
             offset: Number of results to skip
+            with_payload: Return the payload, or only the listed payload keys
+            with_vectors: Return stored vectors with each result
 
         Returns:
             Dictionary with recent documents
@@ -430,11 +1287,14 @@ class QdrantStore(VectorStore):
         with MetricsTimer("get_recent"):
             try:
                 # Use scroll to get recent documents (without filter)
-                results = await asyncio.to_thread(
+                results = await self._call(
                     self.client.scroll,
+                    read=True,
                     collection_name=self.collection_name,
                     limit=limit,
                     offset=offset,
+                    with_payload=with_payload,
+                    with_vectors=with_vectors,
                 )
 
                 # For scroll results, we need to extract points
@@ -443,16 +1303,10 @@ class QdrantStore(VectorStore):
                 else:
                     points = results[0]  # scroll returns (points, next_page_offset)
 
-                # Format results
-                formatted_results = []
-                for point in points:
-                    result_dict = {
-                        "id": point.id,
-                        "score": 1.0,  # No similarity score for scroll
-                        "metadata": point.payload,
-                        "vector": getattr(point, "vector", None),
-                    }
-                    formatted_results.append(result_dict)
+                # Format results (no similarity score for scroll)
+                formatted_results = [
+                    self._format_point(point, 1.0, with_vectors) for point in points
+                ]
 
                 # Update connection status on successful operation
                 update_qdrant_connection_status(True)
@@ -476,11 +1330,12 @@ class QdrantStore(VectorStore):
             )
 
             # Delete points with the tag
-            result = await asyncio.to_thread(
+            result = await self._call(
                 self.client.delete,
                 collection_name=self.collection_name,
                 points_selector=models.FilterSelector(filter=delete_filter),
             )
+            bump_collection_generation(self.collection_name)
 
             return {
                 "success": True,
@@ -503,7 +1358,8 @@ class QdrantStore(VectorStore):
                 info = await asyncio.to_thread(
                     self.client.get_collection, collection_name=self.collection_name
                 )
-                count = info.vectors_count or 0
+                # Local mode (and newer servers) only report points_count
+                count = info.vectors_count or info.points_count or 0
 
                 # Update vector count metric
                 update_vector_count(self.collection_name, count)
@@ -533,8 +1389,52 @@ class QdrantStore(VectorStore):
                 return False
 
     def close(self) -> None:
-        """Close the Qdrant client connection."""
+        """Release this store's client; the pooled connection stays open for others."""
         if self._client:
-            self._client.close()
             self._client = None
-            self._collection_initialized = False
+        self._collection_initialized = False
+
+
+_stores: dict[tuple[str, str], QdrantStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_qdrant_store(
+    url: str | None = None,
+    api_key: str | None = None,
+    collection_name: str | None = None,
+    vector_size: int | None = None,
+) -> QdrantStore:
+    """
+    Get the process-wide QdrantStore for a (url, collection), creating it once.
+
+    Reusing the store keeps its pooled client and its collection set-up state,
+    so tool calls do not repeat ``get_collections``/``create_payload_index``.
+
+    Args:
+        url: Qdrant URL; defaults to the Qdrant settings
+        api_key: Qdrant API key; defaults to the Qdrant settings
+        collection_name: Collection; defaults to the Qdrant settings
+        vector_size: Vector dimension used when the store is first created
+
+    Returns:
+        Shared QdrantStore
+    """
+    from ..config.settings import settings
+
+    config = settings.get_qdrant_config()
+    url = url or config["url"]
+    collection_name = collection_name or config["collection_name"]
+    key = (url, collection_name)
+    with _stores_lock:
+        store = _stores.get(key)
+        reused = store is not None
+        if store is None:
+            store = _stores[key] = QdrantStore(
+                url=url,
+                api_key=config["api_key"] if api_key is None else api_key,
+                collection_name=collection_name,
+                vector_size=vector_size or config["vector_size"],
+            )
+    record_qdrant_store_lookup(reused)
+    return store
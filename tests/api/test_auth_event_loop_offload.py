@@ -0,0 +1,88 @@
+"""Tests that the login path keeps password hashing off the event loop."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from agent_data_manager.auth import user_manager as user_manager_module
+from agent_data_manager.auth.user_manager import UserManager, pwd_context
+from agent_data_manager.utils.event_loop_monitor import EventLoopLagMonitor
+
+
+@pytest.fixture
+def user_manager():
+    """UserManager backed by a mocked async Firestore client."""
+    with patch("agent_data_manager.auth.user_manager.firestore.AsyncClient"):
+        yield UserManager()
+
+
+@pytest.mark.asyncio
+async def test_authenticate_user_does_not_block_event_loop(user_manager):
+    """A slow password verification must not stall other coroutines."""
+    mock_user = {
+        "email": "slow@test.com",
+        "password_hash": "irrelevant",
+        "is_active": True,
+        "user_id": "slow_user",
+    }
+
+    def slow_verify(plain, hashed):
+        time.sleep(0.3)
+        return True
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        for _ in range(10):
+            await asyncio.sleep(0.02)
+            ticks += 1
+
+    with (
+        patch.object(user_manager, "get_user_by_email", return_value=mock_user),
+        patch.object(user_manager, "update_login_stats", new=AsyncMock()),
+        patch.object(
+            user_manager_module.pwd_context, "verify", side_effect=slow_verify
+        ),
+    ):
+        result, _ = await asyncio.gather(
+            user_manager.authenticate_user("slow@test.com", "password"), ticker()
+        )
+
+    assert result["user_id"] == "slow_user"
+    # The ticker completed all iterations while verification ran in the pool
+    assert ticks == 10
+
+
+@pytest.mark.asyncio
+async def test_create_user_hashes_in_pool_and_awaits_firestore(user_manager):
+    """create_user uses the async Firestore client and a real bcrypt hash."""
+    mock_doc_ref = AsyncMock()
+    user_manager.firestore_client.collection.return_value.document.return_value = (
+        mock_doc_ref
+    )
+
+    with patch.object(user_manager, "get_user_by_email", return_value=None):
+        user = await user_manager.create_user("pool@test.com", "secret123")
+
+    mock_doc_ref.set.assert_awaited_once()
+    assert pwd_context.verify("secret123", user["password_hash"])
+
+
+@pytest.mark.asyncio
+async def test_event_loop_lag_monitor_detects_blocking_call():
+    """The lag monitor reports a stall caused by a blocking call on the loop."""
+    monitor = EventLoopLagMonitor(interval=0.01)
+    monitor.start()
+    await asyncio.sleep(0.03)
+
+    time.sleep(0.2)  # Deliberately block the loop
+    await asyncio.sleep(0.03)
+    await monitor.stop()
+
+    stats = monitor.get_stats()
+    assert stats["samples"] > 0
+    assert stats["max_lag_ms"] >= 100
+    assert not stats["running"]
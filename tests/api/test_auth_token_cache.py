@@ -0,0 +1,104 @@
+"""Tests for the verified-token cache and revocation hooks in AuthManager."""
+
+import os
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from agent_data_manager.auth.auth_manager import AuthManager
+from agent_data_manager.auth.token_cache import RevocationRegistry, TokenCache
+from agent_data_manager.auth.user_manager import UserManager
+
+
+@pytest.fixture
+def auth_manager():
+    """AuthManager with a fixed development secret."""
+    with patch.dict(os.environ, {"JWT_SECRET_KEY": "test-secret-key"}):
+        yield AuthManager()
+
+
+def test_repeat_token_served_from_cache(auth_manager):
+    """Second lookup of the same token skips JWT verification."""
+    token = auth_manager.create_user_token("user_1", "user1@test.com", ["read"])
+
+    with patch.object(
+        auth_manager, "verify_token", wraps=auth_manager.verify_token
+    ) as mock_verify:
+        first = auth_manager.get_principal(token)
+        second = auth_manager.get_principal(token)
+
+    assert first == second
+    assert first["user_id"] == "user_1"
+    assert mock_verify.call_count == 1
+    assert auth_manager.token_cache.get_stats()["hits"] == 1
+
+    # Callers get copies; mutating one does not change the cached principal
+    second["scopes"].append("admin")
+    assert auth_manager.get_principal(token)["scopes"] == ["read"]
+
+
+def test_cache_entries_expire_with_token():
+    """Entries are dropped once the token exp has passed, and LRU bounds size."""
+    cache = TokenCache(max_size=2)
+    cache.put("expired", {"user_id": "u1"}, time.time() - 1)
+    cache.put("a", {"user_id": "u1"}, time.time() + 60)
+    cache.put("b", {"user_id": "u2"}, time.time() + 60)
+
+    assert cache.get("expired") is None
+    assert cache.size() == 2
+    assert cache.get_stats()["evictions"] == 1
+
+    # Cut-offs older than any token lifetime are forgotten
+    registry = RevocationRegistry(max_token_age=60)
+    registry.revoke_user("old", cutoff=time.time() - 61)
+    registry.revoke_user("new")
+    assert list(registry.user_cutoffs) == ["new"]
+
+
+def test_logout_revokes_token(auth_manager):
+    """A revoked token is rejected even though its signature is still valid."""
+    token = auth_manager.create_user_token("user_2", "user2@test.com")
+    auth_manager.get_principal(token)
+
+    assert auth_manager.revoke_token(token) is True
+
+    with pytest.raises(HTTPException):
+        auth_manager.get_principal(token)
+
+    # A user revoked while their token was being verified is not cached
+    token = auth_manager.create_user_token("user_4", "user4@test.com")
+    verify = auth_manager.verify_token
+
+    def verify_then_revoke(raw_token):
+        payload = verify(raw_token)
+        auth_manager.revoke_user("user_4")
+        return payload
+
+    with patch.object(auth_manager, "verify_token", side_effect=verify_then_revoke):
+        auth_manager.get_principal(token)
+    assert auth_manager.token_cache.get(token) is None
+    with pytest.raises(HTTPException):
+        auth_manager.get_principal(token)
+
+
+@pytest.mark.asyncio
+async def test_user_manager_hooks_invalidate_principals(auth_manager):
+    """deactivate_user and update_user_scopes propagate to cached principals."""
+    with patch("agent_data_manager.auth.user_manager.firestore.AsyncClient"):
+        user_manager = UserManager()
+    user_manager.firestore_client.collection.return_value.document.return_value = (
+        AsyncMock()
+    )
+    user_manager.add_change_listener(auth_manager.on_user_changed)
+
+    token = auth_manager.create_user_token("user_3", "user3@test.com", ["read"])
+    assert auth_manager.get_principal(token)["scopes"] == ["read"]
+
+    await user_manager.update_user_scopes("user_3", ["read", "write"])
+    assert auth_manager.get_principal(token)["scopes"] == ["read", "write"]
+
+    await user_manager.deactivate_user("user_3")
+    with pytest.raises(HTTPException):
+        auth_manager.get_principal(token)
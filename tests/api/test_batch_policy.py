@@ -2,7 +2,7 @@
 
 import asyncio
 import time
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -47,10 +47,7 @@ class TestBatchPolicy:
 
         # Override batch size for testing
         with patch.object(settings, "get_qdrant_config") as mock_config:
-            mock_config.return_value = {
-                "batch_size": 10,
-                "sleep_between_batches": 0.01,
-            }  # Very short sleep for testing
+            mock_config.return_value = {"batch_size": 10}
 
             result = await mock_vectorization_tool.batch_vectorize_documents(
                 documents=sample_documents, tag="test_batch", update_firestore=False
@@ -70,10 +67,10 @@ class TestBatchPolicy:
             assert mock_vectorization_tool.vectorize_document.call_count == 25
 
     @pytest.mark.asyncio
-    async def test_sleep_between_batches(
+    async def test_no_fixed_sleep_between_batches(
         self, mock_vectorization_tool, sample_documents
     ):
-        """Test that sleep is applied between batches but not after the last batch."""
+        """Test that batches are paced by the rate limiters, not fixed sleeps."""
 
         # Mock the vectorize_document method
         mock_vectorization_tool.vectorize_document = AsyncMock(
@@ -93,7 +90,7 @@ class TestBatchPolicy:
             patch("asyncio.sleep", side_effect=mock_sleep),
         ):
 
-            mock_config.return_value = {"batch_size": 10, "sleep_between_batches": 0.35}
+            mock_config.return_value = {"batch_size": 10}
 
             result = await mock_vectorization_tool.batch_vectorize_documents(
                 documents=sample_documents, tag="test_batch", update_firestore=False
@@ -102,21 +99,16 @@ class TestBatchPolicy:
             # Verify results
             assert result["status"] == "completed"
             assert result["batches_processed"] == 3
-            assert result["sleep_between_batches"] == 0.35
+            assert "sleep_between_batches" not in result
 
-            # Verify sleep calls - should be called between batches but not after the last batch
-            # With 25 docs and batch_size 10: batches are [0-9], [10-19], [20-24]
-            # Sleep should occur after batch 1 and batch 2, but not after batch 3
-            batch_sleep_calls = [call for call in sleep_calls if call == 0.35]
-            assert (
-                len(batch_sleep_calls) == 2
-            )  # Sleep between batch 1-2 and 2-3, not after 3
+            # With vectorize_document mocked out nothing calls the limiters
+            assert sleep_calls == []
 
     @pytest.mark.asyncio
     async def test_rate_limit_applied_per_document(
         self, mock_vectorization_tool, sample_documents
     ):
-        """Test that rate limiting is applied per document."""
+        """Test that the Qdrant rate limiter is applied per document."""
 
         # Mock the rate_limit method to track calls
         rate_limit_calls = []
@@ -126,12 +118,28 @@ class TestBatchPolicy:
             await asyncio.sleep(0.001)  # Very short sleep for testing
 
         mock_vectorization_tool._rate_limit = mock_rate_limit
-        mock_vectorization_tool.vectorize_document = AsyncMock(
-            return_value={"status": "success", "doc_id": "test"}
+        mock_vectorization_tool.embedding_provider = MagicMock()
+        mock_vectorization_tool.embedding_provider.embed_single = AsyncMock(
+            return_value=[0.1, 0.2, 0.3]
         )
+        mock_vectorization_tool.embedding_provider.get_model_name.return_value = "test"
+        mock_vectorization_tool.qdrant_store.upsert_vector.return_value = {
+            "success": True,
+            "vector_id": "test",
+        }
 
-        with patch.object(settings, "get_qdrant_config") as mock_config:
-            mock_config.return_value = {"batch_size": 10, "sleep_between_batches": 0.01}
+        with (
+            patch.object(settings, "get_qdrant_config") as mock_config,
+            patch(
+                "agent_data_manager.tools.qdrant_vectorization_tool.get_auto_tagging_tool",
+                side_effect=RuntimeError("auto-tagging disabled in test"),
+            ),
+            patch(
+                "agent_data_manager.tools.qdrant_vectorization_tool.get_event_manager",
+                return_value=AsyncMock(),
+            ),
+        ):
+            mock_config.return_value = {"batch_size": 10}
 
             result = await mock_vectorization_tool.batch_vectorize_documents(
                 documents=sample_documents[:5],  # Use fewer documents for faster test
@@ -142,6 +150,7 @@ class TestBatchPolicy:
             # Verify that rate limiting was called for each document
             assert len(rate_limit_calls) == 5
             assert result["total_documents"] == 5
+            assert result["successful"] == 5
 
     @pytest.mark.asyncio
     async def test_batch_policy_with_failures(
@@ -166,7 +175,7 @@ class TestBatchPolicy:
         mock_vectorization_tool.vectorize_document = mock_vectorize_with_failures
 
         with patch.object(settings, "get_qdrant_config") as mock_config:
-            mock_config.return_value = {"batch_size": 5, "sleep_between_batches": 0.01}
+            mock_config.return_value = {"batch_size": 5}
 
             result = await mock_vectorization_tool.batch_vectorize_documents(
                 documents=sample_documents[:10],
@@ -187,7 +196,7 @@ class TestBatchPolicy:
         """Test batch processing with empty documents list."""
 
         with patch.object(settings, "get_qdrant_config") as mock_config:
-            mock_config.return_value = {"batch_size": 10, "sleep_between_batches": 0.35}
+            mock_config.return_value = {"batch_size": 10}
 
             result = await mock_vectorization_tool.batch_vectorize_documents(
                 documents=[], tag="test_batch", update_firestore=False
@@ -217,5 +226,5 @@ class TestBatchPolicy:
 
         # Verify that default values are used
         assert result["batch_size"] == 100  # Default from settings
-        assert result["sleep_between_batches"] == 0.35  # Default from settings
+        assert "sleep_between_batches" not in result  # Paced by rate limiters
         assert result["batches_processed"] == 1  # 5 docs fit in one batch of 100
@@ -0,0 +1,151 @@
+"""Tests for document chunking, per-chunk upserts and grouped RAG search."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from agent_data_manager.tools.qdrant_vectorization_tool import QdrantVectorizationTool
+from agent_data_manager.utils.chunking import TextChunker
+from agent_data_manager.vector_store.qdrant_store import QdrantStore
+
+
+class BatchRecordingProvider:
+    """Embedding provider that records the size of each batched request."""
+
+    def __init__(self):
+        self.batches = []
+
+    async def embed(self, texts):
+        self.batches.append(len(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    async def embed_single(self, text):
+        return (await self.embed([text]))[0]
+
+    def get_model_name(self):
+        return "test-embedding-model"
+
+
+def _store() -> QdrantStore:
+    store = QdrantStore(
+        url="http://unused:6333", api_key="", collection_name="chunk_test"
+    )
+    store._client = MagicMock()
+    store._collection_initialized = True
+    return store
+
+
+def test_chunker_strategies_respect_size_and_overlap():
+    """Token windows overlap; sentence packing never splits a sentence."""
+    text = " ".join(f"word{i}" for i in range(100))
+    chunker = TextChunker(chunk_size=30, chunk_overlap=10)
+    chunks = chunker.split(text)
+
+    assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+    assert all(chunk.token_count <= 30 for chunk in chunks)
+    assert chunks[0].text[-8:] in chunks[1].text
+    assert chunks[0].text[:8] not in chunks[1].text
+    assert chunks[-1].text.endswith("word99")
+    assert chunker.split("short text")[0].text == "short text"
+
+    sentences = [f"Sentence number {i} has several words in it." for i in range(20)]
+    sentence_chunker = TextChunker(chunk_size=40, chunk_overlap=12, strategy="sentence")
+    for chunk in sentence_chunker.split(" ".join(sentences)):
+        assert chunk.token_count <= 40
+        assert chunk.text.startswith("Sentence") and chunk.text.endswith(".")
+
+    with pytest.raises(ValueError):
+        TextChunker(chunk_size=10, chunk_overlap=10)
+
+
+@pytest.mark.asyncio
+async def test_long_documents_are_stored_one_point_per_chunk():
+    """Chunks are embedded in batches and replace the document's older points."""
+    provider = BatchRecordingProvider()
+    tool = QdrantVectorizationTool(
+        embedding_provider=provider,
+        chunker=TextChunker(chunk_size=20, chunk_overlap=5),
+    )
+    tool.embed_batch_size = 2
+    tool._initialized = True
+    tool.qdrant_store = _store()
+
+    content = " ".join(f"token{i}" for i in range(70))
+    result = await tool.vectorize_document(
+        "doc_long", content, update_firestore=False, enable_auto_tagging=False
+    )
+
+    assert result["status"] == "success"
+    assert result["chunk_count"] == 5
+    assert provider.batches == [2, 2, 1]
+
+    points = tool.qdrant_store.client.upsert.call_args.kwargs["points"]
+    assert [point.payload["chunk_index"] for point in points] == list(range(5))
+    assert {point.payload["doc_id"] for point in points} == {"doc_long"}
+    assert points[0].payload["chunk_text"].startswith("token0")
+
+    # Re-saving writes the same point IDs and drops any other point of the doc
+    await tool.vectorize_document(
+        "doc_long", content, update_firestore=False, enable_auto_tagging=False
+    )
+    again = tool.qdrant_store.client.upsert.call_args.kwargs["points"]
+    assert [point.id for point in again] == [point.id for point in points]
+    stale_filter = tool.qdrant_store.client.delete.call_args.kwargs[
+        "points_selector"
+    ].filter
+    assert stale_filter.must[0].match.value == "doc_long"
+    assert stale_filter.must_not[0].has_id == [point.id for point in points]
+
+    # Shrinking to a single point still removes the old chunks
+    await tool.vectorize_document(
+        "doc_long", "now short", update_firestore=False, enable_auto_tagging=False
+    )
+    (single,) = tool.qdrant_store.client.upsert.call_args.kwargs["points"]
+    stale_filter = tool.qdrant_store.client.delete.call_args.kwargs[
+        "points_selector"
+    ].filter
+    assert stale_filter.must[0].match.value == "doc_long"
+    assert stale_filter.must_not[0].has_id == [single.id]
+
+
+@pytest.mark.asyncio
+async def test_rag_search_returns_each_document_once_with_best_passage():
+    """Chunk hits are grouped by doc_id in Qdrant and surfaced as best_passage."""
+    store = _store()
+
+    def hit(doc_id, chunk_index, score):
+        return SimpleNamespace(
+            id=f"{doc_id}-{chunk_index}",
+            score=score,
+            payload={
+                "doc_id": doc_id,
+                "chunk_index": chunk_index,
+                "chunk_text": f"{doc_id} passage {chunk_index}",
+            },
+        )
+
+    store._client.search_groups.return_value = SimpleNamespace(
+        groups=[
+            SimpleNamespace(id="doc_a", hits=[hit("doc_a", 3, 0.92)]),
+            SimpleNamespace(id="doc_b", hits=[hit("doc_b", 0, 0.81)]),
+        ]
+    )
+
+    tool = QdrantVectorizationTool(embedding_provider=BatchRecordingProvider())
+    tool._initialized = True
+    tool.qdrant_store = store
+    tool.firestore_manager = MagicMock()
+    tool.firestore_manager.batch_get_metadata = AsyncMock(
+        return_value={"doc_a": {"title": "A"}, "doc_b": {"title": "B"}}
+    )
+
+    result = await tool.rag_search("passage", query_vector=[1.0, 0.0], limit=5)
+
+    kwargs = store._client.search_groups.call_args.kwargs
+    assert kwargs["group_by"] == "doc_id" and kwargs["limit"] == 10
+    assert [r["doc_id"] for r in result["results"]] == ["doc_a", "doc_b"]
+    assert result["results"][0]["best_passage"] == {
+        "chunk_index": 3,
+        "text": "doc_a passage 3",
+    }
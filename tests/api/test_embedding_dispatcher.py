@@ -0,0 +1,123 @@
+"""Tests for the cross-request micro-batching embedding dispatcher."""
+
+import asyncio
+
+import pytest
+
+from agent_data_manager.embedding.batching_embedding_provider import (
+    BatchingEmbeddingProvider,
+)
+from agent_data_manager.embedding.embedding_provider import EmbeddingError
+from agent_data_manager.tools.prometheus_metrics import qdrant_registry
+
+
+class RecordingProvider:
+    """Provider that records each embed() batch and can be told to fail."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error: Exception | None = None,
+        reject: tuple[str, ...] = (),
+    ):
+        self.latency = latency
+        self.error = error
+        self.reject = reject
+        self.batches: list[list[str]] = []
+
+    async def embed(self, texts):
+        self.batches.append(list(texts))
+        await asyncio.sleep(self.latency)
+        if self.error:
+            raise self.error
+        if any(text in self.reject for text in texts):
+            raise EmbeddingError("invalid input", 400, "test")
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def get_embedding_dimension(self):
+        return 2
+
+    def get_model_name(self):
+        return "recording"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_request():
+    """Callers arriving within max_wait get their own vector from one batch."""
+    provider = RecordingProvider()
+    dispatcher = BatchingEmbeddingProvider(provider, max_wait=0.02)
+    texts = ["a", "bb", "ccc", "bb", "dddd"]
+
+    vectors = await asyncio.gather(*(dispatcher.embed_single(t) for t in texts))
+
+    assert vectors == [[1.0, 1.0], [2.0, 1.0], [3.0, 1.0], [2.0, 1.0], [4.0, 1.0]]
+    assert provider.batches == [["a", "bb", "ccc", "dddd"]]  # duplicates sent once
+    assert dispatcher.queue_depth == 0
+    assert dispatcher.get_model_name() == "recording"
+
+
+@pytest.mark.asyncio
+async def test_size_and_token_caps_flush_without_waiting():
+    """Full batches go out at once; only the remainder waits for max_wait."""
+    provider = RecordingProvider()
+    dispatcher = BatchingEmbeddingProvider(provider, max_wait=0.05, max_batch_size=3)
+    before = qdrant_registry.get_sample_value(
+        "embedding_dispatch_batch_size_count", {"reason": "max_size"}
+    )
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await asyncio.gather(*(dispatcher.embed_single(f"t{i}") for i in range(6)))
+    assert loop.time() - started < 0.05
+    assert [len(batch) for batch in provider.batches] == [3, 3]
+    after = qdrant_registry.get_sample_value(
+        "embedding_dispatch_batch_size_count", {"reason": "max_size"}
+    )
+    assert after - (before or 0) == 2
+
+    provider.batches.clear()
+    dispatcher = BatchingEmbeddingProvider(provider, max_wait=0.01, max_batch_tokens=40)
+    await asyncio.gather(*(dispatcher.embed_single("word " * 20) for _ in range(3)))
+    assert [len(batch) for batch in provider.batches] == [1, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_failures_reach_every_caller_and_cancellation_is_isolated():
+    """A failed batch raises in each caller; a cancelled caller does not break others."""
+    provider = RecordingProvider(error=EmbeddingError("upstream down", 503, "test"))
+    dispatcher = BatchingEmbeddingProvider(provider, max_wait=0.01)
+
+    results = await asyncio.gather(
+        dispatcher.embed_single("x"),
+        dispatcher.embed_single("y"),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, EmbeddingError) for r in results)
+    assert len(provider.batches) == 1
+
+    provider.error = None
+    provider.latency = 0.02
+    cancelled = asyncio.create_task(dispatcher.embed_single("gone"))
+    kept = asyncio.create_task(dispatcher.embed_single("kept"))
+    await asyncio.sleep(0.015)  # batch has been sent
+    cancelled.cancel()
+    assert await kept == [4.0, 1.0]
+    assert cancelled.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_rejected_text_fails_only_its_caller():
+    """A batch rejected for one input is retried per text; the others succeed."""
+    provider = RecordingProvider(reject=("bad",))
+    dispatcher = BatchingEmbeddingProvider(provider, max_wait=0.01)
+
+    results = await asyncio.gather(
+        dispatcher.embed_single("ok"),
+        dispatcher.embed_single("bad"),
+        dispatcher.embed_single("fine"),
+        return_exceptions=True,
+    )
+
+    assert results[0] == [2.0, 1.0] and results[2] == [4.0, 1.0]
+    assert isinstance(results[1], EmbeddingError) and results[1].status_code == 400
+    assert provider.batches == [["ok", "bad", "fine"], ["ok"], ["bad"], ["fine"]]
@@ -0,0 +1,187 @@
+"""Tests for fire-and-forget event publishing through the bounded event queue."""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from agent_data_manager.event.buffered_publisher import (
+    BufferedEventPublisher,
+    LocalEventPublisher,
+)
+from agent_data_manager.event.event_manager import EventManager
+
+
+@pytest.mark.asyncio
+async def test_async_mode_returns_before_publish_completes():
+    """Queued events return immediately and are published in batches later."""
+    local = LocalEventPublisher(latency=0.2)
+    manager = EventManager(project_id="test", mode="async", batch_publisher=local)
+
+    start = asyncio.get_running_loop().time()
+    results = [
+        await manager.publish_save_document_event(doc_id=f"doc_{i}") for i in range(5)
+    ]
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert all(r["status"] == "queued" for r in results)
+    assert elapsed < 0.1
+    assert local.published == []
+
+    await manager.close()
+    assert [e["doc_id"] for e in local.published] == [f"doc_{i}" for i in range(5)]
+    assert local.batches == [5]
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_policy_bounds_queue():
+    """When the queue is full the oldest event is discarded."""
+    local = LocalEventPublisher()
+    buffer = BufferedEventPublisher(
+        local,
+        max_queue_size=3,
+        max_batch_size=10,
+        max_latency=0.05,
+        policy="drop_oldest",
+    )
+
+    outcomes = [await buffer.enqueue({"n": i}) for i in range(5)]
+    await buffer.close()
+
+    assert outcomes[-1] == "dropped_oldest"
+    assert [e["n"] for e in local.published] == [2, 3, 4]
+    assert buffer.get_stats()["dropped"] == 2
+
+
+@pytest.mark.asyncio
+async def test_spill_policy_replays_events_after_outage(tmp_path):
+    """Overflow and failed batches are spilled to disk and replayed later."""
+    spill_path = tmp_path / "spill.jsonl"
+    local = LocalEventPublisher(fail_batches=1)
+    buffer = BufferedEventPublisher(
+        local,
+        max_queue_size=2,
+        max_batch_size=2,
+        max_latency=0.01,
+        policy="spill",
+        spill_path=str(spill_path),
+        max_retries=1,
+        replay_backoff=0.05,
+    )
+
+    outcomes = [await buffer.enqueue({"n": i}) for i in range(3)]
+    assert outcomes == ["queued", "queued", "spilled"]
+    assert json.loads(spill_path.read_text().splitlines()[0]) == {"n": 2}
+
+    # First batch fails and is spilled; the replay then publishes everything
+    for _ in range(50):
+        await asyncio.sleep(0.02)
+        if len(local.published) == 3:
+            break
+    await buffer.close()
+
+    assert sorted(e["n"] for e in local.published) == [0, 1, 2]
+    assert not spill_path.exists()
+    assert buffer.get_stats()["failed_batches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_spill_replay_backs_off_during_outage(tmp_path):
+    """Spilled events wait for a successful publish instead of looping."""
+    spill_path = tmp_path / "spill.jsonl"
+    local = LocalEventPublisher(fail_batches=10**9)
+    buffer = BufferedEventPublisher(
+        local,
+        max_batch_size=10,
+        max_latency=0.01,
+        policy="spill",
+        spill_path=str(spill_path),
+        max_retries=1,
+        replay_backoff=0.05,
+    )
+
+    await buffer.enqueue({"n": 0})
+    await buffer.flush(timeout=1)
+    await asyncio.sleep(0.3)
+    # Replays at 0.05s, 0.1s and 0.2s backoff at most, not a tight loop
+    assert 1 <= buffer.get_stats()["failed_batches"] <= 4
+    assert buffer.get_stats()["replayed"] <= 3
+
+    local.fail_batches = 0
+    await buffer.enqueue({"n": 1})
+    for _ in range(50):
+        await asyncio.sleep(0.02)
+        if len(local.published) == 2:
+            break
+    await buffer.close()
+
+    assert sorted(e["n"] for e in local.published) == [0, 1]
+    assert not spill_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_close_spills_batch_whose_publish_is_cancelled(tmp_path):
+    """Closing during a slow publish keeps the in-flight batch on disk."""
+    spill_path = tmp_path / "spill.jsonl"
+    buffer = BufferedEventPublisher(
+        LocalEventPublisher(latency=5),
+        max_latency=0.01,
+        policy="spill",
+        spill_path=str(spill_path),
+    )
+
+    await buffer.enqueue({"n": 0})
+    await asyncio.sleep(0.05)
+    await buffer.close(timeout=0.05)
+
+    assert [json.loads(line) for line in spill_path.read_text().splitlines()] == [
+        {"n": 0}
+    ]
+    assert buffer.get_stats()["spilled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_block_policy_waits_for_flusher():
+    """Producers wait for space instead of losing events."""
+    local = LocalEventPublisher(latency=0.01)
+    buffer = BufferedEventPublisher(
+        local, max_queue_size=2, max_batch_size=2, max_latency=0.01, policy="block"
+    )
+
+    outcomes = await asyncio.gather(*(buffer.enqueue({"n": i}) for i in range(6)))
+    await buffer.close()
+
+    assert set(outcomes) == {"queued"}
+    assert sorted(e["n"] for e in local.published) == list(range(6))
+    assert buffer.get_stats()["dropped"] == 0
+
+
+def test_queue_survives_its_loop_and_accepts_other_loops():
+    """A closed owner loop hands the queue over; other live loops are marshalled."""
+    local = LocalEventPublisher()
+    buffer = BufferedEventPublisher(local, max_batch_size=10, max_latency=0.2)
+
+    # asyncio.run closes its loop, and the flusher with it, while the event waits
+    asyncio.run(buffer.enqueue({"n": 0}))
+    assert buffer.queue_depth == 1
+
+    owner = asyncio.new_event_loop()
+    thread = threading.Thread(target=owner.run_forever, daemon=True)
+    thread.start()
+    try:
+        asyncio.run_coroutine_threadsafe(buffer.enqueue({"n": 1}), owner).result(5)
+        assert asyncio.run(buffer.enqueue({"n": 2})) == "queued"
+        asyncio.run(buffer.flush(timeout=5))
+        assert sorted(e["n"] for e in local.published) == [0, 1, 2]
+        asyncio.run(buffer.close())
+        assert (
+            asyncio.run_coroutine_threadsafe(buffer.enqueue({"n": 3}), owner).result(5)
+            == "queued"
+        )
+        asyncio.run_coroutine_threadsafe(buffer.close(), owner).result(5)
+        assert [e["n"] for e in local.published][-1] == 3
+    finally:
+        owner.call_soon_threadsafe(owner.stop)
+        thread.join()
+        owner.close()
@@ -0,0 +1,153 @@
+"""Tests for journaled, lock-protected mutations of FAISS metadata files."""
+
+import os
+import pickle
+import threading
+
+import faiss
+import numpy as np
+import pytest
+
+from agent_data_manager.tools import (
+    batch_generate_embeddings_tool,
+    bulk_delete_metadata_tool,
+    bulk_update_metadata_tool,
+    faiss_metadata_journal,
+    multi_field_update_tool,
+)
+from agent_data_manager.tools.faiss_metadata_journal import (
+    compact,
+    journal_path,
+    load_metadata,
+)
+
+
+@pytest.fixture
+def faiss_dir(tmp_path, monkeypatch):
+    """A FAISS index with 10 nodes; the mutation tools point at tmp_path."""
+    for module in (
+        batch_generate_embeddings_tool,
+        bulk_delete_metadata_tool,
+        bulk_update_metadata_tool,
+        multi_field_update_tool,
+    ):
+        monkeypatch.setattr(module, "FAISS_DIR", str(tmp_path))
+
+    keys = [f"doc{i}" for i in range(10)]
+    index = faiss.IndexIDMap(faiss.IndexFlatL2(1))
+    index.add_with_ids(np.zeros((10, 1), dtype="float32"), np.arange(10))
+    faiss.write_index(index, str(tmp_path / "idx.faiss"))
+    with open(tmp_path / "idx.meta", "wb") as f:
+        pickle.dump(
+            {
+                "metadata": {
+                    key: {"group": "even" if i % 2 == 0 else "odd"}
+                    for i, key in enumerate(keys)
+                },
+                "id_to_key": dict(enumerate(keys)),
+                "key_to_id": {key: i for i, key in enumerate(keys)},
+            },
+            f,
+        )
+    return tmp_path
+
+
+def test_small_edits_append_to_journal_without_rewriting_snapshot(faiss_dir):
+    """Edits are replayed by readers; the snapshot bytes stay untouched."""
+    meta_path = str(faiss_dir / "idx.meta")
+    snapshot = (faiss_dir / "idx.meta").read_bytes()
+
+    result = bulk_update_metadata_tool.bulk_update_metadata(
+        "idx", {"group": "even"}, {"status": "reviewed"}
+    )
+    assert result["updated_count"] == 5
+    multi_field_update_tool.multi_field_update("idx", "doc1", {"status": "draft"})
+
+    assert (faiss_dir / "idx.meta").read_bytes() == snapshot
+    metadata = load_metadata(meta_path)["metadata"]
+    assert metadata["doc0"] == {"group": "even", "status": "reviewed"}
+    assert metadata["doc1"] == {"group": "odd", "status": "draft"}
+    assert "status" not in metadata["doc3"]
+
+    # A record torn by a crash mid-append is ignored
+    with open(journal_path(meta_path), "ab") as f:
+        f.write(b"\x00\x00\x01\x00partial")
+    assert load_metadata(meta_path)["metadata"]["doc1"]["status"] == "draft"
+
+
+def test_append_after_torn_tail_truncates_it(faiss_dir):
+    """Records appended after a crash mid-append are read back and compacted."""
+    meta_path = str(faiss_dir / "idx.meta")
+    multi_field_update_tool.multi_field_update("idx", "doc1", {"status": "draft"})
+    with open(journal_path(meta_path), "ab") as f:
+        f.write(b"\x00\x00\x01\x00partial")
+
+    multi_field_update_tool.multi_field_update("idx", "doc2", {"status": "final"})
+    metadata = load_metadata(meta_path)["metadata"]
+    assert metadata["doc1"]["status"] == "draft"
+    assert metadata["doc2"]["status"] == "final"
+
+    assert compact(meta_path, str(faiss_dir / "idx.faiss")) == 2
+    assert load_metadata(meta_path)["metadata"]["doc2"]["status"] == "final"
+
+
+def test_concurrent_updates_are_not_lost(faiss_dir):
+    """Threads editing the same index all land in the journal."""
+    errors = []
+
+    def edit(i):
+        try:
+            multi_field_update_tool.multi_field_update("idx", f"doc{i}", {"writer": i})
+            bulk_update_metadata_tool.bulk_update_metadata(
+                "idx", {"group": "odd"}, {f"seen_by_{i}": True}
+            )
+            if i % 3 == 0:
+                # Rewrites the whole snapshot from what it loaded
+                batch_generate_embeddings_tool.batch_generate_embeddings(
+                    "idx", overwrite=True
+                )
+        except Exception as e:  # pragma: no cover - surfaced below
+            errors.append(e)
+
+    threads = [threading.Thread(target=edit, args=(i,)) for i in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    metadata = load_metadata(str(faiss_dir / "idx.meta"))["metadata"]
+    assert [metadata[f"doc{i}"]["writer"] for i in range(10)] == list(range(10))
+    assert all(
+        metadata["doc1"][f"seen_by_{i}"] for i in range(10)
+    ), "bulk updates were lost"
+    assert all("embedding" in item for item in metadata.values())
+
+
+def test_compaction_folds_journal_and_drops_deleted_vectors(faiss_dir, monkeypatch):
+    """Deletes reach the FAISS index on compaction; empty indexes are removed."""
+    meta_path = str(faiss_dir / "idx.meta")
+    index_path = str(faiss_dir / "idx.faiss")
+
+    result = bulk_delete_metadata_tool.bulk_delete_metadata("idx", {"group": "odd"})
+    assert result["deleted_count"] == 5 and result["remaining_count"] == 5
+    assert faiss.read_index(index_path).ntotal == 10
+    assert "doc1" not in load_metadata(meta_path)["key_to_id"]
+
+    assert compact(meta_path, index_path) == 1
+    assert not os.path.exists(journal_path(meta_path))
+    with open(meta_path, "rb") as f:
+        snapshot = pickle.load(f)
+    assert sorted(snapshot["metadata"]) == ["doc0", "doc2", "doc4", "doc6", "doc8"]
+    assert faiss.read_index(index_path).ntotal == 5
+
+    # Past the size threshold every append compacts immediately
+    monkeypatch.setattr(faiss_metadata_journal, "COMPACT_THRESHOLD_BYTES", 1)
+    multi_field_update_tool.multi_field_update("idx", "doc0", {"status": "final"})
+    assert not os.path.exists(journal_path(meta_path))
+    with open(meta_path, "rb") as f:
+        assert pickle.load(f)["metadata"]["doc0"]["status"] == "final"
+
+    result = bulk_delete_metadata_tool.bulk_delete_metadata("idx", {"group": "even"})
+    assert result["remaining_count"] == 0
+    assert not os.path.exists(meta_path) and not os.path.exists(index_path)
@@ -5,7 +5,7 @@ Tests connection failures, data validation, sync scenarios, and error handling
 
 import asyncio
 from datetime import datetime
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
@@ -18,7 +18,7 @@ class TestFirestoreConnectionEdgeCases:
     def test_firestore_connection_failure(self):
         """Test handling of Firestore connection failures"""
         with patch(
-            "agent_data_manager.auth.user_manager.firestore.Client"
+            "agent_data_manager.auth.user_manager.firestore.AsyncClient"
         ) as mock_client:
             # Simulate connection failure
             mock_client.side_effect = Exception("Connection failed")
@@ -170,30 +170,26 @@ class TestConcurrentFirestoreOperations:
             """Create a user asynchronously"""
             try:
                 email = f"concurrent_{user_id}@test.com"
-
-                # Mock the Firestore operations
-                with (
-                    patch.object(
-                        self.user_manager, "get_user_by_email", return_value=None
-                    ),
-                    patch.object(
-                        self.user_manager.firestore_client, "collection"
-                    ) as mock_collection,
-                ):
-
-                    mock_doc_ref = MagicMock()
-                    mock_collection.return_value.document.return_value = mock_doc_ref
-
-                    asyncio.run(self.user_manager.create_user(email, "password123"))
-                    return {"success": True, "user_id": user_id, "email": email}
+                asyncio.run(self.user_manager.create_user(email, "password123"))
+                return {"success": True, "user_id": user_id, "email": email}
 
             except Exception as e:
                 return {"success": False, "user_id": user_id, "error": str(e)}
 
-        # Create users concurrently
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = [executor.submit(create_user_async, i) for i in range(10)]
-            results = [future.result() for future in as_completed(futures)]
+        # Mock the Firestore operations once so worker threads don't race on patching
+        with (
+            patch.object(self.user_manager, "get_user_by_email", return_value=None),
+            patch.object(
+                self.user_manager.firestore_client, "collection"
+            ) as mock_collection,
+        ):
+            mock_doc_ref = AsyncMock()
+            mock_collection.return_value.document.return_value = mock_doc_ref
+
+            # Create users concurrently
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                futures = [executor.submit(create_user_async, i) for i in range(10)]
+                results = [future.result() for future in as_completed(futures)]
 
         # Check results
         successful_creations = [r for r in results if r["success"]]
@@ -278,7 +274,7 @@ class TestFirestoreDataConsistency:
             ) as mock_collection,
         ):
 
-            mock_doc_ref = MagicMock()
+            mock_doc_ref = AsyncMock()
             mock_collection.return_value.document.return_value = mock_doc_ref
 
             result = asyncio.run(
@@ -312,7 +308,7 @@ class TestFirestoreDataConsistency:
             ) as mock_collection,
         ):
 
-            mock_doc_ref = MagicMock()
+            mock_doc_ref = AsyncMock()
             mock_collection.return_value.document.return_value = mock_doc_ref
 
             result = asyncio.run(
@@ -350,7 +346,7 @@ class TestFirestoreDataConsistency:
                 ) as mock_collection,
             ):
 
-                mock_doc_ref = MagicMock()
+                mock_doc_ref = AsyncMock()
                 mock_collection.return_value.document.return_value = mock_doc_ref
 
                 result = asyncio.run(
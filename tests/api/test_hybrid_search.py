@@ -0,0 +1,150 @@
+"""Tests for BM25 sparse vectors and hybrid (keyword + vector) RAG search."""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from agent_data_manager.config.settings import Settings
+from agent_data_manager.embedding.deterministic_embedding_provider import (
+    DeterministicEmbeddingProvider,
+)
+from agent_data_manager.tools.qdrant_vectorization_tool import QdrantVectorizationTool
+from agent_data_manager.utils import lexical, rate_limiter, resilience
+from agent_data_manager.vector_store.qdrant_store import QdrantStore
+
+DOCS = {
+    "pay_1": "Payment failed because the card was declined, ask the customer to retry the payment",
+    "pay_2": "When a payment failed twice, check the billing address and retry payment",
+    "pay_3": "Refund a failed payment from the billing dashboard",
+    "err": "Sync job stops with ERR-1042 when the warehouse feed is late",
+}
+QUERY = "payment failed with ERR-1042"
+
+
+@pytest.fixture
+def hybrid(monkeypatch):
+    """Hybrid search enabled against local Qdrant, with fresh upstream limiters."""
+    monkeypatch.setattr(Settings, "HYBRID_SEARCH_ENABLED", True)
+    monkeypatch.setattr(Settings, "RAG_SEARCH_MODE", "vector")
+    monkeypatch.setattr(Settings, "QDRANT_REQUESTS_PER_MINUTE", 0)
+    monkeypatch.setattr(Settings, "EMBEDDING_PROVIDER", "deterministic")
+    monkeypatch.setattr(Settings, "EMBEDDING_BATCHING_ENABLED", False)
+    monkeypatch.setattr(Settings, "VECTOR_DIMENSION", 32)
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+
+
+async def _store_with_docs(provider) -> QdrantStore:
+    store = QdrantStore(
+        ":memory:", "", collection_name=f"hybrid_{uuid.uuid4().hex[:8]}", vector_size=32
+    )
+    for doc_id, text in DOCS.items():
+        vector = await provider.embed_single(text)
+        result = await store.upsert_vector(
+            doc_id, vector, {"content_preview": text}, text=text
+        )
+        assert result["success"]
+    return store
+
+
+def test_bm25_vectors_keep_codes_whole_and_saturate_term_frequency():
+    """Codes match whole and by part; repeated terms gain less and less weight."""
+    assert lexical.tokenize("Error ERR-1042 in v2.3") == [
+        "error",
+        "err-1042",
+        "err",
+        "1042",
+        "in",
+        "v2.3",
+        "v2",
+        "3",
+    ]
+
+    indices, values = lexical.query_vector("ERR-1042 err")
+    assert indices == sorted(
+        lexical.term_index(term) for term in ("err-1042", "err", "1042")
+    )
+    assert values == [1.0, 1.0, 1.0]
+
+    def weight(text, term):
+        indices, values = lexical.document_vector(text)
+        return values[indices.index(lexical.term_index(term))]
+
+    # Same document length, so only the term frequency changes
+    once, twice, ten = (
+        weight(" ".join(["code"] * n + ["word"] * (20 - n)), "code") for n in (1, 2, 10)
+    )
+    assert once < twice < ten < lexical.BM25_K1 + 1
+    assert twice - once > (ten - twice) / 8  # Gain per extra occurrence shrinks
+    assert lexical.document_vector("") == ([], [])
+
+
+@pytest.mark.asyncio
+async def test_lexical_search_finds_exact_codes(hybrid, monkeypatch):
+    """The sparse vector is stored with the dense one; old collections opt out."""
+    provider = DeterministicEmbeddingProvider(dimension=32)
+    store = await _store_with_docs(provider)
+    assert store.has_lexical_index
+
+    found = await store.lexical_search("ERR-1042", limit=2, group_by="doc_id")
+    assert found["status"] == "success"
+    assert [r["metadata"]["doc_id"] for r in found["results"]] == ["err"]
+    assert (await store.lexical_search("?!", limit=2))["results"] == []
+
+    # A collection created without the sparse vector keeps working for vectors
+    monkeypatch.setattr(Settings, "HYBRID_SEARCH_ENABLED", False)
+    legacy = QdrantStore(
+        ":memory:", "", collection_name=f"legacy_{uuid.uuid4().hex[:8]}", vector_size=32
+    )
+    vector = await provider.embed_single(DOCS["err"])
+    assert (await legacy.upsert_vector("err", vector, text=DOCS["err"]))["success"]
+    monkeypatch.setattr(Settings, "HYBRID_SEARCH_ENABLED", True)
+    reopened = QdrantStore(":memory:", "", legacy.collection_name, vector_size=32)
+    result = await reopened.lexical_search("ERR-1042")
+    assert result["status"] == "failed" and not reopened.has_lexical_index
+
+
+@pytest.mark.asyncio
+async def test_hybrid_rag_search_fuses_rankings_with_per_request_weight(hybrid):
+    """Keyword hits below the vector threshold are fused in, weighted per request."""
+    provider = DeterministicEmbeddingProvider(dimension=32)
+    tool = QdrantVectorizationTool(embedding_provider=provider)
+    tool.qdrant_store = await _store_with_docs(provider)
+    tool.firestore_manager = MagicMock()
+    tool._initialized = True
+    tool._batch_get_firestore_metadata = AsyncMock(
+        side_effect=lambda doc_ids: {
+            doc_id: {"content_preview": DOCS[doc_id]} for doc_id in doc_ids
+        }
+    )
+    search = {"query_text": QUERY, "limit": 2, "score_threshold": 0.37}
+
+    vector = await tool.rag_search(**search)
+    assert [r["doc_id"] for r in vector["results"]] == ["pay_2"]
+    assert vector["rag_info"]["search_mode"] == "vector"
+
+    hybrid_result = await tool.rag_search(
+        **search, search_mode="hybrid", lexical_weight=0.8
+    )
+    ranked = {r["doc_id"]: r for r in hybrid_result["results"]}
+    assert set(ranked) == {"pay_2", "err"}
+    assert ranked["err"]["hybrid"]["lexical_rank"] == 1
+    assert "vector_rank" not in ranked["err"]["hybrid"]
+    # pay_2 ranks in both lists, so it still edges out the keyword-only hit
+    assert ranked["pay_2"]["qdrant_score"] > ranked["err"]["qdrant_score"]
+    assert hybrid_result["rag_info"]["lexical_weight"] == 0.8
+
+    keyword_first = await tool.rag_search(
+        **search, search_mode="hybrid", lexical_weight=1.0
+    )
+    assert [r["doc_id"] for r in keyword_first["results"]] == ["err", "pay_2"]
+
+    # Weight 0 keeps the vector ranking; keyword-only documents drop out
+    vector_only = await tool.rag_search(
+        **search, search_mode="hybrid", lexical_weight=0.0
+    )
+    assert [r["doc_id"] for r in vector_only["results"]] == ["pay_2"]
+
+    invalid = await tool.rag_search(**search, search_mode="keyword")
+    assert invalid["status"] == "failed"
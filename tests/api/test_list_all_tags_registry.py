@@ -0,0 +1,114 @@
+"""Tests for tag enumeration via Qdrant facets or the maintained tag registry."""
+
+import pytest
+from fastapi.testclient import TestClient
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import PointStruct
+
+import api_vector_search
+from agent_data.vector_store import qdrant_store as qdrant_store_module
+from agent_data.vector_store.qdrant_store import QdrantStore
+from tests.mocks.qdrant_basic import FakeAsyncQdrantClient, FakeQdrantClient
+
+VECTOR = [0.1, 0.2, 0.3, 0.4]
+
+
+def _points(tags, vector=VECTOR):
+    return [
+        PointStruct(id=i, vector=vector, payload={"tag": tag})
+        for i, tag in enumerate(tags, start=1)
+    ]
+
+
+@pytest.fixture
+def store_env(monkeypatch):
+    monkeypatch.setenv("QDRANT_URL", "http://tags-test:6333")
+    monkeypatch.setenv("QDRANT_COLLECTION_NAME", "tag_collection")
+    monkeypatch.setenv("ENABLE_FIRESTORE_SYNC", "false")
+    monkeypatch.setattr(QdrantStore, "_instance", None)
+    monkeypatch.setattr(qdrant_store_module, "_sync_clients", {})
+    FakeQdrantClient.clear_all_data()
+    yield monkeypatch
+    FakeQdrantClient.clear_all_data()
+
+
+@pytest.fixture
+def registry_store(store_env):
+    """Store on the fake client, which has no facet support."""
+    store_env.setattr(qdrant_store_module, "QdrantClient", FakeQdrantClient)
+    store_env.setattr(qdrant_store_module, "AsyncQdrantClient", FakeAsyncQdrantClient)
+    store = QdrantStore()
+    store.client.upsert(
+        "tag_collection", points=_points(["news", "news", " sport ", "", None])
+    )
+    return store
+
+
+def test_list_all_tags_uses_facets_without_scrolling(store_env):
+    """With facet support, tags and counts come from one facet request."""
+    store_env.setattr(
+        qdrant_store_module,
+        "QdrantClient",
+        lambda **kwargs: QdrantClient(location=":memory:"),
+    )
+    store = QdrantStore()
+    store.client.upsert(
+        "tag_collection", points=_points(["b", "a", "b", " a "], vector=[0.1] * 1536)
+    )
+
+    def no_scroll(**kwargs):
+        raise AssertionError("list_all_tags should not scroll the collection")
+
+    store_env.setattr(store.client, "scroll", no_scroll)
+
+    assert store.list_all_tags() == ["a", "b"]
+    assert store.list_all_tags(with_counts=True) == {"a": 2, "b": 2}
+    assert store._facets_supported is True
+    assert store._tag_counts is None
+
+
+@pytest.mark.asyncio
+async def test_registry_is_built_once_and_follows_writes(registry_store, monkeypatch):
+    """Without facets, one scroll builds the registry; writes keep it current."""
+    scrolls = []
+    scroll = registry_store.client.scroll
+    monkeypatch.setattr(
+        registry_store.client,
+        "scroll",
+        lambda **kwargs: scrolls.append(kwargs) or scroll(**kwargs),
+    )
+
+    assert registry_store.list_all_tags(with_counts=True) == {"news": 2, "sport": 1}
+    assert registry_store._facets_supported is False
+    assert len(scrolls) == 1
+
+    await registry_store.upsert_vector(10, VECTOR, {"tag": "weather"})
+    await registry_store.upsert_vector(1, VECTOR, {"tag": "weather"})  # was news
+    await registry_store.delete_vector(3)  # was sport
+    assert registry_store.list_all_tags(with_counts=True) == {"news": 1, "weather": 2}
+
+    assert await registry_store.delete_vectors_by_tag("weather") == 2
+    assert registry_store.list_all_tags() == ["news"]
+    assert len(scrolls) == 1
+
+    registry_store.invalidate_tag_registry()
+    assert registry_store.list_all_tags() == ["news"]
+    assert len(scrolls) == 2
+
+
+def test_list_all_tags_endpoint_returns_counts_on_request(registry_store):
+    """?with_counts=true adds per-tag counts; the default response is unchanged."""
+    api_vector_search.app.dependency_overrides[api_vector_search.get_qdrant_store] = (
+        lambda: registry_store
+    )
+    try:
+        client = TestClient(api_vector_search.app)
+        plain = client.post("/list_all_tags")
+        counted = client.post("/list_all_tags", params={"with_counts": "true"})
+    finally:
+        api_vector_search.app.dependency_overrides.clear()
+
+    assert plain.status_code == 200
+    assert plain.json() == {"status": "ok", "tags": ["news", "sport"], "counts": None}
+    assert counted.json()["tags"] == ["news", "sport"]
+    assert counted.json()["counts"] == {"news": 2, "sport": 1}
@@ -0,0 +1,95 @@
+"""Tests for the MCPAgent persistent event loop and batched tool execution."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from agent_data_manager.mcp import mcp_agent_core
+from agent_data_manager.utils.background_loop import BackgroundEventLoop
+
+
+async def current_loop_id() -> int:
+    return id(asyncio.get_running_loop())
+
+
+async def sleep_and_return(delay: float) -> float:
+    await asyncio.sleep(delay)
+    return delay
+
+
+@pytest.fixture
+def agent():
+    """MCPAgent with only the test tools registered."""
+    with patch.object(mcp_agent_core, "register_tools"):
+        agent = mcp_agent_core.MCPAgent()
+    agent.core_agent.tools_manager.register_tool("loop_id", current_loop_id)
+    agent.core_agent.tools_manager.register_tool("sleep", sleep_and_return)
+    yield agent
+    agent.close()
+
+
+def test_requests_reuse_the_agent_loop(agent):
+    """The loop is set up once and every request runs on it."""
+    first = agent.run({"tool_name": "loop_id", "input_data": {}})
+    second = agent.run({"tool_name": "loop_id", "input_data": {}})
+
+    assert first["meta"]["status"] == second["meta"]["status"] == "success"
+    assert first["result"] == second["result"] == id(agent._event_loop.loop)
+    assert first["meta"]["loop_setup_ms"] > 0
+    assert second["meta"]["loop_setup_ms"] == 0
+    assert "tool_duration_ms" in second["meta"]
+
+
+def test_batch_runs_tool_calls_concurrently(agent):
+    """A list of requests runs concurrently and answers in request order."""
+    batch = [
+        {"id": f"call-{i}", "tool_name": "sleep", "input_data": {"delay": 0.2}}
+        for i in range(4)
+    ]
+    batch.append("not a request")
+
+    start = time.monotonic()
+    responses = agent.run(batch)
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.6
+    assert [r["meta"]["request_id"] for r in responses[:4]] == [
+        f"call-{i}" for i in range(4)
+    ]
+    assert all(r["result"] == 0.2 for r in responses[:4])
+    assert responses[4]["meta"]["status"] == "failed"
+    assert {r["meta"]["batch_size"] for r in responses} == {5}
+    assert all(r["meta"]["duration_ms"] >= 200 for r in responses[:4])
+
+
+def test_tool_timeouts_are_opt_in(agent):
+    """Only tools or requests that ask for a timeout are cut short."""
+    slow = {"tool_name": "sleep", "input_data": {"delay": 0.2}}
+    assert agent.run(dict(slow))["meta"]["status"] == "success"
+
+    timed_out = agent.run({**slow, "timeout_seconds": 0.05})
+    assert timed_out["meta"]["status"] == "failed"
+    assert "timed out after 0.05 seconds" in timed_out["error"]
+
+    with patch.dict(mcp_agent_core.TOOL_TIMEOUTS_SECONDS, {"sleep": 0.05}):
+        assert agent.run(dict(slow))["meta"]["status"] == "failed"
+        assert agent.run({**slow, "timeout_seconds": 1})["meta"]["status"] == (
+            "success"
+        )
+
+
+def test_background_loop_timeout_and_stop():
+    """Timed-out coroutines are cancelled; a stopped loop restarts on demand."""
+    background = BackgroundEventLoop(name="test-loop")
+    with pytest.raises(TimeoutError):
+        background.run(asyncio.sleep(1), timeout=0.05)
+
+    first_loop = background.loop
+    background.stop()
+    assert not background.is_running
+
+    assert background.run(sleep_and_return(0)) == 0
+    assert background.loop is not first_loop
+    background.stop()
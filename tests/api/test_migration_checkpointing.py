@@ -0,0 +1,136 @@
+"""End-to-end tests for batched, checkpointed FAISS to Qdrant migration."""
+
+import hashlib
+import json
+from unittest.mock import AsyncMock, patch
+
+import faiss
+import numpy as np
+import pytest
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models
+
+from scripts import migrate_faiss_to_qdrant as migration
+
+COLLECTION = "migrated"
+
+
+def _index(count: int = 250, dimension: int = 8, seed: int = 0) -> faiss.Index:
+    vectors = np.random.default_rng(seed).random((count, dimension), dtype="float32")
+    index = faiss.IndexIDMap(faiss.IndexFlatL2(dimension))
+    index.add_with_ids(vectors, np.arange(1000, 1000 + count))
+    return index
+
+
+def _all_vectors(index: faiss.Index) -> np.ndarray:
+    return faiss.downcast_index(index.index).reconstruct_n(0, index.ntotal)
+
+
+async def _client() -> AsyncQdrantClient:
+    client = AsyncQdrantClient(location=":memory:")
+    await client.create_collection(
+        COLLECTION,
+        vectors_config=models.VectorParams(size=8, distance=models.Distance.COSINE),
+    )
+    return client
+
+
+@pytest.mark.asyncio
+async def test_migrates_index_in_multi_point_batches(tmp_path):
+    """Blocks become one upsert each; the checkpoint records offset and checksum."""
+    client = await _client()
+    index = _index()
+    calls = []
+    upsert = client.upsert
+
+    async def counting_upsert(**kwargs):
+        calls.append(len(kwargs["points"].ids))
+        return await upsert(**kwargs)
+
+    client.upsert = counting_upsert
+    result = await migration.migrate_index(
+        client, COLLECTION, index, "idx", batch_size=50, checkpoint_dir=tmp_path
+    )
+
+    assert calls == [50] * 5
+    assert result["migrated_vectors"] == 250 and result["vectors_per_second"] > 0
+    assert (await client.count(COLLECTION)).count == 250
+
+    expected = hashlib.sha256(_all_vectors(index).tobytes()).hexdigest()
+    checkpoint = json.loads((tmp_path / "idx.json").read_text())
+    assert checkpoint["offset"] == 250 and checkpoint["checksum"] == expected
+    assert result["checksum"] == expected
+
+    point = (await client.retrieve(COLLECTION, [migration._point_id("idx", 7)]))[0]
+    assert point.payload["original_id"] == "1007"
+
+
+@pytest.mark.asyncio
+async def test_interrupted_migration_resumes_from_checkpoint(tmp_path):
+    """A failed batch stops the run; the rerun starts after the last good batch."""
+    client = await _client()
+    index = _index()
+    upsert = client.upsert
+    offsets = []
+    qdrant_down = True
+
+    async def flaky_upsert(**kwargs):
+        offset = kwargs["points"].payloads[0]["vector_index"]
+        offsets.append(offset)
+        if offset == 100 and qdrant_down:
+            raise ConnectionError("qdrant unavailable")
+        return await upsert(**kwargs)
+
+    client.upsert = flaky_upsert
+    with (
+        patch.object(migration.asyncio, "sleep", AsyncMock()),
+        pytest.raises(migration.QdrantMigrationError, match="offset 100"),
+    ):
+        await migration.migrate_index(
+            client,
+            COLLECTION,
+            index,
+            "idx",
+            batch_size=50,
+            max_in_flight=2,
+            checkpoint_dir=tmp_path,
+        )
+    assert json.loads((tmp_path / "idx.json").read_text())["offset"] == 100
+
+    qdrant_down = False
+    offsets.clear()
+    result = await migration.migrate_index(
+        client, COLLECTION, index, "idx", batch_size=50, checkpoint_dir=tmp_path
+    )
+
+    assert offsets == [100, 150, 200]
+    assert result["start_offset"] == 100 and result["end_offset"] == 250
+    # Deterministic point IDs: batches retried across runs do not duplicate
+    assert (await client.count(COLLECTION)).count == 250
+
+
+@pytest.mark.asyncio
+async def test_limit_and_changed_index_checkpoint(tmp_path):
+    """Limits stop at a checkpoint; a checkpoint for different vectors restarts."""
+    client = await _client()
+    result = await migration.migrate_index(
+        client,
+        COLLECTION,
+        _index(),
+        "idx",
+        limit=120,
+        batch_size=50,
+        checkpoint_dir=tmp_path,
+    )
+    assert result["end_offset"] == 120
+    assert json.loads((tmp_path / "idx.json").read_text())["offset"] == 120
+
+    rebuilt = await migration.migrate_index(
+        client,
+        COLLECTION,
+        _index(seed=1),
+        "idx",
+        batch_size=50,
+        checkpoint_dir=tmp_path,
+    )
+    assert rebuilt["start_offset"] == 0 and rebuilt["end_offset"] == 250
@@ -0,0 +1,102 @@
+"""Tests for the offline embedding provider, local Qdrant and the benchmark harness."""
+
+import asyncio
+import json
+import math
+import uuid
+
+import pytest
+
+from agent_data_manager.config.settings import Settings
+from agent_data_manager.embedding.deterministic_embedding_provider import (
+    DeterministicEmbeddingProvider,
+)
+from agent_data_manager.embedding.openai_embedding_provider import (
+    get_default_embedding_provider,
+)
+from agent_data_manager.utils import rate_limiter, resilience
+from agent_data_manager.vector_store.qdrant_store import QdrantStore
+from scripts import benchmark_ingest_search
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    """Select the deterministic provider, fresh upstream limiters and no emulator."""
+    monkeypatch.delenv("FIRESTORE_EMULATOR_HOST", raising=False)
+    monkeypatch.setattr(Settings, "EMBEDDING_PROVIDER", "deterministic")
+    monkeypatch.setattr(Settings, "EMBEDDING_BATCHING_ENABLED", False)
+    monkeypatch.setattr(Settings, "VECTOR_DIMENSION", 32)
+    monkeypatch.setattr(Settings, "QDRANT_REQUESTS_PER_MINUTE", 0)
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+
+
+def _cosine(a, b):
+    return sum(x * y for x, y in zip(a, b, strict=True))
+
+
+@pytest.mark.asyncio
+async def test_deterministic_provider_is_stable_and_similarity_preserving(offline):
+    """Same text, same unit vector; shared words score higher; latency is simulated."""
+    provider = get_default_embedding_provider()
+    assert isinstance(provider, DeterministicEmbeddingProvider)
+    assert provider.get_embedding_dimension() == 32
+
+    first, again, related, unrelated = await provider.embed(
+        ["refund my card payment", "refund my card payment", "card refund", "parcel"]
+    )
+    assert first == again == await provider.embed_single("refund my card payment")
+    assert len(first) == 32 and math.isclose(_cosine(first, first), 1.0)
+    assert _cosine(first, related) > _cosine(first, unrelated)
+    assert await provider.embed([]) == []
+
+    slow = DeterministicEmbeddingProvider(dimension=8, latency=0.05)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await slow.embed(["a", "b", "c"])
+    assert 0.05 <= loop.time() - started < 0.5  # once per request, not per text
+
+
+@pytest.mark.asyncio
+async def test_local_qdrant_is_shared_between_stores(offline):
+    """':memory:' stores see one dataset; concurrent first writes create it once."""
+    collection = f"offline_{uuid.uuid4().hex[:8]}"
+    writer = QdrantStore(":memory:", "", collection_name=collection, vector_size=32)
+    reader = QdrantStore(":memory:", "", collection_name=collection, vector_size=32)
+    provider = DeterministicEmbeddingProvider(dimension=32)
+    texts = [f"document {i} about topic{i % 3}" for i in range(10)]
+    vectors = await provider.embed(texts)
+
+    results = await asyncio.gather(
+        *(
+            writer.upsert_vector(f"doc_{i}", vector, {"text": text}, tag="offline")
+            for i, (text, vector) in enumerate(zip(texts, vectors, strict=True))
+        )
+    )
+    assert all(result["success"] for result in results)
+    assert await reader.get_vector_count() == 10
+
+    found = await reader.semantic_search(texts[4], limit=1, score_threshold=0.0)
+    assert found["results"][0]["metadata"]["doc_id"] == "doc_4"
+    writer.close()  # Shared local clients stay open for the other stores
+    assert await reader.get_vector_count() == 10
+
+
+def test_benchmark_reports_throughput_and_percentiles(offline, tmp_path, capsys):
+    """A small run ingests every document and writes a JSON report."""
+    output = tmp_path / "report.json"
+    benchmark_ingest_search.main(
+        ["--documents", "12", "--queries", "6", "--batch-size", "4"]
+        + ["--dimension", "32", "--output", str(output)]
+    )
+
+    report = json.loads(output.read_text())
+    assert report["ingestion"]["points_stored"] == 12
+    assert report["ingestion"]["failed_documents"] == 0
+    assert report["ingestion"]["docs_per_sec"] > 0
+    for endpoint in ("query", "batch_query"):
+        summary = report["endpoints"][endpoint]
+        assert summary["errors"] == 0
+        assert summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"]
+    assert report["endpoints"]["batch_query"]["requests"] == 2
+    assert "skipped" in report["endpoints"]["cskh_query"]
@@ -0,0 +1,135 @@
+"""Tests for multi-input OpenAI embedding requests."""
+
+from types import SimpleNamespace
+
+import httpx
+import numpy as np
+import openai
+import pytest
+
+from agent_data_manager.embedding import openai_embedding_provider
+from agent_data_manager.embedding.openai_embedding_provider import (
+    OpenAIEmbeddingProvider,
+)
+from agent_data_manager.tools import external_tool_registry, save_metadata_to_faiss_tool
+from agent_data_manager.tools.external_tool_registry import (
+    get_openai_embedding,
+    get_openai_embeddings_batch,
+)
+
+
+class FakeEmbeddings:
+    """embeddings.create that answers out of order and rejects long requests."""
+
+    def __init__(self, max_request_chars: int | None = None):
+        self.max_request_chars = max_request_chars
+        self.requests: list[list[str]] = []
+
+    async def create(self, input, model, encoding_format):
+        self.requests.append(list(input))
+        if self.max_request_chars and sum(map(len, input)) > self.max_request_chars:
+            response = httpx.Response(
+                400, request=httpx.Request("POST", "https://api.openai.com")
+            )
+            raise openai.BadRequestError(
+                "maximum context length exceeded", response=response, body=None
+            )
+        data = [
+            SimpleNamespace(index=i, embedding=[float(len(text)), float(i)])
+            for i, text in enumerate(input)
+        ]
+        return SimpleNamespace(
+            data=list(reversed(data)),
+            usage=SimpleNamespace(total_tokens=10 * len(input)),
+            model=model,
+        )
+
+
+@pytest.fixture
+def fake_embeddings(monkeypatch):
+    embeddings = FakeEmbeddings()
+    client = SimpleNamespace(embeddings=embeddings)
+    monkeypatch.setattr(external_tool_registry, "openai_async_client", client)
+    monkeypatch.setattr(openai_embedding_provider, "openai_async_client", client)
+    monkeypatch.setattr(openai_embedding_provider, "OPENAI_AVAILABLE", True)
+    return embeddings
+
+
+@pytest.mark.asyncio
+async def test_batch_requests_respect_input_and_token_limits(fake_embeddings):
+    """Texts are packed into few requests and come back in input order."""
+    texts = [f"text number {i}" for i in range(7)]
+
+    result = await get_openai_embeddings_batch(None, texts, max_inputs=3)
+
+    assert [len(request) for request in fake_embeddings.requests] == [3, 3, 1]
+    assert [vector[0] for vector in result["embeddings"]] == [
+        float(len(t)) for t in texts
+    ]
+    assert result["batches"] == [
+        {"inputs": 3, "total_tokens": 30},
+        {"inputs": 3, "total_tokens": 30},
+        {"inputs": 1, "total_tokens": 10},
+    ]
+    assert result["total_tokens"] == 70 and result["errors"] == {}
+
+    fake_embeddings.requests.clear()
+    await get_openai_embeddings_batch(None, ["a " * 50, "b " * 50, "c"], max_tokens=60)
+    assert [len(request) for request in fake_embeddings.requests] == [1, 2]
+
+    # A list passed to the single-text helper returns every vector too
+    single = await get_openai_embedding(None, ["x", "yy"])
+    assert single["embedding"] == [1.0, 0.0]
+    assert single["embeddings"] == [[1.0, 0.0], [2.0, 1.0]]
+
+
+@pytest.mark.asyncio
+async def test_rejected_batches_are_split_down_to_the_bad_text(fake_embeddings):
+    """A 400 splits the request; only the text that is too long fails."""
+    fake_embeddings.max_request_chars = 100
+    texts = ["short"] * 5 + ["x" * 500] + ["short"] * 2
+
+    result = await get_openai_embeddings_batch(None, texts)
+
+    assert list(result["errors"]) == [5]
+    assert result["embeddings"][5] is None
+    assert [result["embeddings"][i][0] for i in (0, 1, 2, 3, 4, 6, 7)] == [5.0] * 7
+    assert sum(batch["inputs"] for batch in result["batches"]) == 7
+
+    # Other 400s are not the batch's size: no splitting, the call fails
+    fake_embeddings.requests.clear()
+    fake_embeddings.max_request_chars = None
+    response = httpx.Response(
+        400, request=httpx.Request("POST", "https://api.openai.com")
+    )
+
+    async def invalid_model(input, model, encoding_format):
+        fake_embeddings.requests.append(list(input))
+        raise openai.BadRequestError(
+            "The model does not exist", response=response, body=None
+        )
+
+    fake_embeddings.create = invalid_model
+    failed = await get_openai_embeddings_batch(None, ["short"] * 4)
+    assert failed["status_code"] == 400 and "does not exist" in failed["error"]
+    assert len(fake_embeddings.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_provider_and_faiss_batches_use_one_request(fake_embeddings):
+    """The provider and the FAISS save path no longer make a call per text."""
+    provider = OpenAIEmbeddingProvider(model_name="text-embedding-3-small")
+    vectors = await provider.embed(["alpha", "be", "gamma!"])
+
+    assert len(fake_embeddings.requests) == 1
+    assert [vector[0] for vector in vectors] == [5.0, 2.0, 6.0]
+    assert provider.last_batch_usage == [{"inputs": 3, "total_tokens": 30}]
+
+    fake_embeddings.requests.clear()
+    results = await save_metadata_to_faiss_tool._generate_embeddings_batch(
+        [("doc1", "first"), ("doc2", "second one")], None
+    )
+    assert len(fake_embeddings.requests) == 1
+    assert results["doc2"]["status"] == "success"
+    assert results["doc2"]["embedding"].dtype == np.float32
+    np.testing.assert_array_equal(results["doc1"]["embedding"], [5.0, 0.0])
@@ -0,0 +1,190 @@
+"""Tests for streamed Qdrant snapshot backups to GCS and alias-swapped restores."""
+
+import base64
+import hashlib
+import io
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from scripts import qdrant_restore, qdrant_snapshot
+
+SNAPSHOT_BYTES = b"".join(bytes([i]) * 1000 for i in range(10))
+
+
+class FakeBlob:
+    """GCS blob that streams through in-memory buffers."""
+
+    def __init__(self, name, data=b"", metadata=None):
+        self.name = name
+        self.data = data
+        self.metadata = metadata
+        self.size = None
+        self.md5_hash = None
+        self.deleted = False
+        self.open_kwargs = None
+
+    def open(self, mode, **kwargs):
+        self.open_kwargs = kwargs
+        if mode == "rb":
+            return io.BytesIO(self.data)
+        blob = self
+
+        class Writer(io.BytesIO):
+            def close(self):
+                blob.data = self.getvalue()
+                super().close()
+
+        return Writer()
+
+    def reload(self):
+        self.size = len(self.data)
+        self.md5_hash = base64.b64encode(hashlib.md5(self.data).digest()).decode()
+
+    def patch(self):
+        pass
+
+    def delete(self):
+        self.deleted = True
+
+
+class FakeResponse:
+    """Streaming HTTP response that can drop the connection part way."""
+
+    def __init__(self, body, status_code=200, fail_after=None):
+        self.body = body
+        self.status_code = status_code
+        self.fail_after = fail_after
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), 1000):
+            if self.fail_after is not None and start >= self.fail_after:
+                raise requests.exceptions.ChunkedEncodingError("connection reset")
+            yield self.body[start : start + 1000]
+
+
+def _storage_client(blob):
+    client = MagicMock()
+    client.bucket.return_value.blob.return_value = blob
+    client.bucket.return_value.get_blob.return_value = blob
+    return client
+
+
+@pytest.fixture(autouse=True)
+def qdrant_env(monkeypatch):
+    monkeypatch.setenv("QDRANT_URL", "http://qdrant:6333")
+    monkeypatch.setenv("QDRANT_API_KEY", "secret")
+
+
+def test_backup_streams_chunks_to_gcs_and_resumes_interrupted_download():
+    """Snapshot bytes go straight into a resumable upload; drops resume by Range."""
+    blob = FakeBlob("pending")
+    responses = [
+        FakeResponse(SNAPSHOT_BYTES, fail_after=4000),
+        FakeResponse(SNAPSHOT_BYTES[4000:], status_code=206),
+    ]
+    snapshot = SimpleNamespace(
+        name="server-snap", checksum=hashlib.sha256(SNAPSHOT_BYTES).hexdigest()
+    )
+
+    with (
+        patch.object(
+            qdrant_snapshot.storage, "Client", return_value=_storage_client(blob)
+        ),
+        patch.object(qdrant_snapshot.requests, "get", side_effect=responses) as get,
+    ):
+        upload = qdrant_snapshot.stream_snapshot_to_gcs(
+            "docs", snapshot, source_collection="docs_restore_1"
+        )
+
+    assert blob.data == SNAPSHOT_BYTES
+    assert blob.open_kwargs["if_generation_match"] == 0
+    assert blob.metadata["sha256"] == snapshot.checksum
+    assert upload["size"] == len(SNAPSHOT_BYTES)
+    assert "snapshot_docs_" in upload["gcs_path"]
+
+    first, second = get.call_args_list
+    assert first.args[0].endswith("/collections/docs_restore_1/snapshots/server-snap")
+    assert "Range" not in first.kwargs["headers"]
+    assert second.kwargs["headers"]["Range"] == "bytes=4000-"
+    assert second.kwargs["headers"]["api-key"] == "secret"
+
+
+def test_backup_with_mismatched_checksum_is_deleted():
+    """An upload that does not match Qdrant's SHA-256 never stays in the bucket."""
+    blob = FakeBlob("pending")
+    snapshot = SimpleNamespace(name="server-snap", checksum="0" * 64)
+
+    with (
+        patch.object(
+            qdrant_snapshot.storage, "Client", return_value=_storage_client(blob)
+        ),
+        patch.object(
+            qdrant_snapshot.requests, "get", return_value=FakeResponse(SNAPSHOT_BYTES)
+        ),
+        pytest.raises(ValueError, match="SHA-256"),
+    ):
+        qdrant_snapshot.stream_snapshot_to_gcs("docs", snapshot)
+
+    assert blob.deleted
+
+
+def test_restore_streams_into_shadow_collection_then_swaps_alias():
+    """The alias moves only after a verified restore; failures drop the shadow."""
+    sha256 = hashlib.sha256(SNAPSHOT_BYTES).hexdigest()
+    blob = FakeBlob("snapshots/x.snapshot", SNAPSHOT_BYTES, {"sha256": sha256})
+    client = MagicMock()
+    client.get_aliases.return_value = SimpleNamespace(
+        aliases=[SimpleNamespace(alias_name="docs", collection_name="docs_old")]
+    )
+    client.collection_exists.return_value = True
+    uploaded = {}
+
+    def fake_post(url, params, data, headers, timeout):
+        uploaded["url"], uploaded["params"] = url, params
+        uploaded["body"] = b"".join(data)
+        return FakeResponse(b"")
+
+    with (
+        patch.object(
+            qdrant_restore.storage, "Client", return_value=_storage_client(blob)
+        ),
+        patch.object(qdrant_restore, "get_qdrant_client", return_value=client),
+        patch.object(qdrant_restore.requests, "post", side_effect=fake_post),
+    ):
+        result = qdrant_restore.restore_snapshot_to_qdrant(
+            "snapshots/x.snapshot", "docs"
+        )
+
+        shadow = result["restored_collection"]
+        assert shadow.startswith("docs_restore_")
+        assert uploaded["url"].endswith(f"/collections/{shadow}/snapshots/upload")
+        assert uploaded["params"]["checksum"] == sha256
+        assert SNAPSHOT_BYTES in uploaded["body"]
+
+        operations = client.update_collection_aliases.call_args.kwargs[
+            "change_aliases_operations"
+        ]
+        assert operations[0].delete_alias.alias_name == "docs"
+        assert operations[1].create_alias.collection_name == shadow
+        assert result["previous_collection"] == "docs_old"
+        client.delete_collection.assert_called_once_with("docs_old")
+
+        # Corrupted bytes: the shadow is dropped and the alias is left alone
+        client.reset_mock()
+        blob.data = SNAPSHOT_BYTES[:-1] + b"\xff"
+        with pytest.raises(ValueError, match="checksum mismatch"):
+            qdrant_restore.restore_snapshot_to_qdrant("snapshots/x.snapshot", "docs")
+        client.update_collection_aliases.assert_not_called()
+        assert client.delete_collection.call_args.args[0].startswith("docs_restore_")
@@ -0,0 +1,88 @@
+"""Tests that QdrantStore async methods use the pooled AsyncQdrantClient."""
+
+import asyncio
+
+import pytest
+from qdrant_client.http.models import Distance, PointStruct, VectorParams
+
+from agent_data.vector_store import qdrant_store as qdrant_store_module
+from agent_data.vector_store.qdrant_store import QdrantStore
+from tests.mocks.qdrant_basic import FakeAsyncQdrantClient, FakeQdrantClient
+
+
+class SlowFakeAsyncQdrantClient(FakeAsyncQdrantClient):
+    """Fake async client whose calls yield to the event loop while they run."""
+
+    def __getattr__(self, name):
+        call = super().__getattr__(name)
+        if not callable(call):
+            return call
+
+        async def _slow_call(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return await call(*args, **kwargs)
+
+        return _slow_call
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """QdrantStore on fake clients with a few tagged points."""
+    monkeypatch.setenv("QDRANT_URL", "http://pool-test:6333")
+    monkeypatch.setenv("QDRANT_COLLECTION_NAME", "async_collection")
+    monkeypatch.setenv("ENABLE_FIRESTORE_SYNC", "false")
+    monkeypatch.setattr(qdrant_store_module, "QdrantClient", FakeQdrantClient)
+    monkeypatch.setattr(
+        qdrant_store_module, "AsyncQdrantClient", SlowFakeAsyncQdrantClient
+    )
+    monkeypatch.setattr(QdrantStore, "_instance", None)
+    FakeQdrantClient.clear_all_data()
+
+    sync_client = FakeQdrantClient(url="http://pool-test:6333")
+    sync_client.create_collection(
+        "async_collection",
+        vectors_config=VectorParams(size=4, distance=Distance.COSINE),
+    )
+    sync_client.upsert(
+        "async_collection",
+        points=[
+            PointStruct(id=i, vector=[0.1, 0.2, 0.3, 0.4], payload={"tag": "bulk"})
+            for i in range(1, 6)
+        ],
+    )
+    yield QdrantStore()
+    FakeQdrantClient.clear_all_data()
+
+
+@pytest.mark.asyncio
+async def test_delete_by_tag_yields_to_event_loop(store):
+    """Scroll/count/delete are awaited, so other coroutines keep running."""
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    deleted, _ = await asyncio.gather(store.delete_vectors_by_tag("bulk"), ticker())
+
+    assert deleted == 5
+    assert ticks == 5
+    assert store.count_vectors_by_tag("bulk") == 0
+
+
+def test_clients_are_pooled_per_endpoint_and_loop(store):
+    """Stores share one sync client; async clients are shared within a loop."""
+    assert store.client is qdrant_store_module.get_pooled_client(
+        "http://pool-test:6333", store.api_key
+    )
+
+    async def get_async_clients():
+        return store.async_client, store.async_client
+
+    first_a, first_b = asyncio.run(get_async_clients())
+    second_a, _ = asyncio.run(get_async_clients())
+
+    assert first_a is first_b
+    assert first_a is not second_a
@@ -0,0 +1,163 @@
+"""Tests for the shared QdrantStore registry and the pooled Qdrant clients."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from qdrant_client.http.exceptions import UnexpectedResponse
+
+from agent_data_manager.config.settings import Settings
+from agent_data_manager.tools import qdrant_embedding_tools, qdrant_vector_tools
+from agent_data_manager.tools.prometheus_metrics import qdrant_registry
+from agent_data_manager.utils import rate_limiter, resilience
+from agent_data_manager.vector_store import qdrant_store
+from agent_data_manager.vector_store.qdrant_store import (
+    QdrantStore,
+    close_pooled_clients,
+    get_qdrant_store,
+)
+
+URL = "https://cluster.example.qdrant.io"
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """Empty store registry and client pool, with a fake QdrantClient class."""
+    monkeypatch.setattr(qdrant_store, "_stores", {})
+    monkeypatch.setattr(qdrant_store, "_clients", {})
+    monkeypatch.setattr(qdrant_store, "_client_capacity", {})
+    monkeypatch.setattr(qdrant_store, "_in_flight", {})
+    monkeypatch.setattr(qdrant_store, "_ensured_collections", {})
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    monkeypatch.setattr(Settings, "QDRANT_URL", URL)
+    monkeypatch.setattr(Settings, "QDRANT_API_KEY", "key")
+    monkeypatch.setattr(Settings, "QDRANT_COLLECTION_NAME", "shared_docs")
+    monkeypatch.setattr(Settings, "QDRANT_REQUESTS_PER_MINUTE", 0)
+    monkeypatch.setattr(Settings, "QDRANT_PREFER_GRPC", False)
+    monkeypatch.setattr(Settings, "QDRANT_POOL_MAX_CONNECTIONS", 4)
+
+    def new_client(**kwargs):
+        client = MagicMock(name="client")
+        client.get_collections.return_value = SimpleNamespace(
+            collections=[SimpleNamespace(name="shared_docs")]
+        )
+        return client
+
+    client_class = MagicMock(name="QdrantClient", side_effect=new_client)
+    with patch.object(qdrant_store, "QdrantClient", client_class):
+        yield client_class
+
+
+def _metric(name, **labels):
+    return qdrant_registry.get_sample_value(name, labels) or 0
+
+
+def test_tools_and_gateway_share_one_store_per_collection(pool):
+    """Tool lookups reuse the configured store; other collections get their own."""
+    misses = _metric("qdrant_store_registry_lookups_total", result="miss")
+    hits = _metric("qdrant_store_registry_lookups_total", result="hit")
+
+    store = get_qdrant_store()
+    assert store.url == URL and store.collection_name == "shared_docs"
+    assert qdrant_vector_tools.get_qdrant_store() is store
+    assert qdrant_embedding_tools.get_qdrant_store() is store
+
+    other = get_qdrant_store(collection_name="archive")
+    assert other is not store and other.collection_name == "archive"
+    assert get_qdrant_store(collection_name="archive") is other
+
+    assert _metric("qdrant_store_registry_lookups_total", result="miss") == misses + 2
+    assert _metric("qdrant_store_registry_lookups_total", result="hit") == hits + 3
+
+
+@pytest.mark.asyncio
+async def test_stores_share_the_pooled_client_and_collection_setup(pool):
+    """One client per endpoint; a second store skips the collection round trips."""
+    first = QdrantStore(URL, "key", collection_name="shared_docs", vector_size=8)
+    second = QdrantStore(URL, "key", collection_name="shared_docs", vector_size=8)
+    client = first.client
+
+    await first._ensure_collection()
+    assert client.get_collections.call_count == 1
+    assert client.create_payload_index.call_count > 0
+    indexed = client.create_payload_index.call_count
+
+    await second._ensure_collection()
+    assert second.client is first.client
+    assert pool.call_count == 1
+    assert client.get_collections.call_count == 1
+    assert client.create_payload_index.call_count == indexed
+
+    # Closing a store only drops its reference; the pooled client stays open
+    first.close()
+    client.close.assert_not_called()
+    assert first.client is second.client
+
+    # A different API key is a different client
+    assert QdrantStore(URL, "other", "shared_docs", 8).client is not client
+    assert pool.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_and_grpc_transport(pool, monkeypatch):
+    """In-flight calls show up as pool utilization; gRPC is opt-in via settings."""
+    store = QdrantStore(URL, "key", collection_name="shared_docs", vector_size=8)
+    store.client  # noqa: B018 - creates the pooled client
+    kwargs = pool.call_args.kwargs
+    assert kwargs["prefer_grpc"] is False
+    limits = kwargs["limits"]
+    assert limits.max_connections == 4 and limits.max_keepalive_connections == 20
+    assert _metric("qdrant_client_pool_clients", transport="http") == 1
+
+    observed = []
+
+    def count(**kwargs):
+        observed.append(
+            (
+                _metric("qdrant_client_pool_in_flight", transport="http"),
+                _metric("qdrant_client_pool_utilization", transport="http"),
+            )
+        )
+        return SimpleNamespace(count=3)
+
+    store.client.count.side_effect = count
+    await asyncio.gather(*(store._call(store.client.count) for _ in range(2)))
+    assert observed and all(in_flight >= 1 for in_flight, _ in observed)
+    assert all(utilization == in_flight / 4 for in_flight, utilization in observed)
+    assert _metric("qdrant_client_pool_in_flight", transport="http") == 0
+
+    monkeypatch.setattr(Settings, "QDRANT_PREFER_GRPC", True)
+    monkeypatch.setattr(Settings, "QDRANT_GRPC_PORT", 7334)
+    grpc_store = QdrantStore(URL, "key", collection_name="shared_docs", vector_size=8)
+    assert grpc_store.client is not store.client
+    assert pool.call_args.kwargs["prefer_grpc"] is True
+    assert pool.call_args.kwargs["grpc_port"] == 7334
+    assert grpc_store._transport == "grpc"
+    assert _metric("qdrant_client_pool_clients", transport="grpc") == 1
+
+
+@pytest.mark.asyncio
+async def test_closed_pool_and_deleted_collections_are_set_up_again(pool):
+    """Closing the pool reconnects stores; a 404 re-checks the collection."""
+    store = get_qdrant_store()
+    await store._ensure_collection()
+    client = store.client
+
+    close_pooled_clients()
+    client.close.assert_called_once()
+    assert get_qdrant_store() is not store
+    await store._ensure_collection()
+    assert store.client is not client
+    assert store.client.get_collections.call_count == 1
+
+    store.client.count.side_effect = UnexpectedResponse(
+        404, "Not Found", b"Collection doesn't exist", {}
+    )
+    with pytest.raises(UnexpectedResponse):
+        await store._call(store.client.count)
+    other = QdrantStore(URL, "key", collection_name="shared_docs", vector_size=8)
+    await other._ensure_collection()
+    assert store.client.get_collections.call_count == 2
+    assert store._collection_initialized is False
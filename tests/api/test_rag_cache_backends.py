@@ -0,0 +1,114 @@
+"""Tests for the pluggable RAG result cache backends."""
+
+import multiprocessing
+
+import fakeredis
+import pytest
+
+from agent_data_manager.utils.result_cache import (
+    LRUCache,
+    RedisResultCache,
+    SQLiteResultCache,
+    create_result_cache,
+)
+
+
+def _worker_put(path: str):
+    """Runs in a separate process, like another uvicorn worker."""
+    cache = SQLiteResultCache(path)
+    cache.put("query", {"results": ["from worker"], "total_found": 1})
+    cache.bump_generation("docs")
+
+
+def test_sqlite_cache_is_shared_between_processes(tmp_path):
+    """Entries and generations written by one worker are seen by another."""
+    path = str(tmp_path / "rag_cache.db")
+    cache = SQLiteResultCache(path, max_size=2)
+
+    process = multiprocessing.get_context("fork").Process(
+        target=_worker_put, args=(path,)
+    )
+    process.start()
+    process.join(timeout=30)
+    assert process.exitcode == 0
+
+    assert cache.lookup("query") == (
+        {"results": ["from worker"], "total_found": 1},
+        "fresh",
+    )
+
+    # The other worker saw a write, so entries from before it are dropped
+    assert cache.get_generation("docs") == 1
+    assert cache.lookup("query", generation=1) == (None, "invalidated")
+
+    for i in range(3):
+        cache.put(f"key_{i}", i, generation=1)
+    assert cache.size() == 2
+    assert cache.get("key_0", generation=1) is None
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite", "redis"])
+def test_backends_share_lookup_semantics(backend, tmp_path):
+    """Every backend reports fresh, stale, invalidated and miss the same way."""
+    server = fakeredis.FakeServer()
+    config = {
+        "rag_cache_backend": backend,
+        "rag_cache_max_size": 10,
+        "rag_cache_ttl": 60,
+        "rag_cache_refresh_after": 30,
+        "rag_cache_sqlite_path": str(tmp_path / "cache.db"),
+    }
+    cache = create_result_cache(config, client=fakeredis.FakeRedis(server=server))
+    assert cache.backend == backend
+
+    generation = cache.bump_generation("docs")
+    cache.put("key", {"results": [1, 2]}, generation)
+    assert cache.lookup("key", generation) == ({"results": [1, 2]}, "fresh")
+
+    cache.refresh_after = 0
+    assert cache.lookup("key", generation) == ({"results": [1, 2]}, "stale")
+
+    newer = cache.bump_generation("docs")
+    assert cache.lookup("key", newer) == (None, "invalidated")
+    assert cache.lookup("key", newer) == (None, "miss")
+    assert cache.size() == 0
+
+
+def test_redis_cache_is_shared_across_instances():
+    """Two gateway instances on the same Redis see each other's entries."""
+    server = fakeredis.FakeServer()
+    first = RedisResultCache(fakeredis.FakeRedis(server=server), ttl=60)
+    second = RedisResultCache(fakeredis.FakeRedis(server=server), ttl=60)
+
+    first.put("query", {"total_found": 3})
+    assert second.get("query") == {"total_found": 3}
+
+    second.bump_generation("docs")
+    assert first.get_generation("docs") == 1
+    assert first.get("query", first.get_generation("docs")) is None
+
+
+def test_unavailable_backend_falls_back_to_memory(tmp_path):
+    """Misconfigured shared backends degrade to the in-process cache."""
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+
+    cache = create_result_cache(
+        {
+            "rag_cache_backend": "sqlite",
+            "rag_cache_sqlite_path": str(blocker / "cache.db"),
+        }
+    )
+    assert isinstance(cache, LRUCache)
+    assert isinstance(create_result_cache({"rag_cache_backend": "bogus"}), LRUCache)
+
+
+def test_unreachable_redis_falls_back_to_memory():
+    """A Redis server that does not answer PING is not used."""
+    server = fakeredis.FakeServer()
+    server.connected = False
+
+    cache = create_result_cache(
+        {"rag_cache_backend": "redis"}, client=fakeredis.FakeRedis(server=server)
+    )
+    assert isinstance(cache, LRUCache)
@@ -0,0 +1,207 @@
+"""Tests for RAG cache keys, write invalidation and stale-while-revalidate."""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from agent_data_manager import api_mcp_gateway as gateway
+from agent_data_manager.utils.result_cache import LRUCache, SQLiteResultCache
+from agent_data_manager.vector_store.qdrant_store import QdrantStore
+
+
+class CountingRagSearch:
+    """Stand-in for qdrant_rag_search that counts calls and tags results."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self, **kwargs):
+        self.calls += 1
+        call = self.calls
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        results = [
+            {"doc_id": f"doc_{i}", "content": f"call {call}", "score": 0.9}
+            for i in range(kwargs["limit"])
+        ]
+        return {"status": "success", "results": results, "count": len(results)}
+
+
+@pytest.fixture
+def gateway_client():
+    """ASGI client for the gateway with auth disabled and a fresh RAG cache."""
+    store = MagicMock()
+    store.collection_name = "rag_cache_test"
+    cache = LRUCache(max_size=100, ttl=3600)
+
+    with (
+        patch.object(gateway, "qdrant_store", store),
+        patch.object(gateway, "vectorization_tool", MagicMock()),
+        patch.object(gateway, "_rag_cache", cache),
+        patch.object(gateway.settings, "ENABLE_AUTHENTICATION", False),
+        patch.object(gateway.settings, "RAG_CACHE_ENABLED", True),
+        patch.object(gateway.limiter, "enabled", False),
+    ):
+        transport = httpx.ASGITransport(app=gateway.app)
+        yield httpx.AsyncClient(transport=transport, base_url="http://test"), cache
+
+
+@pytest.mark.asyncio
+async def test_limit_and_threshold_are_part_of_cache_key(gateway_client):
+    """Requests differing only in limit or score_threshold do not share entries."""
+    client, _ = gateway_client
+    rag_search = CountingRagSearch()
+    payload = {"query_text": "refund policy", "limit": 2, "score_threshold": 0.5}
+
+    with patch.object(gateway, "qdrant_rag_search", rag_search):
+        first = (await client.post("/cskh_query", json=payload)).json()
+        repeat = (await client.post("/cskh_query", json=payload)).json()
+        wider = (await client.post("/cskh_query", json={**payload, "limit": 4})).json()
+        stricter = (
+            await client.post("/cskh_query", json={**payload, "score_threshold": 0.8})
+        ).json()
+
+    assert (first["cached"], repeat["cached"]) == (False, True)
+    assert wider["cached"] is False and wider["total_found"] == 4
+    assert stricter["cached"] is False
+    assert rag_search.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_store_writes_invalidate_cached_results(gateway_client):
+    """Upserts and tag deletes bump the collection generation."""
+    client, _ = gateway_client
+    rag_search = CountingRagSearch()
+    payload = {"query_text": "shipping times", "limit": 1}
+
+    store = QdrantStore(
+        url="http://unused:6333", api_key="", collection_name="rag_cache_test"
+    )
+    store._client = MagicMock()
+    store._collection_initialized = True
+
+    with patch.object(gateway, "qdrant_rag_search", rag_search):
+        first = (await client.post("/cskh_query", json=payload)).json()
+        repeat = (await client.post("/cskh_query", json=payload)).json()
+        assert (first["cached"], repeat["cached"]) == (False, True)
+
+        assert (await store.upsert_vector("doc_new", [0.1, 0.2]))["success"] is True
+        after_upsert = (await client.post("/cskh_query", json=payload)).json()
+
+        assert (await store.delete_vectors_by_tag("old"))["success"] is True
+        after_delete = (await client.post("/cskh_query", json=payload)).json()
+
+    assert after_upsert["cached"] is False
+    assert after_upsert["results"][0]["content"] == "call 2"
+    assert after_delete["cached"] is False
+    assert rag_search.calls == 3
+
+
+class ThreadRecordingCache(SQLiteResultCache):
+    """SQLite cache noting which threads call into it."""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.threads = set()
+
+    def lookup(self, key, generation=0):
+        self.threads.add(threading.current_thread())
+        return super().lookup(key, generation)
+
+    def put(self, key, value, generation=0):
+        self.threads.add(threading.current_thread())
+        super().put(key, value, generation)
+
+    def get_generation(self, namespace):
+        self.threads.add(threading.current_thread())
+        return super().get_generation(namespace)
+
+    def bump_generation(self, namespace):
+        self.threads.add(threading.current_thread())
+        return super().bump_generation(namespace)
+
+
+@pytest.mark.asyncio
+async def test_shared_backends_stay_off_the_event_loop(gateway_client, tmp_path):
+    """SQLite and Redis calls run in worker threads; writes still invalidate."""
+    client, _ = gateway_client
+    cache = ThreadRecordingCache(str(tmp_path / "rag_cache.db"))
+    rag_search = CountingRagSearch()
+    payload = {"query_text": "delivery areas", "limit": 1}
+
+    with (
+        patch.object(gateway, "_rag_cache", cache),
+        patch.object(gateway, "qdrant_rag_search", rag_search),
+    ):
+        await client.post("/cskh_query", json=payload)
+        assert (await client.post("/cskh_query", json=payload)).json()["cached"]
+
+        gateway._on_collection_write("rag_cache_test")
+        after_write = (await client.post("/cskh_query", json=payload)).json()
+
+    assert after_write["cached"] is False
+    assert not gateway._pending_generation_bumps
+    assert cache.threads and threading.main_thread() not in cache.threads
+    assert cache.get_generation("rag_cache_test") == 1
+
+
+@pytest.mark.parametrize("failing", ["get_generation", "lookup", "put"])
+@pytest.mark.asyncio
+async def test_cache_backend_errors_are_misses(gateway_client, failing):
+    """A failing cache backend is logged and counted, not a 500."""
+    client, cache = gateway_client
+    rag_search = CountingRagSearch()
+    payload = {"query_text": "warranty terms", "limit": 1}
+    events = MagicMock()
+
+    with (
+        patch.object(cache, failing, side_effect=ConnectionError("cache down")),
+        patch.object(gateway, "qdrant_rag_search", rag_search),
+        patch.object(gateway, "record_rag_cache_event", events),
+    ):
+        first = await client.post("/cskh_query", json=payload)
+        second = await client.post("/cskh_query", json=payload)
+
+    assert first.json()["status"] == second.json()["status"] == "success"
+    assert (first.json()["cached"], second.json()["cached"]) == (False, False)
+    assert rag_search.calls == 2
+    events.assert_any_call("error")
+    if failing == "get_generation":
+        assert cache.size() == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_served_and_refreshed_once(gateway_client):
+    """Stale hits return immediately while a single background refresh runs."""
+    client, cache = gateway_client
+    rag_search = CountingRagSearch()
+    payload = {"query_text": "opening hours", "limit": 1}
+
+    with patch.object(gateway, "qdrant_rag_search", rag_search):
+        await client.post("/cskh_query", json=payload)
+
+        # Every entry is now past its refresh point and the refresh is slow
+        cache.refresh_after = 0
+        rag_search.delay = 0.2
+        await asyncio.sleep(0.01)
+
+        start = asyncio.get_running_loop().time()
+        stale = await asyncio.gather(
+            *(client.post("/cskh_query", json=payload) for _ in range(3))
+        )
+        elapsed = asyncio.get_running_loop().time() - start
+
+        assert elapsed < 0.2
+        assert all(r.json()["cached"] is True for r in stale)
+        assert all(r.json()["results"][0]["content"] == "call 1" for r in stale)
+
+        await asyncio.gather(*list(gateway._rag_refresh_tasks.values()))
+
+    assert rag_search.calls == 2
+    assert not gateway._rag_refresh_tasks
+    key = next(iter(cache.cache))
+    assert cache.cache[key]["results"][0]["content"] == "call 2"
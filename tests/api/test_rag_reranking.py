@@ -0,0 +1,181 @@
+"""Tests for the rag_search reranking stage and its scorers."""
+
+import asyncio
+import threading
+import time
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from agent_data_manager.config.settings import Settings
+from agent_data_manager.embedding.deterministic_embedding_provider import (
+    DeterministicEmbeddingProvider,
+)
+from agent_data_manager.reranking import cross_encoder_reranker, rerank_stage
+from agent_data_manager.reranking.lexical_overlap_reranker import (
+    LexicalOverlapReranker,
+)
+from agent_data_manager.reranking.rerank_stage import RerankStage
+from agent_data_manager.tools.prometheus_metrics import qdrant_registry
+from agent_data_manager.tools.qdrant_vectorization_tool import QdrantVectorizationTool
+from agent_data_manager.utils import rate_limiter, resilience
+from agent_data_manager.vector_store.qdrant_store import QdrantStore
+
+DOCS = {
+    "pay_1": "Payment failed because the card was declined, ask the customer to retry",
+    "pay_2": "When a payment failed twice, check the billing address and retry payment",
+    "pay_3": "Refund a failed payment from the billing dashboard",
+    "err": "Sync job stops with ERR-1042 when the warehouse feed is late",
+}
+QUERY = "payment failed with ERR-1042"
+
+
+class CountingReranker:
+    """Lexical scores, recording every scored passage and scoring thread."""
+
+    name = "counting"
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.scored = []
+        self.threads = set()
+        self._lexical = LexicalOverlapReranker()
+
+    def score(self, query, passages):
+        time.sleep(self.delay)
+        self.scored.extend(passages)
+        self.threads.add(threading.current_thread().name)
+        return self._lexical.score(query, passages)
+
+
+def _metric(name, **labels):
+    return qdrant_registry.get_sample_value(name, labels) or 0
+
+
+def test_lexical_overlap_rewards_query_terms_and_phrases(monkeypatch):
+    """Coverage of query terms scores first; matching word order adds a bonus."""
+    reranker = LexicalOverlapReranker()
+    in_order, shuffled, partial, unrelated = reranker.score(
+        "payment failed",
+        [
+            "the payment failed at checkout",
+            "failed to find the payment",
+            "payment received",
+            "",
+        ],
+    )
+    assert in_order == pytest.approx(1.0)
+    assert shuffled == pytest.approx(0.7)
+    assert partial == pytest.approx(0.35)
+    assert unrelated == 0.0
+    assert reranker.score("?!", ["anything"]) == [0.0]
+    assert reranker.score("refund", ["Refund policy"]) == [1.0]
+
+    # A cross-encoder without sentence-transformers degrades to lexical overlap
+    monkeypatch.setattr(Settings, "RERANKER", "cross-encoder")
+    monkeypatch.setattr(cross_encoder_reranker, "CROSS_ENCODER_AVAILABLE", False)
+    assert isinstance(rerank_stage.get_default_reranker(), LexicalOverlapReranker)
+
+
+@pytest.mark.asyncio
+async def test_stage_scores_in_pool_and_caches_per_document_version():
+    """Misses are scored in worker threads; a new document version is rescored."""
+    reranker = CountingReranker()
+    stage = RerankStage(reranker, workers=2, budget_ms=1000)
+    candidates = [(f"{doc_id}:1:t0", text) for doc_id, text in DOCS.items()]
+    hits = _metric("rerank_cache_lookups_total", result="hit")
+
+    scores, info = await stage.rerank(QUERY, candidates)
+    assert scores == LexicalOverlapReranker().score(QUERY, list(DOCS.values()))
+    assert info["cached"] == 0 and info["fallback"] is None
+    assert info["latency_ms"] >= 0
+    assert len(reranker.scored) == 4
+    assert all(name.startswith("rerank") for name in reranker.threads)
+
+    again, info = await stage.rerank(QUERY, candidates)
+    assert again == scores and info["cached"] == 4
+    assert len(reranker.scored) == 4
+    assert _metric("rerank_cache_lookups_total", result="hit") == hits + 4
+
+    # Only the updated document and the other query are scored again
+    candidates[0] = ("pay_1:2:t1", "Payment failed with ERR-1042 at checkout")
+    _, info = await stage.rerank(QUERY, candidates)
+    assert info["cached"] == 3
+    assert reranker.scored[-1] == candidates[0][1]
+    _, info = await stage.rerank("refund", candidates)
+    assert info["cached"] == 0
+
+
+@pytest.fixture
+def offline_search(monkeypatch):
+    """Vector search against local Qdrant with reranking off by default."""
+    monkeypatch.setattr(Settings, "HYBRID_SEARCH_ENABLED", False)
+    monkeypatch.setattr(Settings, "RAG_SEARCH_MODE", "vector")
+    monkeypatch.setattr(Settings, "RERANK_ENABLED", False)
+    monkeypatch.setattr(Settings, "RERANK_MIN_SCORE", 0.25)
+    monkeypatch.setattr(Settings, "QDRANT_REQUESTS_PER_MINUTE", 0)
+    monkeypatch.setattr(Settings, "EMBEDDING_PROVIDER", "deterministic")
+    monkeypatch.setattr(Settings, "EMBEDDING_BATCHING_ENABLED", False)
+    monkeypatch.setattr(Settings, "VECTOR_DIMENSION", 32)
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    monkeypatch.setattr(
+        rerank_stage, "_stage", RerankStage(LexicalOverlapReranker(), budget_ms=1000)
+    )
+
+
+@pytest.mark.asyncio
+async def test_rag_search_reranks_cuts_off_and_falls_back(offline_search, monkeypatch):
+    """Reranking reorders and cuts candidates; over budget, vector order stays."""
+    provider = DeterministicEmbeddingProvider(dimension=32)
+    tool = QdrantVectorizationTool(embedding_provider=provider)
+    tool.qdrant_store = QdrantStore(
+        ":memory:", "", collection_name=f"rerank_{uuid.uuid4().hex[:8]}", vector_size=32
+    )
+    for doc_id, text in DOCS.items():
+        vector = await provider.embed_single(text)
+        assert (await tool.qdrant_store.upsert_vector(doc_id, vector))["success"]
+    tool.firestore_manager = MagicMock()
+    tool._initialized = True
+    tool._batch_get_firestore_metadata = AsyncMock(
+        side_effect=lambda doc_ids: {
+            doc_id: {"content_preview": DOCS[doc_id], "version": 1}
+            for doc_id in doc_ids
+        }
+    )
+    search = {"query_text": QUERY, "limit": 4, "score_threshold": 0.0}
+
+    vector = await tool.rag_search(**search)
+    vector_order = [r["doc_id"] for r in vector["results"]]
+    assert "rerank" not in vector["rag_info"]
+    assert "rerank_score" not in vector["results"][0]
+
+    reranked = await tool.rag_search(**search, rerank=True)
+    order = [r["doc_id"] for r in reranked["results"]]
+    assert order[0] == "err"
+    # "Refund a failed payment" lacks the phrase and the code: cut off
+    assert "pay_3" not in order
+    assert order[1:] == [d for d in vector_order if d in ("pay_1", "pay_2")]
+    scores = [r["rerank_score"] for r in reranked["results"]]
+    assert scores == sorted(scores, reverse=True) and scores[-1] >= 0.25
+    info = reranked["rag_info"]["rerank"]
+    assert info["reranker"] == "lexical-overlap" and info["cut_off"] == 1
+    assert info["latency_ms"] >= 0 and info["fallback"] is None
+
+    # A scorer that overruns its budget leaves the vector order untouched
+    slow = CountingReranker(delay=0.3)
+    monkeypatch.setattr(rerank_stage, "_stage", RerankStage(slow, budget_ms=20))
+    monkeypatch.setattr(Settings, "RERANK_ENABLED", True)
+    started = time.monotonic()
+    fallback = await tool.rag_search(**search)
+    assert time.monotonic() - started < 0.25
+    assert [r["doc_id"] for r in fallback["results"]] == vector_order
+    assert fallback["rag_info"]["rerank"]["fallback"] == "timeout"
+    assert "rerank_score" not in fallback["results"][0]
+
+    # The overrun scoring still completes and serves the next identical query
+    await asyncio.sleep(0.4)
+    warmed = await tool.rag_search(**search)
+    assert warmed["rag_info"]["rerank"]["cached"] == 4
+    assert [r["doc_id"] for r in warmed["results"]] == order
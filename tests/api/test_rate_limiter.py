@@ -0,0 +1,138 @@
+"""Tests for the adaptive per-upstream rate limiters."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import httpx
+import openai
+import pytest
+from qdrant_client.http.exceptions import UnexpectedResponse
+
+from agent_data_manager.tools import external_tool_registry
+from agent_data_manager.tools.external_tool_registry import get_openai_embeddings_batch
+from agent_data_manager.tools.prometheus_metrics import qdrant_registry
+from agent_data_manager.utils import rate_limiter, resilience
+from agent_data_manager.utils.rate_limiter import (
+    UpstreamRateLimiter,
+    get_rate_limiter,
+    parse_duration,
+)
+from agent_data_manager.vector_store.qdrant_store import QdrantStore
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    """Record limiter waits instead of sleeping through them."""
+    sleep = AsyncMock()
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", sleep)
+    return sleep
+
+
+@pytest.mark.asyncio
+async def test_buckets_pace_requests_and_tokens(no_sleep):
+    """Requests are spaced at the configured rate; large token requests leave a debt."""
+    limiter = UpstreamRateLimiter(
+        "openai", requests_per_minute=600, tokens_per_minute=60_000, burst_seconds=0
+    )
+
+    assert await limiter.acquire() == 0
+    assert await limiter.acquire() == pytest.approx(0.1, abs=0.01)
+    assert await limiter.acquire() == pytest.approx(0.2, abs=0.01)
+
+    tokens = UpstreamRateLimiter("openai", None, tokens_per_minute=60_000)
+    assert await tokens.acquire(tokens=5000) == 0  # Larger than the bucket, still sent
+    assert await tokens.acquire(tokens=10) == pytest.approx(4.01, abs=0.01)
+    assert no_sleep.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_responses_adapt_the_limiter(no_sleep):
+    """429s pause and slow the limiter; successes and headers tune it back."""
+    limiter = UpstreamRateLimiter("qdrant", requests_per_minute=6000)
+    before = qdrant_registry.get_sample_value(
+        "rate_limiter_throttled_total", {"upstream": "qdrant"}
+    )
+
+    limiter.observe_response(429, {"Retry-After": "2"})
+    assert limiter.rates() == {"requests": 3000}
+    assert await limiter.acquire() == pytest.approx(2.0, abs=0.01)
+    after = qdrant_registry.get_sample_value(
+        "rate_limiter_throttled_total", {"upstream": "qdrant"}
+    )
+    assert after - (before or 0) == 1
+
+    for _ in range(5):
+        limiter.observe_response(200)
+    assert limiter.rates() == {"requests": 4500}
+
+    # The advertised limit caps the rate; nothing left pauses until the reset
+    limiter.observe_response(
+        200,
+        {
+            "x-ratelimit-limit-requests": "1200",
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": "1m30s",
+        },
+    )
+    assert limiter.rates() == {"requests": 1200}
+    assert await limiter.acquire() == pytest.approx(90.0, abs=0.1)
+    assert parse_duration("20ms") == pytest.approx(0.02)
+    assert parse_duration("6m0s") == 360
+
+
+@pytest.mark.asyncio
+async def test_openai_429_is_retried_after_retry_after(monkeypatch, no_sleep):
+    """A rate-limited embedding request waits out Retry-After and is retried."""
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    calls = []
+
+    async def create(input, model, encoding_format):
+        calls.append(list(input))
+        if len(calls) == 1:
+            response = httpx.Response(
+                429,
+                headers={"retry-after-ms": "1500"},
+                request=httpx.Request("POST", "https://api.openai.com"),
+            )
+            raise openai.RateLimitError("slow down", response=response, body=None)
+        return SimpleNamespace(
+            data=[SimpleNamespace(index=i, embedding=[1.0]) for i in range(len(input))],
+            usage=SimpleNamespace(total_tokens=4),
+            model=model,
+        )
+
+    monkeypatch.setattr(
+        external_tool_registry,
+        "openai_async_client",
+        SimpleNamespace(embeddings=SimpleNamespace(create=create)),
+    )
+
+    result = await get_openai_embeddings_batch(None, ["one", "two"])
+
+    assert result["embeddings"] == [[1.0], [1.0]]
+    assert len(calls) == 2
+    waits = [call.args[0] for call in no_sleep.await_args_list]
+    assert waits and waits[-1] == pytest.approx(1.5, abs=0.01)
+    assert get_rate_limiter("openai").rates()["requests"] < 3000
+
+
+@pytest.mark.asyncio
+async def test_qdrant_calls_report_every_response(monkeypatch, no_sleep):
+    """Qdrant 429s slow the shared limiter and successful calls restore it."""
+    limiter = UpstreamRateLimiter("qdrant", requests_per_minute=6000)
+    monkeypatch.setattr(rate_limiter, "_limiters", {"qdrant": limiter})
+    monkeypatch.setattr(resilience.asyncio, "sleep", AsyncMock())
+    store = QdrantStore(url="http://unused:6333", api_key="", collection_name="docs")
+    responses = [UnexpectedResponse(429, "Too Many Requests", b"", httpx.Headers())]
+
+    def search():
+        if responses:
+            raise responses.pop()
+        return []
+
+    assert await store._call(search, read=True) == []
+    assert limiter.rates() == {"requests": 3300}
+
+    for _ in range(4):
+        await store._call(search, read=True)
+    assert limiter.rates() == {"requests": 4500}
@@ -0,0 +1,116 @@
+"""Tests for vector-free search results and field projection."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from agent_data_manager import api_mcp_gateway as gateway
+from agent_data_manager.utils.result_cache import LRUCache
+from agent_data_manager.vector_store.qdrant_store import QdrantStore
+
+
+def _point(point_id: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=point_id,
+        score=0.9,
+        payload={"doc_id": f"doc_{point_id}", "title": f"Title {point_id}"},
+        vector=[0.1] * 8,
+    )
+
+
+@pytest.fixture
+def gateway_client():
+    """ASGI client for the gateway with auth disabled and a mocked store."""
+    store = MagicMock()
+    store.collection_name = "projection_test"
+    store.semantic_search = AsyncMock(
+        return_value={
+            "status": "success",
+            "results": [
+                {"id": 1, "score": 0.9, "metadata": {"title": "Refunds"}},
+            ],
+        }
+    )
+
+    with (
+        patch.object(gateway, "qdrant_store", store),
+        patch.object(gateway, "vectorization_tool", MagicMock()),
+        patch.object(gateway, "_rag_cache", LRUCache(max_size=100, ttl=3600)),
+        patch.object(gateway.settings, "ENABLE_AUTHENTICATION", False),
+        patch.object(gateway.settings, "RAG_CACHE_ENABLED", True),
+        patch.object(gateway.limiter, "enabled", False),
+    ):
+        transport = httpx.ASGITransport(app=gateway.app)
+        yield httpx.AsyncClient(transport=transport, base_url="http://test"), store
+
+
+@pytest.mark.asyncio
+async def test_store_omits_vectors_unless_requested():
+    """Qdrant is asked for no vectors by default and results carry none."""
+    store = QdrantStore(
+        url="http://unused:6333", api_key="", collection_name="projection_test"
+    )
+    store._client = MagicMock()
+    store._client.search.return_value = [_point(1)]
+    store._client.scroll.return_value = ([_point(2)], None)
+    store._collection_initialized = True
+
+    search = await store.semantic_search(
+        "refunds", query_vector=[0.1] * 8, with_payload=["title"]
+    )
+    assert "vector" not in search["results"][0]
+    kwargs = store._client.search.call_args.kwargs
+    assert (kwargs["with_payload"], kwargs["with_vectors"]) == (["title"], False)
+
+    recent = await store.get_recent_documents(limit=1, with_vectors=True)
+    assert recent["results"][0]["vector"] == [0.1] * 8
+    assert store._client.scroll.call_args.kwargs["with_vectors"] is True
+
+
+@pytest.mark.asyncio
+async def test_query_fields_are_projected_and_pushed_down(gateway_client):
+    """/query and /batch_query fetch and return only the listed fields."""
+    client, store = gateway_client
+    fields = ["score", "metadata.title"]
+
+    single = await client.post(
+        "/query", json={"query_text": "refunds", "fields": fields}
+    )
+    batch = await client.post(
+        "/batch_query",
+        json={"queries": [{"query_text": "refunds", "fields": fields}]},
+    )
+
+    expected = [{"score": 0.9, "metadata": {"title": "Refunds"}}]
+    assert single.json()["results"] == expected
+    assert batch.json()["results"][0]["results"] == expected
+    for call in store.semantic_search.call_args_list:
+        assert call.kwargs["with_payload"] == ["title"]
+        assert call.kwargs["with_vectors"] is False
+
+
+@pytest.mark.asyncio
+async def test_cskh_fields_apply_to_cached_results(gateway_client):
+    """Projection happens after the cache, so projected requests share entries."""
+    client, _ = gateway_client
+    rag_search = AsyncMock(
+        return_value={
+            "status": "success",
+            "results": [{"doc_id": "doc_1", "content": "long text", "score": 0.8}],
+            "count": 1,
+        }
+    )
+
+    with patch.object(gateway, "qdrant_rag_search", rag_search):
+        full = await client.post("/cskh_query", json={"query_text": "refunds"})
+        projected = await client.post(
+            "/cskh_query",
+            json={"query_text": "refunds", "fields": ["doc_id", "score"]},
+        )
+
+    assert "content" in full.json()["results"][0]
+    assert projected.json()["cached"] is True
+    assert projected.json()["results"] == [{"doc_id": "doc_1", "score": 0.8}]
+    assert rag_search.await_count == 1
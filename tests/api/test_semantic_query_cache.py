@@ -0,0 +1,144 @@
+"""Tests for the semantic (near-duplicate query) cache tier of /cskh_query."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from agent_data_manager import api_mcp_gateway as gateway
+from agent_data_manager.tools.prometheus_metrics import semantic_cache_samples_total
+from agent_data_manager.utils.result_cache import LRUCache
+from agent_data_manager.utils.semantic_cache import SemanticQueryCache
+
+EMBEDDINGS = {
+    "how do i reset my password": [1.0, 0.0, 0.0],
+    "how can i reset my password": [0.99, 0.1, 0.0],
+    "what are your opening hours": [0.0, 1.0, 0.0],
+}
+
+
+class RecordingRagSearch:
+    """Stand-in for qdrant_rag_search that records the kwargs of each call."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, **kwargs):
+        self.calls.append(kwargs)
+        doc_id = f"doc_{len(self.calls)}"
+        return {
+            "status": "success",
+            "results": [{"doc_id": doc_id, "content": kwargs["query_text"]}],
+            "count": 1,
+            "rag_info": {},
+        }
+
+
+@pytest.fixture
+def gateway_client():
+    """ASGI client for the gateway with an enabled semantic cache."""
+    store = MagicMock()
+    store.collection_name = "semantic_test"
+    store.embed_query = AsyncMock(side_effect=lambda text: EMBEDDINGS[text])
+    semantic_cache = SemanticQueryCache(max_entries=10, similarity_threshold=0.95)
+
+    with (
+        patch.object(gateway, "qdrant_store", store),
+        patch.object(gateway, "vectorization_tool", MagicMock()),
+        patch.object(gateway, "_rag_cache", LRUCache(max_size=100, ttl=3600)),
+        patch.object(gateway, "_semantic_cache", semantic_cache),
+        patch.object(gateway, "_semantic_sample_rate", 0.0),
+        patch.object(gateway.settings, "ENABLE_AUTHENTICATION", False),
+        patch.object(gateway.settings, "RAG_CACHE_ENABLED", True),
+        patch.object(gateway.limiter, "enabled", False),
+    ):
+        transport = httpx.ASGITransport(app=gateway.app)
+        yield httpx.AsyncClient(transport=transport, base_url="http://test"), store
+
+
+def test_lookup_requires_similarity_filters_and_generation():
+    """Only close embeddings with identical filters and generation hit."""
+    cache = SemanticQueryCache(max_entries=2, similarity_threshold=0.95)
+    cache.put([1.0, 0.0], "filters_a", {"total_found": 1}, generation=3, query_text="q")
+
+    assert cache.lookup([0.99, 0.05], "filters_a", generation=3)[0] == {
+        "total_found": 1
+    }
+    assert cache.lookup([0.7, 0.7], "filters_a", generation=3) is None
+    assert cache.lookup([1.0, 0.0], "filters_b", generation=3) is None
+    assert cache.lookup([1.0, 0.0], "filters_a", generation=4) is None
+    assert cache.get_stats()["hit_rate"] == 0.25
+
+    # Full cache replaces the least recently used slot
+    cache.put([0.0, 1.0], "filters_a", {"total_found": 2}, generation=3)
+    assert cache.lookup([1.0, 0.0], "filters_a", generation=3) is not None
+    cache.put([-1.0, 0.0], "filters_a", {"total_found": 3}, generation=3)
+    assert cache.size() == 2
+    assert cache.lookup([0.0, 1.0], "filters_a", generation=3) is None
+    assert cache.lookup([1.0, 0.0], "filters_a", generation=3) is not None
+
+
+@pytest.mark.asyncio
+async def test_paraphrase_is_served_from_semantic_cache(gateway_client):
+    """A paraphrase reuses the cached result and the miss reuses its embedding."""
+    client, store = gateway_client
+    rag_search = RecordingRagSearch()
+
+    with patch.object(gateway, "qdrant_rag_search", rag_search):
+        first = await client.post(
+            "/cskh_query", json={"query_text": "how do i reset my password"}
+        )
+        paraphrase = await client.post(
+            "/cskh_query", json={"query_text": "how can i reset my password"}
+        )
+        other_limit = await client.post(
+            "/cskh_query",
+            json={"query_text": "how can i reset my password", "limit": 3},
+        )
+        unrelated = await client.post(
+            "/cskh_query", json={"query_text": "what are your opening hours"}
+        )
+
+    assert first.json()["cached"] is False
+    assert (
+        rag_search.calls[0]["query_vector"] == EMBEDDINGS["how do i reset my password"]
+    )
+
+    data = paraphrase.json()
+    assert data["cached"] is True
+    assert data["results"][0]["doc_id"] == "doc_1"
+    assert data["rag_info"]["semantic_cache"]["matched_query"] == (
+        "how do i reset my password"
+    )
+    assert data["rag_info"]["semantic_cache"]["similarity"] >= 0.95
+
+    assert other_limit.json()["cached"] is False
+    assert unrelated.json()["cached"] is False
+    assert len(rag_search.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_sampled_hits_record_false_hits(gateway_client):
+    """Sampled semantic hits are re-run and mismatches are counted."""
+    client, _ = gateway_client
+    rag_search = RecordingRagSearch()
+    false_hits = semantic_cache_samples_total.labels(outcome="false_hit")
+    before = false_hits._value.get()
+
+    with (
+        patch.object(gateway, "qdrant_rag_search", rag_search),
+        patch.object(gateway, "_semantic_sample_rate", 1.0),
+    ):
+        await client.post(
+            "/cskh_query", json={"query_text": "how do i reset my password"}
+        )
+        response = await client.post(
+            "/cskh_query", json={"query_text": "how can i reset my password"}
+        )
+        assert response.json()["cached"] is True
+        await asyncio.gather(*list(gateway._semantic_sample_tasks))
+
+    # The live search returned a different document than the one served
+    assert len(rag_search.calls) == 2
+    assert false_hits._value.get() == before + 1
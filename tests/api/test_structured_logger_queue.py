@@ -0,0 +1,119 @@
+"""Tests for the queued structured logging pipeline and per-logger rate limiting."""
+
+import json
+import logging
+import threading
+import time
+from unittest.mock import patch
+
+from agent_data_manager.utils import structured_logger
+from agent_data_manager.utils.structured_logger import (
+    SamplingFilter,
+    StructuredLogger,
+    flush_logs,
+)
+
+
+def test_formatting_and_io_happen_on_writer_thread(tmp_path):
+    """Callers return before the slow write; %-args are rendered off-thread."""
+    log_file = str(tmp_path / "queued.log")
+    logger = StructuredLogger("test.queue.writer", log_file)
+    pipeline = structured_logger._get_pipeline(log_file)
+    file_handler = pipeline.listener.handlers[0]
+    original_emit = file_handler.emit
+
+    def slow_emit(record):
+        time.sleep(0.05)
+        original_emit(record)
+
+    formatted_on = []
+
+    class Payload:
+        def __str__(self):
+            formatted_on.append(threading.current_thread())
+            return "payload"
+
+    # Keep test-runner capture handlers on the root logger out of the picture
+    with (
+        patch.object(file_handler, "emit", side_effect=slow_emit),
+        patch.object(logger.logger, "propagate", False),
+        patch("random.random", return_value=0.0),
+    ):
+        start = time.perf_counter()
+        for _ in range(5):
+            logger.warning("value=%s", Payload(), doc_id="doc_1")
+        elapsed = time.perf_counter() - start
+        flush_logs()
+
+    assert elapsed < 0.05
+    assert formatted_on and all(t is pipeline.thread for t in formatted_on)
+
+    with open(log_file) as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    assert len(entries) == 5
+    assert entries[0]["message"] == "value=payload"
+    assert entries[0]["doc_id"] == "doc_1"
+
+
+def test_rate_limit_is_per_logger_and_spares_errors():
+    """A chatty logger is capped without affecting other loggers or errors."""
+    sampling_filter = SamplingFilter(info_sample_rate=1.0, max_per_second=1, burst=3)
+
+    def record(name, level):
+        return logging.LogRecord(name, level, "test.py", 1, "msg", (), None)
+
+    chatty = [sampling_filter.filter(record("chatty", logging.INFO)) for _ in range(10)]
+    assert chatty.count(True) == 3
+    assert sampling_filter.suppressed["chatty"] == 7
+
+    assert sampling_filter.filter(record("quiet", logging.WARNING)) is True
+    assert sampling_filter.filter(record("chatty", logging.ERROR)) is True
+
+
+def test_full_queue_drops_info_but_keeps_errors(tmp_path):
+    """Non-error records are dropped instead of blocking when the queue is full."""
+    log_file = str(tmp_path / "bounded.log")
+    with patch.object(
+        structured_logger.settings,
+        "get_logging_config",
+        return_value={
+            "queue_max_size": 2,
+            "error_flush_timeout": 0.1,
+            "info_sample_rate": 1.0,
+            "rate_limit_per_second": 0,
+            "rate_limit_burst": 1,
+        },
+    ):
+        logger = StructuredLogger("test.queue.bounded", log_file)
+    pipeline = structured_logger._get_pipeline(log_file)
+
+    release = threading.Event()
+    file_handler = pipeline.listener.handlers[0]
+    original_emit = file_handler.emit
+
+    def gated_emit(record):
+        release.wait(timeout=2)
+        original_emit(record)
+
+    with patch.object(file_handler, "emit", side_effect=gated_emit):
+        for i in range(10):
+            logger.info(f"info {i}")
+        assert pipeline.dropped > 0
+
+        release.set()
+        logger.error("must be written")
+
+        # A stuck writer delays errors by the flush timeout, not indefinitely
+        release.clear()
+        logger.info("holds the writer")
+        start = time.perf_counter()
+        logger.error("queued behind it")
+        assert time.perf_counter() - start < 1.0
+        assert not pipeline.flush(timeout=0.01)
+        release.set()
+        assert pipeline.flush(timeout=2)
+
+    with open(log_file) as f:
+        messages = [json.loads(line)["message"] for line in f if line.strip()]
+    assert "must be written" in messages and "queued behind it" in messages
+    assert len(messages) < 13
@@ -0,0 +1,111 @@
+"""Tests for the shared event loop behind the sync Qdrant tool wrappers."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from agent_data_manager.config.settings import Settings
+from agent_data_manager.tools import qdrant_sync_wrappers
+from agent_data_manager.tools.prometheus_metrics import qdrant_registry
+from agent_data_manager.tools.qdrant_sync_wrappers import run_async_tool
+from agent_data_manager.utils.background_loop import BackgroundEventLoop
+
+
+@pytest.fixture
+def tool_loop(monkeypatch):
+    """A fresh tool loop, stopped after the test."""
+    loop = BackgroundEventLoop(name="test-sync-tool-loop")
+    monkeypatch.setattr(qdrant_sync_wrappers, "_tool_loop", loop)
+    monkeypatch.setattr(qdrant_sync_wrappers, "_concurrency", None)
+    monkeypatch.setattr(Settings, "SYNC_TOOL_TIMEOUT", 5.0)
+    monkeypatch.setattr(Settings, "SYNC_TOOL_MAX_CONCURRENCY", 16)
+    yield loop
+    loop.stop()
+
+
+def _metric(name, **labels):
+    return qdrant_registry.get_sample_value(name, labels) or 0
+
+
+async def loop_and_thread():
+    return id(asyncio.get_running_loop()), threading.current_thread().name
+
+
+def test_calls_reuse_one_loop_with_or_without_a_running_loop(tool_loop, monkeypatch):
+    """Plain threads and threads running a loop both submit to the tool loop."""
+    monkeypatch.setattr(qdrant_sync_wrappers, "async_qdrant_get_count", loop_and_thread)
+
+    first = qdrant_sync_wrappers.qdrant_get_count_sync()
+    second = qdrant_sync_wrappers.qdrant_get_count_sync()
+
+    async def from_running_loop():
+        return qdrant_sync_wrappers.qdrant_get_count_sync()
+
+    third = asyncio.run(from_running_loop())
+    assert first == second == third == (id(tool_loop.loop), "test-sync-tool-loop")
+    assert tool_loop.setup_ms is not None
+
+
+def test_concurrency_is_bounded_and_latency_tracked(tool_loop, monkeypatch):
+    """At most SYNC_TOOL_MAX_CONCURRENCY tools run at once; each call is timed."""
+    monkeypatch.setattr(Settings, "SYNC_TOOL_MAX_CONCURRENCY", 2)
+    running = []
+    peak = []
+
+    async def bounded_tool(i):
+        running.append(i)
+        peak.append(len(running))
+        await asyncio.sleep(0.05)
+        running.remove(i)
+        return i
+
+    calls = _metric(
+        "sync_tool_duration_seconds_count", tool="bounded_tool", status="success"
+    )
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(
+            executor.map(lambda i: run_async_tool(bounded_tool, i), range(6))
+        )
+
+    assert results == list(range(6))
+    assert max(peak) == 2
+    assert (
+        _metric(
+            "sync_tool_duration_seconds_count", tool="bounded_tool", status="success"
+        )
+        == calls + 6
+    )
+    assert _metric("sync_tool_in_flight") == 0
+
+
+def test_timed_out_calls_are_cancelled_and_reported(tool_loop, monkeypatch):
+    """A call over SYNC_TOOL_TIMEOUT raises TimeoutError and cancels the tool."""
+    monkeypatch.setattr(Settings, "SYNC_TOOL_TIMEOUT", 0.05)
+    cancelled = threading.Event()
+
+    async def stuck_tool():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    timeouts = _metric(
+        "sync_tool_duration_seconds_count", tool="stuck_tool", status="timeout"
+    )
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        run_async_tool(stuck_tool)
+    assert time.monotonic() - started < 1
+    assert cancelled.wait(1)
+    assert (
+        _metric("sync_tool_duration_seconds_count", tool="stuck_tool", status="timeout")
+        == timeouts + 1
+    )
+
+    # The loop keeps serving calls after a timeout
+    monkeypatch.setattr(Settings, "SYNC_TOOL_TIMEOUT", 5.0)
+    assert run_async_tool(loop_and_thread)[0] == id(tool_loop.loop)
@@ -0,0 +1,194 @@
+"""Tests for async upstream retries, circuit breakers and hedged reads."""
+
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from agent_data_manager.tools import external_tool_registry
+from agent_data_manager.tools.external_tool_registry import get_openai_embedding
+from agent_data_manager.tools.prometheus_metrics import qdrant_registry
+from agent_data_manager.utils import rate_limiter, resilience
+from agent_data_manager.utils.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    call_upstream,
+    request_deadline,
+)
+from agent_data_manager.vector_store.qdrant_store import QdrantStore
+
+
+@pytest.fixture(autouse=True)
+def fresh_upstreams(monkeypatch):
+    """Give each test its own breakers and rate limiters."""
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+
+
+class StatusError(Exception):
+    """Error carrying an HTTP status, like google.api_core exceptions."""
+
+    def __init__(self, code):
+        super().__init__(f"status {code}")
+        self.code = code
+
+
+def _metric(name, **labels):
+    return qdrant_registry.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.asyncio
+async def test_async_embedding_failures_are_retried_within_the_deadline(monkeypatch):
+    """Connection errors are retried (the old sync decorator never did); 400s are not."""
+    calls = []
+    connection_drops = [True]
+    request = httpx.Request("POST", "https://api.openai.com")
+
+    async def create(input, model, encoding_format):
+        calls.append(list(input))
+        if connection_drops:
+            connection_drops.pop()
+            raise openai.APIConnectionError(request=request)
+        if input == ["bad"]:
+            raise openai.BadRequestError(
+                "invalid input",
+                response=httpx.Response(400, request=request),
+                body=None,
+            )
+        return SimpleNamespace(
+            data=[SimpleNamespace(index=0, embedding=[0.5])],
+            usage=SimpleNamespace(total_tokens=1),
+            model=model,
+        )
+
+    monkeypatch.setattr(
+        external_tool_registry,
+        "openai_async_client",
+        SimpleNamespace(embeddings=SimpleNamespace(create=create)),
+    )
+    retries = _metric("upstream_retries_total", upstream="openai")
+
+    result = await get_openai_embedding(None, "hello")
+    assert result["embedding"] == [0.5]
+    assert len(calls) == 2
+    assert _metric("upstream_retries_total", upstream="openai") - retries == 1
+
+    calls.clear()
+    result = await get_openai_embedding(None, "bad")
+    assert result["status_code"] == 400 and len(calls) == 1
+
+    # A backoff that would outlive the deadline is not waited out
+    async def always_down():
+        calls.append("down")
+        raise ConnectionError("upstream down")
+
+    calls.clear()
+    started = time.monotonic()
+    with pytest.raises(ConnectionError), request_deadline(0.05):
+        await call_upstream(
+            "qdrant",
+            always_down,
+            policy=RetryPolicy(max_attempts=5, base_delay=10, max_delay=10),
+        )
+    assert time.monotonic() - started < 0.05 * 10
+    assert 1 <= len(calls) < 5
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_opens_rejects_and_recovers():
+    """Consecutive transient failures open the breaker; a successful probe closes it."""
+    breaker = CircuitBreaker("firestore", failure_threshold=2, reset_timeout=0.05)
+    resilience._breakers["firestore"] = breaker
+    policy = RetryPolicy(max_attempts=1)
+    rejections = _metric("circuit_breaker_rejections_total", upstream="firestore")
+
+    async def unavailable():
+        raise StatusError(503)
+
+    for _ in range(2):
+        with pytest.raises(StatusError):
+            await call_upstream("firestore", unavailable, policy=policy)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert _metric("circuit_breaker_state", upstream="firestore") == 2
+
+    async def healthy():
+        return "ok"
+
+    with pytest.raises(CircuitOpenError):
+        await call_upstream("firestore", healthy, policy=policy)
+    assert _metric("circuit_breaker_rejections_total", upstream="firestore") == (
+        rejections + 1
+    )
+
+    await asyncio.sleep(0.06)
+
+    # A probe cancelled by its caller does not keep the breaker half-open
+    async def hanging():
+        await asyncio.sleep(10)
+
+    probe = asyncio.ensure_future(call_upstream("firestore", hanging, policy=policy))
+    await asyncio.sleep(0.01)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    assert await call_upstream("firestore", healthy, policy=policy) == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert _metric("circuit_breaker_state", upstream="firestore") == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_idempotent_reads_are_hedged(monkeypatch):
+    """A read slower than hedge_delay is sent again and the first answer wins."""
+    started = []
+
+    async def read():
+        attempt = len(started)
+        started.append(asyncio.current_task())
+        await asyncio.sleep(0.5 if attempt == 0 else 0.01)
+        return f"answer {attempt}"
+
+    hedge_wins = _metric(
+        "upstream_hedged_requests_total", upstream="qdrant", winner="hedge"
+    )
+    began = time.monotonic()
+    result = await call_upstream("qdrant", read, idempotent=True, hedge_delay=0.02)
+
+    assert result == "answer 1"
+    assert time.monotonic() - began < 0.3
+    assert (
+        _metric("upstream_hedged_requests_total", upstream="qdrant", winner="hedge")
+        == hedge_wins + 1
+    )
+    await asyncio.sleep(0)
+    assert started[0].cancelled()
+
+    # Writes are never duplicated
+    started.clear()
+    assert await call_upstream("qdrant", read, hedge_delay=0.02) == "answer 0"
+    assert len(started) == 1
+
+    # A save retried after Qdrant already applied it overwrites the same point
+    store = QdrantStore(
+        ":memory:", "", collection_name=f"retry_{uuid.uuid4().hex[:8]}", vector_size=4
+    )
+    await store._ensure_collection()
+    upsert = store.client.upsert
+    drops = [True]
+
+    def applied_then_dropped(**kwargs):
+        result = upsert(**kwargs)
+        if drops:
+            drops.pop()
+            raise ValueError("response lost after the write")
+        return result
+
+    monkeypatch.setattr(store.client, "upsert", applied_then_dropped)
+    assert not (await store.upsert_vector("doc", [0.1, 0.2, 0.3, 0.4]))["success"]
+    assert (await store.upsert_vector("doc", [0.1, 0.2, 0.3, 0.4]))["success"]
+    assert store.client.count(store.collection_name).count == 1
@@ -0,0 +1,256 @@
+"""Tests for named vector spaces and the re-embedding job."""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import numpy as np
+import pytest
+from qdrant_client.local.local_collection import LocalCollection
+
+from agent_data_manager import api_mcp_gateway as gateway
+from agent_data_manager.config.settings import Settings
+from agent_data_manager.embedding import openai_embedding_provider, vector_spaces
+from agent_data_manager.embedding.deterministic_embedding_provider import (
+    DeterministicEmbeddingProvider,
+)
+from agent_data_manager.embedding.openai_embedding_provider import (
+    OpenAIEmbeddingProvider,
+)
+from agent_data_manager.embedding.vector_spaces import (
+    VectorSpace,
+    get_space_embedding_provider,
+    get_vector_space,
+    get_vector_spaces,
+    parse_vector_spaces,
+)
+from agent_data_manager.tools import reembedding_job
+from agent_data_manager.tools.prometheus_metrics import qdrant_registry
+from agent_data_manager.tools.qdrant_vectorization_tool import QdrantVectorizationTool
+from agent_data_manager.tools.reembedding_job import (
+    ReembeddingJob,
+    get_reembedding_job,
+    start_reembedding,
+)
+from agent_data_manager.utils import rate_limiter, resilience
+from agent_data_manager.vector_store import qdrant_store
+from agent_data_manager.vector_store.qdrant_store import QdrantStore
+
+DOCS = {
+    "refund": "Refunds are issued to the original card within five days",
+    "invoice": "Invoices can be downloaded from the billing page",
+    "login": "Reset the password from the login screen when locked out",
+}
+
+
+def _metric(name, **labels):
+    return qdrant_registry.get_sample_value(name, labels) or 0
+
+
+@pytest.fixture
+def two_spaces(monkeypatch):
+    """Offline embeddings with a 48-dimension "large" space next to the default."""
+    add_point = LocalCollection._add_point
+
+    def add_point_keeping_named_vectors(self, point):
+        # qdrant-client's local mode grows a named vector's array only when the
+        # added point has that vector, so vectors added later have no row
+        idx = len(self.ids)
+        add_point(self, point)
+        for name, vectors in self.vectors.items():
+            if vectors.shape[0] <= idx:
+                self.vectors[name] = np.resize(vectors, (idx * 2 + 1, vectors.shape[1]))
+
+    monkeypatch.setattr(LocalCollection, "_add_point", add_point_keeping_named_vectors)
+    monkeypatch.setattr(Settings, "HYBRID_SEARCH_ENABLED", False)
+    monkeypatch.setattr(Settings, "RAG_SEARCH_MODE", "vector")
+    monkeypatch.setattr(Settings, "RERANK_ENABLED", False)
+    monkeypatch.setattr(Settings, "QDRANT_REQUESTS_PER_MINUTE", 0)
+    monkeypatch.setattr(Settings, "EMBEDDING_PROVIDER", "deterministic")
+    monkeypatch.setattr(Settings, "EMBEDDING_BATCHING_ENABLED", False)
+    monkeypatch.setattr(Settings, "VECTOR_DIMENSION", 32)
+    monkeypatch.setattr(Settings, "VECTOR_SPACES", "large=large-model:48")
+    monkeypatch.setattr(Settings, "VECTOR_SPACE", "default")
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    monkeypatch.setattr(vector_spaces, "_providers", {})
+    monkeypatch.setattr(reembedding_job, "_jobs", {})
+
+
+def _store() -> QdrantStore:
+    return QdrantStore(
+        ":memory:", "", collection_name=f"spaces_{uuid.uuid4().hex[:8]}", vector_size=32
+    )
+
+
+def _tool(store: QdrantStore) -> QdrantVectorizationTool:
+    tool = QdrantVectorizationTool(
+        embedding_provider=DeterministicEmbeddingProvider(dimension=32)
+    )
+    tool.qdrant_store = store
+    tool.firestore_manager = MagicMock()
+    tool._initialized = True
+    tool._batch_get_firestore_metadata = AsyncMock(
+        side_effect=lambda doc_ids: {
+            doc_id: {"content_preview": DOCS[doc_id], "version": 1}
+            for doc_id in doc_ids
+        }
+    )
+    return tool
+
+
+@pytest.mark.asyncio
+async def test_vector_space_config_and_model_dimensions(two_spaces, monkeypatch):
+    """Spaces parse from settings; OpenAI spaces request their dimension."""
+    assert parse_vector_spaces(" a=text-embedding-3-large:256 ,b=m:v1:8,") == [
+        VectorSpace("a", "text-embedding-3-large", 256),
+        VectorSpace("b", "m:v1", 8),
+    ]
+    for spec in ("a=model", "a=:8", "a b=m:8", "default=m:8", "a=m:8,a=n:8"):
+        with pytest.raises(ValueError):
+            parse_vector_spaces(spec)
+
+    spaces = get_vector_spaces()
+    assert list(spaces) == ["default", "large"]
+    assert spaces["default"] == VectorSpace("default", "deterministic-hash", 32)
+    assert (
+        spaces["default"].vector_name == "" and spaces["large"].vector_name == "large"
+    )
+    assert get_vector_space() == spaces["default"]
+    with pytest.raises(ValueError, match="Unknown vector space 'huge'"):
+        get_vector_space("huge")
+
+    provider = get_space_embedding_provider("large")
+    assert provider is get_space_embedding_provider("large")
+    assert provider.get_embedding_dimension() == 48
+    assert provider.get_model_name() == "large-model"
+
+    batch = AsyncMock(
+        return_value={"embeddings": [[0.5] * 256], "batches": [], "errors": {}}
+    )
+    monkeypatch.setattr(openai_embedding_provider, "OPENAI_AVAILABLE", True)
+    monkeypatch.setattr(openai_embedding_provider, "openai_async_client", object())
+    monkeypatch.setattr(openai_embedding_provider, "get_openai_embeddings_batch", batch)
+    native = OpenAIEmbeddingProvider("text-embedding-3-large", dimensions=3072)
+    assert native.dimensions is None and native.get_embedding_dimension() == 3072
+    short = OpenAIEmbeddingProvider("text-embedding-3-large", dimensions=256)
+    assert short.get_embedding_dimension() == 256
+    assert await short.embed(["refunds"]) == [[0.5] * 256]
+    assert batch.call_args.kwargs["dimensions"] == 256
+
+
+@pytest.mark.asyncio
+async def test_search_selects_vector_space_per_request(two_spaces, monkeypatch):
+    """New writes fill every space; searches pick one, unknown ones fail."""
+    store = _store()
+    tool = _tool(store)
+    for doc_id, text in DOCS.items():
+        result = await tool.vectorize_document(
+            doc_id, text, update_firestore=False, enable_auto_tagging=False
+        )
+        assert result["status"] == "success"
+    assert store.dense_vectors == frozenset({"", "large"})
+
+    points, _ = await store.scroll_vector_space("large")
+    assert len(points) == 3 and all(point["has_vector"] for point in points)
+    assert {point["metadata"]["embedded_text"] for point in points} == set(
+        DOCS.values()
+    )
+
+    for space in ("default", "large"):
+        found = await store.semantic_search(
+            DOCS["invoice"], limit=1, score_threshold=0.0, vector_space=space
+        )
+        assert found["vector_space"] == space
+        assert found["results"][0]["metadata"]["doc_id"] == "invoice"
+
+    rag = await tool.rag_search(
+        DOCS["login"], limit=2, score_threshold=0.0, vector_space="large"
+    )
+    assert rag["status"] == "success"
+    assert rag["rag_info"]["vector_space"] == "large"
+    assert rag["results"][0]["doc_id"] == "login"
+    failed = await tool.rag_search("refunds", vector_space="huge")
+    assert failed["status"] == "failed" and "huge" in failed["error"]
+
+    # A collection created before "large" was declared only has the default
+    monkeypatch.setattr(Settings, "VECTOR_SPACES", "")
+    legacy = _store()
+    assert (await legacy.upsert_vector("doc", [0.1] * 32))["success"]
+    monkeypatch.setattr(Settings, "VECTOR_SPACES", "large=large-model:48")
+    monkeypatch.setattr(qdrant_store, "_ensured_collections", {})
+    reopened = QdrantStore(":memory:", "", legacy.collection_name, vector_size=32)
+    result = await reopened.semantic_search("doc", vector_space="large")
+    assert result["results"] == [] and "no vector space 'large'" in result["error"]
+    assert (await reopened.semantic_search("doc", score_threshold=0.0))["results"]
+
+
+@pytest.mark.asyncio
+async def test_reembedding_job_fills_space_and_resumes(two_spaces):
+    """The job embeds points missing the space's vector, in pages, idempotently."""
+    store = _store()
+    default = DeterministicEmbeddingProvider(dimension=32)
+    for doc_id, text in DOCS.items():
+        vector = await default.embed_single(text)
+        await store.upsert_vector(doc_id, vector, {"doc_id": doc_id}, text=text)
+    # Saved before texts were kept, with a truncated preview: cannot be re-embedded
+    await store.upsert_vector(
+        "old",
+        await default.embed_single("old"),
+        {"doc_id": "old", "content_preview": "x" * 200 + "...", "content_length": 900},
+    )
+    embedded = _metric(
+        "vector_space_reembed_points_total", space="large", result="embedded"
+    )
+
+    job = ReembeddingJob(store, "large", batch_size=2)
+    progress = await job.run()
+    assert progress["status"] == "completed"
+    assert progress["total"] == progress["scanned"] == 4
+    assert progress["embedded"] == 3 and progress["no_text"] == 1
+    assert progress["present"] == progress["failed"] == 0
+    assert progress["offset"] is None
+    assert (
+        _metric("vector_space_reembed_points_total", space="large", result="embedded")
+        == embedded + 3
+    )
+    assert _metric("vector_space_reembed_progress", space="large") == 1.0
+
+    found = await store.semantic_search(
+        DOCS["refund"], limit=1, score_threshold=0.0, vector_space="large"
+    )
+    assert found["results"][0]["metadata"]["doc_id"] == "refund"
+
+    # Running again only counts what is already there
+    again = await ReembeddingJob(store, "large", batch_size=2).run()
+    assert again["embedded"] == 0 and again["present"] == 3 and again["no_text"] == 1
+
+    # The background entry point reuses a running job and reports progress
+    assert get_reembedding_job("large", store) is None
+    started = start_reembedding("large", store, batch_size=2)
+    assert start_reembedding("large", store) is started
+    await started._task
+    assert get_reembedding_job("large", store) is started
+    assert started.progress["status"] == "completed"
+    with pytest.raises(ValueError):
+        start_reembedding("huge", store)
+
+    with (
+        patch.object(gateway, "qdrant_store", store),
+        patch.object(gateway.settings, "ENABLE_AUTHENTICATION", False),
+        patch.object(gateway.limiter, "enabled", False),
+    ):
+        transport = httpx.ASGITransport(app=gateway.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            status = await client.get("/vector_spaces/large/reembed")
+            assert status.json()["status"] == "completed"
+            assert status.json()["progress"]["embedded"] == 0
+            assert (
+                await client.get("/vector_spaces/default/reembed")
+            ).status_code == 404
+            assert (await client.post("/vector_spaces/huge/reembed")).status_code == 400
+            restarted = await client.post("/vector_spaces/large/reembed")
+            assert restarted.json()["status"] == "running"
+            await get_reembedding_job("large", store)._task
@@ -19,6 +19,7 @@ from collections.abc import Generator
 # Import the mocks from the dedicated file
 try:
     from tests.mocks.qdrant_basic import (
+        FakeAsyncQdrantClient,
         FakeQdrantClient,
     )
     from tests.mocks.qdrant_basic import (
@@ -29,6 +30,7 @@ except ImportError:
     from unittest.mock import Mock
 
     FakeQdrantClient = Mock
+    FakeAsyncQdrantClient = Mock
     mock_embedding_function = Mock()
 
 # Placeholder for actual QdrantStore, assuming it's in agent_data.vector_store.qdrant_store
@@ -269,6 +271,7 @@ os.environ["ENABLE_FIRESTORE_SYNC"] = "false"  # Disable Firestore for tests
 
 # Perform the global patch of QdrantClient
 _ORIGINAL_QDRANT_CLIENT = None
+_ORIGINAL_ASYNC_QDRANT_CLIENT = None
 try:
     # Import the module where QdrantClient is defined or imported by QdrantStore
     import agent_data.vector_store.qdrant_store
@@ -277,6 +280,11 @@ try:
     _ORIGINAL_QDRANT_CLIENT = agent_data.vector_store.qdrant_store.QdrantClient
     # Perform the patch by direct assignment
     agent_data.vector_store.qdrant_store.QdrantClient = FakeQdrantClient
+    # The async client shares the fake's in-memory data
+    _ORIGINAL_ASYNC_QDRANT_CLIENT = (
+        agent_data.vector_store.qdrant_store.AsyncQdrantClient
+    )
+    agent_data.vector_store.qdrant_store.AsyncQdrantClient = FakeAsyncQdrantClient
 except ImportError as e:
     print(
         f"CRITICAL WARNING: Could not import 'agent_data.vector_store.qdrant_store' for patching QdrantClient. Tests will likely fail. Error: {e}",
@@ -309,6 +317,10 @@ def _manage_env_and_qdrant_patch():
             import agent_data.vector_store.qdrant_store  # Re-import just in case
 
             agent_data.vector_store.qdrant_store.QdrantClient = _ORIGINAL_QDRANT_CLIENT
+            if _ORIGINAL_ASYNC_QDRANT_CLIENT is not None:
+                agent_data.vector_store.qdrant_store.AsyncQdrantClient = (
+                    _ORIGINAL_ASYNC_QDRANT_CLIENT
+                )
         except (ImportError, AttributeError) as e:
             # If it failed to import/patch initially, or if module was manipulated unexpectedly
             print(
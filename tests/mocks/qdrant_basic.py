@@ -1331,3 +1331,28 @@ class FakeQdrantClient:
     def _validate_collection_info(self, *args, **kwargs):
         """Placeholder for _validate_collection_info method"""
         return True
+
+
+class FakeAsyncQdrantClient:
+    """Async facade over FakeQdrantClient, mirroring qdrant_client.AsyncQdrantClient.
+
+    Every client method becomes a coroutine; data lives in the same class-level
+    store as FakeQdrantClient, so sync and async clients see the same points.
+    """
+
+    def __init__(
+        self, url: str, api_key: str | None = None, timeout: int = 10, **kwargs
+    ):
+        self._sync_client = FakeQdrantClient(
+            url=url, api_key=api_key, timeout=timeout, **kwargs
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._sync_client, name)
+        if not callable(attr):
+            return attr
+
+        async def _call(*args: Any, **kwargs: Any) -> Any:
+            return attr(*args, **kwargs)
+
+        return _call
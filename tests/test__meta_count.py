@@ -62,7 +62,41 @@ def test_meta_count():
     # CLI140m.10: Current count is 491 tests, updating to match actual count after coverage improvements
     # CLI140m.46: Updated to 515 tests to match current actual count
     # CLI140m.48: Updated to 519 tests to match current actual count after CLI140m.47c additions
-    EXPECTED_TOTAL_TESTS = 519  # Updated for CLI140m.48 to match actual test count
+    # Added 3 tests for login path hashing offload and event loop lag monitoring (519 -> 522)
+    # Added 4 tests for verified-token cache and revocation hooks (522 -> 526)
+    # Added 4 tests for buffered event publishing and backpressure policies (526 -> 530)
+    # Added 3 tests for the queued structured logging pipeline and rate limiting (530 -> 533)
+    # Added 2 tests for the async, pooled Qdrant clients in QdrantStore (533 -> 535)
+    # Added 3 tests for RAG cache keys, write invalidation and background refresh (535 -> 538)
+    # Added 6 tests for the memory, SQLite and Redis RAG cache backends (538 -> 544)
+    # Added 3 tests for the semantic near-duplicate CSKH query cache (544 -> 547)
+    # Added 3 tests for search field projection (547 -> 550)
+    # Added 3 tests for document chunking and grouped RAG search (550 -> 553)
+    # Added 3 tests for the MCPAgent persistent event loop and batches (553 -> 556)
+    # Added 3 tests for journaled FAISS metadata mutations (556 -> 559)
+    # Added 3 tests for streamed snapshot backup and restore (559 -> 562)
+    # Added 3 tests for checkpointed FAISS to Qdrant migration (562 -> 565)
+    # Added 3 tests for facet and registry based tag listing (565 -> 568)
+    # Added 3 tests for multi-input OpenAI embedding requests (568 -> 571)
+    # Added 3 tests for the micro-batching embedding dispatcher (571 -> 574)
+    # Added 3 tests for the adaptive upstream rate limiters (574 -> 577)
+    # Added 3 tests for upstream retries, circuit breakers and hedging (577 -> 580)
+    # Added 3 tests for the offline embedding provider and benchmark (580 -> 583)
+    # Added 3 tests for the shared QdrantStore registry and client pool (583 -> 586)
+    # Added 3 tests for the shared sync tool loop (586 -> 589)
+    # Added 3 tests for hybrid lexical + vector retrieval (589 -> 592)
+    # Added 3 tests for the rag_search reranking stage (592 -> 595)
+    # Added 3 tests for named vector spaces and re-embedding (595 -> 598)
+    # Added 1 test for publishing to the event queue across event loops (598 -> 599)
+    # Added 1 test for keeping shared RAG cache backends off the event loop (599 -> 600)
+    # Added 1 test for opt-in MCP tool timeouts (600 -> 601)
+    # Added 2 tests for spill replay backoff and in-flight batches on close (601 -> 603)
+    # Added 1 test for appending after a torn journal tail (603 -> 604)
+    # Added 4 tests for failing and unreachable RAG cache backends (604 -> 608)
+    # Added 1 test for Qdrant responses feeding the rate limiter (608 -> 609)
+    # Added 1 test for per-text retry of a rejected embedding batch (609 -> 610)
+    # Added 1 test for reconnecting after closing the Qdrant pool (610 -> 611)
+    EXPECTED_TOTAL_TESTS = 611  # Keep in sync with the collected test count
 
     # For CLI 126A. Test count after adding optimization tests (259->263, +4 tests)
     # Previous: CLI 126 had 259 tests (256 passed, 3 skipped)
@@ -15,6 +15,10 @@ from src.agent_data_manager.tools.qdrant_vectorization_tool import (
     qdrant_rag_search,
     qdrant_vectorize_document,
 )
+from src.agent_data_manager.utils.rate_limiter import (
+    UpstreamRateLimiter,
+    get_rate_limiter,
+)
 
 
 @pytest.mark.qdrant
@@ -35,10 +39,13 @@ class TestQdrantVectorizationToolCoverage:
         """Test rate limiting mechanism for free tier constraints."""
         tool = QdrantVectorizationTool(embedding_provider=self.mock_embedding_provider)
 
-        # Test rate limiter initialization
-        assert "last_call" in tool._rate_limiter
-        assert "min_interval" in tool._rate_limiter
-        assert tool._rate_limiter["min_interval"] == 0.3  # 300ms
+        # Test rate limiter initialization: the shared Qdrant limiter
+        assert tool._rate_limiter is get_rate_limiter("qdrant")
+
+        # A free-tier limiter allows one call per 300ms
+        tool._rate_limiter = UpstreamRateLimiter(
+            "qdrant", requests_per_minute=200, burst_seconds=0
+        )
 
         # Test rate limiting behavior
         await tool._rate_limit()
@@ -17,6 +17,7 @@ from src.agent_data_manager.tools.qdrant_vectorization_tool import (
     qdrant_rag_search,
     qdrant_vectorize_document,
 )
+from src.agent_data_manager.utils.rate_limiter import UpstreamRateLimiter
 
 
 @pytest.mark.performance
@@ -89,10 +90,14 @@ class TestCLI140fCoverage:
         """Test rate limiting mechanism without complex dependencies."""
         tool = QdrantVectorizationTool(embedding_provider=self.mock_embedding_provider)
 
-        # Test rate limiter initialization
-        assert "last_call" in tool._rate_limiter
-        assert "min_interval" in tool._rate_limiter
-        assert tool._rate_limiter["min_interval"] == 0.3  # 300ms
+        # Test rate limiter initialization: the shared Qdrant limiter, 200/min (300ms)
+        assert tool._rate_limiter.name == "qdrant"
+        assert tool._rate_limiter.buckets["requests"].configured_rate == 200
+
+        # Without burst capacity calls are spaced by the full interval
+        tool._rate_limiter = UpstreamRateLimiter(
+            "qdrant", requests_per_minute=200, burst_seconds=0
+        )
 
         # Test rate limiting behavior
         start_time = time.time()
@@ -161,7 +166,7 @@ class TestCLI140fCoverage:
         assert tool.embedding_provider is self.mock_embedding_provider
 
         # Test rate limiter properties
-        assert tool._rate_limiter["min_interval"] == 0.3
+        assert tool._rate_limiter.buckets["requests"].configured_rate == 200
 
         # Test filter methods with edge cases
         empty_results = []